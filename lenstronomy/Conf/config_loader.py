@@ -57,3 +57,16 @@ def conventions_conf():
         conf = yaml.safe_load(file)
         conventions_conf = conf["conventions"]
     return conventions_conf
+
+
+def fft_conf():
+    """
+
+    :return: keyword arguments of the FFT backend configurations (with defaults for
+        configuration files without an fft section)
+    """
+    fft_conf = {"backend": "numpy", "workers": 1, "wisdom_file": None}
+    with open(conf_file) as file:
+        conf = yaml.safe_load(file)
+        fft_conf.update(conf.get("fft", None) or {})
+    return fft_conf
@@ -3,6 +3,7 @@ __author__ = "sibirrer"
 import numpy as np
 import lenstronomy.Util.constants as const
 from lenstronomy.Cosmo.cosmo_interp import CosmoInterp
+from lenstronomy.Cosmo.cosmo_numpy import CosmoNumpy, RedshiftGrid
 
 __all__ = ["Background"]
 
@@ -10,13 +11,15 @@ __all__ = ["Background"]
 class Background(object):
     """Class to compute cosmological distances."""
 
-    def __init__(self, cosmo=None, interp=False, **kwargs_interp):
+    def __init__(self, cosmo=None, interp=False, numpy_engine=False, **kwargs_interp):
         """
 
         :param cosmo: instance of astropy.cosmology
         :param interp: boolean, if True, uses interpolated cosmology to evaluate specific redshifts
-        :param kwargs_interp: keyword arguments of CosmoInterp specifying the interpolation interval and maximum
-         redshift
+        :param numpy_engine: boolean, if True, uses the pure NumPy distance engine (CosmoNumpy) with the parameters
+         of the astropy.cosmology instance instead of the astropy integrators
+        :param kwargs_interp: keyword arguments of CosmoInterp (or CosmoNumpy) specifying the interpolation interval
+         and maximum redshift
         :return: Background class with instance of astropy.cosmology
         """
         self.rhoc = 2.77536627e11  # critical density [h^2 M_sun Mpc^-3]
@@ -24,11 +27,44 @@ class Background(object):
             from astropy.cosmology import default_cosmology
 
             cosmo = default_cosmology.get()
+        self._max_table_size = 1000
+        if interp and numpy_engine:
+            raise ValueError(
+                "interp and numpy_engine can not be used at the same time for the Background class."
+            )
         if interp:
             self.cosmo = CosmoInterp(cosmo, **kwargs_interp)
+        elif numpy_engine:
+            self.cosmo = CosmoNumpy(cosmo, **kwargs_interp)
         else:
             self.cosmo = cosmo
 
+    @property
+    def cosmo(self):
+        """Cosmology instance used to compute the distances.
+
+        :return: instance of astropy.cosmology (or CosmoInterp)
+        """
+        return self._cosmo
+
+    @cosmo.setter
+    def cosmo(self, cosmo):
+        """Sets a new cosmology instance and invalidates the memoized distance table.
+
+        :param cosmo: instance of astropy.cosmology (or CosmoInterp)
+        :return: None
+        """
+        self._cosmo = cosmo
+        self.reset_distance_table()
+
+    def reset_distance_table(self):
+        """Deletes all memoized distances of T_xy_table().
+
+        :return: None
+        """
+        self._z_table_index = {}
+        self._T_table = np.zeros((0, 0))
+
     @staticmethod
     def a_z(z):
         """Returns scale factor (a_0 = 1) for given redshift.
@@ -73,6 +109,106 @@ class Background(object):
         T_xy = D_xy * (1 + z_source)
         return T_xy
 
+    def T_xy_table(self, z_observer, z_source):
+        """Transverse comoving distance served from a memoized distance matrix over all
+        the redshifts requested so far. The matrix is extended lazily with new redshifts
+        and only the missing pairs are computed with the cosmology instance. The table
+        is reset when a new cosmology is set or when it exceeds the maximum number of
+        redshifts.
+
+        :param z_observer: observer redshift (float)
+        :param z_source: source redshift (float)
+        :return: transverse comoving distance in units of Mpc
+        """
+        i = self._z_table_lookup(z_observer)
+        j = self._z_table_lookup(z_source)
+        T_xy = self._T_table[i, j]
+        if np.isnan(T_xy):
+            T_xy = self.T_xy(z_observer, z_source)
+            self._T_table[i, j] = T_xy
+        return T_xy
+
+    def _z_table_lookup(self, z):
+        """Index of a redshift in the memoized distance table. New redshifts are
+        appended and the matrix is padded with non-computed (nan) entries.
+
+        :param z: redshift (float)
+        :return: index of the redshift in the distance table
+        """
+        z = float(z)
+        index = self._z_table_index.get(z, None)
+        if index is None:
+            if len(self._z_table_index) >= self._max_table_size:
+                self.reset_distance_table()
+            index = len(self._z_table_index)
+            self._z_table_index[z] = index
+            size = len(self._T_table)
+            if index >= size:
+                size_new = max(2 * size, 8)
+                T_table = np.full((size_new, size_new), np.nan)
+                T_table[:size, :size] = self._T_table
+                self._T_table = T_table
+        return index
+
+    def distances_batch(
+        self, z_lens, z_source, H0, Om0, Ok0=0, w0=-1, wa=0, max_elements=10**7
+    ):
+        """Angular diameter and time-delay distances for arrays of cosmological
+        parameters and arrays of lens-source redshift pairs in one vectorized call. The
+        integrals are evaluated on a Gauss-Legendre redshift grid (see RedshiftGrid
+        class) that is re-used as long as the redshifts do not change. The cosmology
+        instance of this class is not used.
+
+        :param z_lens: lens redshift(s), float or array of length n_lens
+        :param z_source: source redshift(s) matching z_lens
+        :param H0: Hubble constant(s) [km/s/Mpc], float or array of length n_cosmo
+        :param Om0: matter density(ies) at z=0
+        :param Ok0: curvature density(ies) at z=0
+        :param w0: dark energy equation of state at z=0
+        :param wa: time evolution of the dark energy equation of state
+        :param max_elements: maximum number of elements (n_cosmo x n_nodes) evaluated at
+            once per chunk of cosmologies
+        :return: dd, ds, dds, ddt in units of Mpc, each of shape (n_cosmo, n_lens) (or
+            reduced by the axes of scalar inputs)
+        """
+        z_lens_ = np.atleast_1d(np.asarray(z_lens, dtype=float))
+        z_source_ = np.atleast_1d(np.asarray(z_source, dtype=float))
+        z_lens_, z_source_ = np.broadcast_arrays(z_lens_, z_source_)
+        z_key = (tuple(z_lens_), tuple(z_source_))
+        if getattr(self, "_redshift_grid_key", None) != z_key:
+            self._redshift_grid = RedshiftGrid(np.concatenate([z_lens_, z_source_]))
+            self._redshift_grid_key = z_key
+        grid = self._redshift_grid
+        n_lens = len(z_lens_)
+        index_lens, index_source = grid.index[:n_lens], grid.index[n_lens:]
+
+        params = np.broadcast_arrays(
+            *[np.atleast_1d(np.asarray(p, dtype=float)) for p in [H0, Om0, Ok0, w0, wa]]
+        )
+        n_cosmo = len(params[0])
+        num_chunk = max(int(max_elements // max(len(grid.nodes), 1)), 1)
+        dd, ds, dds = [np.zeros((n_cosmo, n_lens)) for _ in range(3)]
+        for i in range(0, n_cosmo, num_chunk):
+            H0_, Om0_, Ok0_, w0_, wa_ = [
+                p[i : i + num_chunk, np.newaxis] for p in params
+            ]
+            cosmo = CosmoNumpy(H0=H0_, Om0=Om0_, Ok0=Ok0_, w0=w0_, wa=wa_)
+            dc = cosmo.comoving_distance_grid(grid)
+            dc_lens, dc_source = dc[:, index_lens], dc[:, index_source]
+            dd[i : i + num_chunk] = cosmo.comoving2transverse(dc_lens) / (1 + z_lens_)
+            ds[i : i + num_chunk] = cosmo.comoving2transverse(dc_source) / (
+                1 + z_source_
+            )
+            dds[i : i + num_chunk] = cosmo.comoving2transverse(dc_source - dc_lens) / (
+                1 + z_source_
+            )
+        ddt = (1 + z_lens_) * dd * ds / dds
+        if np.ndim(z_lens) == 0 and np.ndim(z_source) == 0:
+            dd, ds, dds, ddt = dd[:, 0], ds[:, 0], dds[:, 0], ddt[:, 0]
+        if all(np.ndim(p) == 0 for p in [H0, Om0, Ok0, w0, wa]):
+            dd, ds, dds, ddt = dd[0], ds[0], dds[0], ddt[0]
+        return dd, ds, dds, ddt
+
     @property
     def rho_crit(self):
         """Critical density.
@@ -0,0 +1,417 @@
+__author__ = "sibirrer"
+
+import numpy as np
+from astropy import units
+from scipy.special import hyp2f1
+
+__all__ = ["CosmoNumpy", "RedshiftGrid"]
+
+# speed of light in km/s
+_c_km_s = 299792.458
+
+
+class CosmoNumpy(object):
+    """Pure NumPy distance engine for (w0wa)CDM cosmologies without calling the
+    astropy integrators.
+
+    Flat LambdaCDM cosmologies without radiation are evaluated with the closed-form
+    hypergeometric expression of the comoving distance integral. All other cases (curvature,
+    w0, wa, radiation, massive neutrinos) are evaluated with a cumulative trapezoidal table
+    of 1/E(z) on a shared redshift grid that is extended when higher redshifts are requested. The
+    cosmological parameters can be floats or arrays, in which case they are
+    broadcast against the redshift arrays.
+
+    The class provides the subset of the astropy.cosmology interface used by the
+    Background class and can be used as its backend.
+    """
+
+    def __init__(
+        self,
+        cosmo=None,
+        H0=70,
+        Om0=0.3,
+        Ok0=0,
+        w0=-1,
+        wa=0,
+        Or0=0,
+        z_stop=None,
+        num_interp=None,
+    ):
+        """
+
+        :param cosmo: astropy.cosmology instance (optional), if provided, overwrites the
+            parameters below. The density of massive neutrinos is evaluated with the
+            nu_relative_density() function of the astropy cosmology.
+        :param H0: Hubble constant [km/s/Mpc]
+        :param Om0: matter density at z=0
+        :param Ok0: curvature density at z=0
+        :param w0: dark energy equation of state at z=0
+        :param wa: time evolution of the dark energy equation of state w(a) = w0 + wa (1 - a)
+        :param Or0: radiation density at z=0
+        :param z_stop: maximum redshift of the integration table (extended if needed)
+        :param num_interp: number of redshift steps of the integration table up to z_stop
+        """
+        # photon density and neutrino to photon density ratio as a function of redshift (only with massive neutrinos)
+        self._Ogamma0 = None
+        self._nu_relative_density = None
+        if cosmo is not None:
+            H0 = cosmo.H0.value
+            Om0 = cosmo.Om0
+            Ok0 = cosmo.Ok0
+            w0 = getattr(cosmo, "w0", -1)
+            wa = getattr(cosmo, "wa", 0)
+            Or0 = cosmo.Ogamma0 + cosmo.Onu0
+            if cosmo.has_massive_nu:
+                self._Ogamma0 = cosmo.Ogamma0
+                self._nu_relative_density = cosmo.nu_relative_density
+        self._H0 = np.asarray(H0, dtype=float)
+        self.Om0 = np.asarray(Om0, dtype=float)
+        self.Ok0 = np.asarray(Ok0, dtype=float)
+        self.w0 = np.asarray(w0, dtype=float)
+        self.wa = np.asarray(wa, dtype=float)
+        self.Or0 = np.asarray(Or0, dtype=float)
+        self.Ode0 = 1.0 - self.Om0 - self.Ok0 - self.Or0
+
+        self._closed_form = bool(
+            np.all(np.abs(self.Ok0) < 1.0e-8)
+            and np.all(self.w0 == -1)
+            and np.all(self.wa == 0)
+            and np.all(self.Or0 == 0)
+        )
+        if z_stop is None:
+            z_stop = 10
+        if num_interp is None:
+            num_interp = 10000
+        self._dz = float(z_stop) / num_interp
+        self._z_table = None
+        self._dc_table = None
+
+    @property
+    def H0(self):
+        """Hubble constant.
+
+        :return: H0 in units km/s/Mpc
+        """
+        return self._H0 * units.km / units.s / units.Mpc
+
+    @property
+    def hubble_distance(self):
+        """Hubble distance c/H0.
+
+        :return: hubble distance in units Mpc
+        """
+        return self._hubble_distance() * units.Mpc
+
+    def H(self, z):
+        """Hubble parameter at redshift z.
+
+        :param z: redshift
+        :return: H(z) in units km/s/Mpc
+        """
+        return self._H0 * self.efunc(z) * units.km / units.s / units.Mpc
+
+    def efunc(self, z):
+        """Dimensionless Hubble parameter E(z) = H(z)/H0.
+
+        :param z: redshift
+        :return: E(z)
+        """
+        z = np.asarray(z, dtype=float)
+        zp1 = 1.0 + z
+        de = (
+            self.Ode0
+            * zp1 ** (3 * (1 + self.w0 + self.wa))
+            * np.exp(-3 * self.wa * (zp1 - 1) / zp1)
+        )
+        return np.sqrt(
+            self._radiation_density(z, self.Or0)
+            + self.Om0 * zp1**3
+            + self.Ok0 * zp1**2
+            + de
+        )
+
+    def _radiation_density(self, z, Or0):
+        """Density of photons and neutrinos relative to the critical density today,
+        Or0 (1+z)^4 for massless neutrinos.
+
+        :param z: redshift (array_like)
+        :param Or0: radiation density at z=0, broadcast against z
+        :return: radiation density at redshift z
+        """
+        zp1 = 1.0 + z
+        if self._nu_relative_density is None:
+            return Or0 * zp1**4
+        return self._Ogamma0 * (1 + self._nu_relative_density(z)) * zp1**4
+
+    def angular_diameter_distance(self, z, z2=None):
+        """Angular diameter distance in Mpc at a given redshift or between two
+        redshifts.
+
+        :param z: redshift (array_like)
+        :param z2: redshift of end (optional, array_like)
+        :return: angular diameter distance in units Mpc
+        """
+        if z2 is None:
+            return self.angular_diameter_distance_z1z2(0, z)
+        return self.angular_diameter_distance_z1z2(z, z2)
+
+    def angular_diameter_distance_z1z2(self, z1, z2):
+        """Angular diameter distance between objects at two redshifts.
+
+        :param z1: redshift of the observer (array_like)
+        :param z2: redshift of the source (array_like), z2 >= z1
+        :return: angular diameter distance in units Mpc
+        """
+        return self.d_xy(z1, z2) * units.Mpc
+
+    def d_xy(self, z1, z2):
+        """Angular diameter distance between two redshifts without astropy units.
+
+        :param z1: redshift of the observer (array_like)
+        :param z2: redshift of the source (array_like)
+        :return: angular diameter distance in Mpc (numpy array broadcast over redshifts
+            and cosmological parameters)
+        """
+        z2 = np.asarray(z2, dtype=float)
+        return self.comoving_transverse_distance_z1z2(z1, z2) / (1.0 + z2)
+
+    def comoving_transverse_distance_z1z2(self, z1, z2):
+        """Comoving transverse distance between two redshifts.
+
+        :param z1: redshift of the observer (array_like)
+        :param z2: redshift of the source (array_like)
+        :return: transverse comoving distance in Mpc
+        """
+        dc = self.comoving_distance_z1z2(z1, z2)
+        return self.comoving2transverse(dc)
+
+    def comoving2transverse(self, dc):
+        """Converts line-of-sight comoving distances into transverse comoving distances
+        given the curvature.
+
+        :param dc: line-of-sight comoving distance in Mpc
+        :return: transverse comoving distance in Mpc
+        """
+        if self._closed_form:
+            return dc
+        d_h = self._hubble_distance()
+        if self.Ok0.ndim == 0:
+            if np.abs(self.Ok0) < 1.0e-6:
+                return dc
+            sqrt_ok = np.sqrt(np.abs(self.Ok0))
+            if self.Ok0 > 0:
+                return d_h / sqrt_ok * np.sinh(sqrt_ok * dc / d_h)
+            return d_h / sqrt_ok * np.sin(sqrt_ok * dc / d_h)
+        sqrt_ok = np.sqrt(np.abs(self.Ok0))
+        # avoids division by zero for the (partially) flat cases, which are selected below
+        sqrt_ok_safe = np.where(sqrt_ok > 0, sqrt_ok, 1)
+        x = dc / d_h * sqrt_ok_safe
+        d_open = d_h / sqrt_ok_safe * np.sinh(x)
+        d_closed = d_h / sqrt_ok_safe * np.sin(x)
+        return np.where(
+            np.abs(self.Ok0) < 1.0e-6, dc, np.where(self.Ok0 > 0, d_open, d_closed)
+        )
+
+    def comoving_distance_z1z2(self, z1, z2):
+        """Line-of-sight comoving distance between two redshifts.
+
+        :param z1: redshift of the observer (array_like)
+        :param z2: redshift of the source (array_like)
+        :return: comoving distance in Mpc
+        """
+        z1 = np.asarray(z1, dtype=float)
+        z2 = np.asarray(z2, dtype=float)
+        return self._hubble_distance() * (
+            self._integral_inv_efunc(z2) - self._integral_inv_efunc(z1)
+        )
+
+    def comoving_distance_grid(self, redshift_grid):
+        """Line-of-sight comoving distances from z=0 to the redshifts of a
+        RedshiftGrid instance, integrated with its Gauss-Legendre nodes. The
+        cosmological parameters broadcast element-wise against the redshift axis, i.e.
+        parameter arrays of shape (n, 1) result in distances of shape (n, len(z)).
+
+        :param redshift_grid: RedshiftGrid instance
+        :return: comoving distances in Mpc
+        """
+        inv_e = 1.0 / self.efunc(redshift_grid.nodes)
+        return self._hubble_distance() * redshift_grid.integrate(inv_e)
+
+    def _hubble_distance(self):
+        """
+
+        :return: hubble distance c/H0 in Mpc without units
+        """
+        return _c_km_s / self._H0
+
+    def _integral_inv_efunc(self, z):
+        """Integral of 1/E(z') from 0 to z.
+
+        :param z: redshift (array_like)
+        :return: dimensionless comoving distance
+        """
+        if self._closed_form:
+            return self._integral_flat_lcdm(z)
+        return self._integral_table(z)
+
+    def _integral_flat_lcdm(self, z):
+        """Closed-form integral of 1/E(z') from 0 to z for flat LambdaCDM without
+        radiation.
+
+        With x = 1+z and s = Om0/Ode0, the anti-derivative of 1/sqrt(Ode0 (1 + s x^3)) is
+        x 2F1(1/3, 1/2; 4/3; -s x^3) / sqrt(Ode0).
+
+        :param z: redshift (array_like)
+        :return: dimensionless comoving distance
+        """
+        zp1 = 1.0 + z
+        om, ode = self.Om0, self.Ode0
+        ode_safe = np.where(ode > 0, ode, 1)
+        s = om / ode_safe
+
+        def _anti(x):
+            return x * hyp2f1(1.0 / 3, 0.5, 4.0 / 3, -s * x**3) / np.sqrt(ode_safe)
+
+        integral = _anti(zp1) - _anti(1.0)
+        # Einstein-de Sitter limit
+        integral_eds = 2 * (1 - 1 / np.sqrt(zp1)) / np.sqrt(om)
+        return np.where(ode > 0, integral, integral_eds)
+
+    def _integral_table(self, z):
+        """Integral of 1/E(z') from 0 to z interpolated from a cumulative trapezoidal
+        table.
+
+        :param z: redshift (array_like)
+        :return: dimensionless comoving distance
+        """
+        z_max = np.max(z)
+        if self._z_table is None or z_max > self._z_table[-1]:
+            self._set_table(z_max)
+        if self._dc_table.ndim == 1:
+            return np.interp(z, self._z_table, self._dc_table)
+        # linear interpolation on the equally spaced grid, broadcast element-wise between the redshifts and the
+        # cosmological parameters
+        index = np.clip((z / self._dz).astype(int), 0, len(self._z_table) - 2)
+        w = (z - self._z_table[index]) / self._dz
+        param_shape = self._dc_table.shape[:-1]
+        shape = np.broadcast_shapes(param_shape, np.shape(z))
+        dc_table = self._dc_table.reshape(-1, len(self._z_table))
+        param_index = np.broadcast_to(
+            np.arange(len(dc_table)).reshape(param_shape), shape
+        )
+        index = np.broadcast_to(index, shape)
+        return (
+            dc_table[param_index, index] * (1 - w)
+            + dc_table[param_index, index + 1] * w
+        )
+
+    def _set_table(self, z_max):
+        """Computes the cumulative trapezoidal integral of 1/E(z) on an equally spaced
+        redshift grid covering [0, z_max].
+
+        :param z_max: minimum redshift to be covered by the table
+        :return: None
+        """
+        num = max(int(np.ceil(z_max / self._dz)), 1) + 1
+        if self._z_table is not None:
+            # extend by at least a factor of 2 to limit the number of table rebuilds
+            num = max(num, 2 * len(self._z_table))
+        z_table = np.arange(num) * self._dz
+        # the cosmological parameters broadcast as (..., 1) against the redshift axis
+        inv_e = 1.0 / self._efunc_table(z_table)
+        dc = np.zeros_like(inv_e)
+        dc[..., 1:] = np.cumsum((inv_e[..., 1:] + inv_e[..., :-1]) / 2, axis=-1)
+        self._z_table = z_table
+        self._dc_table = dc * self._dz
+
+    def _efunc_table(self, z):
+        """E(z) with the cosmological parameters expanded by a trailing redshift axis.
+
+        :param z: 1d redshift array
+        :return: E(z) of shape (param_shape..., len(z))
+        """
+        params = np.broadcast_arrays(
+            self.Om0, self.Ok0, self.Or0, self.Ode0, self.w0, self.wa
+        )
+        om, ok, orad, ode, w0, wa = [p[..., np.newaxis] for p in params]
+        zp1 = 1.0 + z
+        de = ode * zp1 ** (3 * (1 + w0 + wa)) * np.exp(-3 * wa * z / zp1)
+        return np.sqrt(
+            self._radiation_density(z, orad) + om * zp1**3 + ok * zp1**2 + de
+        )
+
+
+class RedshiftGrid(object):
+    """Gauss-Legendre integration grid over a fixed set of redshifts.
+
+    The interval from z=0 to the largest redshift is split into segments at each of
+    the (unique) requested redshifts and each segment is integrated with num_nodes
+    Gauss-Legendre nodes. The nodes only depend on the redshifts and are re-used for
+    any number of cosmologies, such that integrals over many cosmological parameters
+    only require the evaluation of the integrand on the nodes.
+    """
+
+    def __init__(self, z, num_nodes=8, max_segment=0.5):
+        """
+
+        :param z: array of redshifts to which the integrals are evaluated
+        :param num_nodes: number of Gauss-Legendre nodes per segment
+        :param max_segment: maximum redshift interval of a segment
+        """
+        z_unique, self._index = np.unique(
+            np.asarray(z, dtype=float), return_inverse=True
+        )
+        self._z = z_unique
+        # additional segment boundaries keep each segment shorter than max_segment
+        z_max = z_unique[-1] if len(z_unique) > 0 else 0
+        z_fill = np.linspace(0, z_max, int(np.ceil(z_max / max_segment)) + 1)
+        bounds = np.unique(np.concatenate([[0], z_fill, z_unique]))
+        self._bound_index = np.searchsorted(bounds, z_unique) - 1
+        x, w = np.polynomial.legendre.leggauss(num_nodes)
+        z_low, z_high = bounds[:-1], bounds[1:]
+        half = (z_high - z_low)[:, np.newaxis] / 2
+        self._nodes = ((z_high + z_low)[:, np.newaxis] / 2 + half * x).flatten()
+        self._weights = (half * w).flatten()
+        self._num_segments = len(bounds) - 1
+        self._num_nodes = num_nodes
+
+    @property
+    def z(self):
+        """Unique and sorted redshifts of the grid.
+
+        :return: redshift array
+        """
+        return self._z
+
+    @property
+    def index(self):
+        """Indices of the input redshifts in the unique redshift array z.
+
+        :return: int array of the shape of the input redshifts
+        """
+        return self._index
+
+    @property
+    def nodes(self):
+        """Redshifts at which the integrand is evaluated.
+
+        :return: 1d redshift array
+        """
+        return self._nodes
+
+    def integrate(self, f):
+        """Integrals of f from z=0 to each redshift of the grid.
+
+        :param f: integrand evaluated on the nodes, shape (..., len(nodes))
+        :return: integrals of shape (..., len(z))
+        """
+        shape = f.shape[:-1]
+        if self._num_segments < 1:
+            return np.zeros(shape + (len(self._z),))
+        segments = (f * self._weights).reshape(
+            shape + (self._num_segments, self._num_nodes)
+        )
+        cumulative = np.cumsum(np.sum(segments, axis=-1), axis=-1)
+        integral = cumulative[..., self._bound_index]
+        # redshift zero is not an upper bound of any segment
+        return np.where(self._z > 0, integral, 0)
@@ -66,6 +66,29 @@ class LensCosmo(object):
         """
         return (1 + self.z_lens) * self.dd * self.ds / self.dds
 
+    def distances_batch(self, H0, Om0, Ok0=0, w0=-1, wa=0, z_lens=None, z_source=None):
+        """Angular diameter and time-delay distances for arrays of cosmological
+        parameters in one vectorized call (see Background.distances_batch()).
+
+        :param H0: Hubble constant(s) [km/s/Mpc], float or array of length n_cosmo
+        :param Om0: matter density(ies) at z=0
+        :param Ok0: curvature density(ies) at z=0
+        :param w0: dark energy equation of state at z=0
+        :param wa: time evolution of the dark energy equation of state
+        :param z_lens: lens redshift(s); if None, uses the lens redshift of the class
+        :param z_source: source redshift(s); if None, uses the source redshift of the
+            class
+        :return: dd, ds, dds, ddt in units of Mpc, each of shape (n_cosmo, n_lens) (or
+            reduced by the axes of scalar inputs)
+        """
+        if z_lens is None:
+            z_lens = self.z_lens
+        if z_source is None:
+            z_source = self.z_source
+        return self.background.distances_batch(
+            z_lens, z_source, H0=H0, Om0=Om0, Ok0=Ok0, w0=w0, wa=wa
+        )
+
     @property
     def sigma_crit(self):
         """Returns the critical projected lensing mass density in units of M_sun/Mpc^2.
@@ -1,6 +1,7 @@
 __all__ = ["MultiDataBase"]
 
 import numpy as np
+from lenstronomy.ImSim.component_cache import merge_stats
 
 
 class MultiDataBase(object):
@@ -48,6 +49,28 @@ class MultiDataBase(object):
         for imageModel in self._image_model_list:
             imageModel.reset_point_source_cache(cache=cache)
 
+    @property
+    def component_cache_stats(self):
+        """Hit and miss counters of the memoized model components summed over all
+        bands.
+
+        :return: dictionary {component name: {'hits': int, 'misses': int}}
+        """
+        return merge_stats(
+            [imageModel.component_cache_stats for imageModel in self._image_model_list]
+        )
+
+    def reset_component_cache(self, enabled=True):
+        """Deletes the memoized model components and their hit and miss counters of all
+        bands.
+
+        :param enabled: bool, if False, the model components are re-computed on every
+            call from now on
+        :return: None
+        """
+        for imageModel in self._image_model_list:
+            imageModel.reset_component_cache(enabled=enabled)
+
     @property
     def num_data_evaluate(self):
         num = 0
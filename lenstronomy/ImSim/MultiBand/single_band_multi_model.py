@@ -1,5 +1,6 @@
 from lenstronomy.ImSim.image_linear_solve import ImageLinearFit
 from lenstronomy.ImSim.image_model import ImageModel
+import lenstronomy.ImSim.de_lens as de_lens
 from lenstronomy.Data.imaging_data import ImageData
 from lenstronomy.Data.psf import PSF
 from lenstronomy.Util import class_creator
@@ -103,6 +104,10 @@ class SingleBandMultiModel(ImageLinearFit, ImageModel):
             likelihood_mask=likelihood_mask_list[band_index],
             kwargs_pixelbased=kwargs_pixelbased,
         )
+        if not linear_solver:
+            # the linear solver can still be activated in likelihood_data_given_model()
+            self._gram_blocks = de_lens.GramMatrixBlocks()
+            self._scaled_response = {}
 
     def image(
         self,
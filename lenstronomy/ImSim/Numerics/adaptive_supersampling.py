@@ -0,0 +1,229 @@
+import numpy as np
+from lenstronomy.Util import util
+
+__all__ = ["AdaptiveSupersampling"]
+
+
+class AdaptiveSupersampling(object):
+    """Derives individual super-sampling factors of each pixel from the lensed surface
+    brightness model.
+
+    The image-plane gradient of the lensed source is computed with the chain rule from
+    the lens-model Jacobian A = d beta / d theta and the source-plane gradient of the
+    source profile, grad_theta I = A^T grad_beta S. The un-lensed lens light adds its
+    own image-plane gradient. The flux variation across a pixel,
+    |grad_theta I| * pixel_width * pixel_area, is divided by the tolerated flux
+    variation to get the super-sampling factor of that pixel, rounded up to the next
+    power of two (capped at supersampling_factor).
+
+    The factors are stored with the model parameters they were derived from and are
+    only re-derived when a parameter moves by more than update_tolerance.
+    """
+
+    def __init__(
+        self,
+        pixel_grid,
+        lens_model,
+        source_model,
+        lens_light_model=None,
+        flux_tolerance=1,
+        supersampling_factor=8,
+        update_tolerance=0.01,
+        flux_evaluate_indexes=None,
+    ):
+        """
+
+        :param pixel_grid: PixelGrid() class instance
+        :param lens_model: LensModel() class instance
+        :param source_model: LightModel() class instance of the source
+        :param lens_light_model: LightModel() class instance of the lens light (or None)
+        :param flux_tolerance: tolerated flux variation (in units of the pixel values of the image) across a
+         (super-sampled) pixel
+        :param supersampling_factor: int, maximal factor (per axis) of super-sampling
+        :param update_tolerance: relative change of a parameter (absolute for parameters with absolute value below 1)
+         that triggers a re-evaluation of the super-sampling factors
+        :param flux_evaluate_indexes: bool array of shape nx x ny, pixels being evaluated (or None for all pixels)
+        """
+        if not isinstance(supersampling_factor, int) or supersampling_factor < 1:
+            raise ValueError(
+                "supersampling_factor needs to be a positive integer, not %s."
+                % supersampling_factor
+            )
+        self._lens_model = lens_model
+        self._source_model = source_model
+        self._lens_light_model = lens_light_model
+        self._flux_tolerance = flux_tolerance
+        self._supersampling_factor = supersampling_factor
+        self._update_tolerance = update_tolerance
+        self._nx, self._ny = pixel_grid.num_pixel_axes
+        self._pixel_width = pixel_grid.pixel_width
+        self._pixel_area = pixel_grid.pixel_area
+        x_grid, y_grid = pixel_grid.pixel_coordinates
+        if flux_evaluate_indexes is None:
+            flux_evaluate_indexes = np.ones((self._nx, self._ny), dtype=bool)
+        self._evaluate_indexes = util.image2array(
+            np.array(flux_evaluate_indexes, dtype=bool)
+        )
+        self._x = util.image2array(x_grid)[self._evaluate_indexes]
+        self._y = util.image2array(y_grid)[self._evaluate_indexes]
+        self._levels = 2 ** np.arange(int(np.ceil(np.log2(supersampling_factor))) + 1)
+        self._levels[-1] = supersampling_factor
+        self._supersampling_factors = np.ones((self._nx, self._ny), dtype=int)
+        self._params = None
+        self.num_updates = 0
+
+    @property
+    def supersampling_factors(self):
+        """
+
+        :return: 2d int array of the current super-sampling factor of each pixel
+        """
+        return self._supersampling_factors
+
+    @property
+    def num_evaluations(self):
+        """
+
+        :return: number of surface brightness evaluations with the current super-sampling factors
+        """
+        factors = util.image2array(self._supersampling_factors)
+        return int(np.sum(factors[self._evaluate_indexes] ** 2))
+
+    @property
+    def num_evaluations_uniform(self):
+        """
+
+        :return: number of surface brightness evaluations of a uniform super-sampling with the maximal factor
+        """
+        return int(np.sum(self._evaluate_indexes)) * self._supersampling_factor**2
+
+    @property
+    def evaluation_savings(self):
+        """
+
+        :return: fraction of surface brightness evaluations saved compared to a uniform super-sampling with the
+         maximal factor
+        """
+        return 1 - self.num_evaluations / self.num_evaluations_uniform
+
+    def update(
+        self, kwargs_lens=None, kwargs_source=None, kwargs_lens_light=None, force=False
+    ):
+        """Re-derives the super-sampling factors when the parameters moved by more than
+        the update tolerance since the last evaluation.
+
+        :param kwargs_lens: list of keyword arguments of the lens model
+        :param kwargs_source: list of keyword arguments of the source model
+        :param kwargs_lens_light: list of keyword arguments of the lens light model
+        :param force: bool, if True, re-derives the factors regardless of the parameter change
+        :return: bool, True if the super-sampling factors changed
+        """
+        params = self._flatten_kwargs(kwargs_lens, kwargs_source, kwargs_lens_light)
+        if force is False and self._params is not None:
+            if len(params) == len(self._params) and np.all(
+                np.abs(params - self._params)
+                <= self._update_tolerance * np.maximum(np.abs(self._params), 1)
+            ):
+                return False
+        self._params = params
+        self.num_updates += 1
+        factors = self.pixel_supersampling_factors(
+            kwargs_lens, kwargs_source, kwargs_lens_light
+        )
+        if np.array_equal(factors, self._supersampling_factors):
+            return False
+        self._supersampling_factors = factors
+        return True
+
+    def pixel_supersampling_factors(
+        self, kwargs_lens=None, kwargs_source=None, kwargs_lens_light=None
+    ):
+        """Super-sampling factors required to resolve the flux variation within each
+        pixel to the flux tolerance.
+
+        :param kwargs_lens: list of keyword arguments of the lens model
+        :param kwargs_source: list of keyword arguments of the source model
+        :param kwargs_lens_light: list of keyword arguments of the lens light model
+        :return: 2d int array of super-sampling factors
+        """
+        gradient = self.surface_brightness_gradient(
+            kwargs_lens, kwargs_source, kwargs_lens_light
+        )
+        flux_variation = gradient * self._pixel_width * self._pixel_area
+        factors_required = np.ceil(np.nan_to_num(flux_variation / self._flux_tolerance))
+        index = np.searchsorted(self._levels, factors_required)
+        factors = self._levels[np.minimum(index, len(self._levels) - 1)]
+        factors1d = np.ones(self._nx * self._ny, dtype=int)
+        factors1d[self._evaluate_indexes] = factors
+        return util.array2image(factors1d, self._nx, self._ny)
+
+    def surface_brightness_gradient(
+        self, kwargs_lens=None, kwargs_source=None, kwargs_lens_light=None
+    ):
+        """Absolute image-plane gradient of the lensed source and lens light surface
+        brightness at the evaluated pixel centers.
+
+        :param kwargs_lens: list of keyword arguments of the lens model
+        :param kwargs_source: list of keyword arguments of the source model
+        :param kwargs_lens_light: list of keyword arguments of the lens light model
+        :return: 1d array of |grad I| for the pixels being evaluated
+        """
+        gradient = np.zeros_like(self._x)
+        if kwargs_source is not None and len(kwargs_source) > 0:
+            beta_x, beta_y = self._lens_model.ray_shooting(
+                self._x, self._y, kwargs_lens
+            )
+            f_xx, f_xy, f_yx, f_yy = self._lens_model.hessian(
+                self._x, self._y, kwargs_lens
+            )
+            s_x, s_y = self._finite_difference(
+                self._source_model, beta_x, beta_y, kwargs_source
+            )
+            i_x = (1 - f_xx) * s_x - f_yx * s_y
+            i_y = -f_xy * s_x + (1 - f_yy) * s_y
+            gradient += np.sqrt(i_x**2 + i_y**2)
+        if (
+            self._lens_light_model is not None
+            and kwargs_lens_light is not None
+            and len(kwargs_lens_light) > 0
+        ):
+            i_x, i_y = self._finite_difference(
+                self._lens_light_model, self._x, self._y, kwargs_lens_light
+            )
+            gradient += np.sqrt(i_x**2 + i_y**2)
+        return gradient
+
+    def _finite_difference(self, light_model, x, y, kwargs_light):
+        """Central finite difference gradient of a surface brightness profile.
+
+        :param light_model: LightModel() class instance
+        :param x: x-coordinates
+        :param y: y-coordinates
+        :param kwargs_light: list of keyword arguments of the light model
+        :return: d I / dx, d I / dy
+        """
+        delta = self._pixel_width / self._supersampling_factor / 10.0
+        x_ = np.concatenate([x + delta, x - delta, x, x])
+        y_ = np.concatenate([y, y, y + delta, y - delta])
+        flux = np.reshape(light_model.surface_brightness(x_, y_, kwargs_light), (4, -1))
+        return (flux[0] - flux[1]) / (2 * delta), (flux[2] - flux[3]) / (2 * delta)
+
+    @staticmethod
+    def _flatten_kwargs(*kwargs_lists):
+        """Collects all numerical parameters of keyword argument lists in one array.
+
+        :param kwargs_lists: lists of keyword argument dictionaries (or None)
+        :return: 1d array of parameter values
+        """
+        values = []
+        for kwargs_list in kwargs_lists:
+            if kwargs_list is None:
+                continue
+            for kwargs in kwargs_list:
+                for key in sorted(kwargs):
+                    value = np.asarray(kwargs[key])
+                    if np.issubdtype(value.dtype, np.number):
+                        values.append(np.ravel(value).astype(float))
+        if len(values) == 0:
+            return np.zeros(0)
+        return np.concatenate(values)
@@ -1,42 +1,48 @@
 from scipy import fftpack, ndimage, signal
 import numpy as np
-import threading
 import lenstronomy.Util.kernel_util as kernel_util
 import lenstronomy.Util.util as util
 import lenstronomy.Util.image_util as image_util
 
+from lenstronomy.Util.fft_util import FFTBackend
 from lenstronomy.Util.package_util import exporter
 
 export, __all__ = exporter()
 
-_rfft_mt_safe = True  # (NumpyVersion(np.__version__) >= '1.9.0.dev-e24486e')
-_rfft_lock = threading.Lock()
-
 
 def _centered(arr, newshape):
-    # Return the center newshape portion of the array.
+    # Return the center newshape portion of the array (along the trailing axes).
     newshape = np.asarray(newshape)
-    currshape = np.array(arr.shape)
+    currshape = np.array(arr.shape[arr.ndim - len(newshape) :])
     startind = (currshape - newshape) // 2
     endind = startind + newshape
     myslice = [slice(startind[k], endind[k]) for k in range(len(endind))]
-    return arr[tuple(myslice)]
+    return arr[(Ellipsis,) + tuple(myslice)]
 
 
 @export
 class PixelKernelConvolution(object):
     """Class to compute convolutions for a given pixelized kernel (fft, grid)"""
 
-    def __init__(self, kernel, convolution_type="fft_static"):
+    def __init__(
+        self, kernel, convolution_type="fft_static", fft_backend=None, fft_workers=None
+    ):
         """
 
         :param kernel: 2d array, convolution kernel
         :param convolution_type: string, 'fft', 'grid', 'fft_static' mode of 2d convolution
+        :param fft_backend: string, FFT backend of the 'fft_static' convolution ('numpy', 'scipy' or 'pyfftw'),
+         if None, uses the lenstronomy configuration file
+        :param fft_workers: int, number of threads of the 'scipy' and 'pyfftw' FFT backends, if None, uses the
+         lenstronomy configuration file
         """
         self._kernel = kernel
         if convolution_type not in ["fft", "grid", "fft_static"]:
             raise ValueError("convolution_type %s not supported!" % convolution_type)
         self._type = convolution_type
+        self._fft_backend, self._fft_workers = fft_backend, fft_workers
+        if convolution_type == "fft_static":
+            self._fft = FFTBackend(backend=fft_backend, workers=fft_workers)
         self._pre_computed = False
 
     def pixel_kernel(self, num_pix=None):
@@ -55,28 +61,46 @@ class PixelKernelConvolution(object):
 
         :return: copy of the class with kernel set to the transpose of original one
         """
-        return PixelKernelConvolution(self._kernel.T, convolution_type=self._type)
+        return PixelKernelConvolution(
+            self._kernel.T,
+            convolution_type=self._type,
+            fft_backend=self._fft_backend,
+            fft_workers=self._fft_workers,
+        )
 
     def convolution2d(self, image):
         """
 
-        :param image: 2d array (image) to be convolved
+        :param image: 2d array (image) to be convolved or 3d array of a stack of images
+            (n_images, nx, ny) to be convolved in a single batched call
         :return: fft convolution
         """
         if self._type == "fft":
-            image_conv = signal.fftconvolve(image, self._kernel, mode="same")
+            kernel = self._kernel.reshape(
+                (1,) * (np.ndim(image) - 2) + self._kernel.shape
+            )
+            image_conv = signal.fftconvolve(image, kernel, mode="same", axes=(-2, -1))
         elif self._type == "fft_static":
             image_conv = self._static_fft(image, mode="same")
         elif self._type == "grid":
-            image_conv = signal.convolve2d(image, self._kernel, mode="same")
+            if np.ndim(image) == 3:
+                image_conv = np.array(
+                    [
+                        signal.convolve2d(image_, self._kernel, mode="same")
+                        for image_ in image
+                    ]
+                )
+            else:
+                image_conv = signal.convolve2d(image, self._kernel, mode="same")
         else:
             raise ValueError("convolution_type %s not supported!" % self._type)
         return image_conv
 
     def _static_fft(self, image, mode="same"):
-        """Scipy fft convolution with saved static fft kernel.
+        """Scipy fft convolution with saved static fft kernel. A stack of images is
+        transformed in a single batched rfftn over the two trailing axes.
 
-        :param image: 2d numpy array to be convolved
+        :param image: 2d numpy array to be convolved (or 3d stack of 2d arrays)
         :return:
         """
         in1 = image
@@ -114,26 +138,15 @@ class PixelKernelConvolution(object):
         # only applicable for 'valid' mode
         #    in1, s1, in2, s2 = in2, s2, in1, s1
 
-        # Pre-1.9 NumPy FFT routines are not threadsafe.  For older NumPys, make
-        # sure we only call rfftn/irfftn from one thread at a time.
-        if not complex_result and (_rfft_mt_safe or _rfft_lock.acquire(False)):
-            try:
-                sp1 = np.fft.rfftn(in1, fshape, axes=tuple(range(in1.ndim)))
-                ret = np.fft.irfftn(sp1 * sp2, fshape, axes=tuple(range(sp1.ndim)))[
-                    fslice
-                ].copy()
-            finally:
-                if not _rfft_mt_safe:
-                    _rfft_lock.release()
+        if not complex_result:
+            sp1 = self._fft.rfftn(in1, fshape, axes=(-2, -1))
+            ret = self._fft.irfftn(sp1 * sp2, fshape, axes=(-2, -1))[
+                (Ellipsis,) + fslice
+            ].copy()
         else:
-            # If we're here, it's either because we need a complex result, or we
-            # failed to acquire _rfft_lock (meaning rfftn isn't threadsafe and
-            # is already in use by another thread).  In either case, use the
-            # (threadsafe but slower) SciPy complex-FFT routines instead.
-            sp1 = fftpack.fftn(in1, fshape)
-            ret = fftpack.ifftn(sp1 * sp2)[fslice].copy()
-            if not complex_result:
-                ret = ret.real
+            # complex results use the SciPy complex-FFT routines
+            sp1 = fftpack.fftn(in1, fshape, axes=(-2, -1))
+            ret = fftpack.ifftn(sp1 * sp2, axes=(-2, -1))[(Ellipsis,) + fslice].copy()
 
         if mode == "full":
             return ret
@@ -148,12 +161,12 @@ class PixelKernelConvolution(object):
         """Pre-compute Fourier transformed kernel and shape quantities to speed up
         convolution.
 
-        :param image: 2d numpy array
+        :param image: 2d numpy array (or 3d stack of 2d arrays)
         :return:
         """
         in1 = image
         in2 = self._kernel
-        s1 = np.array(in1.shape)
+        s1 = np.array(in1.shape[-2:])
         s2 = np.array(in2.shape)
         complex_result = np.issubdtype(in1.dtype, np.complexfloating) or np.issubdtype(
             in2.dtype, np.complexfloating
@@ -169,19 +182,10 @@ class PixelKernelConvolution(object):
         # Speed up FFT by padding to optimal size for FFTPACK
         fshape = [fftpack.next_fast_len(int(d)) for d in shape]
         fslice = tuple([slice(0, int(sz)) for sz in shape])
-        # Pre-1.9 NumPy FFT routines are not threadsafe.  For older NumPys, make
-        # sure we only call rfftn/irfftn from one thread at a time.
-        if not complex_result and (_rfft_mt_safe or _rfft_lock.acquire(False)):
-            try:
-                sp2 = np.fft.rfftn(in2, fshape, axes=tuple(range(in2.ndim)))
-            finally:
-                if not _rfft_mt_safe:
-                    _rfft_lock.release()
+        if not complex_result:
+            sp2 = self._fft.rfftn(in2, fshape, axes=(-2, -1))
         else:
-            # If we're here, it's either because we need a complex result, or we
-            # failed to acquire _rfft_lock (meaning rfftn isn't threadsafe and
-            # is already in use by another thread).  In either case, use the
-            # (threadsafe but slower) SciPy complex-FFT routines instead.
+            # complex results use the SciPy complex-FFT routines
             sp2 = fftpack.fftn(in2, fshape)
         return s1, s2, complex_result, shape, fshape, fslice, sp2
 
@@ -195,6 +199,177 @@ class PixelKernelConvolution(object):
         return self.convolution2d(image_low_res)
 
 
+@export
+class TiledKernelConvolution(object):
+    """Overlap-save FFT convolution restricted to the pixels of interest.
+
+    The output frame is tiled into square blocks. Blocks that do not contain any pixel
+    of compute_indexes (e.g. the likelihood mask) and blocks whose input footprint
+    (the block extended by the kernel size) is zero everywhere are skipped. The
+    remaining blocks are convolved in a single batched FFT call with a kernel
+    transform that is computed once. Pixels outside compute_indexes are set to zero.
+    """
+
+    def __init__(
+        self,
+        kernel,
+        compute_indexes=None,
+        tile_size=None,
+        fft_backend=None,
+        fft_workers=None,
+    ):
+        """
+
+        :param kernel: 2d array, convolution kernel
+        :param compute_indexes: 2d boolean array of the image size, pixels for which the convolved values are
+         computed (all others are set to zero). If None, all pixels are computed and only blocks with zero input
+         footprint are skipped.
+        :param tile_size: int, size of the output blocks (in pixels). If None, chosen such that the FFT size of the
+         blocks is an efficient transform length of at least twice the kernel size.
+        :param fft_backend: string, FFT backend (see PixelKernelConvolution)
+        :param fft_workers: int, number of threads of the FFT backend (see PixelKernelConvolution)
+        """
+        self._kernel = np.asarray(kernel)
+        ky, kx = self._kernel.shape
+        if tile_size is None:
+            tile_size = max(2 * max(ky, kx), 32)
+        # block size of the overlap-save transforms, padded to an efficient FFT length
+        self._block = [
+            fftpack.next_fast_len(int(tile_size + k - 1)) for k in self._kernel.shape
+        ]
+        self._tile = [b - k + 1 for b, k in zip(self._block, self._kernel.shape)]
+        # padding of the input frame before the first pixel to center the kernel
+        self._pad = [k - 1 - (k - 1) // 2 for k in self._kernel.shape]
+        self._fft = FFTBackend(backend=fft_backend, workers=fft_workers)
+        self._sp_kernel = self._fft.rfftn(self._kernel, self._block, axes=(-2, -1))
+        if compute_indexes is not None:
+            compute_indexes = np.array(compute_indexes, dtype=bool)
+        self._compute_indexes = compute_indexes
+        self._shape = None
+        self._num_tiles = 0
+        self._num_tiles_computed = 0
+
+    def _set_tiling(self, shape):
+        """Sets the tiling of a frame of a given shape and the tiles that contain pixels
+        to be computed.
+
+        :param shape: (nx, ny) shape of the image
+        :return: None
+        """
+        self._shape = shape
+        self._num_tile_axes = [int(np.ceil(n / t)) for n, t in zip(shape, self._tile)]
+        ntx, nty = self._num_tile_axes
+        if self._compute_indexes is None:
+            tile_out = np.ones((ntx, nty), dtype=bool)
+        else:
+            if self._compute_indexes.shape != tuple(shape):
+                raise ValueError(
+                    "shape of compute_indexes %s does not match shape of the image %s."
+                    % (self._compute_indexes.shape, shape)
+                )
+            mask = np.zeros((ntx * self._tile[0], nty * self._tile[1]), dtype=bool)
+            mask[: shape[0], : shape[1]] = self._compute_indexes
+            tile_out = mask.reshape(ntx, self._tile[0], nty, self._tile[1]).any(
+                axis=(1, 3)
+            )
+        self._tile_out = tile_out
+        self._num_tiles = ntx * nty
+
+    def convolution2d(self, image):
+        """
+
+        :param image: 2d array (image) to be convolved or 3d array of a stack of images
+            (n_images, nx, ny)
+        :return: convolved image(s), same shape as image
+        """
+        image = np.asarray(image, dtype=float)
+        shape = image.shape[-2:]
+        if self._shape != shape:
+            self._set_tiling(shape)
+        (ntx, nty), (tx, ty), (bx, by) = self._num_tile_axes, self._tile, self._block
+        # zero-padded input frame such that every block is fully contained
+        image_pad = np.zeros(
+            image.shape[:-2] + (ntx * tx + bx - tx, nty * ty + by - ty)
+        )
+        image_pad[
+            ...,
+            self._pad[0] : self._pad[0] + shape[0],
+            self._pad[1] : self._pad[1] + shape[1],
+        ] = image
+        # tiles of the padded frame containing non-zero input pixels, dilated to the
+        # (conservative) input footprint of each block
+        m_x, m_y = -(-bx // tx), -(-by // ty)
+        non_zero = image_pad != 0
+        if non_zero.ndim > 2:
+            non_zero = non_zero.any(axis=tuple(range(non_zero.ndim - 2)))
+        tile_in = np.zeros(((ntx + m_x) * tx, (nty + m_y) * ty), dtype=bool)
+        tile_in[: non_zero.shape[0], : non_zero.shape[1]] = non_zero
+        tile_in = tile_in.reshape(ntx + m_x, tx, nty + m_y, ty).any(axis=(1, 3))
+        footprint = np.zeros((ntx, nty), dtype=bool)
+        for i in range(m_x):
+            for j in range(m_y):
+                footprint |= tile_in[i : i + ntx, j : j + nty]
+        i_tile, j_tile = np.where(self._tile_out & footprint)
+        self._num_tiles_computed = len(i_tile)
+
+        image_conv = np.zeros(image.shape[:-2] + (ntx * tx, nty * ty))
+        if len(i_tile) > 0:
+            rows = (i_tile * tx)[:, None, None] + np.arange(bx)[None, :, None]
+            cols = (j_tile * ty)[:, None, None] + np.arange(by)[None, None, :]
+            blocks = image_pad[..., rows, cols]
+            sp = self._fft.rfftn(blocks, self._block, axes=(-2, -1))
+            blocks_conv = self._fft.irfftn(
+                sp * self._sp_kernel, self._block, axes=(-2, -1)
+            )
+            # overlap-save: only the last tile_size pixels of each block are un-aliased
+            rows = rows[:, :tx, :]
+            cols = cols[:, :, :ty]
+            image_conv[..., rows, cols] = blocks_conv[..., bx - tx :, by - ty :]
+        image_conv = image_conv[..., : shape[0], : shape[1]]
+        if self._compute_indexes is not None:
+            image_conv *= self._compute_indexes
+        return image_conv
+
+    @property
+    def compute_fraction(self):
+        """Fraction of the tiles of the frame that were computed in the last call of
+        convolution2d().
+
+        :return: float between 0 and 1
+        """
+        if self._num_tiles == 0:
+            return 0.0
+        return self._num_tiles_computed / self._num_tiles
+
+    @property
+    def num_tiles(self):
+        """
+
+        :return: (number of tiles computed in the last call, total number of tiles)
+        """
+        return self._num_tiles_computed, self._num_tiles
+
+    def pixel_kernel(self, num_pix=None):
+        """Access pixelated kernel.
+
+        :param num_pix: size of returned kernel (odd number per axis). If None, return
+            the original kernel.
+        :return: pixel kernel centered
+        """
+        if num_pix is not None:
+            return kernel_util.cut_psf(self._kernel, num_pix)
+        return self._kernel
+
+    def re_size_convolve(self, image_low_res, image_high_res=None):
+        """
+
+        :param image_low_res: regular sampled image/model
+        :param image_high_res: supersampled image/model to be convolved on a regular pixel grid
+        :return: convolved and re-sized image
+        """
+        return self.convolution2d(image_low_res)
+
+
 @export
 class SubgridKernelConvolution(object):
     """Class to compute the convolution on a supersampled grid with partial convolution
@@ -206,6 +381,8 @@ class SubgridKernelConvolution(object):
         supersampling_factor,
         supersampling_kernel_size=None,
         convolution_type="fft_static",
+        fft_backend=None,
+        fft_workers=None,
     ):
         """
 
@@ -213,6 +390,8 @@ class SubgridKernelConvolution(object):
         :param supersampling_factor: supersampling factor relative to the image pixel grid
         :param supersampling_kernel_size: number of pixels (in units of the image pixels) that are convolved with the
          supersampled kernel
+        :param fft_backend: string, FFT backend of the 'fft_static' convolution (see PixelKernelConvolution)
+        :param fft_workers: int, number of threads of the FFT backend (see PixelKernelConvolution)
         """
         # n_high = len(kernel_supersampled)
         self._supersampling_factor = supersampling_factor
@@ -232,16 +411,23 @@ class SubgridKernelConvolution(object):
             )
             self._low_res_convolution = True
         self._low_res_conv = PixelKernelConvolution(
-            kernel_low_res, convolution_type=convolution_type
+            kernel_low_res,
+            convolution_type=convolution_type,
+            fft_backend=fft_backend,
+            fft_workers=fft_workers,
         )
         self._high_res_conv = PixelKernelConvolution(
-            kernel_high_res, convolution_type=convolution_type
+            kernel_high_res,
+            convolution_type=convolution_type,
+            fft_backend=fft_backend,
+            fft_workers=fft_workers,
         )
 
     def convolution2d(self, image):
         """
 
-        :param image: 2d array (high resoluton image) to be convolved and re-sized
+        :param image: 2d array (high resoluton image) to be convolved and re-sized (or
+            3d stack of 2d arrays)
         :return: convolved image
         """
 
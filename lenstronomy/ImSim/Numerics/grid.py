@@ -179,6 +179,150 @@ class AdaptiveGrid(Coordinates1D):
         return grid2d
 
 
+@export
+class MultiLevelAdaptiveGrid(Coordinates1D):
+    """Manages a grid with an individual super-sampling factor per pixel.
+
+    Pixels sharing the same super-sampling factor are grouped into one level. The
+    surface brightness is evaluated level by level and averaged back onto the regular
+    pixel grid.
+    """
+
+    def __init__(
+        self,
+        nx,
+        ny,
+        transform_pix2angle,
+        ra_at_xy_0,
+        dec_at_xy_0,
+        supersampling_factors,
+        flux_evaluate_indexes=None,
+    ):
+        """
+
+        :param nx: number of pixels in x-axis
+        :param ny: number of pixels in y-axis
+        :param transform_pix2angle: 2x2 matrix, mapping of pixel to coordinate
+        :param ra_at_xy_0: ra coordinate at pixel (0,0)
+        :param dec_at_xy_0: dec coordinate at pixel (0,0)
+        :param supersampling_factors: int array of shape nx x ny, factor (per axis) of super-sampling of each pixel
+         (=1 for no super-sampling)
+        :param flux_evaluate_indexes: bool array of shape nx x ny, corresponding to pixels being evaluated.
+         Default is None, replaced by setting all pixels to being evaluated.
+        """
+        super(MultiLevelAdaptiveGrid, self).__init__(
+            transform_pix2angle, ra_at_xy_0, dec_at_xy_0
+        )
+        self._nx = nx
+        self._ny = ny
+        self._x_grid, self._y_grid = self.coordinate_grid(nx, ny)
+        if flux_evaluate_indexes is None:
+            flux_evaluate_indexes = np.ones_like(self._x_grid, dtype=bool)
+        else:
+            flux_evaluate_indexes = util.image2array(flux_evaluate_indexes)
+        factors1d = np.maximum(
+            np.array(util.image2array(supersampling_factors), dtype=int), 1
+        )
+        self._levels = [int(n) for n in np.unique(factors1d[flux_evaluate_indexes])]
+        self._level_indexes = []
+        x_joint, y_joint, num_evaluate = [], [], []
+        for n in self._levels:
+            indexes = (factors1d == n) & flux_evaluate_indexes
+            x_level, y_level = self._subpixel_coordinates(
+                self._x_grid[indexes], self._y_grid[indexes], n
+            )
+            self._level_indexes.append(indexes)
+            x_joint.append(x_level)
+            y_joint.append(y_level)
+            num_evaluate.append(len(x_level))
+        self._x_evaluate = np.concatenate(x_joint) if x_joint else np.zeros(0)
+        self._y_evaluate = np.concatenate(y_joint) if y_joint else np.zeros(0)
+        self._splits = np.cumsum(num_evaluate)[:-1]
+        self._supersampling_factors = util.array2image(
+            np.where(flux_evaluate_indexes, factors1d, 0), nx, ny
+        )
+
+    @property
+    def coordinates_evaluate(self):
+        """
+
+        :return: 1d array of all coordinates being evaluated to perform the image computation
+        """
+        return self._x_evaluate, self._y_evaluate
+
+    @property
+    def supersampling_factor(self):
+        """
+        :return: maximal factor (per axis) of super-sampling relative to a pixel
+        """
+        if len(self._levels) == 0:
+            return 1
+        return self._levels[-1]
+
+    @property
+    def supersampling_levels(self):
+        """
+
+        :return: list of super-sampling factors present on the grid (ascending order)
+        """
+        return self._levels
+
+    @property
+    def supersampling_factors(self):
+        """
+
+        :return: 2d int array of the super-sampling factor of each pixel (=0 for pixels not being evaluated)
+        """
+        return self._supersampling_factors
+
+    @property
+    def num_evaluations(self):
+        """
+
+        :return: number of surface brightness evaluations of the grid
+        """
+        return len(self._x_evaluate)
+
+    def flux_array2image_low_high(self, flux_array, high_res_return=False):
+        """
+
+        :param flux_array: 1d array of flux values corresponding to the coordinates_evaluate order
+        :param high_res_return: bool, needs to be False as no common high resolution image exists for multiple
+         super-sampling factors
+        :return: 2d array, None; image of the pixel-averaged flux values
+        """
+        if high_res_return is True:
+            raise ValueError(
+                "MultiLevelAdaptiveGrid does not support super-sampled convolutions."
+            )
+        array = np.zeros(
+            self._nx * self._ny, dtype=np.result_type(flux_array, np.float32)
+        )
+        for n, indexes, values in zip(
+            self._levels, self._level_indexes, np.split(flux_array, self._splits)
+        ):
+            array[indexes] = np.mean(np.reshape(values, (-1, n * n)), axis=1)
+        return util.array2image(array, self._nx, self._ny), None
+
+    def _subpixel_coordinates(self, x_grid_select, y_grid_select, supersampling_factor):
+        """
+
+        :param x_grid_select: 1d array of pixel center coordinates
+        :param y_grid_select: 1d array of pixel center coordinates
+        :param supersampling_factor: int, factor (per axis) of super-sampling
+        :return: 1d arrays of subpixel grid coordinates, ordered with the sub-pixels of each pixel being consecutive
+        """
+        if supersampling_factor == 1:
+            return x_grid_select, y_grid_select
+        sub = (np.arange(supersampling_factor) + 0.5) / supersampling_factor - 0.5
+        y_ij, x_ij = np.meshgrid(sub, sub, indexing="ij")
+        delta_ra, delta_dec = self.map_pix2coord(x_ij.flatten(), y_ij.flatten())
+        delta_ra0, delta_dec0 = self.map_pix2coord(0, 0)
+        x_sub_grid = x_grid_select[:, None] + (delta_ra - delta_ra0)[None, :]
+        y_sub_grid = y_grid_select[:, None] + (delta_dec - delta_dec0)[None, :]
+        return x_sub_grid.flatten(), y_sub_grid.flatten()
+
+
 @export
 class RegularGrid(Coordinates1D):
     """Manages a super-sampled grid on the partial image."""
@@ -300,7 +444,8 @@ class RegularGrid(Coordinates1D):
             self._nx * self._supersampling_factor,
             self._ny * self._supersampling_factor,
         )
-        grid1d = np.zeros((nx * ny))
+        # float32 arrays (Numerics with precision='float32') are kept in single precision
+        grid1d = np.zeros((nx * ny), dtype=np.result_type(array, np.float32))
         grid1d[self._compute_indexes] = array
         grid2d = util.array2image(grid1d, nx, ny)
         return grid2d
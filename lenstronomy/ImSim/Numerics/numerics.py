@@ -1,7 +1,12 @@
-from lenstronomy.ImSim.Numerics.grid import RegularGrid, AdaptiveGrid
+from lenstronomy.ImSim.Numerics.grid import (
+    RegularGrid,
+    AdaptiveGrid,
+    MultiLevelAdaptiveGrid,
+)
 from lenstronomy.ImSim.Numerics.convolution import (
     SubgridKernelConvolution,
     PixelKernelConvolution,
+    TiledKernelConvolution,
     MultiGaussianConvolution,
 )
 from lenstronomy.ImSim.Numerics.point_source_rendering import PointSourceRendering
@@ -28,11 +33,15 @@ class Numerics(PointSourceRendering):
         supersampling_kernel_size=5,
         flux_evaluate_indexes=None,
         supersampled_indexes=None,
+        supersampling_factors=None,
         compute_indexes=None,
         point_source_supersampling_factor=None,
         convolution_kernel_size=None,
         convolution_type="fft_static",
         truncation_conv=None,
+        fft_backend=None,
+        fft_workers=None,
+        precision="float64",
     ):
         """
 
@@ -51,21 +60,39 @@ class Numerics(PointSourceRendering):
         :param supersampled_indexes: 2d boolean array (only used in mode='adaptive') of pixels to be supersampled (in
             surface brightness and if supersampling_convolution=True also in convolution). All other pixels not set to =True
             will not be super-sampled.
-        :param compute_indexes: 2d boolean array (only used in compute_mode='adaptive'), marks pixel that the response after
-            convolution is computed (all others =0). This can be set to likelihood_mask in the Likelihood module for
+        :param supersampling_factors: 2d int array (only used in compute_mode='adaptive'), individual
+            super-sampling factor of the surface brightness of each pixel (=1 for no super-sampling). If set,
+            replaces supersampled_indexes and supersampling_factor for the surface brightness evaluation. Not
+            compatible with supersampling_convolution=True.
+        :param compute_indexes: 2d boolean array (only used in compute_mode='adaptive' or convolution_type='fft_tiled'),
+            marks pixel that the response after convolution is computed (all others =0). This can be set to likelihood_mask in the Likelihood module for
             consistency.
         :param point_source_supersampling_factor: super-sampling resolution of the point source placing
             if None, then uses the supersampling factor of the original PSF
         :param convolution_kernel_size: int, odd number, size of convolution kernel. If None, takes size of point_source_kernel
-        :param convolution_type: string, 'fft', 'grid', 'fft_static' mode of 2d convolution
+        :param convolution_type: string, 'fft', 'grid', 'fft_static', 'fft_tiled' mode of 2d convolution. 'fft_tiled'
+            performs overlap-save convolutions only on the blocks of the image containing compute_indexes (only
+            available without supersampling_convolution)
         :param truncation_conv: Truncation used for the construction of the convolution kernels (only relevant for Gaussian convolution). By default,
             the truncation from the psf class will be used. Can be overwritten so that different PSFs are used for
             convolution and point source rendering.
+        :param fft_backend: string, FFT backend of the 'fft_static' convolution ('numpy', 'scipy' or 'pyfftw'),
+            if None, uses the lenstronomy configuration file
+        :param fft_workers: int, number of threads of the 'scipy' and 'pyfftw' FFT backends, if None, uses the
+            lenstronomy configuration file
+        :param precision: string, 'float64' or 'float32', floating point precision of the coordinates being
+            evaluated, the surface brightness arrays and the convolutions
         """
         if compute_mode not in ["regular", "adaptive"]:
             raise ValueError(
                 'compute_mode specified as %s not valid. Options are "adaptive", "regular"'
             )
+        if precision not in ["float64", "float32"]:
+            raise ValueError(
+                'precision %s not valid. Options are "float64", "float32"' % precision
+            )
+        self._dtype = np.dtype(precision)
+        self._coordinates_evaluate = None
         # if no super sampling, turn the supersampling convolution off
         self._psf_type = psf.psf_type
         if not isinstance(supersampling_factor, int):
@@ -76,12 +103,27 @@ class Numerics(PointSourceRendering):
         if supersampling_factor == 1:
             supersampling_convolution = False
         self._pixel_width = pixel_grid.pixel_width
+        self._pixel_area = self._dtype.type(self._pixel_width**2)
         nx, ny = pixel_grid.num_pixel_axes
         transform_pix2angle = pixel_grid.transform_pix2angle
         ra_at_xy_0, dec_at_xy_0 = pixel_grid.radec_at_xy_0
         if supersampled_indexes is None:
             supersampled_indexes = np.zeros((nx, ny), dtype=bool)
-        if (
+        if compute_mode == "adaptive" and supersampling_factors is not None:
+            if supersampling_convolution is True:
+                raise ValueError(
+                    "supersampling_factors are not supported with supersampling_convolution."
+                )
+            self._grid = MultiLevelAdaptiveGrid(
+                nx,
+                ny,
+                transform_pix2angle,
+                ra_at_xy_0,
+                dec_at_xy_0,
+                supersampling_factors,
+                flux_evaluate_indexes,
+            )
+        elif (
             compute_mode == "adaptive"
         ):  # or (compute_mode == 'regular' and supersampling_convolution is False and supersampling_factor > 1):
             self._grid = AdaptiveGrid(
@@ -128,6 +170,10 @@ class Numerics(PointSourceRendering):
                 )
 
             elif compute_mode == "regular" and supersampling_convolution is True:
+                if convolution_type == "fft_tiled":
+                    raise ValueError(
+                        "convolution_type 'fft_tiled' is not supported with supersampling_convolution."
+                    )
                 kernel_super = psf.kernel_point_source_supersampled(
                     supersampling_factor
                 )
@@ -139,19 +185,32 @@ class Numerics(PointSourceRendering):
                         kernel_super, convolution_kernel_size, supersampling_factor
                     )
                 self._conv = SubgridKernelConvolution(
-                    kernel_super,
+                    kernel_super.astype(self._dtype),
                     supersampling_factor,
                     supersampling_kernel_size=supersampling_kernel_size,
                     convolution_type=convolution_type,
+                    fft_backend=fft_backend,
+                    fft_workers=fft_workers,
                 )
             else:
                 kernel = psf.kernel_point_source
                 kernel = self._supersampling_cut_kernel(
                     kernel, convolution_kernel_size, supersampling_factor=1
-                )
-                self._conv = PixelKernelConvolution(
-                    kernel, convolution_type=convolution_type
-                )
+                ).astype(self._dtype)
+                if convolution_type == "fft_tiled":
+                    self._conv = TiledKernelConvolution(
+                        kernel,
+                        compute_indexes=compute_indexes,
+                        fft_backend=fft_backend,
+                        fft_workers=fft_workers,
+                    )
+                else:
+                    self._conv = PixelKernelConvolution(
+                        kernel,
+                        convolution_type=convolution_type,
+                        fft_backend=fft_backend,
+                        fft_workers=fft_workers,
+                    )
 
         elif self._psf_type == "GAUSSIAN":
             if compute_mode == "adaptive":
@@ -198,9 +257,15 @@ class Numerics(PointSourceRendering):
         :return: convolved image on regular pixel grid, 2d array
         """
         # add supersampled region to lower resolution on
+        flux_array = np.asarray(flux_array, dtype=self._dtype)
         image_low_res, image_high_res_partial = self._grid.flux_array2image_low_high(
             flux_array, high_res_return=self._high_res_return
         )
+        image_low_res = image_low_res.astype(self._dtype, copy=False)
+        if image_high_res_partial is not None:
+            image_high_res_partial = image_high_res_partial.astype(
+                self._dtype, copy=False
+            )
         if unconvolved is True or self._psf_type == "NONE":
             image_conv = image_low_res
         else:
@@ -208,7 +273,59 @@ class Numerics(PointSourceRendering):
             image_conv = self._conv.re_size_convolve(
                 image_low_res, image_high_res_partial
             )
-        return image_conv * self._pixel_width**2
+        return image_conv * self._pixel_area
+
+    def re_size_convolve_stack(
+        self, flux_arrays, unconvolved=False, max_elements=10**5
+    ):
+        """Convolves a stack of flux arrays (e.g. the linear basis functions of a
+        response matrix). Pixelized kernel convolutions are performed in batched calls
+        on the stack of images, other convolution types are performed image by image.
+
+        :param flux_arrays: 2d array (n_images, n_evaluate), flux values corresponding
+            to coordinates_evaluate
+        :param unconvolved: boolean, if True, does not apply a convolution
+        :param max_elements: maximum number of (supersampled) pixels convolved in a
+            single batch. This bounds the memory and keeps the batched transforms cache
+            friendly.
+        :return: convolved images on regular pixel grid, 3d array (n_images, nx, ny)
+        """
+        flux_arrays = np.asarray(flux_arrays, dtype=self._dtype)
+        n_images, n_evaluate = np.shape(flux_arrays)
+        batch_convolution = isinstance(
+            self._conv,
+            (PixelKernelConvolution, SubgridKernelConvolution, TiledKernelConvolution),
+        )
+        if unconvolved is True or self._psf_type == "NONE" or not batch_convolution:
+            return np.array(
+                [
+                    self.re_size_convolve(flux_array, unconvolved=unconvolved)
+                    for flux_array in flux_arrays
+                ]
+            )
+        num_batch = max(int(max_elements // max(n_evaluate, 1)), 1)
+        image_conv = []
+        for i in range(0, n_images, num_batch):
+            image_low_res, image_high_res_partial = [], []
+            for flux_array in flux_arrays[i : i + num_batch]:
+                low_res, high_res = self._grid.flux_array2image_low_high(
+                    flux_array, high_res_return=self._high_res_return
+                )
+                image_low_res.append(low_res)
+                image_high_res_partial.append(high_res)
+            if self._high_res_return is True and image_high_res_partial[0] is not None:
+                image_high_res_partial = np.array(
+                    image_high_res_partial, dtype=self._dtype
+                )
+            else:
+                image_high_res_partial = None
+            image_conv.append(
+                self._conv.re_size_convolve(
+                    np.array(image_low_res, dtype=self._dtype),
+                    image_high_res_partial,
+                )
+            )
+        return np.concatenate(image_conv, axis=0) * self._pixel_area
 
     @property
     def grid_supersampling_factor(self):
@@ -224,7 +341,23 @@ class Numerics(PointSourceRendering):
 
         :return: 1d array of all coordinates being evaluated to perform the image computation
         """
-        return self._grid.coordinates_evaluate
+        x_grid, y_grid = self._grid.coordinates_evaluate
+        if self._dtype == np.float64:
+            return x_grid, y_grid
+        if self._coordinates_evaluate is None:
+            self._coordinates_evaluate = (
+                x_grid.astype(self._dtype),
+                y_grid.astype(self._dtype),
+            )
+        return self._coordinates_evaluate
+
+    @property
+    def precision(self):
+        """
+
+        :return: string, floating point precision of the numerical computations ('float64' or 'float32')
+        """
+        return self._dtype.name
 
     @staticmethod
     def _supersampling_cut_kernel(
@@ -258,6 +391,6 @@ class Numerics(PointSourceRendering):
     def grid_class(self):
         """
 
-        :return: grid class (can be RegularGrid, AdaptiveGrid)
+        :return: grid class (can be RegularGrid, AdaptiveGrid, MultiLevelAdaptiveGrid)
         """
         return self._grid
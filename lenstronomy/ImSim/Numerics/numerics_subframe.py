@@ -21,11 +21,15 @@ class NumericsSubFrame(PointSourceRendering):
         supersampling_kernel_size=5,
         flux_evaluate_indexes=None,
         supersampled_indexes=None,
+        supersampling_factors=None,
         compute_indexes=None,
         point_source_supersampling_factor=None,
         convolution_kernel_size=None,
         convolution_type="fft_static",
         truncation_conv=None,
+        fft_backend=None,
+        fft_workers=None,
+        precision="float64",
     ):
         """
 
@@ -43,18 +47,29 @@ class NumericsSubFrame(PointSourceRendering):
             convolution)
         :param supersampled_indexes: 2d boolean array (only used in mode='adaptive') of pixels to be supersampled (in
             surface brightness and if supersampling_convolution=True also in convolution)
-        :param compute_indexes: 2d boolean array (only used in mode='adaptive'), marks pixel that the resonse after
-            convolution is computed (all others =0). This can be set to likelihood_mask in the Likelihood module for
+        :param supersampling_factors: 2d int array (only used in compute_mode='adaptive'), individual
+            super-sampling factor of the surface brightness of each pixel (=1 for no super-sampling). If set,
+            replaces supersampled_indexes and supersampling_factor for the surface brightness evaluation. Not
+            compatible with supersampling_convolution=True.
+        :param compute_indexes: 2d boolean array (only used in mode='adaptive' or convolution_type='fft_tiled'), marks
+            pixel that the resonse after convolution is computed (all others =0). This can be set to likelihood_mask in the Likelihood module for
             consistency.
         :param point_source_supersampling_factor: super-sampling resolution of the point source placing
             if None, then uses the supersampling factor of the original PSF
         :param convolution_kernel_size: int, odd number, size of convolution kernel. If None, takes size of
             point_source_kernel
-        :param convolution_type: string, 'fft', 'grid', 'fft_static' mode of 2d convolution
+        :param convolution_type: string, 'fft', 'grid', 'fft_static', 'fft_tiled' mode of 2d convolution. 'fft_tiled'
+            performs overlap-save convolutions only on the blocks of the image containing compute_indexes (only
+            available without supersampling_convolution)
         :param truncation_conv: Truncation used for the construction of the convolution kernels (only relevant for Gaussian convolution). By default,
             the truncation from the psf class will be used. Can be overwritten so that different PSFs are used for
             convolution and point source rendering.
-
+        :param fft_backend: string, FFT backend of the 'fft_static' convolution ('numpy', 'scipy' or 'pyfftw'),
+            if None, uses the lenstronomy configuration file
+        :param fft_workers: int, number of threads of the 'scipy' and 'pyfftw' FFT backends, if None, uses the
+            lenstronomy configuration file
+        :param precision: string, 'float64' or 'float32', floating point precision of the coordinates being
+            evaluated, the surface brightness arrays and the convolutions
         """
         # if no super sampling, turn the supersampling convolution off
 
@@ -70,11 +85,15 @@ class NumericsSubFrame(PointSourceRendering):
             supersampling_kernel_size=supersampling_kernel_size,
             flux_evaluate_indexes=self._cut_frame(flux_evaluate_indexes),
             supersampled_indexes=self._cut_frame(supersampled_indexes),
+            supersampling_factors=self._cut_frame(supersampling_factors),
             compute_indexes=self._cut_frame(compute_indexes),
             point_source_supersampling_factor=point_source_supersampling_factor,
             convolution_kernel_size=convolution_kernel_size,
             convolution_type=convolution_type,
             truncation_conv=truncation_conv,
+            fft_backend=fft_backend,
+            fft_workers=fft_workers,
+            precision=precision,
         )
         super(NumericsSubFrame, self).__init__(
             pixel_grid=pixel_grid,
@@ -94,6 +113,19 @@ class NumericsSubFrame(PointSourceRendering):
         )
         return self._complete_frame(image_sub_frame)
 
+    def re_size_convolve_stack(self, flux_arrays, unconvolved=False):
+        """
+
+        :param flux_arrays: 2d array (n_images, n_evaluate), flux values corresponding
+            to coordinates_evaluate
+        :param unconvolved: boolean, if True, does not apply a convolution
+        :return: convolved images on regular pixel grid, 3d array (n_images, nx, ny)
+        """
+        image_sub_frame = self._numerics_subframe.re_size_convolve_stack(
+            flux_arrays, unconvolved=unconvolved
+        )
+        return self._complete_frame(image_sub_frame)
+
     @property
     def grid_supersampling_factor(self):
         """
@@ -110,6 +142,14 @@ class NumericsSubFrame(PointSourceRendering):
         """
         return self._numerics_subframe.coordinates_evaluate
 
+    @property
+    def precision(self):
+        """
+
+        :return: string, floating point precision of the numerical computations ('float64' or 'float32')
+        """
+        return self._numerics_subframe.precision
+
     @property
     def convolution_class(self):
         """
@@ -128,12 +168,17 @@ class NumericsSubFrame(PointSourceRendering):
 
     def _complete_frame(self, image_sub_frame):
         """
-        :param image_sub_frame: 2d numpy array of size of the sub-frame
+        :param image_sub_frame: 2d numpy array of size of the sub-frame (or 3d stack of
+            2d arrays)
         :return: 2d numpy array of size of image with added zeros on their edges
         """
         if self._subframe_calc is True:
-            image = np.zeros((self._nx, self._ny))
+            image = np.zeros(
+                np.shape(image_sub_frame)[:-2] + (self._nx, self._ny),
+                dtype=image_sub_frame.dtype,
+            )
             image[
+                ...,
                 self._x_min_sub : self._x_max_sub + 1,
                 self._y_min_sub : self._y_max_sub + 1,
             ] = image_sub_frame
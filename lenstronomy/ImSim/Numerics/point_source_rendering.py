@@ -1,5 +1,5 @@
-from lenstronomy.Util import image_util
 from lenstronomy.Util import kernel_util
+from lenstronomy.Util import numba_util
 import numpy as np
 
 __all__ = ["PointSourceRendering"]
@@ -33,34 +33,81 @@ class PointSourceRendering(object):
         :type unconvolved: bool
         :return: 2d numpy array of size of the image with the point source(s) rendered
         """
+        return self.point_source_rendering_stack(
+            [ra_pos], [dec_pos], [amp], unconvolved=unconvolved
+        )[0]
+
+    def point_source_rendering_stack(
+        self, ra_pos_list, dec_pos_list, amp_list, unconvolved=False
+    ):
+        """Renders a stack of images, one for each set of point source positions (e.g.
+        the linear response of each point source model). All PSF stamps are shifted with
+        bilinear weights and added in a single pass directly onto the regular pixel grid.
+
+        :param ra_pos_list: list of arrays of RA positions of point source(s)
+        :param dec_pos_list: list of arrays of DEC positions of point source(s)
+        :param amp_list: list of arrays of amplitudes of point source(s)
+        :param unconvolved: if True, instead of the proper PSF, renders it on a single pixel
+        :type unconvolved: bool
+        :return: 3d numpy array (n, nx, ny) with the point source(s) of each set rendered
+        """
         subgrid = self._supersampling_factor
-        x_pos, y_pos = self._pixel_grid.map_coord2pix(ra_pos, dec_pos)
-        # translate coordinates to higher resolution grid
-        x_pos_subgird = x_pos * subgrid + (subgrid - 1) / 2.0
-        y_pos_subgrid = y_pos * subgrid + (subgrid - 1) / 2.0
         if unconvolved is True:
             kernel_point_source_subgrid = np.zeros((3, 3))
             kernel_point_source_subgrid[1, 1] = 1
         else:
             kernel_point_source_subgrid = self._kernel_supersampled
-        # initialize grid with higher resolution
-        subgrid2d = np.zeros((self._nx * subgrid, self._ny * subgrid))
-        # add_layer2image
-        if len(x_pos) > len(amp):
-            raise ValueError(
-                "there are %s images appearing but only %s amplitudes provided!"
-                % (len(x_pos), len(amp))
-            )
-        for i in range(len(x_pos)):
-            subgrid2d = image_util.add_layer2image(
-                subgrid2d,
-                x_pos_subgird[i],
-                y_pos_subgrid[i],
-                amp[i] * kernel_point_source_subgrid,
-            )
-        # re-size grid to data resolution
-        grid2d = image_util.re_size(subgrid2d, factor=subgrid)
-        return grid2d * subgrid**2
+        x_pos, y_pos, amp, layer = self._stack_positions(
+            ra_pos_list, dec_pos_list, amp_list
+        )
+        # translate coordinates to higher resolution grid
+        x_pos_subgrid = x_pos * subgrid + (subgrid - 1) / 2.0
+        y_pos_subgrid = y_pos * subgrid + (subgrid - 1) / 2.0
+        images = np.zeros((len(ra_pos_list), self._nx, self._ny))
+        add_point_sources(
+            images,
+            kernel_point_source_subgrid,
+            x_pos_subgrid,
+            y_pos_subgrid,
+            amp,
+            layer,
+            subgrid,
+        )
+        return images
+
+    def _stack_positions(self, ra_pos_list, dec_pos_list, amp_list):
+        """Flattens lists of point source positions and amplitudes to pixel positions
+        with the index of the image they belong to.
+
+        :param ra_pos_list: list of arrays of RA positions of point source(s)
+        :param dec_pos_list: list of arrays of DEC positions of point source(s)
+        :param amp_list: list of arrays of amplitudes of point source(s)
+        :return: x_pos, y_pos (pixel coordinates), amp, layer index
+        """
+        x_list, y_list, amp_flat, layer = [], [], [], []
+        for i, (ra_pos, dec_pos, amp) in enumerate(
+            zip(ra_pos_list, dec_pos_list, amp_list)
+        ):
+            x_pos, y_pos = self._pixel_grid.map_coord2pix(ra_pos, dec_pos)
+            x_pos, y_pos = np.atleast_1d(x_pos), np.atleast_1d(y_pos)
+            amp = np.atleast_1d(amp)
+            if len(x_pos) > len(amp):
+                raise ValueError(
+                    "there are %s images appearing but only %s amplitudes provided!"
+                    % (len(x_pos), len(amp))
+                )
+            x_list.append(x_pos)
+            y_list.append(y_pos)
+            amp_flat.append(amp[: len(x_pos)])
+            layer.append(np.full(len(x_pos), i, dtype=int))
+        if len(x_list) == 0:
+            return np.zeros(0), np.zeros(0), np.zeros(0), np.zeros(0, dtype=int)
+        return (
+            np.concatenate(x_list).astype(float),
+            np.concatenate(y_list).astype(float),
+            np.concatenate(amp_flat).astype(float),
+            np.concatenate(layer),
+        )
 
     @property
     def _kernel_supersampled(self):
@@ -85,20 +132,29 @@ class PointSourceRendering(object):
             inaccuracies in the PSF modeling
         """
         x_pos, y_pos = self._pixel_grid.map_coord2pix(ra_pos, dec_pos)
+        x_pos, y_pos = np.atleast_1d(x_pos), np.atleast_1d(y_pos)
         psf_kernel = self._psf.kernel_point_source
         psf_variance_map = self._psf.psf_variance_map
-        variance_map = np.zeros_like(data)
-        for i in range(len(x_pos)):
-            if fix_psf_variance_map is True:
-                amp_estimated = amp
-            else:
-                amp_estimated = kernel_util.estimate_amp(
-                    data, x_pos[i], y_pos[i], psf_kernel
-                )
-            variance_map = image_util.add_layer2image(
-                variance_map, x_pos[i], y_pos[i], psf_variance_map * amp_estimated**2
+        if fix_psf_variance_map is True:
+            amp_estimated = np.ones(len(x_pos)) * amp
+        else:
+            amp_estimated = np.array(
+                [
+                    kernel_util.estimate_amp(data, x_pos[i], y_pos[i], psf_kernel)
+                    for i in range(len(x_pos))
+                ]
             )
-        return variance_map
+        variance_map = np.zeros((1,) + np.shape(data))
+        add_point_sources(
+            variance_map,
+            psf_variance_map,
+            x_pos.astype(float),
+            y_pos.astype(float),
+            amp_estimated**2,
+            np.zeros(len(x_pos), dtype=int),
+            1,
+        )
+        return variance_map[0]
 
     def point_source_rendering_unconvolved_for_interferometry(
         self, ra_pos, dec_pos, amp
@@ -119,22 +175,131 @@ class PointSourceRendering(object):
             raise ValueError(
                 "Supersampling is not supported for interferometric image fitting."
             )
-        x_pos, y_pos = self._pixel_grid.map_coord2pix(ra_pos, dec_pos)
+        x_pos, y_pos, amp, layer = self._stack_positions([ra_pos], [dec_pos], [amp])
         # render the unconvolved point source using a PSF of [[0, 0, 0], [0, 1, 0], [0, 0, 0]].
         kernel_point_source_for_unconcolved_image = np.zeros((3, 3))
         kernel_point_source_for_unconcolved_image[1, 1] = 1
-        grid2d = np.zeros((self._nx, self._ny))
-        # add_layer2image
-        if len(x_pos) > len(amp):
-            raise ValueError(
-                "there are %s images appearing but only %s amplitudes provided!"
-                % (len(x_pos), len(amp))
-            )
-        for i in range(len(x_pos)):
-            grid2d = image_util.add_layer2image(
-                grid2d,
-                x_pos[i],
-                y_pos[i],
-                amp[i] * kernel_point_source_for_unconcolved_image,
-            )
-        return grid2d
+        grid2d = np.zeros((1, self._nx, self._ny))
+        add_point_sources(
+            grid2d,
+            kernel_point_source_for_unconcolved_image,
+            x_pos,
+            y_pos,
+            amp,
+            layer,
+            1,
+        )
+        return grid2d[0]
+
+
+def add_point_sources(images, kernel, x_pos, y_pos, amp, layer, supersampling_factor):
+    """Adds sub-pixel shifted and scaled copies of a (super-sampled) kernel onto a
+    stack of images at regular resolution. The sub-pixel shifts are performed with
+    bilinear interpolation weights, the (super-sampled) stamps are summed directly into
+    the regular pixels they fall into.
+
+    :param images: 3d array (n, nx, ny) of images at regular resolution, updated in place
+    :param kernel: 2d array (odd number of pixels per axis) of the (super-sampled) kernel
+    :param x_pos: 1d array of x-positions of the kernel centers in super-sampled pixel
+        coordinates
+    :param y_pos: 1d array of y-positions of the kernel centers in super-sampled pixel
+        coordinates
+    :param amp: 1d array of amplitudes of the kernels
+    :param layer: 1d int array, index of the image each kernel is added to
+    :param supersampling_factor: int, super-sampling factor of the kernel and positions
+    :return: None
+    """
+    k_rows, k_cols = np.shape(kernel)
+    if k_rows % 2 == 0 or k_cols % 2 == 0:
+        raise ValueError("kernel dimensions must be odd")
+    kernel = np.asarray(kernel, dtype=float)
+    if numba_util.numba_enabled:
+        _add_point_sources_numba(
+            images, kernel, x_pos, y_pos, amp, layer, supersampling_factor
+        )
+    else:
+        _add_point_sources_numpy(
+            images, kernel, x_pos, y_pos, amp, layer, supersampling_factor
+        )
+
+
+@numba_util.jit()
+def _add_point_sources_numba(
+    images, kernel, x_pos, y_pos, amp, layer, supersampling_factor
+):
+    """Compiled implementation of add_point_sources()."""
+    k_rows, k_cols = kernel.shape
+    n_rows = images.shape[1] * supersampling_factor
+    n_cols = images.shape[2] * supersampling_factor
+    for i in range(len(x_pos)):
+        y_0 = y_pos[i] - (k_rows - 1) / 2.0
+        x_0 = x_pos[i] - (k_cols - 1) / 2.0
+        if not (np.isfinite(x_0) and np.isfinite(y_0)):
+            continue
+        row_0 = int(np.floor(y_0))
+        col_0 = int(np.floor(x_0))
+        t_y = y_0 - row_0
+        t_x = x_0 - col_0
+        w_00 = (1 - t_y) * (1 - t_x) * amp[i]
+        w_01 = (1 - t_y) * t_x * amp[i]
+        w_10 = t_y * (1 - t_x) * amp[i]
+        w_11 = t_y * t_x * amp[i]
+        for k in range(k_rows + 1):
+            row = row_0 + k
+            if row < 0 or row >= n_rows:
+                continue
+            for j in range(k_cols + 1):
+                col = col_0 + j
+                if col < 0 or col >= n_cols:
+                    continue
+                value = 0.0
+                if k < k_rows:
+                    if j < k_cols:
+                        value += w_00 * kernel[k, j]
+                    if j > 0:
+                        value += w_01 * kernel[k, j - 1]
+                if k > 0:
+                    if j < k_cols:
+                        value += w_10 * kernel[k - 1, j]
+                    if j > 0:
+                        value += w_11 * kernel[k - 1, j - 1]
+                images[
+                    layer[i], row // supersampling_factor, col // supersampling_factor
+                ] += value
+
+
+def _add_point_sources_numpy(
+    images, kernel, x_pos, y_pos, amp, layer, supersampling_factor
+):
+    """Vectorized numpy implementation of add_point_sources() (used when numba is
+    disabled)."""
+    k_rows, k_cols = kernel.shape
+    n_layer, nx, ny = images.shape
+    finite = np.isfinite(x_pos) & np.isfinite(y_pos)
+    x_pos, y_pos, amp, layer = x_pos[finite], y_pos[finite], amp[finite], layer[finite]
+    y_0 = y_pos - (k_rows - 1) / 2.0
+    x_0 = x_pos - (k_cols - 1) / 2.0
+    row_0, col_0 = np.floor(y_0).astype(int), np.floor(x_0).astype(int)
+    t_y, t_x = (y_0 - row_0)[:, None, None], (x_0 - col_0)[:, None, None]
+    rows = row_0[:, None, None] + np.arange(k_rows)[None, :, None]
+    cols = col_0[:, None, None] + np.arange(k_cols)[None, None, :]
+    values = amp[:, None, None] * kernel[None, :, :]
+    for d_row, d_col, weight in [
+        (0, 0, (1 - t_y) * (1 - t_x)),
+        (0, 1, (1 - t_y) * t_x),
+        (1, 0, t_y * (1 - t_x)),
+        (1, 1, t_y * t_x),
+    ]:
+        row, col = rows + d_row, cols + d_col
+        valid = (
+            (row >= 0)
+            & (row < nx * supersampling_factor)
+            & (col >= 0)
+            & (col < ny * supersampling_factor)
+        )
+        index = (
+            layer[:, None, None] * nx + row // supersampling_factor
+        ) * ny + col // supersampling_factor
+        images += np.bincount(
+            index[valid], weights=(weight * values)[valid], minlength=images.size
+        ).reshape(images.shape)
@@ -1,4 +1,5 @@
 import numpy as np
+import scipy.sparse as sparse
 from tqdm import tqdm
 
 import lenstronomy.Util.util as util
@@ -13,9 +14,12 @@ class PixelatedSourceReconstruction(object):
     'placeholder for Nan Zhang's paper) for source reconstruction based on different
     likelihood methods.
 
-    All sparse matrices (sp) in this class are represented as a list of lists:
-    [[y_coord, x_coord, pixel_value], ...], where [y_coord, x_coord] are
-    the pixel coordinates and pixel_value is the corresponding pixel's value.
+    The lensing (and PSF convolution) operators are represented as scipy.sparse
+    matrices acting on the flattened (row-major) image and source pixels. The list
+    based sparse representation [[y_coord, x_coord, pixel_value], ...] of single
+    lensed source pixels, where [y_coord, x_coord] are the pixel coordinates and
+    pixel_value is the corresponding pixel's value, is supported by the helper
+    functions of this class.
     """
 
     def __init__(
@@ -79,7 +83,9 @@ class PixelatedSourceReconstruction(object):
                         "in each dimension for interferometry_natwt likelihood."
                     )
 
-    def generate_M_b(self, kwargs_lens, verbose=False, show_progress=True):
+    def generate_M_b(
+        self, kwargs_lens, verbose=False, show_progress=True, sparse_output=False
+    ):
         """Generates the M matrix and the b vector for source reconstruction based on
         the selected likelihood method. Definitions of the M and b is given by
         (placeholder for Nan Zhang's paper).
@@ -89,6 +95,8 @@ class PixelatedSourceReconstruction(object):
             Defaults to False.
         :param show_progress: If True, show progress bar of generating the M matrix.
             Defaults to True.
+        :param sparse_output: If True, returns M as scipy.sparse.csr_matrix (to be used
+            with the sparse solvers of solve_regularization_strength).
         :returns: (M, b) tuple, where M is the matrix and b is the vector.
         """
         if verbose:
@@ -106,16 +114,21 @@ class PixelatedSourceReconstruction(object):
             print("likelihood method:", self._logL_method)
         if self._logL_method == "diagonal":
             M, b = self.generate_M_b_diagonal_likelihood(
-                kwargs_lens, verbose, show_progress
+                kwargs_lens, verbose, show_progress, sparse_output=sparse_output
             )
         elif self._logL_method == "interferometry_natwt":
             M, b = self.generate_M_b_interferometry_natwt_likelihood(
-                kwargs_lens, verbose, show_progress
+                kwargs_lens, verbose, show_progress, sparse_output=sparse_output
             )
         return M, b
 
     def generate_M_b_diagonal_likelihood(
-        self, kwargs_lens, verbose=False, show_progress=True
+        self,
+        kwargs_lens,
+        verbose=False,
+        show_progress=True,
+        num_batch=500,
+        sparse_output=False,
     ):
         """Generates M and b matrices assuming spatially uncorrelated noise with uniform
         RMS across the image. This approach is typically used for CCD image data.
@@ -127,66 +140,68 @@ class PixelatedSourceReconstruction(object):
             Defaults to False.
         :param show_progress: If True, show progress bar of generating the M matrix.
             Defaults to True.
+        :param num_batch: number of columns of M computed in a single sparse matrix
+            product.
+        :param sparse_output: If True, returns M as scipy.sparse.csr_matrix.
         :returns: (M, b) tuple, where M is the matrix and b is the vector.
         """
         if verbose:
             print("Step 1: Lensing the source pixels")
-        lensed_sp = self.lens_pixel_source_of_a_rectangular_region(kwargs_lens)
+        lensing_operator = self.lensing_operator(kwargs_lens)
         if verbose:
             print("Step 1: Finished!")
 
         if verbose:
             print("Step 2: Convolve the lensed pixels")
-        N_lensed = len(lensed_sp)
-        lensed_pixel_conv_set = np.zeros((N_lensed, self._num_pix, self._num_pix))
-        for i in range(N_lensed):
-            lensed_pixel_conv_set[i] = self.sparse_convolution(
-                lensed_sp[i], self._kernel
-            )
+        support = self._support(lensing_operator)
+        response = sparse.csc_matrix(
+            self.convolution_operator(support) @ lensing_operator[support]
+        )
         if verbose:
             print("Step 2: Finished!")
 
         if verbose:
             print("Step 3: Compute the matrix M and vector b")
-        M = np.zeros((N_lensed, N_lensed))
-        b = np.zeros((N_lensed))
-        for i in tqdm(
-            range(N_lensed),
-            desc="Running (iteration times vary)",
-            disable=not show_progress,
-        ):
-            b[i] = np.sum(lensed_pixel_conv_set[i] * self._image_data / self._C_D)
-            for j in range(N_lensed):
-                if j < i:
-                    M[i, j] = M[j, i]  # Exploit symmetry
-                else:
-                    M[i, j] = np.sum(
-                        lensed_pixel_conv_set[i] * lensed_pixel_conv_set[j] / self._C_D
-                    )
+        C_D_inv = 1.0 / util.image2array(self._C_D)
+        response_weighted = sparse.csc_matrix(response.multiply(C_D_inv[:, None]))
+        b = response_weighted.T @ util.image2array(self._image_data)
+        if sparse_output is True:
+            M = sparse.csr_matrix(response.T @ response_weighted)
+        else:
+            M = self._sparse_gram_matrix(
+                response.T.tocsr(), response_weighted, num_batch, show_progress
+            )
         if verbose:
             print("Step 3: Finished!")
 
         return M, b
 
     def generate_M_b_interferometry_natwt_likelihood(
-        self, kwargs_lens, verbose=False, show_progress=True
+        self,
+        kwargs_lens,
+        verbose=False,
+        show_progress=True,
+        num_batch=500,
+        sparse_output=False,
     ):
         """Generates the M and b matrices for interferometric data with natural
         weighting.
 
-        This method integrates the convolution step implicitly via specialized sparse
-        product functions.
+        The convolution with the (dirty beam) kernel is performed on the image pixels
+        that receive flux from the source grid only, block by block.
 
         :param kwargs_lens: List of keyword arguments for the lens_model_class.
         :param verbose: If True, print progress messages during matrix generation steps.
             Defaults to False.
         :param show_progress: If True, show progress bar of generating the M matrix.
             Defaults to True.
+        :param num_batch: number of image pixels convolved in a single block.
+        :param sparse_output: If True, returns M as scipy.sparse.csr_matrix.
         :returns: (M, b) tuple, where M is the matrix and b is the vector.
         """
         if verbose:
             print("Step 1: Lensing the source pixels")
-        lensed_sp = self.lens_pixel_source_of_a_rectangular_region(kwargs_lens)
+        lensing_operator = self.lensing_operator(kwargs_lens)
         if verbose:
             print("Step 1: Finished!")
 
@@ -194,32 +209,100 @@ class PixelatedSourceReconstruction(object):
             print(
                 "Step 2: Compute the matrix M and vector b (including the convolution step)"
             )
-        N_lensed = len(lensed_sp)
-        M = np.zeros((N_lensed, N_lensed))
-        b = np.zeros((N_lensed))
+        b = lensing_operator.T @ util.image2array(self._image_data)
+        support = self._support(lensing_operator)
+        lensing_support = lensing_operator[support]
+        lensing_support_t = lensing_support.T.tocsr()
+        y_support, x_support = np.divmod(support, self._num_pix)
+        kernel_center_y, kernel_center_x = (
+            self._shape_kernel[0] // 2,
+            self._shape_kernel[1] // 2,
+        )
+        M = np.zeros((self._num_pixel_source, self._num_pixel_source))
         for i in tqdm(
-            range(N_lensed),
+            range(0, len(support), num_batch),
             desc="Running (iteration times vary)",
             disable=not show_progress,
         ):
-            b[i] = self.sum_sparse_elementwise_product(lensed_sp[i], self._image_data)
-            pixel_lensed_convolved = self.sparse_convolution(
-                lensed_sp[i], self._kernel
-            )  # convolution
-            for j in range(N_lensed):
-                if j < i:
-                    M[i, j] = M[j, i]  # Exploit symmetry
-                else:
-                    M[i, j] = self.sum_sparse_elementwise_product(
-                        lensed_sp[j], pixel_lensed_convolved
-                    )
+            # block of the PSF convolution matrix between the support pixels
+            delta_y = y_support[i : i + num_batch, None] - y_support[None, :]
+            delta_x = x_support[i : i + num_batch, None] - x_support[None, :]
+            delta_y += kernel_center_y
+            delta_x += kernel_center_x
+            inside = (
+                (delta_y >= 0)
+                & (delta_y < self._shape_kernel[0])
+                & (delta_x >= 0)
+                & (delta_x < self._shape_kernel[1])
+            )
+            kernel_block = np.where(
+                inside,
+                self._kernel[
+                    np.clip(delta_y, 0, self._shape_kernel[0] - 1),
+                    np.clip(delta_x, 0, self._shape_kernel[1] - 1),
+                ],
+                0,
+            )
+            convolved_block = (lensing_support_t @ kernel_block.T).T
+            M += lensing_support_t[:, i : i + num_batch] @ convolved_block
+        # M[i, j] = (lensed pixel j) . (kernel * lensed pixel i) for i <= j
+        M = np.triu(M.T) + np.triu(M.T, 1).T
         b /= self._noise_rms**2
         M /= self._noise_rms**2
+        if sparse_output is True:
+            M = sparse.csr_matrix(M)
         if verbose:
             print("Step 2: Finished!")
 
         return M, b
 
+    def lensing_operator(self, kwargs_lens):
+        """Sparse lensing operator mapping the source grid pixels to the image plane
+        pixels with bilinear interpolation weights. Each image pixel is ray-shot to the
+        source plane and contributes to the (up to) four source pixels surrounding its
+        source position.
+
+        :param kwargs_lens: List of keyword arguments for the lens_model_class.
+        :returns: scipy.sparse.csc_matrix of shape (num_pix**2, number of source pixels),
+            acting on the flattened source grid and returning the flattened (row-major)
+            image.
+        """
+        image_index, source_index, weights = self._lensing_weights(kwargs_lens)
+        return sparse.csc_matrix(
+            (weights, (image_index, source_index)),
+            shape=(self._num_pix**2, self._num_pixel_source),
+        )
+
+    def convolution_operator(self, image_index=None):
+        """Sparse PSF convolution operator of the flattened image (same convolution of
+        sparse_convolution()).
+
+        :param image_index: 1d array of flattened image pixel indices the operator
+            acts on (columns). If None, all image pixels are used.
+        :returns: scipy.sparse.csr_matrix of shape (num_pix**2, len(image_index))
+        """
+        if image_index is None:
+            image_index = np.arange(self._num_pix**2)
+        y_image, x_image = np.divmod(np.asarray(image_index), self._num_pix)
+        kernel_y, kernel_x = np.nonzero(self._kernel)
+        values = self._kernel[kernel_y, kernel_x]
+        y_conv = y_image[:, None] + kernel_y[None, :] - self._shape_kernel[0] // 2
+        x_conv = x_image[:, None] + kernel_x[None, :] - self._shape_kernel[1] // 2
+        inside = (
+            (y_conv >= 0)
+            & (y_conv < self._num_pix)
+            & (x_conv >= 0)
+            & (x_conv < self._num_pix)
+        )
+        column = np.broadcast_to(np.arange(len(image_index))[:, None], inside.shape)
+        return sparse.csr_matrix(
+            (
+                np.broadcast_to(values[None, :], inside.shape)[inside],
+                ((y_conv * self._num_pix + x_conv)[inside], column[inside]),
+            ),
+            shape=(self._num_pix**2, len(image_index)),
+        )
+
     def lens_pixel_source_of_a_rectangular_region(self, kwargs_lens):
         """Maps image plane pixels to source plane pixels within a specified rectangular
         source grid, considering lensing deflections and applying bilinear
@@ -232,95 +315,113 @@ class PixelatedSourceReconstruction(object):
             contributes with `weight` to the image plane pixel at `(y_coord, x_coord)` when lensed.
         :rtype: list
         """
+        image_index, source_index, weights = self._lensing_weights(kwargs_lens)
+        order = np.lexsort((image_index, source_index))
+        image_index, source_index, weights = (
+            image_index[order],
+            source_index[order],
+            weights[order],
+        )
+        y_image, x_image = np.divmod(image_index, self._num_pix)
+        split = np.searchsorted(source_index, np.arange(1, self._num_pixel_source))
+        lensed_pixel_sp = [
+            [[int(y), int(x), w] for y, x, w in zip(y_, x_, w_)]
+            for y_, x_, w_ in zip(
+                np.split(y_image, split),
+                np.split(x_image, split),
+                np.split(weights, split),
+            )
+        ]
+        return lensed_pixel_sp
 
-        lensed_pixel_sp = [[] for _ in range(self._num_pixel_source)]
+    def _lensing_weights(self, kwargs_lens):
+        """Ray-shoots the image pixels and computes the bilinear interpolation weights
+        of the source pixels surrounding the source plane positions.
 
+        :param kwargs_lens: List of keyword arguments for the lens_model_class.
+        :returns: flattened image pixel indices, source pixel indices and weights (1d
+            arrays of the same length)
+        """
         beta_x_grid_2d, beta_y_grid_2d = self._lens_model_class.ray_shooting(
             self._x_grid_data, self._y_grid_data, kwargs=kwargs_lens
         )
+        beta_x = util.image2array(beta_x_grid_2d)
+        beta_y = util.image2array(beta_y_grid_2d)
 
-        # Calculate integer pixel indices (floor/ceiling) in the source plane
+        # Calculate integer pixel indices (floor) in the source plane
         x_floor = np.floor(
-            (beta_x_grid_2d - self._source_min_x) / self._pixel_width_source
+            (beta_x - self._source_min_x) / self._pixel_width_source
         ).astype(int)
-        x_ceiling = x_floor + 1
         y_floor = np.floor(
-            (beta_y_grid_2d - self._source_min_y) / self._pixel_width_source
+            (beta_y - self._source_min_y) / self._pixel_width_source
         ).astype(int)
-        y_ceiling = y_floor + 1
 
         # Calculate fractional pixel offsets for bilinear interpolation
         delta_x_pixel = (
-            beta_x_grid_2d - self._source_min_x
+            beta_x - self._source_min_x
         ) / self._pixel_width_source - x_floor
         delta_y_pixel = (
-            beta_y_grid_2d - self._source_min_y
+            beta_y - self._source_min_y
         ) / self._pixel_width_source - y_floor
 
-        # Compute bilinear interpolation weights
-        w00 = (1 - delta_x_pixel) * (1 - delta_y_pixel)
-        w10 = delta_x_pixel * (1 - delta_y_pixel)
-        w01 = delta_y_pixel * (1 - delta_x_pixel)
-        w11 = delta_x_pixel * delta_y_pixel
-
         # Apply the ratio (data image pixel area / source grid pixel area) to ensure the flux conservation
-        w00 *= self._ratio_data_pixel_source_pixel
-        w10 *= self._ratio_data_pixel_source_pixel
-        w01 *= self._ratio_data_pixel_source_pixel
-        w11 *= self._ratio_data_pixel_source_pixel
-
+        norm = self._ratio_data_pixel_source_pixel * np.ones_like(beta_x)
         # Apply primary beam modulation if specified
         if self._primary_beam is not None:
-            w00 *= self._primary_beam
-            w10 *= self._primary_beam
-            w01 *= self._primary_beam
-            w11 *= self._primary_beam
+            norm = norm * util.image2array(self._primary_beam)
+
+        image_index = np.arange(len(beta_x))
+        image_index_list, source_index_list, weight_list = [], [], []
+        # bilinear interpolation weights of the four surrounding source pixels
+        for dx, dy in [(0, 0), (1, 0), (0, 1), (1, 1)]:
+            x_source, y_source = x_floor + dx, y_floor + dy
+            weight_x = delta_x_pixel if dx == 1 else 1 - delta_x_pixel
+            weight_y = delta_y_pixel if dy == 1 else 1 - delta_y_pixel
+            inside = (
+                (x_source >= 0)
+                & (x_source < self._nx_source)
+                & (y_source >= 0)
+                & (y_source < self._ny_source)
+            )
+            image_index_list.append(image_index[inside])
+            source_index_list.append((y_source * self._nx_source + x_source)[inside])
+            weight_list.append((weight_x * weight_y * norm)[inside])
+        return (
+            np.concatenate(image_index_list),
+            np.concatenate(source_index_list),
+            np.concatenate(weight_list),
+        )
 
-        for i in range(self._num_pix):
-            for j in range(self._num_pix):
-                # Skip if the lensed image pixel falls entirely outside the source region
-                if (
-                    x_ceiling[i][j] < 0
-                    or x_floor[i][j] > (self._nx_source - 1)
-                    or y_ceiling[i][j] < 0
-                    or y_floor[i][j] > (self._ny_source - 1)
-                ):
-                    continue
-
-                # Calculate linear indices of the four potential source pixels
-                source_pixel_index00 = self._nx_source * (y_floor[i][j]) + x_floor[i][j]
-                source_pixel_index10 = source_pixel_index00 + 1
-                source_pixel_index01 = source_pixel_index00 + self._nx_source
-                source_pixel_index11 = source_pixel_index01 + 1
-
-                # Flags for boundary checking
-                check00, check01, check10, check11 = True, True, True, True
-
-                # Adjust flags for contributions near the boundary
-                if x_floor[i][j] == -1:
-                    check00 = False
-                    check01 = False
-                elif x_ceiling[i][j] == self._nx_source:
-                    check10 = False
-                    check11 = False
-
-                if y_floor[i][j] == -1:
-                    check00 = False
-                    check10 = False
-                elif y_ceiling[i][j] == self._ny_source:
-                    check11 = False
-                    check01 = False
-
-                # Append the contribution of each source pixel to the image pixel (i,j) with weight.
-                if check00:
-                    lensed_pixel_sp[source_pixel_index00].append([i, j, w00[i][j]])
-                if check10:
-                    lensed_pixel_sp[source_pixel_index10].append([i, j, w10[i][j]])
-                if check01:
-                    lensed_pixel_sp[source_pixel_index01].append([i, j, w01[i][j]])
-                if check11:
-                    lensed_pixel_sp[source_pixel_index11].append([i, j, w11[i][j]])
-        return lensed_pixel_sp
+    @staticmethod
+    def _support(operator):
+        """
+
+        :param operator: scipy.sparse matrix
+        :returns: indices of the rows of the operator with stored elements
+        """
+        return np.unique(operator.tocoo().row)
+
+    def _sparse_gram_matrix(self, operator_t, operator, num_batch, show_progress):
+        """Dense matrix product operator_t @ operator of two sparse matrices, computed in
+        blocks of columns.
+
+        :param operator_t: scipy.sparse.csr_matrix of shape (n, k)
+        :param operator: scipy.sparse.csc_matrix of shape (k, n)
+        :param num_batch: number of columns computed per block
+        :param show_progress: If True, show progress bar
+        :returns: 2d numpy array of shape (n, n)
+        """
+        n = operator.shape[1]
+        M = np.zeros((n, n))
+        for i in tqdm(
+            range(0, n, num_batch),
+            desc="Running (iteration times vary)",
+            disable=not show_progress,
+        ):
+            M[:, i : i + num_batch] = (
+                operator_t @ operator[:, i : i + num_batch]
+            ).toarray()
+        return M
 
     def lens_an_image_by_rayshooting(self, kwargs_lens, source_image):
         """Lenses a pixelated source plane image to the image plane using ray-shooting
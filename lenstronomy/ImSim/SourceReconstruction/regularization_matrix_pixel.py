@@ -10,11 +10,12 @@ Currently supported regularization types include:
 """
 
 import numpy as np
+import scipy.sparse
 
 __all__ = ["pixelated_regularization_matrix"]
 
 
-def pixelated_regularization_matrix(xlen, ylen, regularization_type):
+def pixelated_regularization_matrix(xlen, ylen, regularization_type, sparse=False):
     """Constructs the regularization matrix for a rectangular pixelated source region.
 
     The regularization term for pixel amplitudes :math:`\\mathbf{a}` (flattened into a 1D vector)
@@ -30,7 +31,10 @@ def pixelated_regularization_matrix(xlen, ylen, regularization_type):
     :param ylen: int, Number of pixels in the y-direction (vertical dimension of the source grid).
     :param regularization_type: str, Type of regularization to apply.
                                 Supported options are 'zeroth_order', 'gradient', 'curvature'.
-    :return: numpy.ndarray, The regularization matrix :math:`U` with shape `(xlen * ylen, xlen * ylen)`.
+    :param sparse: bool, if True, returns the matrix as scipy.sparse.csr_matrix (recommended for large
+                   source grids, see solve_regularization_strength.SparseEvidenceDerivative).
+    :return: numpy.ndarray (or scipy.sparse.csr_matrix if sparse=True), The regularization matrix :math:`U`
+             with shape `(xlen * ylen, xlen * ylen)`.
     :raises TypeError: If `xlen` or `ylen` are not integers.
     :raises ValueError: If an unsupported `regularization_type` is provided.
     """
@@ -38,18 +42,60 @@ def pixelated_regularization_matrix(xlen, ylen, regularization_type):
         raise TypeError(f"xlen must be an integer, but got {type(xlen).__name__}.")
     if not isinstance(ylen, int):
         raise TypeError(f"ylen must be an integer, but got {type(ylen).__name__}.")
+    if regularization_type not in ["zeroth_order", "gradient", "curvature"]:
+        raise ValueError(
+            f"Unsupported regularization_type: '{regularization_type}'. "
+            "Supported options are: 'zeroth_order', 'gradient', 'curvature'."
+        )
+    if sparse is True:
+        return _sparse_regularization_matrix_pixel(xlen, ylen, regularization_type)
     if regularization_type == "zeroth_order":
         return _zeroth_order_regularization_matrix_pixel(xlen, ylen)
     elif regularization_type == "gradient":
         return _gradient_regularization_matrix_pixel(xlen, ylen)
-    elif regularization_type == "curvature":
-        return _curvature_regularization_matrix_pixel(xlen, ylen)
     else:
-        raise ValueError(
-            f"Unsupported regularization_type: '{regularization_type}'. "
-            "Supported options are: 'zeroth_order', 'gradient', 'curvature'."
+        return _curvature_regularization_matrix_pixel(xlen, ylen)
+
+
+def _sparse_regularization_matrix_pixel(xlen, ylen, regularization_type):
+    """Constructs the regularization matrices of pixelated_regularization_matrix() as
+    sparse matrices. The matrices are the Kronecker sums of the one-dimensional
+    operators along the x- and y-direction (with the same Dirichlet boundary conditions
+    as the dense versions).
+
+    :param xlen: int, Number of pixels in the x-direction.
+    :param ylen: int, Number of pixels in the y-direction.
+    :param regularization_type: str, 'zeroth_order', 'gradient' or 'curvature'
+    :return: scipy.sparse.csr_matrix of shape (xlen * ylen, xlen * ylen)
+    """
+    identity_x = scipy.sparse.identity(xlen, format="csr")
+    identity_y = scipy.sparse.identity(ylen, format="csr")
+    if regularization_type == "zeroth_order":
+        return scipy.sparse.identity(xlen * ylen, format="csr")
+
+    def _band(n, diagonals):
+        # symmetric banded (n, n) matrix with the values of diagonals on the offsets 0, 1, 2, ...
+        offsets = [k for k in range(len(diagonals)) if k < n]
+        data = [diagonals[0] * np.ones(n)]
+        data_off = [diagonals[k] * np.ones(n - k) for k in offsets[1:]]
+        return scipy.sparse.diags(
+            data + data_off + data_off,
+            offsets + [-k for k in offsets[1:]],
+            shape=(n, n),
+            format="csr",
         )
 
+    if regularization_type == "gradient":
+        diagonals_x, diagonals_y = [4, -1], [0, -1]
+    else:
+        diagonals_x, diagonals_y = [12, -4, 1], [0, -4, 1]
+    Umatrix = scipy.sparse.kron(
+        identity_y, _band(xlen, diagonals_x)
+    ) + scipy.sparse.kron(_band(ylen, diagonals_y), identity_x)
+    Umatrix = scipy.sparse.csr_matrix(Umatrix)
+    Umatrix.eliminate_zeros()
+    return Umatrix
+
 
 def _zeroth_order_regularization_matrix_pixel(xlen, ylen):
     """Constructs the zeroth-order regularization matrix.
@@ -1,6 +1,14 @@
 import numpy as np
+import scipy.sparse
+from scipy.linalg import eigh_tridiagonal
+from scipy.sparse.linalg import splu
 from typing import Callable
 
+try:
+    from sksparse.cholmod import cholesky as cholmod_cholesky
+except ImportError:
+    cholmod_cholesky = None
+
 
 def d_log_evi_d_lambda(l: float, U: np.ndarray, M: np.ndarray, b: np.ndarray) -> float:
     """Computes the derivative of the logarithm of the Bayesian evidence with respect to
@@ -16,12 +24,20 @@ def d_log_evi_d_lambda(l: float, U: np.ndarray, M: np.ndarray, b: np.ndarray) ->
     - M: The M matrix
     - b: The b vector
 
+    If M is a scipy.sparse matrix, the derivative is estimated with
+    SparseEvidenceDerivative (use an instance of that class directly to benefit from
+    warm starts in repeated calls).
+
     :param l: The current value of the regularization strength (lambda).
-    :param U: The regularization matrix (numpy.ndarray).
-    :param M: The M matrix (numpy.ndarray).
+    :param U: The regularization matrix (numpy.ndarray or scipy.sparse matrix).
+    :param M: The M matrix (numpy.ndarray or scipy.sparse matrix).
     :param b: The b vector (numpy.ndarray).
     :return: The computed derivative value (float).
     """
+    if scipy.sparse.issparse(M):
+        return SparseEvidenceDerivative()(l, U, M, b)
+    if scipy.sparse.issparse(U):
+        U = U.toarray()
     N_source = U.shape[0]
     lambda_U = l * U
     M_plus_lambda_U = M + lambda_U
@@ -66,7 +82,9 @@ def solve_optimal_lambda(
     :param derivative_function: A callable function that computes the derivative
                                 d(ln(Evidence))/d(lambda). It must accept
                                 (regularization_strength, data_matrix, regularization_matrix, data_vector)
-                                as its arguments.
+                                as its arguments. For sparse matrices, pass an instance of
+                                SparseEvidenceDerivative, which warm-starts each evaluation from the
+                                solutions at the previous lambda.
     :param U: The regularization matrix (numpy.ndarray).
     :param M: The M matrix (numpy.ndarray).
     :param b: The b vector (numpy.ndarray).
@@ -136,3 +154,274 @@ def solve_optimal_lambda(
 
     # Return the midpoint of the final interval as the approximate optimal lambda
     return (current_lower_bound + current_upper_bound) / 2
+
+
+class SparseEvidenceDerivative(object):
+    """Derivative of the log-evidence with respect to the regularization strength for
+    sparse M and regularization matrices (see d_log_evi_d_lambda()).
+
+    The linear systems (M + lambda U) x = y are solved with a sparse Cholesky
+    factorization if scikit-sparse is installed and with a preconditioned conjugate
+    gradient otherwise. The preconditioner is the sparse LU factorization of
+    diag(M) + lambda U, which is exact in the regularization dominated regime. The trace term tr[(M + lambda U)^-1 U] is estimated
+    with a fixed set of Rademacher probe vectors (Hutchinson estimator), such that the
+    estimated derivative is a smooth function of lambda. The conjugate gradient
+    solutions of the previous call are used as initial guesses of the next call, which
+    makes the evaluations along a lambda search (e.g. solve_optimal_lambda()) cheap.
+
+    The instance can be passed as derivative_function to solve_optimal_lambda().
+    """
+
+    def __init__(
+        self,
+        num_probes=30,
+        use_cholesky=None,
+        tolerance=1e-8,
+        max_iterations=None,
+        num_lanczos_steps=30,
+        seed=42,
+    ):
+        """
+
+        :param num_probes: int, number of random probe vectors of the trace and
+            log-determinant estimates
+        :param use_cholesky: bool, if True, uses the sparse Cholesky factorization of
+            scikit-sparse, if False, uses the preconditioned conjugate gradient. If None,
+            uses the Cholesky factorization if scikit-sparse is installed.
+        :param tolerance: float, relative residual of the conjugate gradient solutions
+        :param max_iterations: int, maximum number of conjugate gradient iterations
+            (default: size of the system)
+        :param num_lanczos_steps: int, number of Lanczos steps of the stochastic Lanczos
+            quadrature of the log-determinant (only used without Cholesky
+            factorization)
+        :param seed: int, seed of the random probe vectors
+        """
+        if use_cholesky is None:
+            use_cholesky = cholmod_cholesky is not None
+        if use_cholesky is True and cholmod_cholesky is None:
+            raise ImportError(
+                "scikit-sparse is not installed. Install it or use use_cholesky=False."
+            )
+        self._use_cholesky = use_cholesky
+        self._num_probes = num_probes
+        self._tolerance = tolerance
+        self._max_iterations = max_iterations
+        self._num_lanczos_steps = num_lanczos_steps
+        self._seed = seed
+        self._probes = None
+        self._x_previous = None
+        self.num_iterations = 0
+
+    def __call__(self, l, U, M, b):
+        """Derivative of the log-evidence d(ln(Evidence))/d(lambda).
+
+        :param l: The current value of the regularization strength (lambda).
+        :param U: The regularization matrix (scipy.sparse matrix or numpy.ndarray).
+        :param M: The M matrix (scipy.sparse matrix or numpy.ndarray).
+        :param b: The b vector (numpy.ndarray).
+        :return: The estimated derivative value (float).
+        """
+        U = scipy.sparse.csr_matrix(U)
+        N_source = U.shape[0]
+        probes = self._probe_vectors(N_source)
+        # solve for b and the probe vectors multiplied with U at once
+        x = self._solve(l, U, M, np.column_stack([b, U @ probes]))
+        x_b = x[:, 0]
+        trace_term = np.mean(np.sum(probes * x[:, 1:], axis=0))
+        quadratic_term = np.sum(x_b * (U @ x_b))
+        return (N_source / l) - trace_term - quadratic_term
+
+    def solve(self, l, U, M, b):
+        """Solves (M + lambda U) x = b for the source pixel amplitudes x.
+
+        :param l: regularization strength (lambda).
+        :param U: The regularization matrix (scipy.sparse matrix or numpy.ndarray).
+        :param M: The M matrix (scipy.sparse matrix or numpy.ndarray).
+        :param b: The b vector (numpy.ndarray).
+        :return: 1d numpy array, solution x
+        """
+        A = self._system_matrix(l, U, M)
+        if self._use_cholesky is True:
+            return cholmod_cholesky(A.tocsc())(b)
+        x0 = None
+        if self._x_previous is not None and len(self._x_previous) == len(b):
+            x0 = self._x_previous[:, 0]
+        x, num_iterations = block_conjugate_gradient(
+            A,
+            b[:, None],
+            x0=x0,
+            tolerance=self._tolerance,
+            max_iterations=self._max_iterations,
+            preconditioner=self._preconditioner(l, U, M),
+        )
+        self.num_iterations += num_iterations
+        return x[:, 0]
+
+    def log_det(self, l, U, M):
+        """Log-determinant ln det(M + lambda U). Exact with the Cholesky factorization
+        and estimated with stochastic Lanczos quadrature otherwise.
+
+        :param l: regularization strength (lambda).
+        :param U: The regularization matrix (scipy.sparse matrix or numpy.ndarray).
+        :param M: The M matrix (scipy.sparse matrix or numpy.ndarray).
+        :return: float
+        """
+        A = self._system_matrix(l, U, M)
+        if self._use_cholesky is True:
+            return cholmod_cholesky(A.tocsc()).logdet()
+        return log_det_slq(
+            A,
+            num_probes=self._num_probes,
+            num_steps=self._num_lanczos_steps,
+            seed=self._seed,
+        )
+
+    @staticmethod
+    def _system_matrix(l, U, M):
+        """
+
+        :return: M + lambda U as scipy.sparse.csr_matrix
+        """
+        return scipy.sparse.csr_matrix(M) + l * scipy.sparse.csr_matrix(U)
+
+    @staticmethod
+    def _preconditioner(l, U, M):
+        """
+
+        :return: function applying (diag(M) + lambda U)^-1
+        """
+        diagonal = scipy.sparse.diags(scipy.sparse.csr_matrix(M).diagonal())
+        return splu(scipy.sparse.csc_matrix(diagonal + l * U)).solve
+
+    def _probe_vectors(self, n):
+        """Fixed set of Rademacher probe vectors.
+
+        :param n: size of the vectors
+        :return: 2d array (n, num_probes)
+        """
+        if self._probes is None or len(self._probes) != n:
+            rng = np.random.default_rng(self._seed)
+            self._probes = rng.choice([-1.0, 1.0], size=(n, self._num_probes))
+            self._x_previous = None
+        return self._probes
+
+    def _solve(self, l, U, M, rhs):
+        """Solves (M + lambda U) x = rhs for all columns of rhs, warm-started from the
+        solutions of the previous call.
+
+        :param l: regularization strength (lambda).
+        :param U: The regularization matrix (scipy.sparse.csr_matrix).
+        :param M: The M matrix (scipy.sparse matrix or numpy.ndarray).
+        :param rhs: 2d array of right hand sides (n, k)
+        :return: 2d array (n, k)
+        """
+        A = self._system_matrix(l, U, M)
+        if self._use_cholesky is True:
+            return cholmod_cholesky(A.tocsc())(rhs)
+        x, num_iterations = block_conjugate_gradient(
+            A,
+            rhs,
+            x0=self._x_previous,
+            tolerance=self._tolerance,
+            max_iterations=self._max_iterations,
+            preconditioner=self._preconditioner(l, U, M),
+        )
+        self.num_iterations += num_iterations
+        self._x_previous = x
+        return x
+
+
+def block_conjugate_gradient(
+    A, rhs, x0=None, tolerance=1e-8, max_iterations=None, preconditioner=None
+):
+    """Preconditioned conjugate gradient solving A x = rhs for several right hand sides
+    simultaneously (independent conjugate gradients evaluated with sparse matrix -
+    dense matrix products).
+
+    :param A: scipy.sparse matrix (or numpy.ndarray), symmetric positive definite
+    :param rhs: 2d array of right hand sides (n, k)
+    :param x0: initial guess (n, k) or (n,); if None, starts from zero
+    :param tolerance: relative residual norm at which a column is converged
+    :param max_iterations: maximum number of iterations (default: n)
+    :param preconditioner: function applying the inverse of the preconditioner to a
+        (n, k) array; if None, uses the inverse diagonal of A (Jacobi)
+    :return: solution (n, k), number of iterations performed
+    """
+    n = rhs.shape[0]
+    if max_iterations is None:
+        max_iterations = n
+    if preconditioner is None:
+        diagonal = A.diagonal()
+        diagonal_inv = np.where(
+            diagonal > 0, 1.0 / np.where(diagonal > 0, diagonal, 1), 1
+        )
+
+        def preconditioner(r):
+            return diagonal_inv[:, None] * r
+
+    if x0 is None:
+        x = np.zeros_like(rhs, dtype=float)
+    else:
+        x = np.array(x0, dtype=float).reshape(rhs.shape)
+    r = rhs - A @ x
+    z = preconditioner(r)
+    p = z.copy()
+    rz = np.sum(r * z, axis=0)
+    rhs_norm = np.linalg.norm(rhs, axis=0)
+    rhs_norm[rhs_norm == 0] = 1
+    num_iterations = 0
+    for num_iterations in range(max_iterations + 1):
+        active = np.linalg.norm(r, axis=0) > tolerance * rhs_norm
+        if not np.any(active) or num_iterations == max_iterations:
+            break
+        Ap = A @ p
+        pAp = np.sum(p * Ap, axis=0)
+        alpha = np.where(active, rz / np.where(active, pAp, 1), 0)
+        x += alpha * p
+        r -= alpha * Ap
+        z = preconditioner(r)
+        rz_new = np.sum(r * z, axis=0)
+        beta = np.where(active, rz_new / np.where(active, rz, 1), 0)
+        p = z + beta * p
+        rz = rz_new
+    return x, num_iterations
+
+
+def log_det_slq(A, num_probes=30, num_steps=30, seed=42):
+    """Estimates the log-determinant of a symmetric positive definite matrix with
+    stochastic Lanczos quadrature, ln det(A) = tr(ln A) ~ n/k sum_i sum_j tau_ij^2 ln(
+    theta_ij), with the eigenvalues theta and first components tau of the eigenvectors
+    of the Lanczos tridiagonal matrices of k Rademacher probe vectors.
+
+    :param A: scipy.sparse matrix (or numpy.ndarray), symmetric positive definite
+    :param num_probes: int, number of probe vectors k
+    :param num_steps: int, number of Lanczos steps per probe vector
+    :param seed: int, seed of the random probe vectors
+    :return: float, estimate of ln det(A)
+    """
+    n = A.shape[0]
+    num_steps = min(num_steps, n)
+    rng = np.random.default_rng(seed)
+    q = rng.choice([-1.0, 1.0], size=(n, num_probes)) / np.sqrt(n)
+    q_previous = np.zeros_like(q)
+    alphas = np.zeros((num_steps, num_probes))
+    betas = np.zeros((num_steps, num_probes))
+    num_steps_probe = np.full(num_probes, num_steps)
+    beta = np.zeros(num_probes)
+    for k in range(num_steps):
+        w = A @ q - beta * q_previous
+        alphas[k] = np.sum(q * w, axis=0)
+        w -= alphas[k] * q
+        beta = np.linalg.norm(w, axis=0)
+        betas[k] = beta
+        # invariant subspace found (Lanczos breakdown)
+        breakdown = (beta < 1e-10 * np.abs(alphas[k])) & (num_steps_probe == num_steps)
+        num_steps_probe[breakdown] = k + 1
+        q_previous = q
+        q = w / np.where(beta > 0, beta, 1)
+    log_det = 0
+    for j in range(num_probes):
+        m = num_steps_probe[j]
+        theta, vectors = eigh_tridiagonal(alphas[:m, j], betas[: m - 1, j])
+        log_det += np.sum(vectors[0] ** 2 * np.log(theta))
+    return n * log_det / num_probes
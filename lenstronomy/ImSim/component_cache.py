@@ -0,0 +1,202 @@
+__all__ = ["ComponentCache", "merge_stats", "strip_linear_amplitudes"]
+
+import numpy as np
+
+
+class ComponentCache(object):
+    """Memoizes the last evaluation of each model component (e.g. the lensed source,
+    the lens light or the point sources) of an image model.
+
+    A component is re-computed only when its keyword arguments differ from the ones of
+    the previous evaluation, otherwise the stored result is returned. The keys are
+    compared by value on a copy taken at the time of the evaluation, such that in-place
+    changes of the keyword arguments are detected. In addition, a token object (e.g. the
+    numerics instance) is compared by identity to invalidate the cache when the
+    numerical settings of the image model are replaced.
+    """
+
+    def __init__(self, enabled=True):
+        """
+
+        :param enabled: bool, if False, all components are re-computed on every call
+        """
+        self._enabled = enabled
+        self._keys = {}
+        self._tokens = {}
+        self._values = {}
+        self._hits = {}
+        self._misses = {}
+
+    def evaluate(self, name, key, function, token=None):
+        """Returns the stored result of the component if the key (and token) are
+        unchanged since the last evaluation, otherwise evaluates and stores it.
+
+        :param name: string, name of the component
+        :param key: (nested) tuple, list or dict of the arguments the component depends on
+        :param function: callable without arguments computing the component
+        :param token: object compared by identity (e.g. the numerics class instance)
+        :return: result of function()
+        """
+        hit, value = self.lookup(name, key, token=token)
+        if hit is False:
+            value = function()
+            self.store(name, key, value, token=token)
+        return value
+
+    def lookup(self, name, key, token=None):
+        """Looks up the stored result of a component and counts the hit or miss.
+
+        :param name: string, name of the component
+        :param key: (nested) tuple, list or dict of the arguments the component depends on
+        :param token: object compared by identity (e.g. the numerics class instance)
+        :return: bool (True if the stored result is valid), stored result (or None)
+        """
+        if self._enabled is False:
+            return False, None
+        if (
+            name in self._values
+            and self._tokens[name] is token
+            and _equal(self._keys[name], key)
+        ):
+            self._hits[name] = self._hits.get(name, 0) + 1
+            return True, self._values[name]
+        self._misses[name] = self._misses.get(name, 0) + 1
+        return False, None
+
+    def store(self, name, key, value, token=None):
+        """Stores the result of a component.
+
+        :param name: string, name of the component
+        :param key: (nested) tuple, list or dict of the arguments the component depends on
+        :param value: result of the component
+        :param token: object compared by identity (e.g. the numerics class instance)
+        :return: None
+        """
+        if self._enabled is False:
+            return
+        self._keys[name] = _copy(key)
+        self._tokens[name] = token
+        self._values[name] = value
+
+    def clear(self):
+        """Deletes all stored results (the hit and miss counters are kept).
+
+        :return: None
+        """
+        self._keys, self._tokens, self._values = {}, {}, {}
+
+    def reset(self):
+        """Deletes all stored results and the hit and miss counters.
+
+        :return: None
+        """
+        self.clear()
+        self._hits, self._misses = {}, {}
+
+    @property
+    def enabled(self):
+        """
+
+        :return: bool, whether the components are memoized
+        """
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, enabled):
+        """
+
+        :param enabled: bool, whether the components are memoized
+        :return: None
+        """
+        self._enabled = enabled
+        if enabled is False:
+            self.clear()
+
+    @property
+    def stats(self):
+        """Hit and miss counters of the components.
+
+        :return: dictionary {component name: {'hits': int, 'misses': int}}
+        """
+        names = sorted(set(self._hits) | set(self._misses))
+        return {
+            name: {"hits": self._hits.get(name, 0), "misses": self._misses.get(name, 0)}
+            for name in names
+        }
+
+
+def merge_stats(stats_list):
+    """Sums the hit and miss counters of several ComponentCache.stats dictionaries.
+
+    :param stats_list: list of dictionaries {component name: {'hits': int, 'misses': int}}
+    :return: dictionary {component name: {'hits': int, 'misses': int}}
+    """
+    merged = {}
+    for stats in stats_list:
+        for name, counts in stats.items():
+            entry = merged.setdefault(name, {"hits": 0, "misses": 0})
+            entry["hits"] += counts["hits"]
+            entry["misses"] += counts["misses"]
+    return merged
+
+
+def strip_linear_amplitudes(kwargs_list):
+    """Removes the linear amplitudes from a list of keyword arguments (the linear
+    response of a light profile does not depend on them).
+
+    :param kwargs_list: list of keyword arguments of a light model (or None)
+    :return: list of keyword arguments without 'amp'
+    """
+    if kwargs_list is None:
+        return None
+    return [
+        {key: value for key, value in kwargs.items() if key != "amp"}
+        for kwargs in kwargs_list
+    ]
+
+
+def _copy(value):
+    """Copy of nested containers and arrays such that in-place changes of the input do
+    not propagate.
+
+    :param value: (nested) dict, list, tuple, numpy array or scalar
+    :return: copy of value
+    """
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_copy(item) for item in value)
+    if isinstance(value, np.ndarray):
+        return value.copy()
+    return value
+
+
+def _equal(value_1, value_2):
+    """Compares nested containers, arrays and scalars by value (nan == nan).
+
+    :param value_1: (nested) dict, list, tuple, numpy array or scalar
+    :param value_2: (nested) dict, list, tuple, numpy array or scalar
+    :return: bool
+    """
+    if isinstance(value_1, dict):
+        if not isinstance(value_2, dict) or value_1.keys() != value_2.keys():
+            return False
+        return all(_equal(value_1[key], value_2[key]) for key in value_1)
+    if isinstance(value_1, (list, tuple)):
+        if not isinstance(value_2, (list, tuple)) or len(value_1) != len(value_2):
+            return False
+        return all(_equal(item_1, item_2) for item_1, item_2 in zip(value_1, value_2))
+    if isinstance(value_1, np.ndarray) or isinstance(value_2, np.ndarray):
+        array_1, array_2 = np.asarray(value_1), np.asarray(value_2)
+        if array_1.shape != array_2.shape:
+            return False
+        try:
+            return bool(np.array_equal(array_1, array_2, equal_nan=True))
+        except TypeError:
+            return bool(np.array_equal(array_1, array_2))
+    if value_1 is None or value_2 is None:
+        return value_1 is value_2
+    try:
+        return bool(value_1 == value_2) or (value_1 != value_1 and value_2 != value_2)
+    except (TypeError, ValueError):
+        return value_1 is value_2
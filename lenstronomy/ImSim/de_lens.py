@@ -2,6 +2,7 @@ __author__ = "sibirrer"
 
 import numpy as np
 import sys
+from scipy import linalg
 
 from lenstronomy.Util.package_util import exporter
 
@@ -44,6 +45,170 @@ def get_param_WLS(A, C_D_inv, d, inv_bool=True):
     return B, M_inv, image
 
 
+@export
+def get_param_WLS_normal(M, R, inv_bool=True):
+    """Solves the normal equations M B = R of the weighted least squares with a
+    Cholesky factorization. Systems that are not numerically positive definite or
+    whose (estimated) condition number exceeds the limit of _cond_inv() fall back to the
+    same treatment as in get_param_WLS().
+
+    :param M: normal matrix A^T C_D^-1 A, Ns x Ns
+    :param R: projected data A^T C_D^-1 d, 1-d Ns
+    :param inv_bool: boolean, whether returning also the inverse matrix or just solve
+        the linear system
+    :return: 1-d array of parameter values, inverse of M (or None)
+    """
+    n = len(R)
+    if n == 0:
+        return np.zeros(0), np.zeros((0, 0)) if inv_bool else None
+    try:
+        factor = linalg.cho_factor(M, lower=False, check_finite=False)
+        (pocon,) = linalg.get_lapack_funcs(("pocon",), (factor[0],))
+        rcond, info = pocon(factor[0], np.max(np.sum(np.abs(M), axis=0)))
+        cholesky = info == 0 and rcond > sys.float_info.epsilon / 5
+    except (np.linalg.LinAlgError, ValueError):
+        cholesky = False
+    if cholesky:
+        B = linalg.cho_solve(factor, R, check_finite=False)
+        if inv_bool:
+            M_inv = linalg.cho_solve(factor, np.eye(n), check_finite=False)
+        else:
+            M_inv = None
+        return B, M_inv
+    cond_inv = _cond_inv(M)
+    if inv_bool:
+        if cond_inv:
+            M_inv = _stable_inv(M)
+        else:
+            M_inv = np.zeros_like(M)
+        B = M_inv.dot(R)
+    else:
+        if cond_inv:
+            B = _solve_stable(M, R)
+        else:
+            B = np.zeros(n)
+        M_inv = None
+    return B, M_inv
+
+
+@export
+def get_param_WLS_blocks(A_blocks, C_D_inv, d, gram_blocks=None, inv_bool=True):
+    """Weighted least squares of a response matrix that is split in blocks of
+    parameters (e.g. lensed source, lens light and point sources). The normal
+    equations are assembled from the Gram matrix blocks of GramMatrixBlocks, such that
+    only the blocks of the response that changed since the previous call are
+    recomputed, and solved with get_param_WLS_normal().
+
+    :param A_blocks: list of response matrix blocks Ns_i x Nd (Nd = # data points, Ns_i = # parameters of block i)
+    :param C_D_inv: inverse covariance matrix of the data, Nd x Nd, diagonal form
+    :param d: data array, 1-d Nd
+    :param gram_blocks: GramMatrixBlocks() instance keeping the Gram matrix blocks of previous calls (or None)
+    :param inv_bool: boolean, whether returning also the inverse matrix or just solve
+        the linear system
+    :return: 1-d array of parameter values, inverse of the normal matrix (or None), model image (1-d Nd)
+    """
+    if gram_blocks is None:
+        gram_blocks = GramMatrixBlocks()
+    M, R = gram_blocks.update(A_blocks, C_D_inv, d)
+    B, M_inv = get_param_WLS_normal(M, R, inv_bool=inv_bool)
+    image = np.zeros(len(d))
+    n = 0
+    for block in A_blocks:
+        n_block = len(block)
+        if n_block > 0:
+            image += B[n : n + n_block].dot(block)
+        n += n_block
+    return B, M_inv, image
+
+
+@export
+class GramMatrixBlocks(object):
+    """Keeps the blocks M_ij = A_i C_D^-1 A_j^T of the normal matrix and R_i = A_i
+    C_D^-1 d of the projected data of a response matrix split in blocks A_i of
+    parameters.
+
+    When the weights and the data are unchanged, only the blocks of the response that
+    differ from the ones of the previous update are re-projected. Blocks passed as the
+    same objects as in the previous update are taken as unchanged without comparing
+    their values, hence blocks must not be modified in place between updates.
+    """
+
+    def __init__(self):
+        self._blocks = []
+        self._block_sources = []
+        self._C_D_inv = None
+        self._d = None
+        self._d_source = None
+        self._M = {}
+        self._R = []
+        self.num_blocks_updated = 0
+
+    def update(self, A_blocks, C_D_inv, d):
+        """Updates the Gram matrix blocks of the blocks of the response that changed.
+
+        :param A_blocks: list of response matrix blocks Ns_i x Nd
+        :param C_D_inv: inverse covariance matrix of the data, Nd x Nd, diagonal form
+        :param d: data array, 1-d Nd
+        :return: normal matrix M (Ns x Ns), projected data R (1-d Ns)
+        """
+        num_blocks = len(A_blocks)
+        if (
+            len(self._blocks) != num_blocks
+            or not _array_equal(self._C_D_inv, C_D_inv)
+            or (d is not self._d_source and not _array_equal(self._d, d))
+        ):
+            self._blocks = [None] * num_blocks
+            self._block_sources = [None] * num_blocks
+            self._M = {}
+            self._R = [None] * num_blocks
+            self._C_D_inv = np.array(C_D_inv, copy=True)
+            self._d = np.array(d, copy=True)
+        self._d_source = d
+        changed = []
+        for i in range(num_blocks):
+            if A_blocks[i] is self._block_sources[i]:
+                continue
+            if not _array_equal(self._blocks[i], A_blocks[i]):
+                self._blocks[i] = np.array(A_blocks[i], copy=True)
+                changed.append(i)
+            self._block_sources[i] = A_blocks[i]
+        for i in changed:
+            weighted = self._blocks[i] * self._C_D_inv
+            for j in range(num_blocks):
+                if j < i and j in changed:
+                    continue
+                self._M[i, j] = weighted.dot(self._blocks[j].T)
+                self._M[j, i] = self._M[i, j].T
+            self._R[i] = weighted.dot(self._d)
+        self.num_blocks_updated = len(changed)
+
+        sizes = [len(block) for block in self._blocks]
+        offsets = np.append(0, np.cumsum(sizes))
+        M = np.zeros((offsets[-1], offsets[-1]))
+        for i in range(num_blocks):
+            for j in range(num_blocks):
+                M[offsets[i] : offsets[i + 1], offsets[j] : offsets[j + 1]] = self._M[
+                    i, j
+                ]
+        if num_blocks > 0:
+            R = np.concatenate(self._R)
+        else:
+            R = np.zeros(0)
+        return M, R
+
+
+def _array_equal(array_1, array_2):
+    """
+
+    :param array_1: numpy array or None
+    :param array_2: numpy array
+    :return: bool, True if both arrays have the same shape and values
+    """
+    if array_1 is None:
+        return False
+    return np.shape(array_1) == np.shape(array_2) and np.array_equal(array_1, array_2)
+
+
 @export
 def get_param_WLS_interferometry(M, b, inv_bool=True):
     """Returns the linear parameters and its covariance matrix.
@@ -258,6 +258,7 @@ class Image2SourceMapping(object):
 
         if self._multi_source_plane is False:
             x_source, y_source = self._lens_model.ray_shooting(x, y, kwargs_lens)
+            x_source, y_source = _match_precision(x, x_source, y_source)
             return self._light_model.surface_brightness(
                 x_source, y_source, kwargs_source, k=k
             )
@@ -323,6 +324,7 @@ class Image2SourceMapping(object):
 
         if self._multi_source_plane is False:
             x_source, y_source = self._lens_model.ray_shooting(x, y, kwargs_lens)
+            x_source, y_source = _match_precision(x, x_source, y_source)
             return self._light_model.functions_split(x_source, y_source, kwargs_source)
         else:
             response = []
@@ -416,3 +418,18 @@ class Image2SourceMapping(object):
             ]
             n_sum_sorted += n_i
         return reshuffled
+
+
+def _match_precision(x, x_source, y_source):
+    """The ray-shooting is performed in double precision. For single precision image
+    plane coordinates (Numerics with precision='float32'), the source plane
+    coordinates are converted back to single precision.
+
+    :param x: image plane coordinate
+    :param x_source: source plane coordinate
+    :param y_source: source plane coordinate
+    :return: x_source, y_source
+    """
+    if isinstance(x, np.ndarray) and x.dtype == np.float32:
+        return x_source.astype(np.float32), y_source.astype(np.float32)
+    return x_source, y_source
@@ -1,9 +1,11 @@
 from lenstronomy.ImSim.image_model import ImageModel
+from lenstronomy.ImSim.component_cache import strip_linear_amplitudes
 import lenstronomy.ImSim.de_lens as de_lens
 from lenstronomy.Util import util
 from lenstronomy.Util import primary_beam_util
 from lenstronomy.ImSim.Numerics.convolution import PixelKernelConvolution
 import numpy as np
+import warnings
 
 __all__ = ["ImageLinearFit"]
 
@@ -65,6 +67,11 @@ class ImageLinearFit(ImageModel):
             image_index=image_index,
         )
 
+        # Gram matrix blocks of the linear response re-used by the weighted least squares solver
+        self._gram_blocks = de_lens.GramMatrixBlocks()
+        # flux-scaled response blocks kept with the memoized rows they are computed from
+        self._scaled_response = {}
+
         # prepare to use fft convolution for the natwt linear solver
         if self.Data.likelihood_method() == "interferometry_natwt":
             self._convolution = PixelKernelConvolution(
@@ -115,26 +122,33 @@ class ImageLinearFit(ImageModel):
                 kwargs_special,
             )
         elif self.Data.likelihood_method() == "diagonal":
-            A = ImageLinearFit.linear_response_matrix(
-                self,
+            model, model_error, cov_param, param = self._image_linear_solve_diagonal(
                 kwargs_lens,
                 kwargs_source,
                 kwargs_lens_light,
                 kwargs_ps,
                 kwargs_extinction,
                 kwargs_special,
+                inv_bool=inv_bool,
             )
-            C_D_response, model_error = ImageModel.error_response(
-                self, kwargs_lens, kwargs_ps, kwargs_special=kwargs_special
-            )
-            d = self.data_response
-            param, cov_param, wls_model = de_lens.get_param_WLS(
-                A.T, 1 / C_D_response, d, inv_bool=inv_bool
-            )
-            model = self.array_masked2image(wls_model)
-            _, _, _, _ = ImageLinearFit.update_linear_kwargs(
-                self, param, kwargs_lens, kwargs_source, kwargs_lens_light, kwargs_ps
-            )
+            # the super-sampling factors of compute_mode='adaptive_auto' depend on the solved amplitudes
+            if self.update_adaptive_supersampling(
+                kwargs_lens, kwargs_source, kwargs_lens_light
+            ):
+                (
+                    model,
+                    model_error,
+                    cov_param,
+                    param,
+                ) = self._image_linear_solve_diagonal(
+                    kwargs_lens,
+                    kwargs_source,
+                    kwargs_lens_light,
+                    kwargs_ps,
+                    kwargs_extinction,
+                    kwargs_special,
+                    inv_bool=inv_bool,
+                )
         elif self.Data.likelihood_method() == "interferometry_natwt":
             (
                 model,
@@ -156,6 +170,60 @@ class ImageLinearFit(ImageModel):
             )
         return model, model_error, cov_param, param
 
+    def _image_linear_solve_diagonal(
+        self,
+        kwargs_lens=None,
+        kwargs_source=None,
+        kwargs_lens_light=None,
+        kwargs_ps=None,
+        kwargs_extinction=None,
+        kwargs_special=None,
+        inv_bool=False,
+    ):
+        """Weighted linear least square solution for the diagonal (uncorrelated noise)
+        likelihood. The linear parameters of the keyword arguments are updated in
+        place.
+
+        :param kwargs_lens: list of keyword arguments corresponding to the superposition
+            of different lens profiles
+        :param kwargs_source: list of keyword arguments corresponding to the
+            superposition of different source light profiles
+        :param kwargs_lens_light: list of keyword arguments corresponding to different
+            lens light surface brightness profiles
+        :param kwargs_ps: keyword arguments corresponding to "other" parameters, such as
+            external shear and point source image positions
+        :param kwargs_extinction: list of keyword arguments for extinction model
+        :param kwargs_special: list of special keyword arguments
+        :param inv_bool: if True, invert the full linear solver Matrix Ax = y for the
+            purpose of the covariance matrix.
+        :return: model, model_error, cov_param, param
+        """
+        A_blocks = ImageLinearFit.linear_response_blocks(
+            self,
+            kwargs_lens,
+            kwargs_source,
+            kwargs_lens_light,
+            kwargs_ps,
+            kwargs_extinction,
+            kwargs_special,
+        )
+        C_D_response, model_error = ImageModel.error_response(
+            self, kwargs_lens, kwargs_ps, kwargs_special=kwargs_special
+        )
+        d = self.data_response
+        param, cov_param, wls_model = de_lens.get_param_WLS_blocks(
+            A_blocks,
+            1 / C_D_response,
+            d,
+            gram_blocks=self._gram_blocks,
+            inv_bool=inv_bool,
+        )
+        model = self.array_masked2image(wls_model)
+        _, _, _, _ = ImageLinearFit.update_linear_kwargs(
+            self, param, kwargs_lens, kwargs_source, kwargs_lens_light, kwargs_ps
+        )
+        return model, model_error, cov_param, param
+
     def image_pixelbased_solve(
         self,
         kwargs_lens=None,
@@ -234,6 +302,59 @@ class ImageLinearFit(ImageModel):
         :param check_positive_flux: bool, if True, checks whether the linear inversion
             resulted in non-negative flux components and applies a punishment in the
             likelihood if so.
+        :return: log likelihood (natural logarithm), linear parameter list
+        """
+        kwargs_likelihood = dict(
+            kwargs_lens=kwargs_lens,
+            kwargs_source=kwargs_source,
+            kwargs_lens_light=kwargs_lens_light,
+            kwargs_ps=kwargs_ps,
+            kwargs_extinction=kwargs_extinction,
+            kwargs_special=kwargs_special,
+            source_marg=source_marg,
+            linear_prior=linear_prior,
+            check_positive_flux=check_positive_flux,
+        )
+        logL, param = self._likelihood_data_given_model(**kwargs_likelihood)
+        if self._precision_guard is True:
+            # verifies the single precision likelihood against double precision at check points
+            if self._num_precision_evaluations % self._precision_check_interval == 0:
+                precision = self.precision
+                self.set_precision("float64")
+                logL_double, param = self._likelihood_data_given_model(
+                    **kwargs_likelihood
+                )
+                if np.abs(logL_double - logL) > self._precision_tolerance:
+                    warnings.warn(
+                        "The %s log likelihood differs by %s from double precision (tolerance %s). "
+                        "Falling back to double precision."
+                        % (
+                            precision,
+                            np.abs(logL_double - logL),
+                            self._precision_tolerance,
+                        )
+                    )
+                else:
+                    self.set_precision(precision)
+                logL = logL_double
+            self._num_precision_evaluations += 1
+        return logL, param
+
+    def _likelihood_data_given_model(
+        self,
+        kwargs_lens=None,
+        kwargs_source=None,
+        kwargs_lens_light=None,
+        kwargs_ps=None,
+        kwargs_extinction=None,
+        kwargs_special=None,
+        source_marg=False,
+        linear_prior=None,
+        check_positive_flux=False,
+    ):
+        """Log likelihood of the data given a model in the current precision of the
+        numerics (see likelihood_data_given_model() for the arguments).
+
         :return: log likelihood (natural logarithm), linear parameter list
         """
         self.update_pixel_grid_coordinates(
@@ -365,53 +486,187 @@ class ImageLinearFit(ImageModel):
         :param unconvolved: bool, if True, computes components without convolution kernel (will not work for point sources)
         :return: response matrix (m x n)
         """
+        blocks = ImageLinearFit.linear_response_blocks(
+            self,
+            kwargs_lens,
+            kwargs_source,
+            kwargs_lens_light,
+            kwargs_ps,
+            kwargs_extinction=kwargs_extinction,
+            kwargs_special=kwargs_special,
+            unconvolved=unconvolved,
+        )
+        return np.concatenate(blocks, axis=0)
+
+    def linear_response_blocks(
+        self,
+        kwargs_lens,
+        kwargs_source,
+        kwargs_lens_light,
+        kwargs_ps,
+        kwargs_extinction=None,
+        kwargs_special=None,
+        unconvolved=False,
+    ):
+        """Computes the linear response matrix split in the blocks of the lensed
+        source, the lens light and the point sources (see linear_response_matrix()).
+
+        :param kwargs_lens: list of keyword arguments corresponding to the superposition of different lens profiles
+        :param kwargs_source: list of keyword arguments corresponding to the superposition of different source light profiles
+        :param kwargs_lens_light: list of keyword arguments corresponding to different lens light surface brightness profiles
+        :param kwargs_ps: keyword arguments corresponding to "other" parameters, such as external shear and point source image positions
+        :param kwargs_extinction: list of keyword arguments for extinction model
+        :param kwargs_special: list of special keyword arguments
+        :param unconvolved: bool, if True, computes components without convolution kernel (will not work for point sources)
+        :return: list of the response matrix blocks (m_i x n) of the source, lens light and point sources
+        """
         self.update_pixel_grid_coordinates(
             kwargs_special=kwargs_special, model_index=self.image_index
         )
         x_grid, y_grid = self.ImageNumerics.coordinates_evaluate
-
-        source_light_response, n_source = self.source_mapping.image_flux_split(
-            x_grid, y_grid, kwargs_lens, kwargs_source, kwargs_special
+        # the convolved responses of the lensed source and of the lens light are memoized on their non-linear
+        # parameters; the components that changed are convolved together as a stack of images
+        token = self.ImageNumerics
+        key_source = (
+            kwargs_lens,
+            strip_linear_amplitudes(kwargs_source),
+            kwargs_extinction,
+            kwargs_special,
+            unconvolved,
         )
-        extinction = self._extinction.extinction(
-            x_grid,
-            y_grid,
-            kwargs_extinction=kwargs_extinction,
-            kwargs_special=kwargs_special,
+        key_lens_light = (strip_linear_amplitudes(kwargs_lens_light), unconvolved)
+        source_hit, source_rows = self._component_cache.lookup(
+            "source_response", key_source, token=token
         )
-        lens_light_response, n_lens_light = self.LensLightModel.functions_split(
-            x_grid, y_grid, kwargs_lens_light
+        lens_light_hit, lens_light_rows = self._component_cache.lookup(
+            "lens_light_response", key_lens_light, token=token
         )
+        flux_arrays = []
+        if source_hit is False:
+            source_light_response, n_source = self.source_mapping.image_flux_split(
+                x_grid,
+                y_grid,
+                kwargs_lens,
+                self._light_kwargs_precision(kwargs_source),
+                kwargs_special,
+            )
+            extinction = self._extinction.extinction(
+                x_grid,
+                y_grid,
+                kwargs_extinction=kwargs_extinction,
+                kwargs_special=kwargs_special,
+            )
+            for i in range(0, n_source):
+                flux_arrays.append(source_light_response[i] * extinction)
+        else:
+            n_source = len(source_rows)
+        if lens_light_hit is False:
+            lens_light_response, n_lens_light = self.LensLightModel.functions_split(
+                x_grid, y_grid, self._light_kwargs_precision(kwargs_lens_light)
+            )
+            flux_arrays += list(lens_light_response)
+        else:
+            n_lens_light = len(lens_light_rows)
+        # response of lensed source profile and of deflector light profile (or any other un-lensed extended components)
+        # convolved as a stack of images
+        if len(flux_arrays) > 0:
+            images = self.ImageNumerics.re_size_convolve_stack(
+                np.array(flux_arrays), unconvolved=unconvolved
+            )
+            rows = np.nan_to_num(
+                images.reshape(len(flux_arrays), -1)[:, self._mask1d], copy=False
+            )
+        else:
+            rows = np.zeros((0, self.num_data_evaluate))
+        if source_hit is False:
+            source_rows = rows[:n_source]
+            self._component_cache.store(
+                "source_response", key_source, source_rows, token=token
+            )
+        if lens_light_hit is False:
+            lens_light_rows = rows[len(flux_arrays) - n_lens_light :]
+            self._component_cache.store(
+                "lens_light_response", key_lens_light, lens_light_rows, token=token
+            )
 
-        ra_pos, dec_pos, amp, n_points = self.point_source_linear_response_set(
-            kwargs_ps, kwargs_lens, kwargs_special, with_amp=False
+        # response of point sources rendered as a stack of images (memoized on the point source and lens parameters
+        # such that the lens equation is only solved when they change)
+        key_point_source = (kwargs_ps, kwargs_lens, kwargs_special, unconvolved)
+        point_source_hit, point_source_rows = self._component_cache.lookup(
+            "point_source_response", key_point_source, token=token
         )
-        num_param = n_points + n_lens_light + n_source
-
-        num_response = self.num_data_evaluate
-        A = np.zeros((num_param, num_response))
-        n = 0
-        # response of lensed source profile
-        for i in range(0, n_source):
-            image = source_light_response[i]
-            image *= extinction
-            image = self.ImageNumerics.re_size_convolve(image, unconvolved=unconvolved)
-            A[n, :] = np.nan_to_num(self.image2array_masked(image), copy=False)
-            n += 1
-        # response of deflector light profile (or any other un-lensed extended components)
-        for i in range(0, n_lens_light):
-            image = lens_light_response[i]
-            image = self.ImageNumerics.re_size_convolve(image, unconvolved=unconvolved)
-            A[n, :] = np.nan_to_num(self.image2array_masked(image), copy=False)
-            n += 1
-        # response of point sources
-        for i in range(0, n_points):
-            image = self.ImageNumerics.point_source_rendering(
-                ra_pos[i], dec_pos[i], amp[i]
+        if point_source_hit is False:
+            ra_pos, dec_pos, amp, n_points = self.point_source_linear_response_set(
+                kwargs_ps, kwargs_lens, kwargs_special, with_amp=False
             )
-            A[n, :] = np.nan_to_num(self.image2array_masked(image), copy=False)
-            n += 1
-        return A * self._flux_scaling
+            if n_points > 0:
+                images = self.ImageNumerics.point_source_rendering_stack(
+                    ra_pos, dec_pos, amp
+                )
+                point_source_rows = np.nan_to_num(
+                    images.reshape(n_points, -1)[:, self._mask1d], copy=False
+                )
+            else:
+                point_source_rows = np.zeros((0, self.num_data_evaluate))
+            self._component_cache.store(
+                "point_source_response",
+                key_point_source,
+                point_source_rows,
+                token=token,
+            )
+        # the same block objects are returned as long as the memoized rows are re-used, such that the Gram matrix
+        # blocks can recognize unchanged blocks by identity
+        return [
+            self._scaled_response_rows("source_response", source_rows),
+            self._scaled_response_rows("lens_light_response", lens_light_rows),
+            self._scaled_response_rows("point_source_response", point_source_rows),
+        ]
+
+    def _precision_state(self):
+        """Numerics, memoized components and Gram matrix blocks of the current
+        precision.
+
+        :return: dictionary of the instances
+        """
+        state = ImageModel._precision_state(self)
+        state["gram_blocks"] = self._gram_blocks
+        state["scaled_response"] = self._scaled_response
+        return state
+
+    def _new_precision_state(self):
+        """Numerics, empty memoized components and Gram matrix blocks for the
+        precision set in the numerics keyword arguments.
+
+        :return: dictionary of the instances
+        """
+        state = ImageModel._new_precision_state(self)
+        state["gram_blocks"] = de_lens.GramMatrixBlocks()
+        state["scaled_response"] = {}
+        return state
+
+    def _set_precision_state(self, state):
+        """Sets the numerics, memoized components and Gram matrix blocks of a
+        precision.
+
+        :param state: dictionary of the instances as returned by _precision_state()
+        :return: None
+        """
+        ImageModel._set_precision_state(self, state)
+        self._gram_blocks = state["gram_blocks"]
+        self._scaled_response = state["scaled_response"]
+
+    def _scaled_response_rows(self, name, rows):
+        """Flux-scaled response rows, re-used as long as the rows are the same object.
+
+        :param name: name of the response block
+        :param rows: response rows m x n as memoized in the component cache
+        :return: rows multiplied by the flux scaling
+        """
+        rows_cached, scaled_rows = self._scaled_response.get(name, (None, None))
+        if rows_cached is not rows:
+            scaled_rows = rows * self._flux_scaling
+            self._scaled_response[name] = (rows, scaled_rows)
+        return scaled_rows
 
     def update_linear_kwargs(
         self, param, kwargs_lens, kwargs_source, kwargs_lens_light, kwargs_ps
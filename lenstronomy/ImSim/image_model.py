@@ -1,6 +1,8 @@
 __author__ = "sibirrer"
 
 from lenstronomy.ImSim.Numerics.numerics_subframe import NumericsSubFrame
+from lenstronomy.ImSim.Numerics.adaptive_supersampling import AdaptiveSupersampling
+from lenstronomy.ImSim.component_cache import ComponentCache, merge_stats
 from lenstronomy.ImSim.image2source_mapping import Image2SourceMapping
 from lenstronomy.LensModel.lens_model import LensModel
 from lenstronomy.LightModel.light_model import LightModel
@@ -41,7 +43,16 @@ class ImageModel(object):
         :param lens_light_model_class: instance of LightModel() class describing the lens light parameters
         :param point_source_class: instance of PointSource() class describing the point sources
         :param extinction_class: instance of DifferentialExtinction() class
-        :param kwargs_numerics: keyword arguments with various numeric description (see ImageNumerics class for options)
+        :param kwargs_numerics: keyword arguments with various numeric description (see ImageNumerics class for options).
+            compute_mode='adaptive_auto' derives the super-sampling factor of each pixel (up to 'supersampling_factor')
+            from the lensed surface brightness model (see AdaptiveSupersampling class). The flux variation tolerated
+            within a (super-sampled) pixel can be set with 'adaptive_flux_tolerance' (default is 0.1 x background_rms)
+            and the relative parameter change triggering a re-evaluation with 'adaptive_update_tolerance'
+            (default 0.01). precision='float32' evaluates the coordinates, light profiles, convolutions and
+            response matrix in single precision (ray-shooting, linear solver and likelihood remain in double
+            precision). The likelihood is then verified against double precision on the first and every
+            'precision_check_interval' (default 100) evaluation, and the model falls back to double precision
+            when the two differ by more than 'precision_tolerance' (default 0.1) in log likelihood.
         :param likelihood_mask: 2d boolean array of pixels to be counted in the likelihood calculation/linear
             optimization
         :param psf_error_map_bool_list: list of boolean of length of point source models.
@@ -63,6 +74,22 @@ class ImageModel(object):
         self.PSF.set_pixel_size(self.Data.pixel_width)
         if kwargs_numerics is None:
             kwargs_numerics = {}
+        kwargs_numerics, kwargs_adaptive = self._adaptive_supersampling_kwargs(
+            kwargs_numerics
+        )
+        kwargs_numerics = self._precision_kwargs(kwargs_numerics)
+        if likelihood_mask is None:
+            likelihood_mask = np.ones(data_class.num_pixel_axes)
+        self.likelihood_mask = np.array(likelihood_mask, dtype=bool)
+        self._mask1d = util.image2array(self.likelihood_mask)
+        if (
+            kwargs_numerics.get("convolution_type", None) == "fft_tiled"
+            and kwargs_numerics.get("compute_indexes", None) is None
+        ):
+            # the tiled convolution is restricted to the likelihood mask
+            kwargs_numerics = dict(
+                kwargs_numerics, compute_indexes=self.likelihood_mask
+            )
         self.ImageNumerics = NumericsSubFrame(
             pixel_grid=self.Data, psf=self.PSF, **kwargs_numerics
         )
@@ -87,10 +114,6 @@ class ImageModel(object):
             only_from_unspecified=True,
         )
         self._psf_error_map = self.PSF.psf_variance_map_bool
-        if likelihood_mask is None:
-            likelihood_mask = np.ones(data_class.num_pixel_axes)
-        self.likelihood_mask = np.array(likelihood_mask, dtype=bool)
-        self._mask1d = util.image2array(self.likelihood_mask)
 
         if source_model_class is None:
             source_model_class = LightModel(light_model_list=[])
@@ -99,6 +122,19 @@ class ImageModel(object):
             lens_light_model_class = LightModel(light_model_list=[])
         self.LensLightModel = lens_light_model_class
         self._kwargs_numerics = kwargs_numerics
+        if kwargs_adaptive is not None:
+            self._adaptive_supersampling = AdaptiveSupersampling(
+                pixel_grid=self.Data,
+                lens_model=self.LensModel,
+                source_model=self.SourceModel,
+                lens_light_model=self.LensLightModel,
+                flux_evaluate_indexes=kwargs_numerics.get(
+                    "flux_evaluate_indexes", None
+                ),
+                **kwargs_adaptive
+            )
+        else:
+            self._adaptive_supersampling = None
         if extinction_class is None:
             extinction_class = DifferentialExtinction(optical_depth_model=[])
         self._extinction = extinction_class
@@ -149,6 +185,10 @@ class ImageModel(object):
             )
         self._psf_error_map_bool_list = psf_error_map_bool_list
         self.image_index = image_index
+        # memoizes the model components of the last evaluation (pixel-based solutions depend on the data)
+        self._component_cache = ComponentCache(enabled=not self._pixelbased_bool)
+        # numerics and memoized components kept for the precisions not currently in use
+        self._precision_states = {}
 
     def update_pixel_grid_coordinates(self, kwargs_special=None, model_index=0):
         """Updates the coordinate grid with shifts and rotations.
@@ -167,15 +207,52 @@ class ImageModel(object):
             if kwargs_offset is not None:
                 updated = self.Data.update_coordinate_grid(**kwargs_offset[model_index])
                 if updated:
-                    self.ImageNumerics = NumericsSubFrame(
-                        pixel_grid=self.Data, psf=self.PSF, **self._kwargs_numerics
-                    )
+                    self._update_numerics()
                     if self._pixelbased_bool is True:
                         raise NotImplementedError(
                             "updated pixel coordinates are not supported with pixel-based source "
                             "reconstruction"
                         )
 
+    def update_adaptive_supersampling(
+        self, kwargs_lens=None, kwargs_source=None, kwargs_lens_light=None, force=False
+    ):
+        """Re-derives the super-sampling factors of each pixel (compute_mode='adaptive_auto')
+        when the model parameters moved by more than the update tolerance, and updates
+        the numerics accordingly.
+
+        :param kwargs_lens: list of keyword arguments corresponding to the superposition
+            of different lens profiles
+        :param kwargs_source: list of keyword arguments corresponding to the
+            superposition of different source light profiles
+        :param kwargs_lens_light: list of keyword arguments corresponding to different
+            lens light surface brightness profiles
+        :param force: bool, if True, re-derives the factors regardless of the parameter
+            change
+        :return: bool, True if the super-sampling factors changed
+        """
+        if self._adaptive_supersampling is None:
+            return False
+        updated = self._adaptive_supersampling.update(
+            kwargs_lens, kwargs_source, kwargs_lens_light, force=force
+        )
+        if updated:
+            self._kwargs_numerics["supersampling_factors"] = (
+                self._adaptive_supersampling.supersampling_factors
+            )
+            self._update_numerics()
+        return updated
+
+    @property
+    def adaptive_supersampling(self):
+        """AdaptiveSupersampling instance of compute_mode='adaptive_auto' (None
+        otherwise), reporting the super-sampling factors and the number of surface
+        brightness evaluations saved compared to uniform super-sampling.
+
+        :return: AdaptiveSupersampling() class instance or None
+        """
+        return self._adaptive_supersampling
+
     def likelihood_data_given_model(
         self,
         kwargs_lens=None,
@@ -394,6 +471,7 @@ class ImageModel(object):
         :return: 2d array of surface brightness pixels
         """
         ra_grid, dec_grid = self.ImageNumerics.coordinates_evaluate
+        kwargs_source = self._light_kwargs_precision(kwargs_source)
         if de_lensed is True:
             source_light = self.SourceModel.surface_brightness(
                 ra_grid, dec_grid, kwargs_source, k=k
@@ -516,7 +594,7 @@ class ImageModel(object):
         """
         ra_grid, dec_grid = self.ImageNumerics.coordinates_evaluate
         lens_light = self.LensLightModel.surface_brightness(
-            ra_grid, dec_grid, kwargs_lens_light, k=k
+            ra_grid, dec_grid, self._light_kwargs_precision(kwargs_lens_light), k=k
         )
 
         # multiply with primary beam before convolution, if applicable.
@@ -629,35 +707,92 @@ class ImageModel(object):
         self.update_pixel_grid_coordinates(
             kwargs_special=kwargs_special, model_index=self.image_index
         )
+        self.update_adaptive_supersampling(
+            kwargs_lens, kwargs_source, kwargs_lens_light
+        )
         model = np.zeros(self.Data.num_pixel_axes)
         if source_add is True:
-            model += ImageModel.source_surface_brightness(
-                self,
-                kwargs_source,
-                kwargs_lens,
-                kwargs_extinction=kwargs_extinction,
-                kwargs_special=kwargs_special,
-                unconvolved=unconvolved,
-                apply_primary_beam=apply_primary_beam,
+            model += self._component_cache.evaluate(
+                "source",
+                (
+                    kwargs_source,
+                    kwargs_lens,
+                    kwargs_extinction,
+                    kwargs_special,
+                    unconvolved,
+                    apply_primary_beam,
+                ),
+                lambda: ImageModel.source_surface_brightness(
+                    self,
+                    kwargs_source,
+                    kwargs_lens,
+                    kwargs_extinction=kwargs_extinction,
+                    kwargs_special=kwargs_special,
+                    unconvolved=unconvolved,
+                    apply_primary_beam=apply_primary_beam,
+                ),
+                token=self.ImageNumerics,
             )
         if lens_light_add is True:
-            model += ImageModel.lens_surface_brightness(
-                self,
-                kwargs_lens_light,
-                unconvolved=unconvolved,
-                apply_primary_beam=apply_primary_beam,
+            model += self._component_cache.evaluate(
+                "lens_light",
+                (kwargs_lens_light, unconvolved, apply_primary_beam),
+                lambda: ImageModel.lens_surface_brightness(
+                    self,
+                    kwargs_lens_light,
+                    unconvolved=unconvolved,
+                    apply_primary_beam=apply_primary_beam,
+                ),
+                token=self.ImageNumerics,
             )
         if point_source_add is True:
-            model += ImageModel.point_source(
-                self,
-                kwargs_ps,
-                kwargs_lens,
-                kwargs_special=kwargs_special,
-                unconvolved=unconvolved,
-                apply_primary_beam=apply_primary_beam,
+            model += self._component_cache.evaluate(
+                "point_source",
+                (
+                    kwargs_ps,
+                    kwargs_lens,
+                    kwargs_special,
+                    unconvolved,
+                    apply_primary_beam,
+                ),
+                lambda: ImageModel.point_source(
+                    self,
+                    kwargs_ps,
+                    kwargs_lens,
+                    kwargs_special=kwargs_special,
+                    unconvolved=unconvolved,
+                    apply_primary_beam=apply_primary_beam,
+                ),
+                token=self.ImageNumerics,
             )
         return model
 
+    @property
+    def component_cache_stats(self):
+        """Hit and miss counters of the memoized model components (lensed source, lens
+        light and point sources of image() and of the linear response matrix).
+
+        :return: dictionary {component name: {'hits': int, 'misses': int}}
+        """
+        return merge_stats(
+            [self._component_cache.stats]
+            + [
+                state["component_cache"].stats
+                for state in self._precision_states.values()
+            ]
+        )
+
+    def reset_component_cache(self, enabled=True):
+        """Deletes the memoized model components and their hit and miss counters.
+
+        :param enabled: bool, if False, the model components are re-computed on every
+            call from now on
+        :return: None
+        """
+        self._component_cache.reset()
+        self._component_cache.enabled = enabled and not self._pixelbased_bool
+        self._precision_states = {}
+
     def extinction_map(self, kwargs_extinction=None, kwargs_special=None):
         """Differential extinction per pixel.
 
@@ -732,9 +867,7 @@ class ImageModel(object):
         """
         self.PSF = psf_class
         self.PSF.set_pixel_size(self.Data.pixel_width)
-        self.ImageNumerics = NumericsSubFrame(
-            pixel_grid=self.Data, psf=self.PSF, **self._kwargs_numerics
-        )
+        self._update_numerics()
 
     def update_data(self, data_class):
         """
@@ -744,6 +877,8 @@ class ImageModel(object):
         """
         self.Data = data_class
         self.ImageNumerics._PixelGrid = data_class
+        self._component_cache.clear()
+        self._precision_states = {}
 
     @property
     def num_data_evaluate(self):
@@ -909,6 +1044,10 @@ class ImageModel(object):
             raise ValueError(
                 "Only regular coordinate grid is supported for pixel-based modelling"
             )
+        if kwargs_numerics.get("precision", "float64") != "float64":
+            raise ValueError(
+                "Only double precision is supported for pixel-based modelling"
+            )
         if supersampling_convolution is True and supersampling_factor > 1:
             raise ValueError(
                 "Only non-supersampled convolution is supported for pixel-based modelling"
@@ -926,6 +1065,147 @@ class ImageModel(object):
         )
         return source_numerics_class
 
+    def _adaptive_supersampling_kwargs(self, kwargs_numerics):
+        """Translates compute_mode='adaptive_auto' into the numerics options of the
+        multi-level adaptive grid and the options of the AdaptiveSupersampling class.
+
+        :param kwargs_numerics: keyword arguments with various numeric description
+        :return: keyword arguments of the numerics, keyword arguments of
+            AdaptiveSupersampling (or None if compute_mode is not 'adaptive_auto')
+        """
+        if kwargs_numerics.get("compute_mode", "regular") != "adaptive_auto":
+            return kwargs_numerics, None
+        kwargs_numerics = kwargs_numerics.copy()
+        flux_tolerance = kwargs_numerics.pop("adaptive_flux_tolerance", None)
+        update_tolerance = kwargs_numerics.pop("adaptive_update_tolerance", 0.01)
+        if flux_tolerance is None:
+            if not hasattr(self.Data, "background_rms"):
+                raise ValueError(
+                    "compute_mode='adaptive_auto' requires 'adaptive_flux_tolerance' for data "
+                    "without background_rms."
+                )
+            flux_tolerance = 0.1 * self.Data.background_rms
+        kwargs_adaptive = {
+            "flux_tolerance": flux_tolerance,
+            "supersampling_factor": kwargs_numerics.get("supersampling_factor", 1),
+            "update_tolerance": update_tolerance,
+        }
+        kwargs_numerics["compute_mode"] = "adaptive"
+        kwargs_numerics["supersampling_factors"] = np.ones(
+            self.Data.num_pixel_axes, dtype=int
+        )
+        return kwargs_numerics, kwargs_adaptive
+
+    def _precision_kwargs(self, kwargs_numerics):
+        """Reads the options of the single precision mode (precision='float32') that
+        are not passed to the numerics.
+
+        :param kwargs_numerics: keyword arguments with various numeric description
+        :return: keyword arguments of the numerics
+        """
+        precision = kwargs_numerics.get("precision", "float64")
+        kwargs_numerics = kwargs_numerics.copy()
+        self._precision_check_interval = kwargs_numerics.pop(
+            "precision_check_interval", 100
+        )
+        self._precision_tolerance = kwargs_numerics.pop("precision_tolerance", 0.1)
+        self._precision_guard = precision != "float64"
+        self._num_precision_evaluations = 0
+        return kwargs_numerics
+
+    @property
+    def precision(self):
+        """Floating point precision of the numerics.
+
+        :return: string, 'float64' or 'float32'
+        """
+        return self.ImageNumerics.precision
+
+    def set_precision(self, precision):
+        """Changes the floating point precision of the numerics. The numerics and the
+        memoized components of the previous precision are kept, such that switching
+        back does not re-create them.
+
+        :param precision: string, 'float64' or 'float32'
+        :return: None
+        """
+        if precision != self.precision:
+            self._precision_states[self.precision] = self._precision_state()
+            self._kwargs_numerics["precision"] = precision
+            state = self._precision_states.pop(precision, None)
+            if state is None:
+                state = self._new_precision_state()
+            self._set_precision_state(state)
+        self._precision_guard = precision != "float64"
+
+    def _precision_state(self):
+        """Numerics and memoized components of the current precision.
+
+        :return: dictionary of the instances
+        """
+        return {
+            "numerics": self.ImageNumerics,
+            "component_cache": self._component_cache,
+        }
+
+    def _new_precision_state(self):
+        """Numerics and empty memoized components for the precision set in the
+        numerics keyword arguments.
+
+        :return: dictionary of the instances
+        """
+        return {
+            "numerics": NumericsSubFrame(
+                pixel_grid=self.Data, psf=self.PSF, **self._kwargs_numerics
+            ),
+            "component_cache": ComponentCache(enabled=self._component_cache.enabled),
+        }
+
+    def _set_precision_state(self, state):
+        """Sets the numerics and memoized components of a precision.
+
+        :param state: dictionary of the instances as returned by _precision_state()
+        :return: None
+        """
+        self.ImageNumerics = state["numerics"]
+        self._component_cache = state["component_cache"]
+
+    def _update_numerics(self):
+        """Re-creates the numerics with the current settings and discards the ones
+        kept for other precisions.
+
+        :return: None
+        """
+        self.ImageNumerics = NumericsSubFrame(
+            pixel_grid=self.Data, psf=self.PSF, **self._kwargs_numerics
+        )
+        self._precision_states = {}
+
+    def _light_kwargs_precision(self, kwargs_list):
+        """Light profile keyword arguments in the floating point precision of the
+        numerics, such that single precision coordinates are not promoted to double
+        precision by the profile parameters.
+
+        :param kwargs_list: list of keyword arguments of a light model (or None)
+        :return: list of keyword arguments
+        """
+        if kwargs_list is None or self.ImageNumerics.precision == "float64":
+            return kwargs_list
+        dtype = np.dtype(self.ImageNumerics.precision)
+        kwargs_list_precision = []
+        for kwargs in kwargs_list:
+            kwargs_precision = {}
+            for key, value in kwargs.items():
+                if isinstance(value, (float, np.floating)):
+                    value = dtype.type(value)
+                elif isinstance(value, np.ndarray) and np.issubdtype(
+                    value.dtype, np.floating
+                ):
+                    value = value.astype(dtype)
+                kwargs_precision[key] = value
+            kwargs_list_precision.append(kwargs_precision)
+        return kwargs_list_precision
+
     def _point_source_primary_beam_amp_normalization(self, ra_pos, dec_pos):
         """Interpolate primary beam response values at the point source positions, (only
         for interferometric images). These values are used to scale the observed point
@@ -157,8 +157,11 @@ class MultiPlaneOrganizer(object):
         T_ij_start, T_ij_stop = self._transverse_distance_start_stop(
             0, lens_model.lens_model.z_source, kwargs_special, include_z_start=False
         )
-        lens_model.lens_model.multi_plane_base.T_z_list = T_z_list
-        lens_model.lens_model.multi_plane_base.T_ij_list = T_ij_list
+        multi_plane_base = lens_model.lens_model.multi_plane_base
+        multi_plane_base.T_z_list = T_z_list
+        # setting T_ij_list regroups the lens planes, only do so when it changes
+        if T_ij_list != list(multi_plane_base.T_ij_list):
+            multi_plane_base.T_ij_list = T_ij_list
         lens_model.lens_model.T_ij_start = T_ij_start
         lens_model.lens_model._T_ij_stop = T_ij_stop
 
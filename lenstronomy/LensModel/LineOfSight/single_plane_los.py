@@ -322,6 +322,23 @@ class SinglePlaneLOS(SinglePlane):
 
         return f_xx, f_xy, f_yx, f_yy
 
+    def derivatives_and_hessian(self, x, y, kwargs, k=None):
+        """Deflection angles and Hessian matrix including the line-of-sight
+        corrections.
+
+        :param x: x-position (preferentially arcsec)
+        :type x: numpy array
+        :param y: y-position (preferentially arcsec)
+        :type y: numpy array
+        :param kwargs: list of keyword arguments of lens model parameters matching the
+            lens model classes, including line-of-sight corrections
+        :param k: only evaluate the k-th lens model
+        :return: f_x, f_y, f_xx, f_xy, f_yx, f_yy components
+        """
+        f_x, f_y = self.alpha(x, y, kwargs, k=k)
+        f_xx, f_xy, f_yx, f_yy = self.hessian(x, y, kwargs, k=k)
+        return f_x, f_y, f_xx, f_xy, f_yx, f_yy
+
     def mass_3d(self, r, kwargs, bool_list=None):
         """Computes the mass within a 3d sphere of radius r *for the main lens only*
 
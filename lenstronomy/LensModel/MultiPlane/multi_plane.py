@@ -168,6 +168,8 @@ class MultiPlane(object):
         if z_source == self._z_source:
             pass
         else:
+            # keeps the memoized distance table bounded to the redshifts in use
+            self._multi_plane_base._cosmo_bkg.reset_distance_table()
             self._set_source_distances(z_source)
 
     @property
@@ -544,6 +546,39 @@ class MultiPlane(object):
             checks whether the positional conventions are satisfied.
         :return: f_xx, f_xy, f_yx, f_yy
         """
+        return self.derivatives_and_hessian(
+            theta_x,
+            theta_y,
+            kwargs_lens,
+            k=k,
+            diff=diff,
+            check_convention=check_convention,
+        )[2:]
+
+    def derivatives_and_hessian(
+        self,
+        theta_x,
+        theta_y,
+        kwargs_lens,
+        k=None,
+        diff=0.00000001,
+        check_convention=True,
+    ):
+        """Computes the reduced deflection angles and the hessian components with
+        numerical differentiation, re-using the ray-tracing at (theta_x, theta_y) for
+        both.
+
+        :param theta_x: x-position (preferentially arcsec)
+        :type theta_x: numpy array
+        :param theta_y: y-position (preferentially arcsec)
+        :type theta_y: numpy array
+        :param kwargs_lens: list of keyword arguments of lens model parameters matching
+            the lens model classes
+        :param diff: numerical differential step (float)
+        :param check_convention: boolean, if True goes through the lens model list and
+            checks whether the positional conventions are satisfied.
+        :return: f_x, f_y, f_xx, f_xy, f_yx, f_yy
+        """
         self._check_raise(k=k)
         if check_convention and not self.ignore_observed_positions:
             kwargs_lens = self._convention(kwargs_lens)
@@ -568,7 +603,7 @@ class MultiPlane(object):
         f_yy = dalpha_decdec
         f_xy = dalpha_radec
         f_yx = dalpha_decra
-        return f_xx, f_xy, f_yx, f_yy
+        return alpha_ra, alpha_dec, f_xx, f_xy, f_yx, f_yy
 
     def hessian_z1z2(self, z1, z2, theta_x, theta_y, kwargs_lens, diff=0.00000001):
         """Computes Hessian matrix when Observed at z1 with rays going to z2 with z1 <
@@ -1,6 +1,7 @@
 import numpy as np
 from lenstronomy.Cosmo.background import Background
 from lenstronomy.LensModel.profile_list_base import ProfileListBase
+from lenstronomy.LensModel.profile_groups import ProfileGroups
 import lenstronomy.Util.constants as const
 
 __all__ = ["MultiPlaneBase"]
@@ -83,6 +84,7 @@ class MultiPlaneBase(ProfileListBase):
         self._T_z_list = []
 
         self._reduced2physical_factor = []
+        self._plane_list = []
 
         self.set_T_zs_and_T_ijs()
 
@@ -108,11 +110,44 @@ class MultiPlaneBase(ProfileListBase):
             if z_before == z_lens:
                 delta_T = 0
             else:
-                T_z = self._cosmo_bkg.T_xy(0, z_lens)
-                delta_T = self._cosmo_bkg.T_xy(z_before, z_lens)
+                T_z = self._cosmo_bkg.T_xy_table(0, z_lens)
+                delta_T = self._cosmo_bkg.T_xy_table(z_before, z_lens)
             self._T_ij_list.append(delta_T)
             self._T_z_list.append(T_z)
             z_before = z_lens
+        self._set_planes()
+
+    def _set_planes(self):
+        """Groups the deflectors (in sorted redshift order) into lens planes. Deflectors
+        at the same redshift without a distance step between them are deflecting the
+        rays at the same co-moving positions and their deflections are evaluated
+        together. Instances of the same profile type within a plane are evaluated in a
+        single vectorized call (see ProfileGroups class).
+
+        :return: None
+        """
+        self._plane_list = []
+        for i, idex in enumerate(self._sorted_redshift_index):
+            z_lens = self._lens_redshift_list[idex]
+            if (
+                len(self._plane_list) > 0
+                and self._plane_list[-1]["z"] == z_lens
+                and self._T_ij_list[i] == 0
+            ):
+                self._plane_list[-1]["index"].append(i)
+            else:
+                self._plane_list.append({"z": z_lens, "index": [i]})
+        for plane in self._plane_list:
+            k_list = [self._sorted_redshift_index[i] for i in plane["index"]]
+            plane["k"] = k_list
+            plane["groups"] = None
+            if len(k_list) > 1:
+                groups = ProfileGroups(
+                    [self._lens_model_list[k] for k in k_list],
+                    [self.func_list[k] for k in k_list],
+                )
+                if np.any(groups.grouped_index):
+                    plane["groups"] = groups
 
     def set_background_cosmo(self, cosmo):
         """Set the cosmology instance of the background class.
@@ -154,6 +189,7 @@ class MultiPlaneBase(ProfileListBase):
     def T_ij_list(self, T_ij_list):
         """List of transverse angular diameter distances between the lens planes."""
         self._T_ij_list = T_ij_list
+        self._set_planes()
 
     def ray_shooting_partial_comoving(
         self,
@@ -202,8 +238,11 @@ class MultiPlaneBase(ProfileListBase):
 
         z_lens_last = z_start
         first_deflector = True
-        for i, idex in enumerate(self._sorted_redshift_index):
-            z_lens = self._lens_redshift_list[idex]
+        # deflectors at the same redshift are grouped into planes with a single distance step and a combined
+        # deflection per plane
+        for plane in self._plane_list:
+            z_lens = plane["z"]
+            i = plane["index"][0]
 
             if (
                 self._start_condition(include_z_start, z_lens, z_start)
@@ -214,22 +253,27 @@ class MultiPlaneBase(ProfileListBase):
                         if z_start == 0:
                             delta_T = self._T_ij_list[0]
                         else:
-                            delta_T = self._cosmo_bkg.T_xy(z_start, z_lens)
+                            delta_T = self._cosmo_bkg.T_xy_table(z_start, z_lens)
                     else:
                         delta_T = T_ij_start
                     first_deflector = False
                 else:
                     delta_T = self._T_ij_list[i]
                 x, y = self._ray_step_add(x, y, alpha_x, alpha_y, delta_T)
-                alpha_x, alpha_y = self._add_deflection(
-                    x, y, alpha_x, alpha_y, kwargs_lens, i
-                )
+                if len(plane["index"]) == 1:
+                    alpha_x, alpha_y = self._add_deflection(
+                        x, y, alpha_x, alpha_y, kwargs_lens, i
+                    )
+                else:
+                    alpha_x, alpha_y = self._add_plane_deflection(
+                        x, y, alpha_x, alpha_y, kwargs_lens, plane
+                    )
                 z_lens_last = z_lens
         if T_ij_end is None:
             if z_lens_last == z_stop:
                 delta_T = 0
             else:
-                delta_T = self._cosmo_bkg.T_xy(z_lens_last, z_stop)
+                delta_T = self._cosmo_bkg.T_xy_table(z_lens_last, z_stop)
         else:
             delta_T = T_ij_end
         x, y = self._ray_step_add(x, y, alpha_x, alpha_y, delta_T)
@@ -279,7 +323,7 @@ class MultiPlaneBase(ProfileListBase):
         :return: angular position and angles at redshift z_stop
         """
         if T_z_start is None:
-            T_z_start = self._cosmo_bkg.T_xy(0, z_start)
+            T_z_start = self._cosmo_bkg.T_xy_table(0, z_start)
         x = np.array(theta_x, dtype=float) * T_z_start
         y = np.array(theta_y, dtype=float) * T_z_start
 
@@ -296,7 +340,7 @@ class MultiPlaneBase(ProfileListBase):
             T_ij_end=T_ij_end,
         )
         if T_z_stop is None:
-            T_z_stop = self._cosmo_bkg.T_xy(0, z_stop)
+            T_z_stop = self._cosmo_bkg.T_xy_table(0, z_stop)
         beta_x = x / T_z_stop
         beta_y = y / T_z_stop
         return beta_x, beta_y, alpha_x, alpha_y
@@ -322,10 +366,10 @@ class MultiPlaneBase(ProfileListBase):
                 and z_lens <= z_stop
             ):
                 if first_deflector is True:
-                    T_ij_start = self._cosmo_bkg.T_xy(z_start, z_lens)
+                    T_ij_start = self._cosmo_bkg.T_xy_table(z_start, z_lens)
                     first_deflector = False
                 z_lens_last = z_lens
-        T_ij_end = self._cosmo_bkg.T_xy(z_lens_last, z_stop)
+        T_ij_end = self._cosmo_bkg.T_xy_table(z_lens_last, z_stop)
         return T_ij_start, T_ij_end
 
     def geo_shapiro_delay(
@@ -380,11 +424,11 @@ class MultiPlaneBase(ProfileListBase):
                 dt_grav += dt_grav_new
                 z_lens_last = z_lens
         if T_ij_end is None:
-            T_ij_end = self._cosmo_bkg.T_xy(z_lens_last, z_stop)
+            T_ij_end = self._cosmo_bkg.T_xy_table(z_lens_last, z_stop)
         T_ij = T_ij_end
         x_new, y_new = self._ray_step(x, y, alpha_x, alpha_y, T_ij)
         if T_z_stop is None:
-            T_z_stop = self._cosmo_bkg.T_xy(0, z_stop)
+            T_z_stop = self._cosmo_bkg.T_xy_table(0, z_stop)
         T_j = T_z_stop
         T_i = self._T_z_list[i]
         beta_i_x, beta_i_y = x / T_i, y / T_i
@@ -537,6 +581,41 @@ class MultiPlaneBase(ProfileListBase):
         alpha_y_phys = self._reduced2physical_deflection(alpha_y_red, index)
         return alpha_x - alpha_x_phys, alpha_y - alpha_y_phys
 
+    def _add_plane_deflection(self, x, y, alpha_x, alpha_y, kwargs_lens, plane):
+        """Adds the physical deflection angle of all deflectors of a lens plane to the
+        deflection field.
+
+        :param x: co-moving distance at the deflector plane
+        :param y: co-moving distance at the deflector plane
+        :param alpha_x: physical angle (radian) before the deflector plane
+        :param alpha_y: physical angle (radian) before the deflector plane
+        :param kwargs_lens: lens model parameter kwargs
+        :param plane: dictionary of the lens plane as set by _set_planes()
+        :return: updated physical deflection after deflector plane (in a backwards ray-
+            tracing perspective)
+        """
+        index = plane["index"][0]
+        theta_x, theta_y = self._co_moving2angle(x, y, index)
+        k_list = plane["k"]
+        kwargs_plane = [kwargs_lens[k] for k in k_list]
+        bool_list = [True] * len(k_list)
+        if plane["groups"] is not None:
+            f_x, f_y, bool_list = plane["groups"].alpha(
+                theta_x, theta_y, kwargs_plane, bool_list
+            )
+        else:
+            f_x, f_y = np.zeros_like(theta_x), np.zeros_like(theta_y)
+        for j, k in enumerate(k_list):
+            if bool_list[j] is True:
+                f_x_j, f_y_j = self.func_list[k].derivatives(
+                    theta_x, theta_y, **kwargs_plane[j]
+                )
+                f_x = f_x + f_x_j
+                f_y = f_y + f_y_j
+        alpha_x_phys = self._reduced2physical_deflection(f_x, index)
+        alpha_y_phys = self._reduced2physical_deflection(f_y, index)
+        return alpha_x - alpha_x_phys, alpha_y - alpha_y_phys
+
     @staticmethod
     def _start_condition(inclusive, z_lens, z_start):
         """
@@ -62,6 +62,20 @@ class LensProfileBase(object):
             "hessian definition is not defined in the profile you want to execute."
         )
 
+    def derivatives_and_hessian(self, *args, **kwargs):
+        """Deflection angles and Hessian matrix in a single call. Profiles sharing
+        intermediate quantities (coordinate shifts and rotations, ellipticity
+        conversions, radial terms) between the two can overwrite this definition with a
+        fused computation. By default, derivatives() and hessian() are called
+        separately.
+
+        :param kwargs: keywords of the profile
+        :return: f_x, f_y, f_xx, f_xy, f_yx, f_yy
+        """
+        f_x, f_y = self.derivatives(*args, **kwargs)
+        f_xx, f_xy, f_yx, f_yy = self.hessian(*args, **kwargs)
+        return f_x, f_y, f_xx, f_xy, f_yx, f_yy
+
     def density_lens(self, *args, **kwargs):
         """Computes the density at 3d radius r given lens model parameterization. The
         integral in the LOS projection of this quantity results in the convergence
@@ -214,6 +214,44 @@ class EPL(LensProfileBase):
         f_xy = gamma2
         return f_xx, f_xy, f_xy, f_yy
 
+    def derivatives_and_hessian(
+        self, x, y, theta_E, gamma, e1, e2, center_x=0, center_y=0
+    ):
+        """Deflection angles and Hessian matrix with a single parameter conversion,
+        coordinate rotation and hypergeometric function evaluation.
+
+        :param x: x-coordinate in image plane
+        :param y: y-coordinate in image plane
+        :param theta_E: Einstein radius
+        :param gamma: power law slope
+        :param e1: eccentricity component
+        :param e2: eccentricity component
+        :param center_x: profile center
+        :param center_y: profile center
+        :return: f_x, f_y, f_xx, f_xy, f_yx, f_yy
+        """
+        b, t, q, phi_G = self.param_conv(theta_E, gamma, e1, e2)
+        # shift
+        x_ = x - center_x
+        y_ = y - center_y
+        # rotate
+        x__, y__ = util.rotate(x_, y_, phi_G)
+        # evaluate
+        f__x, f__y, f__xx, f__xy, f__yx, f__yy = (
+            self.epl_major_axis.derivatives_and_hessian(x__, y__, b, t, q)
+        )
+        # rotate back
+        f_x, f_y = util.rotate(f__x, f__y, -phi_G)
+        kappa = 1.0 / 2 * (f__xx + f__yy)
+        gamma1__ = 1.0 / 2 * (f__xx - f__yy)
+        gamma2__ = f__xy
+        gamma1 = np.cos(2 * phi_G) * gamma1__ - np.sin(2 * phi_G) * gamma2__
+        gamma2 = +np.sin(2 * phi_G) * gamma1__ + np.cos(2 * phi_G) * gamma2__
+        f_xx = kappa + gamma1
+        f_yy = kappa - gamma1
+        f_xy = gamma2
+        return f_x, f_y, f_xx, f_xy, f_xy, f_yy
+
     def mass_3d_lens(self, r, theta_E, gamma, e1=None, e2=None):
         """Computes the spherical power-law mass enclosed (with SPP routine)
 
@@ -315,6 +353,19 @@ class EPLMajorAxis(LensProfileBase):
         :param q: axis ratio
         :return: f_xx, f_yy, f_xy
         """
+        return self.derivatives_and_hessian(x, y, b, t, q)[2:]
+
+    def derivatives_and_hessian(self, x, y, b, t, q):
+        """Deflection angles and Hessian matrix of the lensing potential. The
+        deflection is evaluated once and re-used for the shear.
+
+        :param x: x-coordinate in image plane relative to center (major axis)
+        :param y: y-coordinate in image plane relative to center (minor axis)
+        :param b: critical radius
+        :param t: projected power-law slope
+        :param q: axis ratio
+        :return: f_x, f_y, f_xx, f_xy, f_yx, f_yy
+        """
         R = np.hypot(q * x, y)
         R = np.maximum(R, 0.00000001)
         r = np.hypot(x, y)
@@ -340,7 +391,7 @@ class EPLMajorAxis(LensProfileBase):
         f_yy = kappa - gamma_1
         f_xy = gamma_2
 
-        return f_xx, f_xy, f_xy, f_yy
+        return alpha_x, alpha_y, f_xx, f_xy, f_xy, f_yy
 
 
 class EPLQPhi(LensProfileBase):
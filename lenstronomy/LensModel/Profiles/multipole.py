@@ -150,6 +150,58 @@ class Multipole(LensProfileBase):
             )
         return f_xx, f_xy, f_xy, f_yy
 
+    def derivatives_and_hessian(
+        self, x, y, m, a_m, phi_m, center_x=0, center_y=0, r_E=1
+    ):
+        """Deflection and Hessian of a multipole contribution (for 1 component with
+        m>=1) with the polar coordinates and angular terms evaluated once.
+
+        :param x: x-coordinate to evaluate function
+        :param y: y-coordinate to evaluate function
+        :param m: int, multipole order, m>=1
+        :param a_m: float, multipole strength
+        :param phi_m: float, multipole orientation in radian
+        :param center_x: x-position
+        :param center_y: y-position
+        :param r_E: float, normalizing radius (only used for the m=1, Einstein radius by default)
+        :return: f_x, f_y, f_xx, f_xy, f_yx, f_yy
+        """
+        r, phi = param_util.cart2polar(x, y, center_x=center_x, center_y=center_y)
+        cos_phi, sin_phi = np.cos(phi), np.sin(phi)
+        if m == 1:
+            r = np.maximum(r, 0.000001)
+            cos_phi_m = np.cos(phi - phi_m)
+            log_r = np.log(r / r_E)
+            f_x = a_m / 2 * (np.cos(phi_m) * log_r + cos_phi_m * cos_phi)
+            f_y = a_m / 2 * (np.sin(phi_m) * log_r + cos_phi_m * sin_phi)
+            f_xx = (
+                a_m
+                / (2 * r)
+                * (2 * np.cos(phi_m) * cos_phi - cos_phi_m * np.cos(2 * phi))
+            )
+            f_yy = (
+                a_m
+                / (2 * r)
+                * (2 * np.sin(phi_m) * sin_phi + cos_phi_m * np.cos(2 * phi))
+            )
+            f_xy = a_m / (2 * r) * (np.sin(phi + phi_m) - cos_phi_m * np.sin(2 * phi))
+        else:
+            cos_m = np.cos(m * (phi - phi_m))
+            sin_m = np.sin(m * (phi - phi_m))
+            f_x = (
+                cos_phi * a_m / (1 - m**2) * cos_m
+                + sin_phi * m * a_m / (1 - m**2) * sin_m
+            )
+            f_y = (
+                sin_phi * a_m / (1 - m**2) * cos_m
+                - cos_phi * m * a_m / (1 - m**2) * sin_m
+            )
+            r = np.maximum(r, 0.000001)
+            f_xx = 1.0 / r * sin_phi**2 * a_m * cos_m
+            f_yy = 1.0 / r * cos_phi**2 * a_m * cos_m
+            f_xy = -1.0 / r * a_m * cos_phi * sin_phi * cos_m
+        return f_x, f_y, f_xx, f_xy, f_xy, f_yy
+
 
 class EllipticalMultipole(LensProfileBase):
     """This class contains a multipole contribution that encode deviations from the
@@ -89,8 +89,7 @@ class NFW(LensProfileBase):
         :return: lensing potential
         """
         rho0_input = self.alpha2rho0(alpha_Rs=alpha_Rs, Rs=Rs)
-        if Rs < 0.0000001:
-            Rs = 0.0000001
+        Rs = np.maximum(Rs, 0.0000001)
         x_ = x - center_x
         y_ = y - center_y
         R = np.sqrt(x_**2 + y_**2)
@@ -110,8 +109,7 @@ class NFW(LensProfileBase):
         :return: deflection angle in x, deflection angle in y
         """
         rho0_input = self.alpha2rho0(alpha_Rs=alpha_Rs, Rs=Rs)
-        if Rs < 0.0000001:
-            Rs = 0.0000001
+        Rs = np.maximum(Rs, 0.0000001)
         x_ = x - center_x
         y_ = y - center_y
         R = np.sqrt(x_**2 + y_**2)
@@ -130,8 +128,7 @@ class NFW(LensProfileBase):
         :return: Hessian matrix of function d^2f/dx^2, d^2/dxdy, d^2/dydx, d^f/dy^2
         """
         rho0_input = self.alpha2rho0(alpha_Rs=alpha_Rs, Rs=Rs)
-        if Rs < 0.0000001:
-            Rs = 0.0000001
+        Rs = np.maximum(Rs, 0.0000001)
         x_ = x - center_x
         y_ = y - center_y
         R = np.sqrt(x_**2 + y_**2)
@@ -142,6 +139,38 @@ class NFW(LensProfileBase):
         f_xy = gamma2
         return f_xx, f_xy, f_xy, f_yy
 
+    def derivatives_and_hessian(self, x, y, Rs, alpha_Rs, center_x=0, center_y=0):
+        """Deflection angles and Hessian matrix with the radial functions g() and F()
+        evaluated once.
+
+        :param x: angular position (normally in units of arc seconds)
+        :param y: angular position (normally in units of arc seconds)
+        :param Rs: turn over point in the slope of the NFW profile in angular unit
+        :param alpha_Rs: deflection (angular units) at projected Rs
+        :param center_x: center of halo (in angular units)
+        :param center_y: center of halo (in angular units)
+        :return: f_x, f_y, f_xx, f_xy, f_yx, f_yy
+        """
+        rho0_input = self.alpha2rho0(alpha_Rs=alpha_Rs, Rs=Rs)
+        Rs = np.maximum(Rs, 0.0000001)
+        x_ = x - center_x
+        y_ = y - center_y
+        # regularization of the center as in nfw_gamma()
+        R = np.maximum(np.sqrt(x_**2 + y_**2), 0.000001)
+        X = R / Rs
+        gx = self.g_(X)
+        Fx = self.F_(X)
+        a = 4 * rho0_input * Rs * gx / X**2
+        f_x, f_y = a * x_, a * y_
+        kappa = 2 * rho0_input * Rs * Fx
+        a = 2 * rho0_input * Rs * (2 * gx / X**2 - Fx)
+        gamma1 = a * (y_**2 - x_**2) / R**2
+        gamma2 = -a * 2 * (x_ * y_) / R**2
+        f_xx = kappa + gamma1
+        f_yy = kappa - gamma1
+        f_xy = gamma2
+        return f_x, f_y, f_xx, f_xy, f_xy, f_yy
+
     @staticmethod
     def density(R, Rs, rho0):
         """Three-dimensional density of the NFW profile at radius R.
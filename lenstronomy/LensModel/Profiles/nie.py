@@ -118,6 +118,44 @@ class NIE(LensProfileBase):
         f_xy = gamma2
         return f_xx, f_xy, f_xy, f_yy
 
+    def derivatives_and_hessian(
+        self, x, y, theta_E, e1, e2, s_scale, center_x=0, center_y=0
+    ):
+        """Deflection angles and Hessian matrix with a single parameter conversion and
+        coordinate rotation.
+
+        :param x: x-coordinate in image plane
+        :param y: y-coordinate in image plane
+        :param theta_E: Einstein radius
+        :param e1: eccentricity component
+        :param e2: eccentricity component
+        :param s_scale: smoothing scale
+        :param center_x: profile center
+        :param center_y: profile center
+        :return: f_x, f_y, f_xx, f_xy, f_yx, f_yy
+        """
+        b, s, q, phi_G = self.param_conv(theta_E, e1, e2, s_scale)
+        # shift
+        x_ = x - center_x
+        y_ = y - center_y
+        # rotate
+        x__, y__ = util.rotate(x_, y_, phi_G)
+        # evaluate
+        f__x, f__y, f__xx, f__xy, _, f__yy = (
+            self.nie_major_axis.derivatives_and_hessian(x__, y__, b, s, q)
+        )
+        # rotate back
+        f_x, f_y = util.rotate(f__x, f__y, -phi_G)
+        kappa = 1.0 / 2 * (f__xx + f__yy)
+        gamma1__ = 1.0 / 2 * (f__xx - f__yy)
+        gamma2__ = f__xy
+        gamma1 = np.cos(2 * phi_G) * gamma1__ - np.sin(2 * phi_G) * gamma2__
+        gamma2 = +np.sin(2 * phi_G) * gamma1__ + np.cos(2 * phi_G) * gamma2__
+        f_xx = kappa + gamma1
+        f_yy = kappa - gamma1
+        f_xy = gamma2
+        return f_x, f_y, f_xx, f_xy, f_xy, f_yy
+
     def density_lens(self, r, theta_E, e1, e2, s_scale, center_x=0, center_y=0):
         """3d mass density at 3d radius r. This function assumes spherical
         symmetry/ignoring the eccentricity.
@@ -270,6 +308,19 @@ class NIEMajorAxis(LensProfileBase):
     def hessian(self, x, y, b, s, q):
         """Returns Hessian matrix of function d^2f/dx^2, d^2/dxdy, d^2/dydx,
         d^f/dy^2."""
+        return self.derivatives_and_hessian(x, y, b, s, q)[2:]
+
+    def derivatives_and_hessian(self, x, y, b, s, q):
+        """Deflection angles and Hessian matrix. The deflection at (x, y) is re-used
+        for the finite differential of the Hessian.
+
+        :param x: major axis coordinate
+        :param y: minor axis coordinate
+        :param b: normalization
+        :param s: smoothing scale
+        :param q: axis ratio
+        :return: f_x, f_y, f_xx, f_xy, f_yx, f_yy
+        """
         alpha_ra, alpha_dec = self.derivatives(x, y, b, s, q)
         diff = self._diff
         alpha_ra_dx, alpha_dec_dx = self.derivatives(x + diff, y, b, s, q)
@@ -279,7 +330,7 @@ class NIEMajorAxis(LensProfileBase):
         f_xy = (alpha_ra_dy - alpha_ra) / diff
         f_yx = (alpha_dec_dx - alpha_dec) / diff
         f_yy = (alpha_dec_dy - alpha_dec) / diff
-        return f_xx, f_xy, f_yx, f_yy
+        return alpha_ra, alpha_dec, f_xx, f_xy, f_yx, f_yy
 
     @staticmethod
     def kappa(x, y, b, s, q):
@@ -124,3 +124,38 @@ class Sersic(SersicUtil, LensProfileBase):
         f_xy = -(d_alpha_dr / r + alpha / r**2) * x_ * y_ / r
 
         return f_xx, f_xy, f_xy, f_yy
+
+    def derivatives_and_hessian(
+        self, x, y, n_sersic, R_sersic, k_eff, center_x=0, center_y=0
+    ):
+        """Deflection angles and Hessian matrix with the radial deflection evaluated
+        once.
+
+        :param x: x-coordinate
+        :param y: y-coordinate
+        :param n_sersic: Sersic index
+        :param R_sersic: half light radius
+        :param k_eff: convergence at half light radius
+        :param center_x: x-center
+        :param center_y: y-center
+        :return: f_x, f_y, f_xx, f_xy, f_yx, f_yy
+        """
+        x_ = x - center_x
+        y_ = y - center_y
+        r = np.sqrt(x_**2 + y_**2)
+        alpha = self.alpha_abs(x, y, n_sersic, R_sersic, k_eff, center_x, center_y)
+        # finite differential in radial direction as in d_alpha_dr()
+        _dr = 0.00001
+        alpha_dr = self.alpha_abs(r + _dr, 0, n_sersic, R_sersic, k_eff)
+        d_alpha_dr = (alpha_dr - alpha) / _dr
+        alpha = -alpha
+        if isinstance(r, int) or isinstance(r, float):
+            r = max(self._smoothing, r)
+        else:
+            r[r < self._smoothing] = self._smoothing
+        f_x = alpha * x_ / r
+        f_y = alpha * y_ / r
+        f_xx = -(d_alpha_dr / r + alpha / r**2) * x_**2 / r + alpha / r
+        f_yy = -(d_alpha_dr / r + alpha / r**2) * y_**2 / r + alpha / r
+        f_xy = -(d_alpha_dr / r + alpha / r**2) * x_ * y_ / r
+        return f_x, f_y, f_xx, f_xy, f_xy, f_yy
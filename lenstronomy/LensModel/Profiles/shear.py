@@ -67,6 +67,20 @@ class Shear(LensProfileBase):
         f_xy = gamma2
         return f_xx, f_xy, f_xy, f_yy
 
+    def derivatives_and_hessian(self, x, y, gamma1, gamma2, ra_0=0, dec_0=0):
+        """
+
+        :param x: x-coordinate (angle)
+        :param y: y0-coordinate (angle)
+        :param gamma1: shear component
+        :param gamma2: shear component
+        :param ra_0: x/ra position where shear deflection is 0
+        :param dec_0: y/dec position where shear deflection is 0
+        :return: f_x, f_y, f_xx, f_xy, f_yx, f_yy
+        """
+        f_x, f_y = self.derivatives(x, y, gamma1, gamma2, ra_0=ra_0, dec_0=dec_0)
+        return f_x, f_y, gamma1, gamma2, gamma2, -gamma1
+
 
 class ShearGammaPsi(LensProfileBase):
     """
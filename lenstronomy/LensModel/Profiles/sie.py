@@ -127,6 +127,27 @@ class SIE(LensProfileBase):
                 x, y, theta_E, self._gamma, e1, e2, center_x, center_y
             )
 
+    def derivatives_and_hessian(self, x, y, theta_E, e1, e2, center_x=0, center_y=0):
+        """
+
+        :param x: x-coordinate (angular coordinates)
+        :param y: y-coordinate (angular coordinates)
+        :param theta_E: Einstein radius
+        :param e1: eccentricity
+        :param e2: eccentricity
+        :param center_x: centroid
+        :param center_y: centroid
+        :return: f_x, f_y, f_xx, f_xy, f_yx, f_yy
+        """
+        if self._nie:
+            return self.profile.derivatives_and_hessian(
+                x, y, theta_E, e1, e2, self._s_scale, center_x, center_y
+            )
+        else:
+            return self.profile.derivatives_and_hessian(
+                x, y, theta_E, self._gamma, e1, e2, center_x, center_y
+            )
+
     @staticmethod
     def theta2rho(theta_E):
         """Converts projected density parameter (in units of deflection) into 3d density
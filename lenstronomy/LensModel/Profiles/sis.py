@@ -34,10 +34,9 @@ class SIS(LensProfileBase):
         if isinstance(R, int) or isinstance(R, float):
             a = theta_E / max(0.000001, R)
         else:
-            a = np.empty_like(R)
-            r = R[R > 0]  # in the SIS regime
-            a[R == 0] = 0
-            a[R > 0] = theta_E / r
+            # theta_E may be an array broadcasting against R (grouped evaluation)
+            a = np.zeros(np.broadcast(theta_E, R).shape)
+            np.divide(theta_E, R, out=a, where=R > 0)  # in the SIS regime
         f_x = a * x_shift
         f_y = a * y_shift
         return f_x, f_y
@@ -51,10 +50,8 @@ class SIS(LensProfileBase):
         if isinstance(R, int) or isinstance(R, float):
             prefac = theta_E / max(0.000001, R)
         else:
-            prefac = np.empty_like(R)
-            r = R[R > 0]  # in the SIS regime
-            prefac[R == 0] = 0.0
-            prefac[R > 0] = theta_E / r
+            prefac = np.zeros(np.broadcast(theta_E, R).shape)
+            np.divide(theta_E, R, out=prefac, where=R > 0)  # in the SIS regime
 
         f_xx = y_shift * y_shift * prefac
         f_yy = x_shift * x_shift * prefac
@@ -155,6 +155,41 @@ class TNFW(LensProfileBase):
         f_xy = gamma2
         return f_xx, f_xy, f_xy, f_yy
 
+    def derivatives_and_hessian(
+        self, x, y, Rs, alpha_Rs, r_trunc, center_x=0, center_y=0
+    ):
+        """Deflection angles and Hessian matrix with the radial functions evaluated
+        once.
+
+        :param x: angular position (normally in units of arc seconds)
+        :param y: angular position (normally in units of arc seconds)
+        :param Rs: turn over point in the slope of the NFW profile in angular unit
+        :param alpha_Rs: deflection (angular units) at projected Rs
+        :param r_trunc: truncation radius (angular units)
+        :param center_x: center of halo (in angular units)
+        :param center_y: center of halo (in angular units)
+        :return: f_x, f_y, f_xx, f_xy, f_yx, f_yy
+        """
+        rho0_input = self.alpha2rho0(alpha_Rs=alpha_Rs, Rs=Rs)
+        x_ = x - center_x
+        y_ = y - center_y
+        R = np.sqrt(x_**2 + y_**2)
+        R = np.maximum(R, self._s * Rs)
+        X = np.maximum(R / Rs, self._s)
+        tau = r_trunc / Rs
+        gx = self._g(X, tau)
+        Fx = self._F(X, tau)
+        a = 4 * rho0_input * Rs * gx / X**2
+        f_x, f_y = a * x_, a * y_
+        kappa = 2 * rho0_input * Rs * Fx
+        a = 2 * rho0_input * Rs * (2 * gx / X**2 - Fx)
+        gamma1 = a * (y_**2 - x_**2) / R**2
+        gamma2 = -a * 2 * (x_ * y_) / R**2
+        f_xx = kappa + gamma1
+        f_yy = kappa - gamma1
+        f_xy = gamma2
+        return f_x, f_y, f_xx, f_xy, f_xy, f_yy
+
     @staticmethod
     def density(r, Rs, rho0, r_trunc):
         """Three dimensional truncated NFW profile.
@@ -190,7 +225,7 @@ class TNFW(LensProfileBase):
         y_ = y - center_y
         R = np.sqrt(x_**2 + y_**2)
         x = R * Rs**-1
-        tau = float(r_trunc) * Rs**-1
+        tau = r_trunc * Rs**-1
         Fx = self._F(x, tau)
         return 2 * rho0 * Rs * Fx
 
@@ -236,7 +271,7 @@ class TNFW(LensProfileBase):
         """
         x = R / Rs
         x = np.maximum(x, self._s)
-        tau = float(r_trunc) / Rs
+        tau = r_trunc / Rs
         hx = self._h(x, tau)
         return 2 * rho0 * Rs**3 * hx
 
@@ -258,7 +293,7 @@ class TNFW(LensProfileBase):
         R = np.maximum(R, self._s * Rs)
         x = R / Rs
         x = np.maximum(x, self._s)
-        tau = float(r_trunc) / Rs
+        tau = r_trunc / Rs
         gx = self._g(x, tau)
         a = 4 * rho0 * Rs * gx / x**2
         return a * ax_x, a * ax_y
@@ -281,7 +316,7 @@ class TNFW(LensProfileBase):
         """
         R = np.maximum(R, self._s * Rs)
         x = R / Rs
-        tau = float(r_trunc) * Rs**-1
+        tau = r_trunc * Rs**-1
         gx = self._g(x, tau)
         Fx = self._F(x, tau)
         a = 2 * rho0 * Rs * (2 * gx / x**2 - Fx)
@@ -316,9 +351,13 @@ class TNFW(LensProfileBase):
         a = t2 * (t2 + 1) ** -2
         if isinstance(X, np.ndarray):
             # b = (t2 + 1) * (X ** 2 - 1) ** -1 * (1 - _F)
+            # tau may be an array broadcasting against X (grouped evaluation)
+            t2_ = np.broadcast_to(t2, np.shape(X))
             b = np.ones_like(X)
-            b[X == 1] = (t2 + 1) * 1.0 / 3
-            b[X != 1] = (t2 + 1) * (X[X != 1] ** 2 - 1) ** -1 * (1 - _F[X != 1])
+            b[X == 1] = (t2_[X == 1] + 1) * 1.0 / 3
+            b[X != 1] = (
+                (t2_[X != 1] + 1) * (X[X != 1] ** 2 - 1) ** -1 * (1 - _F[X != 1])
+            )
 
         elif isinstance(X, float) or isinstance(X, int):
             if X == 1:
@@ -30,6 +30,16 @@ class LensEquationSolver(object):
             lenstronomy.LensModel.lens_model
         """
         self.lensModel = lensModel
+        self._num_rays_shot = 0
+
+    @property
+    def num_rays_shot(self):
+        """Number of positions ray-shot in the image plane by the last call of
+        candidate_solutions() (either on the dense grid or the quadtree search).
+
+        :return: int
+        """
+        return self._num_rays_shot
 
     def change_source_redshift(self, z_source=None):
         """Change source redshift in solver.
@@ -122,6 +132,7 @@ class LensEquationSolver(object):
         verbose=False,
         x_center=0,
         y_center=0,
+        quadtree=False,
     ):
         """Finds pixels in the image plane possibly hosting a solution of the lens
         equation, for the given source position and lens model.
@@ -136,12 +147,34 @@ class LensEquationSolver(object):
         :param verbose: bool, if True, prints some useful information for the user
         :param x_center: float, center of the window to search for point sources
         :param y_center: float, center of the window to search for point sources
+        :param quadtree: bool, if True, uses a hierarchical search starting from a coarse
+            grid and only refines cells that could host a solution (see
+            _candidate_solutions_quadtree()) instead of ray-shooting the full grid with
+            min_distance resolution
         :returns: (approximate) angular position of (multiple) images ra_pos, dec_pos in
             units of angles, related ray-traced source displacements and pixel width
         :raises: AttributeError, KeyError
         """
         # compute number of pixels to cover the search window with the required min_distance
         num_pix = int(round(search_window / min_distance) + 0.5)
+        if quadtree is True:
+            x_mins, y_mins, delta_map, num_rays = self._candidate_solutions_quadtree(
+                sourcePos_x,
+                sourcePos_y,
+                kwargs_lens,
+                min_distance,
+                num_pix,
+                x_center,
+                y_center,
+            )
+            self._num_rays_shot = num_rays
+            if verbose:
+                print(
+                    "Quadtree search shot %s rays compared to %s rays of the full grid."
+                    % (num_rays, num_pix**2)
+                )
+            return x_mins, y_mins, delta_map, min_distance
+        self._num_rays_shot = num_pix**2
         x_grid, y_grid = util.make_grid(num_pix, min_distance)
         x_grid += x_center
         y_grid += y_center
@@ -156,6 +189,109 @@ class LensEquationSolver(object):
 
         return x_mins, y_mins, delta_map, pixel_width
 
+    def _candidate_solutions_quadtree(
+        self,
+        sourcePos_x,
+        sourcePos_y,
+        kwargs_lens,
+        min_distance,
+        num_pix,
+        x_center,
+        y_center,
+        num_pix_coarse=16,
+        safety_factor=3,
+    ):
+        """Hierarchical (quadtree) search for pixels in the image plane possibly hosting
+        a solution of the lens equation.
+
+        The search starts on a coarse grid of square cells. For each cell, the source
+        plane position and the lensing Jacobian are evaluated at its center. To linear
+        order, the cell maps into a region of the source plane with radius bounded by
+        the half-width of the cell times the row-wise absolute sums of the Jacobian.
+        Cells whose ray-traced center is further away from the source position than
+        safety_factor times this bound can not host a solution and are discarded, all
+        others are subdivided into four cells. Once the cell size reaches min_distance,
+        local minima of the source plane distance among the remaining cells are
+        returned in the same way as for the full grid search.
+
+        :param sourcePos_x: source position in units of angle
+        :param sourcePos_y: source position in units of angle
+        :param kwargs_lens: lens model parameters as keyword arguments
+        :param min_distance: pixel size of the finest level
+        :param num_pix: number of pixels per axis of the finest level to cover the
+            search window
+        :param x_center: float, center of the search window
+        :param y_center: float, center of the search window
+        :param num_pix_coarse: minimum number of cells per axis on the coarsest level
+        :param safety_factor: factor applied on the linear bound of the source plane
+            extent of a cell to account for non-linear mapping within the cell
+        :return: x_mins, y_mins, delta_map, number of rays shot
+        """
+        num_level = max(0, int(np.floor(np.log2(num_pix / num_pix_coarse))))
+        num_coarse = int(np.ceil(num_pix / 2**num_level))
+        # integer pixel indices (i, j) of the cells on the current level
+        i_coarse, j_coarse = np.meshgrid(np.arange(num_coarse), np.arange(num_coarse))
+        i_cell, j_cell = i_coarse.flatten(), j_coarse.flatten()
+        num_rays = 0
+        for level in range(num_level, 0, -1):
+            cell_width = min_distance * 2**level
+            num_cells = num_coarse * 2 ** (num_level - level)
+            x_cell = x_center + (i_cell - (num_cells - 1) / 2.0) * cell_width
+            y_cell = y_center + (j_cell - (num_cells - 1) / 2.0) * cell_width
+            x_mapped, y_mapped, f_xx, f_xy, f_yx, f_yy = self._ray_shooting_and_hessian(
+                x_cell, y_cell, kwargs_lens
+            )
+            num_rays += len(x_cell)
+            delta = util.displaceAbs(x_mapped, y_mapped, sourcePos_x, sourcePos_y)
+            extent_x = np.abs(1 - f_xx) + np.abs(f_xy)
+            extent_y = np.abs(f_yx) + np.abs(1 - f_yy)
+            bound = (
+                safety_factor * cell_width / 2.0 * np.sqrt(extent_x**2 + extent_y**2)
+            )
+            # non-finite bounds (e.g. at singular points of the lens model) are kept
+            select = ~(delta > bound)
+            i_cell, j_cell = i_cell[select], j_cell[select]
+            # subdivide the remaining cells into four
+            i_cell = (2 * i_cell[:, np.newaxis] + np.array([0, 1, 0, 1])).flatten()
+            j_cell = (2 * j_cell[:, np.newaxis] + np.array([0, 0, 1, 1])).flatten()
+        num_cells = num_coarse * 2**num_level
+        x_cell = x_center + (i_cell - (num_cells - 1) / 2.0) * min_distance
+        y_cell = y_center + (j_cell - (num_cells - 1) / 2.0) * min_distance
+        x_mapped, y_mapped = self.lensModel.ray_shooting(x_cell, y_cell, kwargs_lens)
+        num_rays += len(x_cell)
+        delta = util.displaceAbs(x_mapped, y_mapped, sourcePos_x, sourcePos_y)
+
+        # local minima among the cells of the finest level. Cells discarded on a coarser level are treated as
+        # infinitely far away. Cells at the border of the search window are not considered, as for the full grid.
+        index = j_cell * num_cells + i_cell
+        sort = np.argsort(index)
+        index_sorted, delta_sorted = index[sort], delta[sort]
+        is_min = (
+            (i_cell > 0)
+            & (i_cell < num_cells - 1)
+            & (j_cell > 0)
+            & (j_cell < num_cells - 1)
+        )
+        for di, dj in [
+            (-1, -1),
+            (0, -1),
+            (1, -1),
+            (-1, 0),
+            (1, 0),
+            (-1, 1),
+            (0, 1),
+            (1, 1),
+        ]:
+            index_neighbor = (j_cell + dj) * num_cells + i_cell + di
+            k = np.minimum(
+                np.searchsorted(index_sorted, index_neighbor), len(index_sorted) - 1
+            )
+            delta_neighbor = np.where(
+                index_sorted[k] == index_neighbor, delta_sorted[k], np.inf
+            )
+            is_min &= delta < delta_neighbor
+        return x_cell[is_min], y_cell[is_min], delta[is_min], num_rays
+
     def image_position_analytical(
         self,
         x,
@@ -292,6 +428,8 @@ class LensEquationSolver(object):
         num_random=0,
         non_linear=False,
         magnification_limit=None,
+        vectorized=False,
+        quadtree=False,
     ):
         """Finds image position  given source position and lens model. The solver first
         samples does a grid search in the lens plane, and the grid points that are
@@ -322,6 +460,12 @@ class LensEquationSolver(object):
             Hessian computation
         :param magnification_limit: None or float, if set will only return image
             positions that have an abs(magnification) larger than this number
+        :param vectorized: bool, if True, advances all candidate positions of the
+            gradient decent simultaneously with one lens model evaluation per iteration
+            for the whole batch (not applicable with non_linear=True)
+        :param quadtree: bool, if True, uses a hierarchical quadtree search instead of
+            ray-shooting the full grid to identify the candidate regions (see
+            candidate_solutions())
         :returns: (exact) angular position of (multiple) images ra_pos, dec_pos in units
             of angle
         :raises: AttributeError, KeyError
@@ -338,6 +482,7 @@ class LensEquationSolver(object):
             verbose,
             x_center,
             y_center,
+            quadtree=quadtree,
         )
         if verbose:
             print(
@@ -385,6 +530,7 @@ class LensEquationSolver(object):
             verbose=verbose,
             min_distance=min_distance,
             non_linear=non_linear,
+            vectorized=vectorized,
         )
         # only select iterative results that match the precision limit
         x_mins = x_mins[solver_precision <= precision_limit]
@@ -400,6 +546,131 @@ class LensEquationSolver(object):
         self.lensModel.set_dynamic()
         return x_mins, y_mins
 
+    def image_position_from_source_batch(
+        self,
+        sourcePos_x,
+        sourcePos_y,
+        kwargs_lens,
+        min_distance=0.1,
+        search_window=10,
+        precision_limit=10 ** (-10),
+        num_iter_max=100,
+        arrival_time_sort=True,
+        initial_guess_cut=True,
+        x_center=0,
+        y_center=0,
+        magnification_limit=None,
+    ):
+        """Solves the lens equation for many source positions behind the same lens
+        model. Follows the same steps as image_position_lenstronomy() but the grid of
+        the candidate search is ray-shot only once and re-used for all source positions,
+        and the gradient decent is performed for the candidates of all source positions
+        simultaneously.
+
+        :param sourcePos_x: array of source positions in units of angle
+        :param sourcePos_y: array of source positions in units of angle
+        :param kwargs_lens: lens model parameters as keyword arguments
+        :param min_distance: minimum separation to consider for two images in units of
+            angle
+        :param search_window: window size to be considered by the solver. Will not find
+            image position outside this window
+        :param precision_limit: required precision in the lens equation solver (in units
+            of angle in the source plane).
+        :param num_iter_max: maximum iteration of lens-source mapping conducted by
+            solver to match the required precision
+        :param arrival_time_sort: bool, if True, sorts image position in arrival time
+            (first arrival photon first listed)
+        :param initial_guess_cut: bool, if True, cuts initial local minima selected by
+            the grid search based on distance criteria from the source position
+        :param x_center: float, center of the window to search for point sources
+        :param y_center: float, center of the window to search for point sources
+        :param magnification_limit: None or float, if set will only return image
+            positions that have an abs(magnification) larger than this number
+        :returns: lists (one entry per source position) of arrays of the image positions
+            ra_pos, dec_pos in units of angle
+        """
+        sourcePos_x = np.atleast_1d(np.asarray(sourcePos_x, dtype=float))
+        sourcePos_y = np.atleast_1d(np.asarray(sourcePos_y, dtype=float))
+        num_sources = len(sourcePos_x)
+        kwargs_lens = self.lensModel.set_static(kwargs_lens)
+        # ray-shoot the grid only once for all source positions
+        num_pix = int(round(search_window / min_distance) + 0.5)
+        x_grid, y_grid = util.make_grid(num_pix, min_distance)
+        x_grid += x_center
+        y_grid += y_center
+        x_mapped, y_mapped = self.lensModel.ray_shooting(x_grid, y_grid, kwargs_lens)
+        self._num_rays_shot = num_pix**2
+        x_mins, y_mins, delta_map, source_index = [], [], [], []
+        for i in range(num_sources):
+            absmapped = util.displaceAbs(
+                x_mapped, y_mapped, sourcePos_x[i], sourcePos_y[i]
+            )
+            x_mins_i, y_mins_i, delta_map_i = util.local_minima_2d(
+                absmapped, x_grid, y_grid
+            )
+            x_mins.append(x_mins_i)
+            y_mins.append(y_mins_i)
+            delta_map.append(delta_map_i)
+            source_index.append(np.ones(len(x_mins_i), dtype=int) * i)
+        x_mins = np.concatenate(x_mins)
+        y_mins = np.concatenate(y_mins)
+        delta_map = np.concatenate(delta_map)
+        source_index = np.concatenate(source_index)
+        if initial_guess_cut and len(x_mins) > 0:
+            mag = np.abs(self.lensModel.magnification(x_mins, y_mins, kwargs_lens))
+            mag[mag < 1] = 1
+            select = delta_map <= min_distance * mag * 5
+            x_mins, y_mins = x_mins[select], y_mins[select]
+            source_index = source_index[select]
+        # iterative solving of the lens equation for the candidates of all source positions at once
+        x_mins, y_mins, solver_precision, _ = self._solve_proposals_vectorized(
+            x_mins,
+            y_mins,
+            sourcePos_x[source_index],
+            sourcePos_y[source_index],
+            kwargs_lens,
+            precision_limit,
+            num_iter_max,
+            max_step=min_distance,
+        )
+        select = solver_precision <= precision_limit
+        x_mins, y_mins = x_mins[select], y_mins[select]
+        source_index = source_index[select]
+        x_image_list, y_image_list = [], []
+        for i in range(num_sources):
+            x_image, y_image = image_util.findOverlap(
+                x_mins[source_index == i], y_mins[source_index == i], min_distance
+            )
+            x_image_list.append(np.array(x_image))
+            y_image_list.append(np.array(y_image))
+        # arrival times and magnifications are evaluated for the images of all source positions at once
+        num_images = [len(x_image) for x_image in x_image_list]
+        split = np.cumsum(num_images)[:-1]
+        x_image_all = np.concatenate(x_image_list)
+        y_image_all = np.concatenate(y_image_list)
+        if arrival_time_sort and len(x_image_all) > 0:
+            arrival_time_list = np.split(
+                self._arrival_times(x_image_all, y_image_all, kwargs_lens), split
+            )
+            for i in range(num_sources):
+                idx = np.argsort(arrival_time_list[i])
+                x_image_list[i] = x_image_list[i][idx]
+                y_image_list[i] = y_image_list[i][idx]
+            x_image_all = np.concatenate(x_image_list)
+            y_image_all = np.concatenate(y_image_list)
+        if magnification_limit is not None and len(x_image_all) > 0:
+            mag_list = np.split(
+                np.abs(
+                    self.lensModel.magnification(x_image_all, y_image_all, kwargs_lens)
+                ),
+                split,
+            )
+            for i in range(num_sources):
+                x_image_list[i] = x_image_list[i][mag_list[i] >= magnification_limit]
+                y_image_list[i] = y_image_list[i][mag_list[i] >= magnification_limit]
+        self.lensModel.set_dynamic()
+        return x_image_list, y_image_list
+
     def _find_gradient_decent(
         self,
         x_min,
@@ -412,6 +683,7 @@ class LensEquationSolver(object):
         verbose=False,
         min_distance=0.01,
         non_linear=False,
+        vectorized=False,
     ):
         """Given a 'good guess' of a solution of the lens equation (expected image
         position given a fixed source position) this routine iteratively performs a ray-
@@ -433,8 +705,30 @@ class LensEquationSolver(object):
             in unstable regions)
         :param non_linear: bool, if True, uses scipy.miminize instead of the directly
             implemented gradient decent approach.
+        :param vectorized: bool, if True, solves all candidates simultaneously (see
+            _solve_proposals_vectorized())
         :return: x_position array, y_position array, error in the source plane array
         """
+        if vectorized is True and non_linear is False:
+            x_mins, y_mins, solver_precision, num_iter = (
+                self._solve_proposals_vectorized(
+                    x_min,
+                    y_min,
+                    sourcePos_x,
+                    sourcePos_y,
+                    kwargs_lens,
+                    precision_limit,
+                    num_iter_max,
+                    max_step=min_distance,
+                )
+            )
+            if verbose:
+                for i in range(len(x_mins)):
+                    print(
+                        "Solution found for region %s with required precision at iteration %s"
+                        % (i, num_iter[i])
+                    )
+            return x_mins, y_mins, solver_precision
         num_candidates = len(x_min)
         x_mins = np.zeros(num_candidates)
         y_mins = np.zeros(num_candidates)
@@ -512,13 +806,10 @@ class LensEquationSolver(object):
             delta = np.sqrt((x_mapped - source_x) ** 2 + (y_mapped - source_y) ** 2)
 
             while delta > precision_limit and l < num_iter_max:
-                x_mapped, y_mapped = self.lensModel.ray_shooting(
-                    x_guess, y_guess, kwargs_lens
+                x_mapped, y_mapped, f_xx, f_xy, f_yx, f_yy = (
+                    self._ray_shooting_and_hessian(x_guess, y_guess, kwargs_lens)
                 )
                 delta = np.sqrt((x_mapped - source_x) ** 2 + (y_mapped - source_y) ** 2)
-                f_xx, f_xy, f_yx, f_yy = self.lensModel.hessian(
-                    x_guess, y_guess, kwargs_lens
-                )
                 DistMatrix = np.array([[1 - f_yy, f_yx], [f_xy, 1 - f_xx]])
                 det = (1 - f_xx) * (1 - f_yy) - f_xy * f_yx
                 deltaVec = np.array([x_mapped - source_x, y_mapped - source_y])
@@ -539,6 +830,114 @@ class LensEquationSolver(object):
                 )
         return x_guess, y_guess, delta, l
 
+    def _solve_proposals_vectorized(
+        self,
+        x_guess,
+        y_guess,
+        source_x,
+        source_y,
+        kwargs_lens,
+        precision_limit,
+        num_iter_max,
+        max_step,
+    ):
+        """Gradient decent solution of multiple proposed starting points solved
+        simultaneously. This follows the same steps as _solve_single_proposal() for
+        each candidate, but the ray-shooting and Hessian evaluations are performed for
+        all candidates that have not yet converged in one lens model call per
+        iteration.
+
+        :param x_guess: array of starting guess positions in the image plane
+        :param y_guess: array of starting guess positions in the image plane
+        :param source_x: source position to solve for in the image plane, either a float
+            or an array with the source position of each candidate
+        :param source_y: source position to solve for in the image plane, either a float
+            or an array with the source position of each candidate
+        :param kwargs_lens: keyword argument list of the lens model
+        :param precision_limit: float, required match in the solution in the source
+            plane
+        :param num_iter_max: int, maximum number of iterations before the algorithm
+            stops
+        :param max_step: maximum correction applied per step (to avoid over-shooting in
+            instable regions)
+        :return: x_positions, y_positions, errors in the source plane, steps required
+            for each candidate
+        """
+        x_guess = np.array(x_guess, dtype=float)
+        y_guess = np.array(y_guess, dtype=float)
+        num_iter = np.zeros(len(x_guess), dtype=int)
+        if len(x_guess) == 0:
+            return x_guess, y_guess, np.zeros(0), num_iter
+        source_x = np.broadcast_to(np.asarray(source_x, dtype=float), x_guess.shape)
+        source_y = np.broadcast_to(np.asarray(source_y, dtype=float), y_guess.shape)
+        x_mapped, y_mapped = self.lensModel.ray_shooting(x_guess, y_guess, kwargs_lens)
+        delta = np.sqrt((x_mapped - source_x) ** 2 + (y_mapped - source_y) ** 2)
+        active = (delta > precision_limit) & (num_iter < num_iter_max)
+        while np.any(active):
+            index = np.where(active)[0]
+            x_mapped, y_mapped, f_xx, f_xy, f_yx, f_yy = self._ray_shooting_and_hessian(
+                x_guess[index], y_guess[index], kwargs_lens
+            )
+            delta_x = x_mapped - source_x[index]
+            delta_y = y_mapped - source_y[index]
+            delta[index] = np.sqrt(delta_x**2 + delta_y**2)
+            det = (1 - f_xx) * (1 - f_yy) - f_xy * f_yx
+            vector_x = ((1 - f_yy) * delta_x + f_yx * delta_y) / det
+            vector_y = (f_xy * delta_x + (1 - f_xx) * delta_y) / det
+            dist = np.sqrt(vector_x**2 + vector_y**2)
+            step_scale = np.ones_like(dist)
+            step_scale[dist > max_step] = max_step / dist[dist > max_step]
+            vector_x *= step_scale
+            vector_y *= step_scale
+
+            # gradient steps; proposals that are worse than the current position are re-drawn in a random direction
+            # and re-tried until they improve or the maximum number of iterations is reached
+            pending = np.ones(len(index), dtype=bool)
+            while np.any(pending):
+                i_pending = np.where(pending)[0]
+                i_guess = index[i_pending]
+                x_new = x_guess[i_guess] - vector_x[i_pending]
+                y_new = y_guess[i_guess] - vector_y[i_pending]
+                x_mapped, y_mapped = self.lensModel.ray_shooting(
+                    x_new, y_new, kwargs_lens
+                )
+                delta_new = np.sqrt(
+                    (x_mapped - source_x[i_guess]) ** 2
+                    + (y_mapped - source_y[i_guess]) ** 2
+                )
+                num_iter[i_guess] += 1
+                worse = delta_new > delta[i_guess]
+                accept = ~worse
+                x_guess[i_guess[accept]] = x_new[accept]
+                y_guess[i_guess[accept]] = y_new[accept]
+                delta[i_guess[accept]] = delta_new[accept]
+                retry = worse & (num_iter[i_guess] <= num_iter_max)
+                i_retry = i_pending[retry]
+                vector_x[i_retry] *= np.random.normal(
+                    loc=0, scale=0.1, size=len(i_retry)
+                )
+                vector_y[i_retry] *= np.random.normal(
+                    loc=0, scale=0.1, size=len(i_retry)
+                )
+                pending[i_pending[~retry]] = False
+            active = (delta > precision_limit) & (num_iter < num_iter_max)
+        return x_guess, y_guess, delta, num_iter
+
+    def _ray_shooting_and_hessian(self, x, y, kwargs_lens):
+        """Ray-shooting and Hessian at the same position, using the fused lens model
+        evaluation when available.
+
+        :param x: image plane position
+        :param y: image plane position
+        :param kwargs_lens: keyword argument list of the lens model
+        :return: beta_x, beta_y, f_xx, f_xy, f_yx, f_yy
+        """
+        if hasattr(self.lensModel, "ray_shooting_and_hessian"):
+            return self.lensModel.ray_shooting_and_hessian(x, y, kwargs_lens)
+        x_mapped, y_mapped = self.lensModel.ray_shooting(x, y, kwargs_lens)
+        f_xx, f_xy, f_yx, f_yy = self.lensModel.hessian(x, y, kwargs_lens)
+        return x_mapped, y_mapped, f_xx, f_xy, f_yx, f_yy
+
     def _gradient_step(
         self,
         x_guess,
@@ -611,6 +1010,8 @@ class LensEquationSolver(object):
         magnification_limit=None,
         initial_guess_cut=True,
         verbose=False,
+        vectorized=False,
+        quadtree=False,
     ):
         """
 
@@ -631,6 +1032,8 @@ class LensEquationSolver(object):
         :param non_linear: bool, if True applies a non-linear solver not dependent on Hessian computation
         :param magnification_limit: None or float, if set will only return image positions that have an
          abs(magnification) larger than this number
+        :param vectorized: bool, if True, solves all candidate positions simultaneously in the gradient decent
+        :param quadtree: bool, if True, uses a hierarchical quadtree search to identify candidate regions
         :returns: (exact) angular position of (multiple) images ra_pos, dec_pos in units of angle
         """
 
@@ -650,6 +1053,8 @@ class LensEquationSolver(object):
             num_random=num_random,
             non_linear=non_linear,
             magnification_limit=magnification_limit,
+            vectorized=vectorized,
+            quadtree=quadtree,
         )
         mag_list = np.abs(self.lensModel.magnification(x_mins, y_mins, kwargs_lens))
         x_mins_sorted = util.selectBest(x_mins, mag_list, numImages)
@@ -678,16 +1083,24 @@ class LensEquationSolver(object):
 
         if len(x_mins) <= 1:
             return x_mins, y_mins
-        if self.lensModel.multi_plane:
-            arrival_time = self.lensModel.arrival_time(x_mins, y_mins, kwargs_lens)
-        else:
-            fermat_pot = self.lensModel.fermat_potential(x_mins, y_mins, kwargs_lens)
-            arrival_time = fermat_pot
+        arrival_time = self._arrival_times(x_mins, y_mins, kwargs_lens)
         idx = np.argsort(arrival_time)
         x_mins = np.array(x_mins)[idx]
         y_mins = np.array(y_mins)[idx]
         return x_mins, y_mins
 
+    def _arrival_times(self, x_mins, y_mins, kwargs_lens):
+        """Quantity to sort the image positions by arrival time.
+
+        :param x_mins: ra position of images
+        :param y_mins: dec position of images
+        :param kwargs_lens: keyword arguments of lens model
+        :return: arrival times for multi-plane lens models, Fermat potential otherwise
+        """
+        if self.lensModel.multi_plane:
+            return self.lensModel.arrival_time(x_mins, y_mins, kwargs_lens)
+        return self.lensModel.fermat_potential(x_mins, y_mins, kwargs_lens)
+
 
 def analytical_lens_model_support(lens_model_list):
     """Checks whether analytical solver can be used.
@@ -42,6 +42,9 @@ class LensModel(object):
         cosmology_sampling=False,
         cosmology_model="FlatLambdaCDM",
         use_jax=False,
+        group_profiles=False,
+        static_table_index=None,
+        kwargs_static_table=None,
     ):
         """
 
@@ -80,6 +83,15 @@ class LensModel(object):
         :param use_jax: bool, if True, uses deflector profiles from jaxtronomy.
             Can also be a list of bools, selecting which models in the lens_model_list to use from jaxtronomy
             Only supported for MultiPlane(), MultiPlaneDecoupled(), and SinglePlane() at the moment
+        :param group_profiles: bool, if True, evaluates all instances of the same profile type (e.g. NFW, TNFW, SIS
+            subhalos) in a single vectorized call. Only supported for SinglePlane() at the moment
+        :param static_table_index: list of indices of lens models with fixed parameters (e.g. external convergence
+            maps, fixed subhalo populations) whose summed deflection and Hessian are evaluated once per coordinate
+            grid and served from memory afterwards. The tables are re-computed when the coordinates or keyword
+            arguments change. Only supported for SinglePlane() at the moment
+        :param kwargs_static_table: keyword arguments of the StaticLensTable class, such as interpolation (bool),
+            max_tables (int), min_table_size (int) and grid_list (list of (x, y) coordinates to be tabulated
+            irrespective of their size)
         """
         self.lens_model_list = lens_model_list
         self.z_lens = z_lens
@@ -232,6 +244,9 @@ class LensModel(object):
                     z_source_convention=z_source_convention,
                     profile_kwargs_list=profile_kwargs_list,
                     use_jax=use_jax,
+                    group_profiles=group_profiles,
+                    static_table_index=static_table_index,
+                    kwargs_static_table=kwargs_static_table,
                 )
                 self.type = "SinglePlane"
                 if z_source is not None and z_source_convention is not None:
@@ -437,6 +452,47 @@ class LensModel(object):
                 % diff_method
             )
 
+    def derivatives_and_hessian(self, x, y, kwargs, k=None):
+        """Deflection angles and Hessian matrix in a single evaluation of the lens
+        model. Profiles with a fused implementation share their coordinate
+        transformations, ellipticity conversions and radial terms between the two
+        quantities; all other profiles fall back to separate deflection and Hessian
+        calls.
+
+        :param x: x-position (preferentially arcsec)
+        :type x: numpy array
+        :param y: y-position (preferentially arcsec)
+        :type y: numpy array
+        :param kwargs: list of keyword arguments of lens model parameters matching the
+            lens model classes
+        :param k: only evaluate the k-th lens model
+        :return: f_x, f_y, f_xx, f_xy, f_yx, f_yy components
+        """
+        if hasattr(self.lens_model, "derivatives_and_hessian"):
+            return self.lens_model.derivatives_and_hessian(x, y, kwargs, k=k)
+        f_x, f_y = self.lens_model.alpha(x, y, kwargs, k=k)
+        f_xx, f_xy, f_yx, f_yy = self.lens_model.hessian(x, y, kwargs, k=k)
+        return f_x, f_y, f_xx, f_xy, f_yx, f_yy
+
+    def ray_shooting_and_hessian(self, x, y, kwargs, k=None):
+        """Maps image to source position and computes the Hessian matrix at the image
+        position in a single evaluation of the lens model (see
+        derivatives_and_hessian()).
+
+        :param x: x-position (preferentially arcsec)
+        :type x: numpy array
+        :param y: y-position (preferentially arcsec)
+        :type y: numpy array
+        :param kwargs: list of keyword arguments of lens model parameters matching the
+            lens model classes
+        :param k: only evaluate the k-th lens model
+        :return: beta_x, beta_y, f_xx, f_xy, f_yx, f_yy
+        """
+        f_x, f_y, f_xx, f_xy, f_yx, f_yy = self.derivatives_and_hessian(
+            x, y, kwargs, k=k
+        )
+        return x - f_x, y - f_y, f_xx, f_xy, f_yx, f_yy
+
     def kappa(self, x, y, kwargs, k=None, diff=None, diff_method="square"):
         """Lensing convergence k = 1/2 laplacian(phi)
 
@@ -0,0 +1,156 @@
+__author__ = "sibirrer"
+
+import numpy as np
+from lenstronomy.LensModel.Profiles.nfw import NFW
+from lenstronomy.LensModel.Profiles.sis import SIS
+from lenstronomy.LensModel.Profiles.tnfw import TNFW
+
+__all__ = ["ProfileGroups"]
+
+# lens models whose derivatives() and hessian() definitions broadcast over parameter arrays of shape (n_profiles, 1)
+# against coordinate arrays of shape (1, n_points)
+_GROUPABLE_MODELS = {"NFW": NFW, "SIS": SIS, "TNFW": TNFW}
+
+
+class ProfileGroups(object):
+    """Class to evaluate all instances of the same lens profile type in a single
+    vectorized call.
+
+    The keyword arguments of all the profiles of a group are packed into parameter
+    arrays of shape (n_profiles, 1) and evaluated against the coordinates of shape (1,
+    n_points) in one broadcast. The profile axis is processed in chunks such that at
+    most max_elements (n_profiles x n_points) are held in memory at once. This is
+    useful for substructure realizations with thousands of subhalos of the same type,
+    where the python loop over the profiles dominates the computational cost.
+    """
+
+    def __init__(
+        self, lens_model_list, func_list, min_group_size=2, max_elements=10**6
+    ):
+        """
+
+        :param lens_model_list: list of strings with lens model names
+        :param func_list: list of lens profile instances matching lens_model_list
+        :param min_group_size: minimum number of profiles of the same type to be evaluated as a group
+        :param max_elements: maximum number of elements (n_profiles x n_points) evaluated at once per chunk
+        """
+        self._max_elements = int(max_elements)
+        groups = {}
+        for i, (lens_type, func) in enumerate(zip(lens_model_list, func_list)):
+            profile_class = _GROUPABLE_MODELS.get(lens_type, None)
+            # jaxtronomy or otherwise replaced instances are not grouped
+            if profile_class is None or type(func) is not profile_class:
+                continue
+            groups.setdefault((lens_type, id(func)), []).append(i)
+        self._groups = []
+        self._grouped_index = np.zeros(len(func_list), dtype=bool)
+        for (lens_type, _), index_list in groups.items():
+            if len(index_list) >= min_group_size:
+                self._groups.append((func_list[index_list[0]], index_list))
+                self._grouped_index[index_list] = True
+
+    @property
+    def grouped_index(self):
+        """Boolean array indicating which lens models are evaluated within a group.
+
+        :return: bool array of length of the lens model list
+        """
+        return self._grouped_index
+
+    def alpha(self, x, y, kwargs, bool_list):
+        """Summed deflection angles of all grouped profiles selected by bool_list.
+
+        :param x: x-position (preferentially arcsec)
+        :type x: numpy array
+        :param y: y-position (preferentially arcsec)
+        :type y: numpy array
+        :param kwargs: list of keyword arguments of lens model parameters matching the
+            lens model classes
+        :param bool_list: list of bools of the lens models to be evaluated
+        :return: f_x, f_y of the grouped profiles and bool list of the profiles not
+            evaluated within a group
+        """
+        f_x, f_y = np.zeros_like(x), np.zeros_like(x)
+        for f_x_i, f_y_i in self._evaluate("derivatives", x, y, kwargs, bool_list):
+            f_x += f_x_i
+            f_y += f_y_i
+        return f_x, f_y, self._remaining(bool_list)
+
+    def hessian(self, x, y, kwargs, bool_list):
+        """Summed Hessian of all grouped profiles selected by bool_list.
+
+        :param x: x-position (preferentially arcsec)
+        :type x: numpy array
+        :param y: y-position (preferentially arcsec)
+        :type y: numpy array
+        :param kwargs: list of keyword arguments of lens model parameters matching the
+            lens model classes
+        :param bool_list: list of bools of the lens models to be evaluated
+        :return: f_xx, f_xy, f_yx, f_yy of the grouped profiles and bool list of the
+            profiles not evaluated within a group
+        """
+        f_xx, f_xy, f_yx, f_yy = (
+            np.zeros_like(x),
+            np.zeros_like(x),
+            np.zeros_like(x),
+            np.zeros_like(x),
+        )
+        for f_xx_i, f_xy_i, f_yx_i, f_yy_i in self._evaluate(
+            "hessian", x, y, kwargs, bool_list
+        ):
+            f_xx += f_xx_i
+            f_xy += f_xy_i
+            f_yx += f_yx_i
+            f_yy += f_yy_i
+        return f_xx, f_xy, f_yx, f_yy, self._remaining(bool_list)
+
+    def _remaining(self, bool_list):
+        """
+
+        :param bool_list: list of bools of the lens models to be evaluated
+        :return: list of bools of the lens models that are not covered by a group
+        """
+        return [bool(b) and not self._grouped_index[i] for i, b in enumerate(bool_list)]
+
+    def _evaluate(self, definition, x, y, kwargs, bool_list):
+        """Generator over the summed outputs of each group and chunk.
+
+        :param definition: name of the profile definition to be called, 'derivatives' or 'hessian'
+        :param x: x-position
+        :param y: y-position
+        :param kwargs: list of keyword arguments of lens model parameters
+        :param bool_list: list of bools of the lens models to be evaluated
+        :return: tuple of summed outputs with the shape of x
+        """
+        shape = np.shape(x)
+        x_ = np.ravel(x)[np.newaxis, :]
+        y_ = np.ravel(y)[np.newaxis, :]
+        chunk_size = max(1, self._max_elements // max(1, x_.size))
+        for func, index_list in self._groups:
+            index_list = [i for i in index_list if bool_list[i] is True]
+            if len(index_list) == 0:
+                continue
+            kwargs_array = self._stack_kwargs(kwargs, index_list)
+            for start in range(0, len(index_list), chunk_size):
+                kwargs_chunk = {
+                    key: value[start : start + chunk_size]
+                    for key, value in kwargs_array.items()
+                }
+                output = getattr(func, definition)(x_, y_, **kwargs_chunk)
+                yield tuple(np.reshape(np.sum(out, axis=0), shape) for out in output)
+
+    @staticmethod
+    def _stack_kwargs(kwargs, index_list):
+        """Packs the keyword arguments of a group into parameter arrays.
+
+        :param kwargs: list of keyword arguments of lens model parameters
+        :param index_list: indices of the lens models of the group
+        :return: dictionary of parameter arrays of shape (n_profiles, 1)
+        """
+        keys = kwargs[index_list[0]].keys()
+        return {
+            key: np.array([kwargs[i][key] for i in index_list], dtype=float)[
+                :, np.newaxis
+            ]
+            for key in keys
+        }
@@ -2,6 +2,8 @@ __author__ = "sibirrer"
 
 import numpy as np
 from lenstronomy.LensModel.profile_list_base import ProfileListBase
+from lenstronomy.LensModel.profile_groups import ProfileGroups
+from lenstronomy.LensModel.static_table import StaticLensTable
 
 __all__ = ["SinglePlane"]
 
@@ -17,6 +19,10 @@ class SinglePlane(ProfileListBase):
         z_source_convention=None,
         alpha_scaling=1,
         use_jax=False,
+        group_profiles=False,
+        kwargs_group_profiles=None,
+        static_table_index=None,
+        kwargs_static_table=None,
     ):
         """
 
@@ -27,6 +33,12 @@ class SinglePlane(ProfileListBase):
         :param alpha_scaling: scaling factor of deflection angle relative to z_source_convention
         :param use_jax: bool, if True, uses deflector profiles from jaxtronomy.
             Can also be a list of bools, selecting which models in the lens_model_list to use from jaxtronomy
+        :param group_profiles: bool, if True, evaluates all instances of the same profile type (e.g. NFW, TNFW, SIS
+            subhalos) in a single vectorized call in alpha() and hessian() instead of looping over them
+        :param kwargs_group_profiles: keyword arguments of the ProfileGroups class (e.g. max_elements to bound memory)
+        :param static_table_index: list of indices of lens models with fixed parameters whose summed deflection and
+            Hessian are served from pre-computed tables in alpha() and hessian() (see StaticLensTable class)
+        :param kwargs_static_table: keyword arguments of the StaticLensTable class (e.g. interpolation, max_tables)
         """
         self._alpha_scaling = alpha_scaling
         ProfileListBase.__init__(
@@ -37,6 +49,22 @@ class SinglePlane(ProfileListBase):
             z_source_convention=z_source_convention,
             use_jax=use_jax,
         )
+        if group_profiles is True:
+            if kwargs_group_profiles is None:
+                kwargs_group_profiles = {}
+            self._profile_groups = ProfileGroups(
+                lens_model_list, self.func_list, **kwargs_group_profiles
+            )
+        else:
+            self._profile_groups = None
+        if static_table_index is not None:
+            if kwargs_static_table is None:
+                kwargs_static_table = {}
+            self._static_table = StaticLensTable(
+                self.func_list, static_table_index, **kwargs_static_table
+            )
+        else:
+            self._static_table = None
 
     def ray_shooting(self, x, y, kwargs, k=None):
         """Maps image to source position (inverse deflection).
@@ -121,6 +149,12 @@ class SinglePlane(ProfileListBase):
             return np.asarray(f_x), np.asarray(f_y)
         bool_list = self._bool_list(k)
         f_x, f_y = np.zeros_like(x), np.zeros_like(x)
+        if self._static_table is not None:
+            f_x_, f_y_, bool_list = self._static_table.alpha(x, y, kwargs, bool_list)
+            f_x, f_y = f_x + f_x_, f_y + f_y_
+        if self._profile_groups is not None:
+            f_x_, f_y_, bool_list = self._profile_groups.alpha(x, y, kwargs, bool_list)
+            f_x, f_y = f_x + f_x_, f_y + f_y_
         for i, func in enumerate(self.func_list):
             if bool_list[i] is True:
                 f_x_i, f_y_i = func.derivatives(x, y, **kwargs[i])
@@ -164,6 +198,13 @@ class SinglePlane(ProfileListBase):
             np.zeros_like(x),
             np.zeros_like(x),
         )
+        for groups in [self._static_table, self._profile_groups]:
+            if groups is not None:
+                f_xx_, f_xy_, f_yx_, f_yy_, bool_list = groups.hessian(
+                    x, y, kwargs, bool_list
+                )
+                f_xx, f_xy = f_xx + f_xx_, f_xy + f_xy_
+                f_yx, f_yy = f_yx + f_yx_, f_yy + f_yy_
         for i, func in enumerate(self.func_list):
             if bool_list[i] is True:
                 f_xx_i, f_xy_i, f_yx_i, f_yy_i = func.hessian(x, y, **kwargs[i])
@@ -178,6 +219,67 @@ class SinglePlane(ProfileListBase):
             np.asarray(f_yy) * self._alpha_scaling,
         )
 
+    def derivatives_and_hessian(self, x, y, kwargs, k=None):
+        """Deflection angles and Hessian matrix in a single pass over the lens models.
+        Profiles with a fused derivatives_and_hessian() definition share their
+        coordinate transformations and radial terms between the two.
+
+        :param x: x-position (preferentially arcsec)
+        :type x: numpy array
+        :param y: y-position (preferentially arcsec)
+        :type y: numpy array
+        :param kwargs: list of keyword arguments of lens model parameters matching the
+            lens model classes
+        :param k: only evaluate the k-th lens model
+        :return: f_x, f_y, f_xx, f_xy, f_yx, f_yy components
+        """
+        x = np.array(x, dtype=float)
+        y = np.array(y, dtype=float)
+
+        # NOTE: jax arrays are converted back into regular numpy arrays in cases where use_jax is True.
+        if isinstance(k, int):
+            return tuple(
+                np.asarray(out) * self._alpha_scaling
+                for out in self._derivatives_and_hessian_func(
+                    self.func_list[k], x, y, kwargs[k]
+                )
+            )
+
+        bool_list = self._bool_list(k)
+        out = [np.zeros_like(x) for _ in range(6)]
+        for groups in [self._static_table, self._profile_groups]:
+            if groups is not None:
+                f_x, f_y, _ = groups.alpha(x, y, kwargs, bool_list)
+                f_xx, f_xy, f_yx, f_yy, bool_list = groups.hessian(
+                    x, y, kwargs, bool_list
+                )
+                out_ = [f_x, f_y, f_xx, f_xy, f_yx, f_yy]
+                out = [out[j] + out_[j] for j in range(6)]
+        for i, func in enumerate(self.func_list):
+            if bool_list[i] is True:
+                out_i = self._derivatives_and_hessian_func(func, x, y, kwargs[i])
+                for j in range(6):
+                    out[j] = out[j] + out_i[j]
+        return tuple(np.asarray(out_j) * self._alpha_scaling for out_j in out)
+
+    @staticmethod
+    def _derivatives_and_hessian_func(func, x, y, kwargs):
+        """Fused deflection and Hessian of a single profile, with a fall-back to
+        separate calls for profiles not inheriting from LensProfileBase (e.g.
+        jaxtronomy profiles).
+
+        :param func: lens profile instance
+        :param x: x-position
+        :param y: y-position
+        :param kwargs: keyword arguments of the profile
+        :return: f_x, f_y, f_xx, f_xy, f_yx, f_yy
+        """
+        if hasattr(func, "derivatives_and_hessian"):
+            return func.derivatives_and_hessian(x, y, **kwargs)
+        f_x, f_y = func.derivatives(x, y, **kwargs)
+        f_xx, f_xy, f_yx, f_yy = func.hessian(x, y, **kwargs)
+        return f_x, f_y, f_xx, f_xy, f_yx, f_yy
+
     def change_redshift_scaling(self, alpha_scaling):
         """
 
@@ -0,0 +1,310 @@
+__author__ = "sibirrer"
+
+import copy
+import numpy as np
+from scipy.interpolate import RegularGridInterpolator
+
+__all__ = ["StaticLensTable"]
+
+
+class StaticLensTable(object):
+    """Class to serve the deflection angles and Hessian of a fixed subset of lens
+    models from pre-computed tables.
+
+    The summed deflection and Hessian of the selected lens models are evaluated once
+    for a given set of coordinates (e.g. the supersampled pixel grid of the data or the
+    search grid of the lens equation solver) and kept in memory. Subsequent calls with
+    the identical coordinates are served by exact lookup. Only registered coordinate
+    grids and coordinate arrays with at least min_table_size entries are tabulated;
+    smaller arrays (e.g. the point source positions or the steps of the lens equation
+    solver) are evaluated directly without touching the stored tables. Optionally, such
+    coordinates are interpolated from a stored table on a regular grid covering them.
+    The tables are keyed on the coordinate arrays and on the keyword arguments of the
+    selected lens models; any change of the keyword arguments invalidates all tables.
+    """
+
+    def __init__(
+        self,
+        func_list,
+        index_list,
+        max_tables=5,
+        interpolation=False,
+        min_table_size=100,
+        grid_list=None,
+    ):
+        """
+
+        :param func_list: list of lens profile instances
+        :param index_list: indices of the lens models to be tabulated
+        :param max_tables: maximum number of coordinate tables kept in memory. When exceeded, the oldest table of
+            a coordinate array that is not registered is removed.
+        :param interpolation: bool, if True, coordinates not matching a stored table are interpolated (linearly) from
+            a stored table on a regular grid covering all of them. Otherwise, they are evaluated directly.
+        :param min_table_size: minimal number of coordinates of an array that is not registered to be tabulated
+        :param grid_list: list of (x, y) coordinate arrays to be registered (see register_grid())
+        """
+        self._func_list = func_list
+        self._index_list = [int(i) for i in index_list]
+        self._max_tables = int(max_tables)
+        self._interpolation = interpolation
+        self._min_table_size = int(min_table_size)
+        self._kwargs_cached = None
+        self._tables = []
+        self._grid_list = []
+        if grid_list is not None:
+            for x, y in grid_list:
+                self.register_grid(x, y)
+
+    def register_grid(self, x, y):
+        """Registers coordinates to be tabulated irrespective of their size (e.g. a
+        small pixel grid). Tables of registered coordinates are only removed when all
+        stored tables are registered.
+
+        :param x: x-position (preferentially arcsec)
+        :type x: numpy array
+        :param y: y-position (preferentially arcsec)
+        :type y: numpy array
+        :return: None
+        """
+        self._grid_list.append(
+            (np.array(x, dtype=float, copy=True), np.array(y, dtype=float, copy=True))
+        )
+
+    @property
+    def index_list(self):
+        """Indices of the tabulated lens models.
+
+        :return: list of int
+        """
+        return self._index_list
+
+    def alpha(self, x, y, kwargs, bool_list):
+        """Summed deflection angles of the tabulated lens models.
+
+        :param x: x-position (preferentially arcsec)
+        :type x: numpy array
+        :param y: y-position (preferentially arcsec)
+        :type y: numpy array
+        :param kwargs: list of keyword arguments of lens model parameters matching the
+            lens model classes
+        :param bool_list: list of bools of the lens models to be evaluated
+        :return: f_x, f_y of the tabulated profiles and bool list of the profiles not
+            evaluated from the table
+        """
+        if not self._use_table(bool_list):
+            return np.zeros_like(x), np.zeros_like(x), bool_list
+        f_x, f_y = self._lookup("alpha", x, y, kwargs)
+        return f_x, f_y, self._remaining(bool_list)
+
+    def hessian(self, x, y, kwargs, bool_list):
+        """Summed Hessian of the tabulated lens models.
+
+        :param x: x-position (preferentially arcsec)
+        :type x: numpy array
+        :param y: y-position (preferentially arcsec)
+        :type y: numpy array
+        :param kwargs: list of keyword arguments of lens model parameters matching the
+            lens model classes
+        :param bool_list: list of bools of the lens models to be evaluated
+        :return: f_xx, f_xy, f_yx, f_yy of the tabulated profiles and bool list of the
+            profiles not evaluated from the table
+        """
+        if not self._use_table(bool_list):
+            zeros = np.zeros_like(x)
+            return zeros, zeros, zeros, zeros, bool_list
+        f_xx, f_xy, f_yx, f_yy = self._lookup("hessian", x, y, kwargs)
+        return f_xx, f_xy, f_yx, f_yy, self._remaining(bool_list)
+
+    def _use_table(self, bool_list):
+        """The table holds the sum over all tabulated lens models and can only be used
+        when all of them are requested.
+
+        :param bool_list: list of bools of the lens models to be evaluated
+        :return: bool
+        """
+        return len(self._index_list) > 0 and all(
+            bool_list[i] is True for i in self._index_list
+        )
+
+    def _remaining(self, bool_list):
+        """
+
+        :param bool_list: list of bools of the lens models to be evaluated
+        :return: list of bools of the lens models that are not covered by the table
+        """
+        return [bool(b) and i not in self._index_list for i, b in enumerate(bool_list)]
+
+    def _lookup(self, definition, x, y, kwargs):
+        """Returns the tabulated quantities at the requested coordinates. Computes and
+        stores a new table if needed.
+
+        :param definition: 'alpha' or 'hessian'
+        :param x: x-position
+        :param y: y-position
+        :param kwargs: list of keyword arguments of lens model parameters
+        :return: tuple of summed outputs with the shape of x
+        """
+        kwargs_static = [kwargs[i] for i in self._index_list]
+        if self._kwargs_cached is None or not _kwargs_equal(
+            kwargs_static, self._kwargs_cached
+        ):
+            self._kwargs_cached = copy.deepcopy(kwargs_static)
+            self._tables = []
+        x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+        registered = self._registered(x, y)
+        if registered is False and x.size < self._min_table_size:
+            if self._interpolation is True:
+                for table in self._tables:
+                    if table["grid"] is not None and _inside(table["grid"], x, y):
+                        return self._interpolate(table, definition, x, y, kwargs_static)
+            return self._evaluate(definition, x, y, kwargs_static)
+        for table in self._tables:
+            if _coordinates_equal(table["x"], table["y"], x, y):
+                if definition not in table:
+                    table[definition] = self._evaluate(definition, x, y, kwargs_static)
+                return table[definition]
+        table = {
+            "x": np.array(x, copy=True),
+            "y": np.array(y, copy=True),
+            "grid": _regular_grid_axes(x, y),
+            "registered": registered,
+        }
+        table[definition] = self._evaluate(definition, x, y, kwargs_static)
+        self._tables.append(table)
+        if len(self._tables) > self._max_tables:
+            index_remove = 0
+            for i, table_i in enumerate(self._tables):
+                if table_i["registered"] is False:
+                    index_remove = i
+                    break
+            self._tables.pop(index_remove)
+        return table[definition]
+
+    def _registered(self, x, y):
+        """
+
+        :param x: x-position
+        :param y: y-position
+        :return: bool, True if the coordinates are registered
+        """
+        for x_grid, y_grid in self._grid_list:
+            if _coordinates_equal(x_grid, y_grid, x, y):
+                return True
+        return False
+
+    def _interpolate(self, table, definition, x, y, kwargs_static):
+        """Linear interpolation of a table on a regular grid.
+
+        :param table: stored table with regular grid axes
+        :param definition: 'alpha' or 'hessian'
+        :param x: x-position
+        :param y: y-position
+        :param kwargs_static: keyword arguments of the tabulated lens models
+        :return: tuple of interpolated outputs with the shape of x
+        """
+        if definition not in table:
+            table[definition] = self._evaluate(
+                definition, table["x"], table["y"], kwargs_static
+            )
+        key = "interp_" + definition
+        if key not in table:
+            x_axes, y_axes = table["grid"]
+            table[key] = [
+                RegularGridInterpolator(
+                    (y_axes, x_axes), np.reshape(out, (len(y_axes), len(x_axes)))
+                )
+                for out in table[definition]
+            ]
+        points = np.stack([np.ravel(y), np.ravel(x)], axis=-1)
+        return tuple(np.reshape(interp(points), np.shape(x)) for interp in table[key])
+
+    def _evaluate(self, definition, x, y, kwargs_static):
+        """Direct evaluation of the summed tabulated lens models.
+
+        :param definition: 'alpha' or 'hessian'
+        :param x: x-position
+        :param y: y-position
+        :param kwargs_static: keyword arguments of the tabulated lens models
+        :return: tuple of summed outputs with the shape of x
+        """
+        num_out = 2 if definition == "alpha" else 4
+        out = [np.zeros_like(x) for _ in range(num_out)]
+        for i, kwargs_i in zip(self._index_list, kwargs_static):
+            func = self._func_list[i]
+            if definition == "alpha":
+                out_i = func.derivatives(x, y, **kwargs_i)
+            else:
+                out_i = func.hessian(x, y, **kwargs_i)
+            for j in range(num_out):
+                out[j] = out[j] + out_i[j]
+        return tuple(np.asarray(out_j) for out_j in out)
+
+
+def _coordinates_equal(x_1, y_1, x_2, y_2):
+    """
+
+    :param x_1: x-coordinates
+    :param y_1: y-coordinates
+    :param x_2: x-coordinates
+    :param y_2: y-coordinates
+    :return: bool, True if the coordinates are identical
+    """
+    return (
+        x_1.shape == x_2.shape and np.array_equal(x_1, x_2) and np.array_equal(y_1, y_2)
+    )
+
+
+def _kwargs_equal(kwargs_list_1, kwargs_list_2):
+    """Compares two lists of keyword arguments, including array-valued entries.
+
+    :param kwargs_list_1: list of keyword arguments
+    :param kwargs_list_2: list of keyword arguments
+    :return: bool, True if all entries are identical
+    """
+    for kwargs_1, kwargs_2 in zip(kwargs_list_1, kwargs_list_2):
+        if kwargs_1.keys() != kwargs_2.keys():
+            return False
+        for key in kwargs_1:
+            if not np.array_equal(kwargs_1[key], kwargs_2[key]):
+                return False
+    return True
+
+
+def _regular_grid_axes(x, y):
+    """Checks whether the coordinates form a regular grid with x running fastest (as
+    produced by util.make_grid()).
+
+    :param x: x-coordinates
+    :param y: y-coordinates
+    :return: (x_axes, y_axes) if the coordinates are a regular grid, None otherwise
+    """
+    x, y = np.ravel(x), np.ravel(y)
+    if x.size < 4:
+        return None
+    x_axes, y_axes = np.unique(x), np.unique(y)
+    nx, ny = len(x_axes), len(y_axes)
+    if nx < 2 or ny < 2 or nx * ny != x.size:
+        return None
+    if not np.array_equal(
+        np.reshape(x, (ny, nx)), np.tile(x_axes, (ny, 1))
+    ) or not np.array_equal(np.reshape(y, (ny, nx)), np.tile(y_axes, (nx, 1)).T):
+        return None
+    return x_axes, y_axes
+
+
+def _inside(grid, x, y):
+    """
+
+    :param grid: (x_axes, y_axes) of a regular grid
+    :param x: x-coordinates
+    :param y: y-coordinates
+    :return: bool, True if all coordinates lie within the grid
+    """
+    x_axes, y_axes = grid
+    return (
+        np.size(x) > 0
+        and np.min(x) >= x_axes[0]
+        and np.max(x) <= x_axes[-1]
+        and np.min(y) >= y_axes[0]
+        and np.max(y) <= y_axes[-1]
+    )
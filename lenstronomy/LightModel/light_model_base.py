@@ -233,14 +233,19 @@ class LightModelBase(object):
         :param k: integer or list of integers for selecting subsets of light profiles
         """
         kwargs_list_standard = self._transform_kwargs(kwargs_list)
-        x = np.array(x, dtype=float)
-        y = np.array(y, dtype=float)
+        # single precision coordinates are evaluated in single precision
+        if isinstance(x, np.ndarray) and x.dtype == np.float32:
+            dtype = np.float32
+        else:
+            dtype = float
+        x = np.array(x, dtype=dtype)
+        y = np.array(y, dtype=dtype)
         flux = np.zeros_like(x)
         bool_list = self._bool_list(k=k)
         for i, func in enumerate(self.func_list):
             if bool_list[i] is True:
                 out = np.array(
-                    func.function(x, y, **kwargs_list_standard[i]), dtype=float
+                    func.function(x, y, **kwargs_list_standard[i]), dtype=dtype
                 )
                 flux += out
         return flux
@@ -119,3 +119,12 @@ class ImageLikelihood(object):
         :return: None
         """
         self.imSim.reset_point_source_cache(cache=cache)
+
+    @property
+    def component_cache_stats(self):
+        """
+
+        :return: hit and miss counters of the memoized model components
+         {component name: {'hits': int, 'misses': int}}
+        """
+        return self.imSim.component_cache_stats
@@ -284,11 +284,10 @@ class PositionLikelihood(object):
                         k_lens = k_list[i]
                     else:
                         k_lens = None
-                    x_source_i, y_source_i = self._lensModel.ray_shooting(
-                        x_image[i], y_image[i], kwargs_lens, k=k_lens
-                    )
-                    f_xx, f_xy, f_yx, f_yy = self._lensModel.hessian(
-                        x_image[i], y_image[i], kwargs_lens, k=k_lens
+                    x_source_i, y_source_i, f_xx, f_xy, f_yx, f_yy = (
+                        self._lensModel.ray_shooting_and_hessian(
+                            x_image[i], y_image[i], kwargs_lens, k=k_lens
+                        )
                     )
                     A = np.array([[1 - f_xx, -f_xy], [-f_yx, 1 - f_yy]])
                     Sigma_theta = np.array([[1, 0], [0, 1]]) * sigma**2
@@ -163,6 +163,86 @@ class PriorLikelihood(object):
         logL += self._prior_kde_list(kwargs_ps, self._prior_ps_kde, self._kde_ps_list)
         return logL
 
+    def logL_batch(self, kwargs_return_list):
+        """Log priors of several models, evaluated in vectorized form across the models.
+
+        :param kwargs_return_list: list of keyword argument dictionaries (as returned
+            by Param.args2kwargs()) containing 'kwargs_lens', 'kwargs_source' etc.
+        :return: numpy array of log priors, one for each model
+        """
+        num = len(kwargs_return_list)
+        logL = np.zeros(num)
+        if num == 0:
+            return logL
+        gaussian = [
+            ("kwargs_lens", self._prior_lens),
+            ("kwargs_source", self._prior_source),
+            ("kwargs_lens_light", self._prior_lens_light),
+            ("kwargs_ps", self._prior_ps),
+            ("kwargs_special", self._prior_special),
+            ("kwargs_extinction", self._prior_extinction),
+        ]
+        lognormal = [
+            ("kwargs_lens", self._prior_lens_lognormal),
+            ("kwargs_source", self._prior_source_lognormal),
+            ("kwargs_lens_light", self._prior_lens_light_lognormal),
+            ("kwargs_ps", self._prior_ps_lognormal),
+            ("kwargs_special", self._prior_special_lognormal),
+            ("kwargs_extinction", self._prior_extinction_lognormal),
+        ]
+        kde = [
+            ("kwargs_lens", self._prior_lens_kde, self._kde_lens_list),
+            ("kwargs_source", self._prior_source_kde, self._kde_source_list),
+            (
+                "kwargs_lens_light",
+                self._prior_lens_light_kde,
+                self._kde_lens_light_list,
+            ),
+            ("kwargs_ps", self._prior_ps_kde, self._kde_ps_list),
+        ]
+        for name, prior_list in gaussian:
+            for prior in prior_list or []:
+                model_value, value, sigma = self._batch_values(
+                    kwargs_return_list, name, prior
+                )
+                dist = (model_value - value) ** 2 / sigma**2 / 2
+                logL -= np.sum(np.reshape(dist, (num, -1)), axis=1)
+        for name, prior_list in lognormal:
+            for prior in prior_list or []:
+                model_value, value, sigma = self._batch_values(
+                    kwargs_return_list, name, prior
+                )
+                dist = (np.log(model_value) - value) ** 2 / sigma**2 / 2 + model_value
+                logL -= np.sum(np.reshape(dist, (num, -1)), axis=1)
+        for name, prior_list, kde_list in kde:
+            for i, prior in enumerate(prior_list or []):
+                index, param_name, _ = prior
+                model_value = np.array(
+                    [kwargs[name][index][param_name] for kwargs in kwargs_return_list],
+                    dtype=float,
+                )
+                logL += np.log(kde_list[i].likelihood(model_value))
+        return logL
+
+    @staticmethod
+    def _batch_values(kwargs_return_list, name, prior):
+        """Collects the values of a prior parameter of several models.
+
+        :param kwargs_return_list: list of keyword argument dictionaries containing
+            'kwargs_lens', 'kwargs_source' etc.
+        :param name: name of the keyword arguments, e.g. 'kwargs_lens'
+        :param prior: [index_model, param_name, mean, 1-sigma] or [param_name, mean,
+            1-sigma] for 'kwargs_special'
+        :return: array of model values (first axis along the models), mean, 1-sigma
+        """
+        if name == "kwargs_special":
+            param_name, value, sigma = prior
+            values = [kwargs[name][param_name] for kwargs in kwargs_return_list]
+        else:
+            index, param_name, value, sigma = prior
+            values = [kwargs[name][index][param_name] for kwargs in kwargs_return_list]
+        return np.array(values, dtype=float), value, sigma
+
     @staticmethod
     def _prior_kde_list(kwargs_list, prior_list, kde_list):
         """
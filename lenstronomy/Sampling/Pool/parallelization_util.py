@@ -33,6 +33,23 @@ def sampler_logl_worker(args):
     return _SAMPLER_LIKELIHOOD_MODULE.logL(args)
 
 
+def sampler_logl_threshold_worker(args_threshold):
+    """Evaluate the log-likelihood from worker-local sampler state with early rejection
+    below a threshold (used by Likelihood.logL_batch()).
+
+    :param args_threshold: tuple of the parameter vector and the log-likelihood
+        threshold
+    :return: log-likelihood value
+    """
+    if _SAMPLER_LIKELIHOOD_MODULE is None:
+        raise RuntimeError(
+            "Worker likelihood module is not initialized. "
+            "Call set_sampler_likelihood_module before evaluating logL."
+        )
+    args, logL_threshold = args_threshold
+    return _SAMPLER_LIKELIHOOD_MODULE.logL(args, logL_threshold=logL_threshold)
+
+
 def set_nested_likelihood_module(likelihood_module, n_dims):
     """Set the nested-sampler likelihood and dimensionality on each worker.
 
@@ -0,0 +1,397 @@
+import signal
+import time
+import traceback
+
+import numpy as np
+import multiprocess
+from multiprocess import shared_memory
+
+__all__ = ["SharedMemoryPool"]
+
+
+class SharedMemoryPool(object):
+    """Persistent pool of worker processes evaluating the log likelihood of batches of
+    parameter vectors.
+
+    In contrast to MultiPool, the likelihood is not pickled with every map. Each worker
+    builds its own Likelihood() instance once from the keyword arguments of the data,
+    the model, the Param() class and the likelihood settings. The large numpy arrays of
+    the imaging data (e.g. images, noise maps and exposure maps, which the data classes
+    keep by reference) are placed in shared memory and are attached by the workers
+    without copying them. The PSF and numerics settings of the bands are sent to the
+    workers as they are, since the PSF() class keeps its own copies of the kernels. Only
+    the parameter arrays and the log likelihood values are sent through the pipes.
+
+    The batch is split in contiguous chunks of (nearly) equal size across the workers.
+    The time spent by each worker is recorded to make load imbalances visible (see
+    worker_timing).
+
+    Example::
+
+        with SharedMemoryPool(kwargs_data_joint, kwargs_model, param_class, kwargs_likelihood, processes=4) as pool:
+            logL = pool.logL_batch(args_array)
+            sampler.pso(n_particles, n_iterations, pool=pool)
+    """
+
+    def __init__(
+        self,
+        kwargs_data_joint,
+        kwargs_model,
+        param_class,
+        kwargs_likelihood=None,
+        processes=2,
+        min_shared_bytes=2**16,
+    ):
+        """
+
+        :param kwargs_data_joint: keyword arguments of the data as for the Likelihood() class
+        :param kwargs_model: keyword arguments of the model as for the Likelihood() class
+        :param param_class: Param() class instance
+        :param kwargs_likelihood: keyword arguments of the Likelihood() class (likelihood settings)
+        :param processes: int, number of worker processes
+        :param min_shared_bytes: minimal size (in bytes) of a numpy array in kwargs_data_joint to be placed in
+         shared memory (smaller arrays are sent to the workers with the specification)
+        """
+        if processes < 1:
+            raise ValueError(
+                "processes needs to be a positive integer, not %s." % processes
+            )
+        if kwargs_likelihood is None:
+            kwargs_likelihood = {}
+        self._shared_memory_list = []
+        spec = {
+            "kwargs_data_joint": self._share_data(kwargs_data_joint, min_shared_bytes),
+            "kwargs_model": kwargs_model,
+            "param_class": param_class,
+            "kwargs_likelihood": kwargs_likelihood,
+        }
+        context = multiprocess.get_context("spawn")
+        self._connections, self._processes = [], []
+        for i in range(processes):
+            connection, child_connection = context.Pipe()
+            process = context.Process(
+                target=_worker_loop, args=(child_connection, spec), daemon=True
+            )
+            process.start()
+            self._connections.append(connection)
+            self._processes.append(process)
+        self._closed = False
+        for connection in self._connections:
+            status, message = connection.recv()
+            if status == "error":
+                self.close()
+                raise RuntimeError(
+                    "SharedMemoryPool worker failed to build the likelihood:\n%s"
+                    % message
+                )
+            self.num_param, lower_limit, upper_limit = message
+            self.param_limits = (lower_limit, upper_limit)
+        self.size = processes
+        self._worker_time = np.zeros(processes)
+        self._worker_num_samples = np.zeros(processes, dtype=int)
+        self._worker_num_calls = np.zeros(processes, dtype=int)
+
+    def _share_data(self, kwargs_data_joint, min_shared_bytes):
+        """Copies the large numpy arrays of the data that the likelihood keeps by
+        reference into shared memory. Of the imaging bands [kwargs_data, kwargs_psf,
+        kwargs_numerics], only kwargs_data is shared, as the PSF() class copies its
+        kernels.
+
+        :param kwargs_data_joint: keyword arguments of the data as for the Likelihood()
+            class
+        :param min_shared_bytes: minimal size (in bytes) of an array to be shared
+        :return: kwargs_data_joint with the large arrays replaced by _SharedArray()
+            instances
+        """
+        kwargs_data_joint_shared = {}
+        for key, value in kwargs_data_joint.items():
+            if key == "multi_band_list":
+                value = [
+                    [self._share_arrays(band[0], min_shared_bytes)] + list(band[1:])
+                    for band in value
+                ]
+            else:
+                value = self._share_arrays(value, min_shared_bytes)
+            kwargs_data_joint_shared[key] = value
+        return kwargs_data_joint_shared
+
+    def _share_arrays(self, value, min_shared_bytes):
+        """Copies the large numpy arrays of a nested structure into shared memory and
+        replaces them with references to the shared memory blocks.
+
+        :param value: (nested) dict, list, tuple, numpy array or other object
+        :param min_shared_bytes: minimal size (in bytes) of an array to be shared
+        :return: value with the large arrays replaced by _SharedArray() instances
+        """
+        if isinstance(value, dict):
+            return {
+                key: self._share_arrays(item, min_shared_bytes)
+                for key, item in value.items()
+            }
+        if isinstance(value, (list, tuple)):
+            return type(value)(
+                self._share_arrays(item, min_shared_bytes) for item in value
+            )
+        if (
+            isinstance(value, np.ndarray)
+            and value.dtype != object
+            and value.nbytes >= min_shared_bytes
+        ):
+            block = shared_memory.SharedMemory(create=True, size=value.nbytes)
+            self._shared_memory_list.append(block)
+            array = np.ndarray(value.shape, dtype=value.dtype, buffer=block.buf)
+            array[...] = value
+            return _SharedArray(block.name, value.shape, value.dtype.str)
+        return value
+
+    def logL_batch(self, args_array, logL_threshold=None):
+        """Log likelihoods of a batch of parameter vectors, evaluated on the workers.
+
+        :param args_array: numpy array of shape (n_samples, n_param) of ordered
+            parameter values
+        :param logL_threshold: (optional) float or numpy array of length n_samples of
+            the log likelihoods below which the models are rejected early (see
+            Likelihood.log_likelihood())
+        :return: numpy array of log likelihoods of length n_samples
+        """
+        if self._closed is True:
+            raise RuntimeError("SharedMemoryPool is closed.")
+        args_array = np.atleast_2d(np.asarray(args_array, dtype=float))
+        if logL_threshold is not None:
+            logL_threshold = np.broadcast_to(
+                np.asarray(logL_threshold, dtype=float), len(args_array)
+            )
+        chunks = np.array_split(np.arange(len(args_array)), self.size)
+        active = []
+        for i, index in enumerate(chunks):
+            if len(index) > 0:
+                threshold = None if logL_threshold is None else logL_threshold[index]
+                self._connections[i].send(("logL", (args_array[index], threshold)))
+                active.append((i, index))
+        logL = np.zeros(len(args_array))
+        errors = []
+        for i, index in active:
+            status, result = self._connections[i].recv()
+            if status == "error":
+                errors.append(result)
+                continue
+            logL[index], time_used = result
+            self._worker_time[i] += time_used
+            self._worker_num_samples[i] += len(index)
+            self._worker_num_calls[i] += 1
+        if len(errors) > 0:
+            raise RuntimeError(
+                "SharedMemoryPool worker failed to evaluate the likelihood:\n%s"
+                % errors[0]
+            )
+        return logL
+
+    def check_likelihood(self, likelihood):
+        """Checks that the likelihood evaluated by the workers samples the same
+        parameters within the same bounds as a given likelihood (e.g. the one of the
+        Sampler() the pool is passed to).
+
+        :param likelihood: Likelihood() class instance
+        :return: None
+        :raises: ValueError if the number of parameters or the bounds differ
+        """
+        num_param = likelihood.param.num_param()[0]
+        if num_param != self.num_param:
+            raise ValueError(
+                "The SharedMemoryPool likelihood has %s parameters, the sampled likelihood %s."
+                % (self.num_param, num_param)
+            )
+        for limit, limit_pool in zip(likelihood.param_limits, self.param_limits):
+            if not np.array_equal(limit, limit_pool):
+                raise ValueError(
+                    "The SharedMemoryPool likelihood has bounds %s, the sampled likelihood %s."
+                    % (self.param_limits, likelihood.param_limits)
+                )
+
+    def logL(self, args):
+        """Log likelihood of a single parameter vector (evaluated on a worker).
+
+        :param args: ordered parameter values
+        :return: log likelihood
+        """
+        return self.logL_batch(np.atleast_2d(args))[0]
+
+    def __call__(self, args):
+        return self.logL(args)
+
+    @property
+    def worker_timing(self):
+        """Time spent in the likelihood evaluations of each worker.
+
+        :return: list of dictionaries (one per worker) with 'time' (seconds), 'num_samples' and 'num_calls'
+        """
+        return [
+            {
+                "time": float(self._worker_time[i]),
+                "num_samples": int(self._worker_num_samples[i]),
+                "num_calls": int(self._worker_num_calls[i]),
+            }
+            for i in range(self.size)
+        ]
+
+    @property
+    def load_imbalance(self):
+        """Ratio of the maximal to the mean time spent by the workers (1 for a perfectly
+        balanced load).
+
+        :return: float
+        """
+        mean_time = np.mean(self._worker_time)
+        if mean_time == 0:
+            return 1.0
+        return float(np.max(self._worker_time) / mean_time)
+
+    def reset_timing(self):
+        """Sets the timing counters of the workers to zero.
+
+        :return: None
+        """
+        self._worker_time[:] = 0
+        self._worker_num_samples[:] = 0
+        self._worker_num_calls[:] = 0
+
+    @staticmethod
+    def is_master():
+        return True
+
+    @staticmethod
+    def is_worker():
+        return False
+
+    @staticmethod
+    def enabled():
+        return True
+
+    def close(self):
+        """Stops the worker processes and releases the shared memory.
+
+        :return: None
+        """
+        if self._closed is True:
+            return
+        self._closed = True
+        for connection, process in zip(self._connections, self._processes):
+            if process.is_alive():
+                try:
+                    connection.send(("close", None))
+                except (BrokenPipeError, OSError):
+                    pass
+        for connection, process in zip(self._connections, self._processes):
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+            connection.close()
+        for block in self._shared_memory_list:
+            block.close()
+            block.unlink()
+        self._shared_memory_list = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class _SharedArray(object):
+    """Reference to a numpy array in a shared memory block."""
+
+    def __init__(self, name, shape, dtype):
+        """
+
+        :param name: name of the shared memory block
+        :param shape: shape of the array
+        :param dtype: string of the numpy data type
+        """
+        self.name = name
+        self.shape = shape
+        self.dtype = dtype
+
+    def attach(self, shared_memory_list):
+        """Read-only numpy array viewing the shared memory block.
+
+        :param shared_memory_list: list to which the opened block is appended (to keep
+            it open while the array is in use)
+        :return: numpy array
+        """
+        block = shared_memory.SharedMemory(name=self.name)
+        shared_memory_list.append(block)
+        array = np.ndarray(self.shape, dtype=np.dtype(self.dtype), buffer=block.buf)
+        array.flags.writeable = False
+        return array
+
+
+def _attach_arrays(value, shared_memory_list):
+    """Replaces the _SharedArray() references of a nested structure with the arrays in
+    shared memory.
+
+    :param value: (nested) dict, list, tuple or other object
+    :param shared_memory_list: list to which the opened blocks are appended
+    :return: value with the arrays attached
+    """
+    if isinstance(value, dict):
+        return {
+            key: _attach_arrays(item, shared_memory_list) for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return type(value)(_attach_arrays(item, shared_memory_list) for item in value)
+    if isinstance(value, _SharedArray):
+        return value.attach(shared_memory_list)
+    return value
+
+
+def _worker_loop(connection, spec):
+    """Main loop of a worker process: builds the likelihood once and evaluates batches
+    of parameter vectors until it receives the 'close' message.
+
+    :param connection: end of the pipe to the master process
+    :param spec: dictionary with the keyword arguments to build the Likelihood() class
+    :return: None
+    """
+    from lenstronomy.Sampling.likelihood import Likelihood
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    shared_memory_list = []
+    try:
+        kwargs_data_joint = _attach_arrays(
+            spec["kwargs_data_joint"], shared_memory_list
+        )
+        likelihood = Likelihood(
+            kwargs_data_joint,
+            spec["kwargs_model"],
+            spec["param_class"],
+            **spec["kwargs_likelihood"]
+        )
+    except Exception:
+        connection.send(("error", traceback.format_exc()))
+        return
+    lower_limit, upper_limit = likelihood.param_limits
+    connection.send(
+        ("ready", (likelihood.param.num_param()[0], lower_limit, upper_limit))
+    )
+    while True:
+        try:
+            message, content = connection.recv()
+        except EOFError:
+            break
+        if message == "close":
+            break
+        args_array, logL_threshold = content
+        time_start = time.perf_counter()
+        try:
+            logL = likelihood.logL_batch(args_array, logL_threshold=logL_threshold)
+        except Exception:
+            connection.send(("error", traceback.format_exc()))
+            continue
+        connection.send(("logL", (logL, time.perf_counter() - time_start)))
+    del likelihood, kwargs_data_joint
+    for block in shared_memory_list:
+        try:
+            block.close()
+        except BufferError:
+            pass
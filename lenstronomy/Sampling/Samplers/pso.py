@@ -3,12 +3,16 @@
 @authors: J. Akeret, S. Birrer, A. Shajib
 """
 
+from concurrent.futures import Future, FIRST_COMPLETED, wait
 from copy import copy
 from math import floor
 import math
+import time
 import numpy as np
 from tqdm import tqdm
 
+from lenstronomy.Util.checkpoint_util import CheckpointWriter
+
 __all__ = ["ParticleSwarmOptimizer"]
 
 
@@ -29,10 +33,22 @@ class ParticleSwarmOptimizer(object):
         object provided by ``pool`` is used for all parallelization. It
         can be any object with a ``map`` method that follows the same
         calling sequence as the built-in ``map`` function.
+    :param vectorize: if True, ``func`` is called once per iteration with the
+        positions of all particles (array of shape particle_count x number of
+        parameters) and returns an array of log probabilities.
     """
 
     def __init__(
-        self, func, low, high, particle_count=25, pool=None, args=None, kwargs=None
+        self,
+        func,
+        low,
+        high,
+        particle_count=25,
+        pool=None,
+        args=None,
+        kwargs=None,
+        vectorize=False,
+        early_rejection=False,
     ):
         """
 
@@ -52,11 +68,29 @@ class ParticleSwarmOptimizer(object):
         :param kwargs: keyword arguments to send to `func`. The function
             will be called as `func(x, *args, **kwargs)`
         :type kwargs: `dict`
+        :param vectorize: if True, `func` evaluates all particles in one call (the
+            pool is then not used to map `func`)
+        :type vectorize: bool
+        :param early_rejection: if True, `func` is called with the keyword argument
+            `logL_threshold`, the lowest fitness of the swarm in the previous
+            iteration. The evaluation of particles falling below it can stop early,
+            their fitness is then an upper bound below the threshold, which enters the
+            convergence criteria and the returned chain (requires vectorize=True)
+        :type early_rejection: bool
         """
+        if early_rejection is True and vectorize is False:
+            raise ValueError("early_rejection=True requires vectorize=True.")
         self.low = [l for l in low]
         self.high = [h for h in high]
         self.particleCount = particle_count
         self.pool = pool
+        self._vectorize = vectorize
+        self._early_rejection = early_rejection
+        self._swarm_evaluated = False
+        self._parallel_submit = False
+        self.utilization = None
+        self._iteration = 0
+        self._resume_iteration = None
 
         self.param_count = len(self.low)
 
@@ -134,8 +168,12 @@ class ParticleSwarmOptimizer(object):
         :type verbose: boolean
         """
 
-        self._get_fitness(self.swarm)
-        i = 0
+        if self._resume_iteration is None:
+            self._get_fitness(self.swarm)
+            i = 0
+        else:
+            # the fitness of the swarm restored with set_state() is already known
+            i, self._resume_iteration = self._resume_iteration, None
         while True:
             for particle in self.swarm:
                 if self.global_best.fitness < particle.fitness:
@@ -169,35 +207,14 @@ class ParticleSwarmOptimizer(object):
                     return
 
             for particle in self.swarm:
-                w = 0.5 + np.random.uniform(0, 1, size=self.param_count) / 2
-                # w=0.72
-                part_vel = w * np.array(particle.velocity)
-                cog_vel = (
-                    c1
-                    * np.random.uniform(0, 1, size=self.param_count)
-                    * (
-                        np.array(particle.personal_best.position)
-                        - np.array(particle.position)
-                    )
-                )
-                soc_vel = (
-                    c2
-                    * np.random.uniform(0, 1, size=self.param_count)
-                    * (
-                        np.array(self.global_best.position)
-                        - np.array(particle.position)
-                    )
-                )
-                particle.velocity = (part_vel + cog_vel + soc_vel).tolist()
-                particle.position = (
-                    np.array(particle.position) + np.array(particle.velocity)
-                ).tolist()
+                self._move_particle(particle, c1, c2)
 
             self._get_fitness(self.swarm)
 
             swarm = []
             for particle in self.swarm:
                 swarm.append(particle.copy())
+            self._iteration = i + 1
             yield swarm
 
             i += 1
@@ -212,6 +229,8 @@ class ParticleSwarmOptimizer(object):
         m=1e-3,
         n=1e-2,
         early_stop_tolerance=None,
+        checkpoint_filename=None,
+        checkpoint_interval=10,
     ):
         """Run the optimization and return a full list of optimization outputs.
 
@@ -224,30 +243,313 @@ class ParticleSwarmOptimizer(object):
         :param n: stop criterion, difference between norm of the particle
          vector and norm of the global best
         :param early_stop_tolerance: will terminate at the given value (should be specified as a chi^2)
+        :param checkpoint_filename: (optional) path of a checkpoint file. If the file exists, the optimization is
+         resumed from the stored state; the state is stored every checkpoint_interval iterations and at the end, where
+         it is marked as finished. A finished checkpoint returns the stored result without further iterations. A
+         checkpoint of an optimizer with different bounds, number of particles or max_iter raises a ValueError.
+        :param checkpoint_interval: number of iterations between two checkpoints
         """
         log_likelihood_list = []
         vel_list = []
         pos_list = []
 
-        num_iter = 0
+        writer = None
+        if checkpoint_filename is not None and self.is_master():
+            writer = CheckpointWriter(checkpoint_filename)
+            state = writer.load()
+            if state is not None:
+                self._check_checkpoint(state, max_iter, checkpoint_filename)
+                self.set_state(state)
+                log_likelihood_list, pos_list, vel_list = state["chain"]
+                if state["finished"] is True:
+                    return self.global_best.position, [
+                        log_likelihood_list,
+                        pos_list,
+                        vel_list,
+                    ]
+
+        num_iter = len(log_likelihood_list)
         if verbose:
             disable_tqdm = False
         else:
             disable_tqdm = True
-        with tqdm(total=max_iter, disable=disable_tqdm) as pbar:
-            for _ in self.sample(
-                max_iter, c1, c2, p, m, n, early_stop_tolerance, verbose
-            ):
-                log_likelihood_list.append(self.global_best.fitness)
-                vel_list.append(self.global_best.velocity)
-                pos_list.append(self.global_best.position)
-                num_iter += 1
-
-                if verbose and self.is_master():
-                    pbar.update(1)
+        try:
+            with tqdm(total=max_iter, initial=num_iter, disable=disable_tqdm) as pbar:
+                for _ in self.sample(
+                    max_iter, c1, c2, p, m, n, early_stop_tolerance, verbose
+                ):
+                    log_likelihood_list.append(self.global_best.fitness)
+                    vel_list.append(self.global_best.velocity)
+                    pos_list.append(self.global_best.position)
+                    num_iter += 1
+
+                    if verbose and self.is_master():
+                        pbar.update(1)
+                    if writer is not None and num_iter % checkpoint_interval == 0:
+                        writer.save(
+                            self.get_state(
+                                chain=[log_likelihood_list, pos_list, vel_list],
+                                max_iter=max_iter,
+                            )
+                        )
+            if writer is not None:
+                writer.save(
+                    self.get_state(
+                        chain=[log_likelihood_list, pos_list, vel_list],
+                        max_iter=max_iter,
+                        finished=True,
+                    )
+                )
+        finally:
+            # the last checkpoint is also written when the optimization is interrupted
+            if writer is not None:
+                writer.flush()
+
+        return self.global_best.position, [log_likelihood_list, pos_list, vel_list]
+
+    def get_state(self, chain=None, max_iter=None, finished=False):
+        """State of the optimizer from which it can be resumed (see set_state()).
+
+        :param chain: (optional) chain of the optimization so far [log likelihoods, positions, velocities]
+        :param max_iter: (optional) maximum iterations of the optimization, stored in the fingerprint
+        :param finished: bool, whether the optimization is completed
+        :return: dictionary with the swarm (positions, velocities, fitness and personal bests), the global best,
+         the number of completed iterations, the state of the numpy random number generator, the chain, the
+         fingerprint of the optimizer (bounds, number of particles and max_iter) and the finished flag
+        """
+        return {
+            "swarm": self.swarm,
+            "global_best": self.global_best,
+            "iteration": self._iteration,
+            "random_state": np.random.get_state(),
+            "chain": chain,
+            "fingerprint": self._fingerprint(max_iter),
+            "finished": finished,
+        }
+
+    def _fingerprint(self, max_iter):
+        """Settings of the optimizer a checkpoint needs to match to be resumed.
+
+        :param max_iter: maximum iterations of the optimization
+        :return: dictionary with the bounds, the number of particles and max_iter
+        """
+        return {
+            "low": np.array(self.low),
+            "high": np.array(self.high),
+            "particle_count": self.particleCount,
+            "max_iter": max_iter,
+        }
+
+    def _check_checkpoint(self, state, max_iter, filename):
+        """Checks that a checkpoint was written by an optimizer with the same bounds,
+        number of particles and maximum iterations.
+
+        :param state: dictionary as returned by get_state()
+        :param max_iter: maximum iterations of the optimization
+        :param filename: path of the checkpoint file (for the error message)
+        :return: None
+        :raises: ValueError if the checkpoint does not match
+        """
+        fingerprint = state.get("fingerprint", None)
+        expected = self._fingerprint(max_iter)
+        if (
+            fingerprint is None
+            or not np.array_equal(fingerprint["low"], expected["low"])
+            or not np.array_equal(fingerprint["high"], expected["high"])
+            or fingerprint["particle_count"] != expected["particle_count"]
+            or fingerprint["max_iter"] != expected["max_iter"]
+        ):
+            raise ValueError(
+                "The checkpoint %s was written by a PSO with different bounds, number of "
+                "particles or max_iter (%s instead of %s). Remove it to start a new "
+                "optimization." % (filename, fingerprint, expected)
+            )
+
+    def set_state(self, state):
+        """Restores the state of the optimizer (as returned by get_state()). The next
+        call of sample() or optimize() continues after the last completed iteration.
 
+        :param state: dictionary as returned by get_state()
+        :return: None
+        """
+        swarm = state["swarm"]
+        if len(swarm) != self.particleCount or swarm[0].param_count != self.param_count:
+            raise ValueError(
+                "The stored swarm with %s particles and %s parameters does not match the "
+                "optimizer with %s particles and %s parameters."
+                % (
+                    len(swarm),
+                    swarm[0].param_count,
+                    self.particleCount,
+                    self.param_count,
+                )
+            )
+        self.swarm = swarm
+        self.global_best = state["global_best"]
+        self._iteration = state["iteration"]
+        self._resume_iteration = state["iteration"]
+        self._swarm_evaluated = True
+        np.random.set_state(state["random_state"])
+
+    def optimize_async(
+        self,
+        max_iter=1000,
+        verbose=True,
+        c1=1.193,
+        c2=1.193,
+        p=0.7,
+        m=1e-3,
+        n=1e-2,
+        early_stop_tolerance=None,
+    ):
+        """Asynchronous (steady-state) version of optimize(). Each particle is moved
+        with the current global best and re-submitted as soon as its own fitness is
+        returned, without waiting for the rest of the swarm.
+
+        The particles are evaluated with the pool if it provides ``submit()`` (e.g.
+        concurrent.futures executors) or ``apply_async()`` (e.g. MultiPool), otherwise
+        in sequence. The evaluation budget is max_iter * particle_count. The
+        convergence criteria are checked (and the chain is recorded) after every
+        particle_count evaluations. The wall-clock utilization of the workers is
+        stored in the ``utilization`` attribute.
+
+        :param max_iter: maximum number of evaluations in units of particle_count
+        :param verbose: if `True`, prints the progress and the utilization
+        :param c1: cognitive weight
+        :param c2: social weight
+        :param p: stop criterion, percentage of particles to use
+        :param m: stop criterion, difference between mean fitness and global best
+        :param n: stop criterion, difference between norm of the particle
+         vector and norm of the global best
+        :param early_stop_tolerance: will terminate at the given value (should be specified as a chi^2)
+        :return: position of the global best, [log likelihoods, positions, velocities of the global best after
+         every particle_count evaluations]
+        """
+        if self._vectorize is True:
+            raise ValueError(
+                "The asynchronous PSO evaluates the particles individually and does not "
+                "support vectorize=True."
+            )
+        submit = self._submit_function()
+        max_evaluations = max_iter * self.particleCount
+        log_likelihood_list = []
+        vel_list = []
+        pos_list = []
+        num_evaluations = 0
+        evaluation_time = 0.0
+        stop = False
+        time_start = time.time()
+        pending = {}
+        for particle in self.swarm:
+            pending[submit(particle.position)] = particle
+        num_submitted = len(pending)
+        with tqdm(total=max_iter, disable=not verbose) as pbar:
+            while len(pending) > 0:
+                done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                for future in done:
+                    particle = pending.pop(future)
+                    particle.fitness, time_used = future.result()
+                    evaluation_time += time_used
+                    num_evaluations += 1
+                    if particle.fitness > particle.personal_best.fitness:
+                        particle.update_personal_best()
+                    if self.global_best.fitness < particle.fitness:
+                        self.global_best = particle.copy()
+                    if num_evaluations % self.particleCount == 0 and stop is False:
+                        log_likelihood_list.append(self.global_best.fitness)
+                        vel_list.append(self.global_best.velocity)
+                        pos_list.append(self.global_best.position)
+                        if verbose and self.is_master():
+                            pbar.update(1)
+                        it = num_evaluations // self.particleCount
+                        if self._converged(it, p=p, m=m, n=n):
+                            if verbose and self.is_master():
+                                print("Converged after {} iterations!".format(it))
+                            stop = True
+                        elif early_stop_tolerance is not None:
+                            stop = self._acceptable_convergence(early_stop_tolerance)
+                    if stop is False and num_submitted < max_evaluations:
+                        self._move_particle(particle, c1, c2)
+                        pending[submit(particle.position)] = particle
+                        num_submitted += 1
+        wall_time = time.time() - time_start
+        num_workers = getattr(self.pool, "size", 1) if self._parallel_submit else 1
+        self.utilization = {
+            "wall_time": wall_time,
+            "evaluation_time": evaluation_time,
+            "num_evaluations": num_evaluations,
+            "num_workers": num_workers,
+            "utilization": evaluation_time / max(wall_time * num_workers, 1e-300),
+        }
+        if verbose and self.is_master():
+            print(
+                "Worker utilization of the asynchronous PSO: {:.1%} of {} workers".format(
+                    self.utilization["utilization"], num_workers
+                )
+            )
         return self.global_best.position, [log_likelihood_list, pos_list, vel_list]
 
+    def _submit_function(self):
+        """Function submitting the evaluation of a single particle position.
+
+        :return: function(position) returning a concurrent.futures.Future() of (fitness, evaluation time)
+        """
+        func = _TimedFunction(self.func)
+        if self.pool is not None and hasattr(self.pool, "submit"):
+            self._parallel_submit = True
+            return lambda position: self.pool.submit(func, position)
+        if self.pool is not None and hasattr(self.pool, "apply_async"):
+            self._parallel_submit = True
+
+            def submit(position):
+                future = Future()
+                self.pool.apply_async(
+                    func,
+                    (position,),
+                    callback=future.set_result,
+                    error_callback=future.set_exception,
+                )
+                return future
+
+            return submit
+        self._parallel_submit = False
+
+        def submit(position):
+            future = Future()
+            try:
+                future.set_result(func(position))
+            except Exception as exception:
+                future.set_exception(exception)
+            return future
+
+        return submit
+
+    def _move_particle(self, particle, c1, c2):
+        """Updates the velocity and position of a particle.
+
+        :param particle: Particle() instance
+        :param c1: cognitive weight
+        :param c2: social weight
+        :return: None
+        """
+        w = 0.5 + np.random.uniform(0, 1, size=self.param_count) / 2
+        # w=0.72
+        part_vel = w * np.array(particle.velocity)
+        cog_vel = (
+            c1
+            * np.random.uniform(0, 1, size=self.param_count)
+            * (np.array(particle.personal_best.position) - np.array(particle.position))
+        )
+        soc_vel = (
+            c2
+            * np.random.uniform(0, 1, size=self.param_count)
+            * (np.array(self.global_best.position) - np.array(particle.position))
+        )
+        particle.velocity = (part_vel + cog_vel + soc_vel).tolist()
+        particle.position = (
+            np.array(particle.position) + np.array(particle.velocity)
+        ).tolist()
+
     def _get_fitness(self, swarm):
         """Set fitness (probability) of the particles in swarm.
 
@@ -257,15 +559,31 @@ class ParticleSwarmOptimizer(object):
         :rtype:
         """
         position = [particle.position for particle in swarm]
-        if self.pool is None:
-            map_func = map
+        if self._early_rejection is True:
+            # the first evaluation of the swarm is done in full
+            if self._swarm_evaluated is True:
+                logL_threshold = min([particle.fitness for particle in swarm])
+            else:
+                logL_threshold = -np.inf
+            ln_probability = list(
+                self.func(
+                    np.array(position),
+                    logL_threshold=np.full(len(position), logL_threshold),
+                )
+            )
+        elif self._vectorize is True:
+            ln_probability = list(self.func(np.array(position)))
         else:
-            map_func = self.pool.map
-        ln_probability = list(map_func(self.func, position))
+            if self.pool is None:
+                map_func = map
+            else:
+                map_func = self.pool.map
+            ln_probability = list(map_func(self.func, position))
 
         for i, particle in enumerate(swarm):
             particle.fitness = ln_probability[i]
             particle.position = position[i]
+        self._swarm_evaluated = True
 
     def _converged(self, it, p, m, n):
         """Check for convergence.
@@ -449,6 +767,19 @@ class Particle(object):
         return self.__str__()
 
 
+class _TimedFunction(object):
+    """Wraps a function to also return the time spent in its evaluation (pickleable for
+    the evaluation in worker processes)."""
+
+    def __init__(self, f):
+        self.f = f
+
+    def __call__(self, x):
+        time_start = time.perf_counter()
+        value = self.f(x)
+        return value, time.perf_counter() - time_start
+
+
 class _FunctionWrapper(object):
     """This is a hack to make the likelihood function pickleable when ``args`` or
     ``kwargs`` are also included.
@@ -468,9 +799,9 @@ class _FunctionWrapper(object):
     def __setstate__(self, state):
         self.__dict__ = state
 
-    def __call__(self, x):
+    def __call__(self, x, **kwargs):
         try:
-            return self.f(x, *self.args, **self.kwargs)
+            return self.f(x, *self.args, **self.kwargs, **kwargs)
         except:  # pragma: no cover
             import traceback
 
@@ -8,7 +8,12 @@ from lenstronomy.Sampling.Likelihoods.flux_ratio_likelihood import FluxRatioLike
 from lenstronomy.Sampling.Likelihoods.prior_likelihood import PriorLikelihood
 from lenstronomy.Sampling.Likelihoods.kinematic_2D_likelihood import KinLikelihood
 import lenstronomy.Util.class_creator as class_creator
+from lenstronomy.Sampling.Pool.parallelization_util import (
+    sampler_logl_worker,
+    sampler_logl_threshold_worker,
+)
 import numpy as np
+import time
 
 __all__ = ["Likelihood"]
 
@@ -177,6 +182,45 @@ class Likelihood(object):
         self._kwargs_flux_compute = kwargs_flux_compute
         self._check_bounds = check_bounds
         self._custom_logL_addition = custom_logL_addition
+        # likelihood terms in the order of their evaluation, the cheap terms first
+        self._term_list = []
+        if custom_logL_addition is not None:
+            self._term_list.append("custom")
+        self._term_list += ["prior", "position"]
+        if time_delay_likelihood is True:
+            self._term_list.append("time_delay")
+        if flux_ratio_likelihood is True:
+            self._term_list.append("flux_ratio")
+        if kinematic_2d_likelihood is True:
+            self._term_list.append("kinematic_2d")
+        if image_likelihood is True:
+            self._term_list.append("image")
+        if tracer_likelihood is True:
+            # the tracer likelihood uses the linear parameters of the imaging likelihood
+            self._term_list.append("tracer")
+        # terms that can not be positive, such that the running log likelihood does not increase with them (the
+        # early rejection only skips terms that all have this upper bound)
+        self._term_nonpositive = {
+            "custom": False,
+            "prior": not any(
+                [
+                    prior_lens_kde,
+                    prior_source_kde,
+                    prior_lens_light_kde,
+                    prior_ps_kde,
+                    prior_special_kde,
+                    prior_extinction_kde,
+                ]
+            ),
+            "position": True,
+            "time_delay": not bimodal_time_delay_measurement,
+            "flux_ratio": True,
+            "kinematic_2d": True,
+            "image": source_marg is False
+            and all(_diagonal_likelihood(band[0]) for band in multi_band_list),
+            "tracer": tracer_data is None or _diagonal_likelihood(tracer_data[0]),
+        }
+        self.reset_term_stats()
         self._kwargs_time_delay = {
             "time_delays_measured": time_delays_measured,
             "time_delays_uncertainties": time_delays_uncertainties,
@@ -336,7 +380,7 @@ class Likelihood(object):
     def __call__(self, a):
         return self.logL(a)
 
-    def logL(self, args, verbose=False):
+    def logL(self, args, verbose=False, logL_threshold=None):
         """Routine to compute X2 given variable parameters for a MCMC/PSO chain.
 
         :param args: ordered parameter values that are being sampled
@@ -344,6 +388,9 @@ class Likelihood(object):
         :param verbose: if True, makes print statements about individual likelihood
             components
         :type verbose: boolean
+        :param logL_threshold: (optional) log likelihood below which the sampler rejects
+            the model, see log_likelihood()
+        :type logL_threshold: float or None
         :returns: log likelihood of the data given the model (natural logarithm)
         """
         if self._check_bounds is True:
@@ -354,11 +401,95 @@ class Likelihood(object):
                 return -(10**18)
         # extract parameters
         kwargs_return = self.param.args2kwargs(args)
-        return self.log_likelihood(kwargs_return, verbose=verbose)
+        return self.log_likelihood(
+            kwargs_return, verbose=verbose, logL_threshold=logL_threshold
+        )
 
-    def log_likelihood(self, kwargs_return, verbose=False):
+    def logL_batch(self, args_array, pool=None, logL_threshold=None):
+        """Log likelihoods of a batch of parameter vectors (e.g. all walkers of an
+        ensemble sampler or all particles of a swarm).
+
+        The bound check is evaluated in vectorized form across the batch. Without a
+        pool, the priors are evaluated in vectorized form as well and the remaining
+        likelihood terms of the parameter vectors within the bounds in sequence. With a
+        pool, the parameter vectors within the bounds are mapped to workers set up with
+        set_sampler_likelihood_module() which evaluate the full logL() each, such that
+        the master does not convert the parameters.
+
+        :param args_array: numpy array of shape (n_samples, n_param) of ordered
+            parameter values
+        :param pool: None (sequential evaluation) or pool with a map() method
+        :param logL_threshold: (optional) float or numpy array of length n_samples of
+            the log likelihoods below which the sampler rejects the models, see
+            log_likelihood()
+        :return: numpy array of log likelihoods of length n_samples
         """
+        args_array = np.atleast_2d(np.asarray(args_array, dtype=float))
+        logL = np.full(len(args_array), -float(10**18))
+        if self._check_bounds is True:
+            inside = ~self.check_bounds_batch(
+                args_array, self._lower_limit, self._upper_limit
+            )
+        else:
+            inside = np.ones(len(args_array), dtype=bool)
+        if logL_threshold is None:
+            threshold_array = None
+        else:
+            threshold_array = np.broadcast_to(
+                np.asarray(logL_threshold, dtype=float), len(logL)
+            )[inside]
+        if pool is not None:
+            if threshold_array is None:
+                logL_list = pool.map(sampler_logl_worker, list(args_array[inside]))
+            else:
+                logL_list = pool.map(
+                    sampler_logl_threshold_worker,
+                    list(zip(args_array[inside], threshold_array)),
+                )
+            logL[inside] = np.array(list(logL_list), dtype=float)
+            return logL
+        kwargs_return_list = [
+            self.param.args2kwargs(args) for args in args_array[inside]
+        ]
+        time_start = time.perf_counter()
+        logL_prior = self._prior_likelihood.logL_batch(kwargs_return_list)
+        self._add_term_stats("prior", time.perf_counter() - time_start, len(logL_prior))
+        if threshold_array is None:
+            threshold_list = [None] * len(kwargs_return_list)
+        else:
+            # the priors are added after the remaining terms
+            threshold_list = list(threshold_array - logL_prior)
+        logL_model = [
+            self.log_likelihood(
+                kwargs_return, include_prior=False, logL_threshold=threshold
+            )
+            for kwargs_return, threshold in zip(kwargs_return_list, threshold_list)
+        ]
+        logL_model = np.array(logL_model, dtype=float)
+        # as in log_likelihood(), the prior is not added when the custom likelihood rejected the model
+        logL[inside] = np.where(
+            logL_model > -(10**18), logL_model + logL_prior, logL_model
+        )
+        return logL
 
+    def log_likelihood(
+        self, kwargs_return, verbose=False, include_prior=True, logL_threshold=None
+    ):
+        """Log likelihood of a model. The likelihood terms are evaluated in the order of
+        their computational cost: the custom likelihood, the priors and the point source
+        position penalties first, the imaging likelihood (and the tracer likelihood
+        depending on it) last.
+
+        When a logL_threshold is provided (e.g. the lowest fitness of the swarm in the
+        previous PSO iteration), the remaining terms are skipped as soon as the running
+        log likelihood drops below the threshold, provided that none of the remaining
+        terms can be positive. The returned value is then the partial sum, which is an
+        upper bound of the full log likelihood and below the threshold, such that the
+        sampler rejects the model as it would with the full evaluation. Terms that can
+        be positive (custom likelihoods, KDE priors, bimodal time delays, the
+        'interferometry_natwt' likelihood or the marginalization over the linear
+        parameters with source_marg=True) are always evaluated. The evaluation time and
+        the number of calls and skips of each term are recorded (see term_stats).
 
         :param kwargs_return: need to contain 'kwargs_lens', 'kwargs_source', 'kwargs_lens_light', 'kwargs_ps',
          'kwargs_special'. These entries themselves are lists of keyword argument of the parameters entering the model
@@ -366,80 +497,152 @@ class Likelihood(object):
         :type kwargs_return: keyword arguments
         :param verbose: if True, makes print statements about individual likelihood components
         :type verbose: boolean
+        :param include_prior: if False, the priors are not added (e.g. when evaluated separately for a batch)
+        :type include_prior: boolean
+        :param logL_threshold: (optional) log likelihood below which the remaining likelihood terms are skipped
+        :type logL_threshold: float or None
 
         :returns:
          - logL (float) log likelihood of the data given the model (natural logarithm)
         """
-        kwargs_lens, kwargs_source, kwargs_lens_light, kwargs_ps, kwargs_special = (
-            kwargs_return.get("kwargs_lens", {}),
-            kwargs_return.get("kwargs_source", {}),
-            kwargs_return.get("kwargs_lens_light", {}),
-            kwargs_return.get("kwargs_ps", {}),
-            kwargs_return.get("kwargs_special", {}),
-        )
+        kwargs_special = kwargs_return.get("kwargs_special", {})
         # kwargs_tracer_source = kwargs_return["kwargs_tracer_source"]
         # update model instance in case of changes affecting it (i.e. redshift sampling in multi-plane)
         self._update_model(kwargs_special)
         # generate image and computes likelihood
         self._reset_point_source_cache(bool_input=True)
         logL = 0
+        param = None
+        for i, name in enumerate(self._term_list):
+            if name == "prior" and include_prior is False:
+                continue
+            # so that custom logL may return -1e18 instead of -inf
+            if logL <= -(10**18) or (
+                logL_threshold is not None
+                and logL < logL_threshold
+                and self._remaining_terms_nonpositive(i, include_prior)
+            ):
+                for name_skip in self._term_list[i:]:
+                    if name_skip != "prior" or include_prior is True:
+                        self._term_skips[name_skip] += 1
+                break
+            time_start = time.perf_counter()
+            logL_term, param = self._log_likelihood_term(
+                name, kwargs_return, param, verbose=verbose
+            )
+            self._add_term_stats(name, time.perf_counter() - time_start)
+            logL += logL_term
+        self._reset_point_source_cache(bool_input=False)
+        return logL  # , None
 
-        # computing custom loglikelihood function first so that the full
-        # likelihood evaluation is skipped if it returns -inf
-        if self._custom_logL_addition is not None:
-            logL_cond = self._custom_logL_addition(**kwargs_return)
-            logL += logL_cond
-            if verbose is True:
-                print("custom added logL = %s" % logL_cond)
+    def _remaining_terms_nonpositive(self, index, include_prior=True):
+        """Whether all the likelihood terms from an index on are bounded from above by
+        zero, such that the partial sum of the preceding terms is an upper bound of the
+        log likelihood.
 
-        if logL > -(10**18):  # so that custom logL may return -1e18 instead of -inf
-            logL_prior = self._prior_likelihood.logL(**kwargs_return)
-            logL += logL_prior
-            if verbose is True:
-                print("Prior likelihood = %s" % logL_prior)
+        :param index: index of the first remaining term in the evaluation order
+        :param include_prior: if False, the priors are not part of the remaining terms
+        :return: bool
+        """
+        return all(
+            self._term_nonpositive[name]
+            for name in self._term_list[index:]
+            if name != "prior" or include_prior is True
+        )
 
-            if self._image_likelihood is True:
-                logL_image, param = self.image_likelihood.logL(**kwargs_return)
-                logL += logL_image
-                if verbose is True:
-                    print("image logL = %s" % logL_image)
-            else:
-                param = None
+    def _log_likelihood_term(self, name, kwargs_return, param, verbose=False):
+        """Evaluates a single term of the log likelihood.
 
-            if self._time_delay_likelihood is True:
-                logL_time_delay = self.time_delay_likelihood.logL(
-                    kwargs_lens, kwargs_ps, kwargs_special
-                )
-                logL += logL_time_delay
-                if verbose is True:
-                    print("time-delay logL = %s" % logL_time_delay)
-            if self._flux_ratio_likelihood is True:
-                ra_image_list, dec_image_list = self.PointSource.image_position(
-                    kwargs_ps=kwargs_ps, kwargs_lens=kwargs_lens
-                )
-                logL_flux_ratios = self.flux_ratio_likelihood.logL(
-                    ra_image_list, dec_image_list, kwargs_lens, kwargs_special
-                )
-                logL += logL_flux_ratios
-                if verbose is True:
-                    print("flux ratio logL = %s" % logL_flux_ratios)
-            if self._kinematic_2D_likelihood is True:
-                logL_kinematic_2d = self.kinematic_2D_likelihood.logL(
-                    kwargs_lens, kwargs_lens_light, kwargs_special
-                )
-                logL += logL_kinematic_2d
-                if verbose is True:
-                    print("kinematic logL = %s" % logL_kinematic_2d)
-            logL += self._position_likelihood.logL(
+        :param name: name of the term (see term_stats)
+        :param kwargs_return: keyword arguments of the model
+        :param param: linear parameters of the imaging likelihood (or None)
+        :param verbose: if True, makes print statements about the likelihood term
+        :return: log likelihood of the term, linear parameters of the imaging likelihood
+        """
+        kwargs_lens = kwargs_return.get("kwargs_lens", {})
+        kwargs_lens_light = kwargs_return.get("kwargs_lens_light", {})
+        kwargs_ps = kwargs_return.get("kwargs_ps", {})
+        kwargs_special = kwargs_return.get("kwargs_special", {})
+        if name == "custom":
+            logL = self._custom_logL_addition(**kwargs_return)
+            if verbose is True:
+                print("custom added logL = %s" % logL)
+        elif name == "prior":
+            logL = self._prior_likelihood.logL(**kwargs_return)
+            if verbose is True:
+                print("Prior likelihood = %s" % logL)
+        elif name == "position":
+            logL = self._position_likelihood.logL(
                 kwargs_lens, kwargs_ps, kwargs_special, verbose=verbose
             )
-            if self._tracer_likelihood is True:
-                logL_tracer = self.tracer_likelihood.logL(param=param, **kwargs_return)
-                if verbose is True:
-                    print("tracer logL = %s" % logL_tracer)
-                logL += logL_tracer
-            self._reset_point_source_cache(bool_input=False)
-        return logL  # , None
+        elif name == "time_delay":
+            logL = self.time_delay_likelihood.logL(
+                kwargs_lens, kwargs_ps, kwargs_special
+            )
+            if verbose is True:
+                print("time-delay logL = %s" % logL)
+        elif name == "flux_ratio":
+            ra_image_list, dec_image_list = self.PointSource.image_position(
+                kwargs_ps=kwargs_ps, kwargs_lens=kwargs_lens
+            )
+            logL = self.flux_ratio_likelihood.logL(
+                ra_image_list, dec_image_list, kwargs_lens, kwargs_special
+            )
+            if verbose is True:
+                print("flux ratio logL = %s" % logL)
+        elif name == "kinematic_2d":
+            logL = self.kinematic_2D_likelihood.logL(
+                kwargs_lens, kwargs_lens_light, kwargs_special
+            )
+            if verbose is True:
+                print("kinematic logL = %s" % logL)
+        elif name == "image":
+            logL, param = self.image_likelihood.logL(**kwargs_return)
+            if verbose is True:
+                print("image logL = %s" % logL)
+        else:
+            logL = self.tracer_likelihood.logL(param=param, **kwargs_return)
+            if verbose is True:
+                print("tracer logL = %s" % logL)
+        return logL, param
+
+    def _add_term_stats(self, name, time_used, num_calls=1):
+        """Adds an evaluation of a likelihood term to the statistics.
+
+        :param name: name of the term
+        :param time_used: evaluation time (seconds)
+        :param num_calls: number of models evaluated
+        :return: None
+        """
+        self._term_time[name] += time_used
+        self._term_calls[name] += num_calls
+
+    @property
+    def term_stats(self):
+        """Evaluation statistics of the likelihood terms in the order of their
+        evaluation (evaluations in worker processes of a pool are not included).
+
+        :return: dictionary {term name: {'time': seconds, 'calls': int, 'skips': int}}
+            with the total evaluation time, the number of evaluations and the number of
+            evaluations skipped by an early rejection
+        """
+        return {
+            name: {
+                "time": self._term_time[name],
+                "calls": self._term_calls[name],
+                "skips": self._term_skips[name],
+            }
+            for name in self._term_list
+        }
+
+    def reset_term_stats(self):
+        """Sets the evaluation statistics of the likelihood terms to zero.
+
+        :return: None
+        """
+        self._term_time = {name: 0.0 for name in self._term_list}
+        self._term_calls = {name: 0 for name in self._term_list}
+        self._term_skips = {name: 0 for name in self._term_list}
 
     @staticmethod
     def check_bounds(args, lowerLimit, upperLimit, verbose=False):
@@ -460,6 +663,22 @@ class Likelihood(object):
                 return penalty, bound_hit
         return penalty, bound_hit
 
+    @staticmethod
+    def check_bounds_batch(args_array, lowerLimit, upperLimit):
+        """Checks which parameter vectors of a batch have left their bounds.
+
+        :param args_array: numpy array of shape (n_samples, n_param)
+        :param lowerLimit: lower bounds of the parameters
+        :param upperLimit: upper bounds of the parameters
+        :return: bool array of length n_samples, True if a bound is hit
+        """
+        args_array = np.atleast_2d(args_array)
+        return np.any(
+            (args_array < np.asarray(lowerLimit))
+            | (args_array > np.asarray(upperLimit)),
+            axis=1,
+        )
+
     @property
     def num_data(self):
         """
@@ -478,6 +697,18 @@ class Likelihood(object):
             num_data += self.tracer_likelihood.num_data
         return num_data
 
+    @property
+    def component_cache_stats(self):
+        """Hit and miss counters of the memoized model components of the imaging
+        likelihood.
+
+        :return: dictionary {component name: {'hits': int, 'misses': int}} (empty
+            without imaging likelihood)
+        """
+        if self._image_likelihood is True:
+            return self.image_likelihood.component_cache_stats
+        return {}
+
     @property
     def param_limits(self):
         return self._lower_limit, self._upper_limit
@@ -574,3 +805,14 @@ class Likelihood(object):
                 kwargs_tracer=self._kwargs_tracer,
             )
         # TODO remove redundancies with Param() calls updates
+
+
+def _diagonal_likelihood(kwargs_data):
+    """Whether the imaging likelihood of the data is the diagonal chi^2 likelihood,
+    which is bounded from above by zero (in contrast to e.g. the 'interferometry_natwt'
+    likelihood).
+
+    :param kwargs_data: keyword arguments of the ImageData() class
+    :return: bool
+    """
+    return kwargs_data.get("likelihood_method", "diagonal") == "diagonal"
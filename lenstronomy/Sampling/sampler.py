@@ -1,6 +1,7 @@
 __author__ = ["sibirrer", "ajshajib", "dgilman", "nataliehogg"]
 
 import time
+from functools import partial
 
 import numpy as np
 from lenstronomy.Sampling.Samplers.pso import ParticleSwarmOptimizer
@@ -31,6 +32,8 @@ class Sampler(object):
         """
         self.chain = likelihood_class
         self.lower_limit, self.upper_limit = self.chain.param_limits
+        # worker utilization of the last asynchronous PSO (see ParticleSwarmOptimizer.optimize_async())
+        self.pso_utilization = None
         # Keep the worker-local log-likelihood state in sync on ranks that construct this class.
         set_sampler_likelihood_module(self.chain)
 
@@ -52,6 +55,23 @@ class Sampler(object):
         pool = choose_pool(mpi=mpi, processes=threadCount)
         return pool, self.chain.logL
 
+    def _pool_and_logl_batch(self, mpi, threadCount, pool=None):
+        """Build a pool and return the log-likelihood callable evaluating a batch of
+        parameter vectors (see Likelihood.logL_batch()), mapping the model
+        evaluations with the pool if it is parallel.
+
+        A given pool with its own logL_batch() method (e.g. SharedMemoryPool) is
+        used as is, after checking that its likelihood samples the same parameters
+        within the same bounds as the likelihood of the sampler.
+        """
+        if pool is not None:
+            pool.check_likelihood(self.chain)
+            return pool, pool.logL_batch
+        pool, _ = self._pool_and_logl(mpi=mpi, threadCount=threadCount)
+        if mpi or threadCount != 1:
+            return pool, partial(self.chain.logL_batch, pool=pool)
+        return pool, self.chain.logL_batch
+
     def simplex(self, init_pos, n_iterations, method, print_key="SIMPLEX"):
         """
 
@@ -94,6 +114,11 @@ class Sampler(object):
         mpi=False,
         print_key="PSO",
         verbose=True,
+        pool=None,
+        asynchronous=False,
+        checkpoint_filename=None,
+        checkpoint_interval=10,
+        early_rejection=False,
     ):
         """Return the best fit for the lens model on catalogue basis with particle swarm
         optimizer.
@@ -110,9 +135,40 @@ class Sampler(object):
         :param mpi: bool, if True, makes instance of MPIPool to allow for MPI execution
         :param print_key: string, prints the process name in the progress bar (optional)
         :param verbose: suppress or turn on print statements
+        :param pool: (optional) SharedMemoryPool instance evaluating the likelihood
+            in its worker processes (mpi and threadCount are then ignored). Its
+            likelihood needs to have the same parameters and bounds as the one of the
+            sampler, otherwise a ValueError is raised.
+        :param asynchronous: bool, if True, runs the asynchronous PSO (see
+            ParticleSwarmOptimizer.optimize_async()) in which each particle is moved
+            and re-submitted as soon as its own likelihood is evaluated (not supported
+            with MPI or a given pool). The worker utilization is then stored in the
+            pso_utilization attribute.
+        :param checkpoint_filename: (optional) path of a checkpoint file. If the file
+            exists, the PSO is resumed from the stored swarm (not supported with the
+            asynchronous PSO)
+        :param checkpoint_interval: number of iterations between two checkpoints
+        :param early_rejection: bool, if True, the remaining likelihood terms of a
+            particle are skipped once its running log likelihood drops below the lowest
+            fitness of the swarm in the previous iteration (see
+            Likelihood.log_likelihood(), not supported with the asynchronous PSO). A
+            rejected particle carries the partial sum of the evaluated terms as its
+            fitness, an upper bound of its log likelihood, which enters the convergence
+            criteria and the returned chain.
         :return: kwargs_result (of best fit), [lnlikelihood of samples, positions of
             samples, velocity of samples])
         """
+        if asynchronous is True and (mpi is True or pool is not None):
+            raise ValueError(
+                "The asynchronous PSO is only supported with threadCount processes of a "
+                "local pool, not with MPI or a given pool."
+            )
+        if asynchronous is True and checkpoint_filename is not None:
+            raise ValueError("Checkpoints are not supported with the asynchronous PSO.")
+        if asynchronous is True and early_rejection is True:
+            raise ValueError(
+                "The early rejection is not supported with the asynchronous PSO."
+            )
         if lower_start is None or upper_start is None:
             lower_start, upper_start = np.array(self.lower_limit), np.array(
                 self.upper_limit
@@ -122,13 +178,24 @@ class Sampler(object):
             lower_start = np.maximum(lower_start, self.lower_limit)
             upper_start = np.minimum(upper_start, self.upper_limit)
 
-        pool, logl_function = self._pool_and_logl(mpi=mpi, threadCount=threadCount)
+        if asynchronous is True:
+            pool, logl_function = self._pool_and_logl(mpi=mpi, threadCount=threadCount)
+        else:
+            pool, logl_function = self._pool_and_logl_batch(
+                mpi=mpi, threadCount=threadCount, pool=pool
+            )
 
         if mpi is True and pool.is_master():
             print("MPI option chosen for PSO.")
 
         pso = ParticleSwarmOptimizer(
-            logl_function, lower_start, upper_start, n_particles, pool=pool
+            logl_function,
+            lower_start,
+            upper_start,
+            n_particles,
+            pool=pool,
+            vectorize=not asynchronous,
+            early_rejection=early_rejection,
         )
 
         if init_pos is None:
@@ -141,9 +208,18 @@ class Sampler(object):
 
         time_start = time.time()
 
-        result, [log_likelihood_list, pos_list, vel_list] = pso.optimize(
-            n_iterations, verbose=verbose
-        )
+        if asynchronous is True:
+            result, [log_likelihood_list, pos_list, vel_list] = pso.optimize_async(
+                n_iterations, verbose=verbose
+            )
+        else:
+            result, [log_likelihood_list, pos_list, vel_list] = pso.optimize(
+                n_iterations,
+                verbose=verbose,
+                checkpoint_filename=checkpoint_filename,
+                checkpoint_interval=checkpoint_interval,
+            )
+        self.pso_utilization = pso.utilization
 
         if pool.is_master():
             kwargs_return = self.chain.param.args2kwargs(result)
@@ -174,6 +250,7 @@ class Sampler(object):
         initpos=None,
         backend_filename=None,
         start_from_backend=False,
+        pool=None,
     ):
         """Run MCMC with emcee. For details, please have a look at the documentation of
         the emcee packager.
@@ -201,6 +278,10 @@ class Sampler(object):
         :param start_from_backend: if True, start from the state saved in `backup_filename`.
          Otherwise, create a new backup file with name `backup_filename` (any already existing file is overwritten!).
         :type start_from_backend: bool
+        :param pool: (optional) SharedMemoryPool instance evaluating the likelihood in its worker processes
+         (mpi and threadCount are then ignored). Its likelihood needs to have the same parameters and bounds as the
+         one of the sampler, otherwise a ValueError is raised.
+        :type pool: None or SharedMemoryPool
         :return: samples, ln likelihood value of samples
         :rtype: numpy 2d array, numpy 1d array
         """
@@ -216,7 +297,9 @@ class Sampler(object):
                 size=n_walkers,
             )
 
-        pool, logl_function = self._pool_and_logl(mpi=mpi, threadCount=threadCount)
+        pool, logl_function = self._pool_and_logl_batch(
+            mpi=mpi, threadCount=threadCount, pool=pool
+        )
 
         if backend_filename is not None:
             backend = emcee.backends.HDFBackend(
@@ -246,8 +329,9 @@ class Sampler(object):
 
         time_start = time.time()
 
+        # the walkers are evaluated in one call, parallelized within the likelihood
         sampler = emcee.EnsembleSampler(
-            n_walkers, num_param, logl_function, pool=pool, backend=backend
+            n_walkers, num_param, logl_function, backend=backend, vectorize=True
         )
 
         sampler.run_mcmc(initpos, n_run_eff, progress=progress)
@@ -0,0 +1,166 @@
+import os
+import pickle
+import threading
+
+from lenstronomy.Util.package_util import exporter
+
+export, __all__ = exporter()
+
+
+@export
+def save_checkpoint(filename, state):
+    """Writes a checkpoint atomically: the state is written to a temporary file which
+    then replaces the checkpoint, such that an interrupted write never corrupts an
+    existing checkpoint.
+
+    :param filename: path of the checkpoint file
+    :param state: pickleable object
+    :return: None
+    """
+    _write_atomic(filename, pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+@export
+def load_checkpoint(filename):
+    """Reads a checkpoint written with save_checkpoint() or CheckpointWriter.
+
+    :param filename: path of the checkpoint file
+    :return: stored state, or None if the file does not exist
+    """
+    if filename is None or not os.path.exists(filename):
+        return None
+    with open(filename, "rb") as f:
+        return pickle.load(f)
+
+
+@export
+def remove_checkpoint(filename):
+    """Deletes a checkpoint file (if it exists).
+
+    :param filename: path of the checkpoint file
+    :return: None
+    """
+    if filename is not None and os.path.exists(filename):
+        os.remove(filename)
+
+
+@export
+class CheckpointWriter(object):
+    """Writes checkpoints in a background thread.
+
+    The state is serialized in the calling thread (such that the checkpoint is a
+    consistent snapshot) and the file is written atomically in a background thread,
+    such that the evaluation loop is not stalled by the disk. When a new checkpoint is
+    saved while the previous one is still being written, only the most recent pending
+    checkpoint is written.
+    """
+
+    def __init__(self, filename):
+        """
+
+        :param filename: path of the checkpoint file
+        """
+        self._filename = filename
+        self._condition = threading.Condition()
+        self._pending = None
+        self._writing = False
+        self._error = None
+        self._running = False
+
+    @property
+    def filename(self):
+        """
+
+        :return: path of the checkpoint file
+        """
+        return self._filename
+
+    def save(self, state):
+        """Serializes the state and hands it to the background thread for writing.
+
+        :param state: pickleable object
+        :return: None
+        """
+        data = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._condition:
+            self._raise_error()
+            self._pending = data
+            if self._running is False:
+                self._running = True
+                threading.Thread(target=self._run, daemon=True).start()
+
+    def load(self):
+        """
+
+        :return: stored state, or None if the file does not exist
+        """
+        self.flush()
+        return load_checkpoint(self._filename)
+
+    def flush(self):
+        """Waits until all pending checkpoints are written.
+
+        :return: None
+        """
+        with self._condition:
+            while self._pending is not None or self._writing:
+                self._condition.wait()
+            self._raise_error()
+
+    def remove(self):
+        """Waits for pending writes and deletes the checkpoint file.
+
+        :return: None
+        """
+        self.flush()
+        remove_checkpoint(self._filename)
+
+    def _run(self):
+        """Loop of the background thread writing the pending checkpoints.
+
+        :return: None
+        """
+        while True:
+            with self._condition:
+                if self._pending is None:
+                    self._running = False
+                    return
+                data, self._pending = self._pending, None
+                self._writing = True
+            try:
+                _write_atomic(self._filename, data)
+            except Exception as error:
+                self._error = error
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+    def _raise_error(self):
+        """Raises the error of a failed background write (once).
+
+        :return: None
+        """
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+
+def _write_atomic(filename, data):
+    """Writes bytes to a temporary file in the same directory and moves it in place.
+
+    :param filename: path of the file
+    :param data: bytes
+    :return: None
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    os.makedirs(directory, exist_ok=True)
+    filename_temp = "%s.tmp%i" % (filename, os.getpid())
+    try:
+        with open(filename_temp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(filename_temp, filename)
+    finally:
+        if os.path.exists(filename_temp):
+            os.remove(filename_temp)
@@ -0,0 +1,163 @@
+__author__ = "sibirrer"
+
+import os
+import numpy as np
+from lenstronomy.Conf import config_loader
+
+fft_conf = config_loader.fft_conf()
+
+try:
+    import pyfftw
+except ImportError:
+    pyfftw = None
+
+__all__ = ["FFTBackend"]
+
+_backend_list = ["numpy", "scipy", "pyfftw"]
+
+
+class FFTBackend(object):
+    """Real-valued n-dimensional FFTs with a selectable backend.
+
+    - 'numpy': np.fft (single-threaded)
+    - 'scipy': scipy.fft with a number of worker threads
+    - 'pyfftw': pre-planned pyFFTW transforms with a number of threads. Plans are
+      re-used for transforms of the same shape. If a wisdom file is set, the FFTW wisdom
+      is loaded from it and saved to it whenever a transform of a new shape is planned,
+      such that the planning only happens once. Falls back to 'scipy' if pyFFTW is not
+      installed.
+
+    The default settings are read from the 'fft' section of the lenstronomy
+    configuration file.
+    """
+
+    def __init__(self, backend=None, workers=None, wisdom_file=None):
+        """
+
+        :param backend: string, 'numpy', 'scipy' or 'pyfftw'; if None, uses the
+            configuration file
+        :param workers: int, number of threads (-1 for all cores); if None, uses the
+            configuration file
+        :param wisdom_file: (only 'pyfftw') path to the FFTW wisdom file; if None, uses
+            the configuration file
+        """
+        if backend is None:
+            backend = fft_conf["backend"]
+        if workers is None:
+            workers = fft_conf["workers"]
+        if wisdom_file is None:
+            wisdom_file = fft_conf["wisdom_file"]
+        if backend not in _backend_list:
+            raise ValueError(
+                "FFT backend %s not supported! Chose among %s."
+                % (backend, _backend_list)
+            )
+        if backend == "pyfftw" and pyfftw is None:
+            backend = "scipy"
+        if workers == -1:
+            workers = os.cpu_count()
+        self._backend = backend
+        self._workers = int(workers)
+        self._wisdom_file = wisdom_file
+        self._plans = {}
+        if backend == "pyfftw" and wisdom_file is not None:
+            load_wisdom(wisdom_file)
+
+    @property
+    def backend(self):
+        """Name of the backend in use.
+
+        :return: string
+        """
+        return self._backend
+
+    def rfftn(self, a, s, axes):
+        """N-dimensional FFT of a real array.
+
+        :param a: real input array
+        :param s: shape (length of each transformed axis) of the output
+        :param axes: axes over which to compute the FFT
+        :return: complex array
+        """
+        if self._backend == "numpy":
+            return np.fft.rfftn(a, s, axes=axes)
+        elif self._backend == "scipy":
+            import scipy.fft
+
+            return scipy.fft.rfftn(a, s, axes=axes, workers=self._workers)
+        return self._plan("rfftn", a, s, axes)(a).copy()
+
+    def irfftn(self, a, s, axes):
+        """Inverse of rfftn().
+
+        :param a: complex input array
+        :param s: shape (length of each transformed axis) of the output
+        :param axes: axes over which to compute the inverse FFT
+        :return: real array
+        """
+        if self._backend == "numpy":
+            return np.fft.irfftn(a, s, axes=axes)
+        elif self._backend == "scipy":
+            import scipy.fft
+
+            return scipy.fft.irfftn(a, s, axes=axes, workers=self._workers)
+        return self._plan("irfftn", a, s, axes)(a).copy()
+
+    def save_wisdom(self):
+        """Saves the FFTW wisdom accumulated by the planned transforms to the wisdom
+        file (only relevant for the 'pyfftw' backend).
+
+        :return: None
+        """
+        if self._backend == "pyfftw" and self._wisdom_file is not None:
+            save_wisdom(self._wisdom_file)
+
+    def _plan(self, transform, a, s, axes):
+        """Returns the pre-planned pyFFTW transform for arrays of the shape and dtype
+        of a, planned at the first call.
+
+        :param transform: 'rfftn' or 'irfftn'
+        :param a: input array
+        :param s: shape of the transformed axes
+        :param axes: axes of the transform
+        :return: pyfftw.FFTW instance
+        """
+        key = (transform, a.shape, a.dtype.str, tuple(s), tuple(axes))
+        plan = self._plans.get(key, None)
+        if plan is None:
+            builder = getattr(pyfftw.builders, transform)
+            plan = builder(
+                pyfftw.empty_aligned(a.shape, dtype=a.dtype),
+                s=s,
+                axes=axes,
+                threads=self._workers,
+                planner_effort="FFTW_MEASURE",
+            )
+            self._plans[key] = plan
+            self.save_wisdom()
+        return plan
+
+
+def load_wisdom(wisdom_file):
+    """Loads FFTW wisdom from a file (if it exists) into pyFFTW.
+
+    :param wisdom_file: path to the wisdom file
+    :return: None
+    """
+    if os.path.exists(wisdom_file):
+        import pickle
+
+        with open(wisdom_file, "rb") as file:
+            pyfftw.import_wisdom(pickle.load(file))
+
+
+def save_wisdom(wisdom_file):
+    """Saves the accumulated FFTW wisdom of pyFFTW to a file.
+
+    :param wisdom_file: path to the wisdom file
+    :return: None
+    """
+    import pickle
+
+    with open(wisdom_file, "wb") as file:
+        pickle.dump(pyfftw.export_wisdom(), file)
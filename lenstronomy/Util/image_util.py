@@ -217,7 +217,7 @@ def coord_in_image(x_coord, y_coord, num_pix, delta_pix):
 def re_size(image, factor=1):
     """Re-sizes image with nx x ny to nx/factor x ny/factor.
 
-    :param image: 2d image with shape (nx,ny)
+    :param image: 2d image with shape (nx,ny) (or stack of images with shape (n, nx, ny))
     :param factor: integer >=1
     :return:
     """
@@ -226,9 +226,13 @@ def re_size(image, factor=1):
     elif factor == 1:
         return image
     f = int(factor)
-    nx, ny = np.shape(image)
+    nx, ny = np.shape(image)[-2:]
     if int(nx / f) == nx / f and int(ny / f) == ny / f:
-        small = image.reshape([int(nx / f), f, int(ny / f), f]).mean(3).mean(1)
+        small = (
+            image.reshape(list(np.shape(image)[:-2]) + [int(nx / f), f, int(ny / f), f])
+            .mean(-1)
+            .mean(-2)
+        )
         return small
     else:
         raise ValueError(
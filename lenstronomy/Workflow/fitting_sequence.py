@@ -12,6 +12,8 @@ from lenstronomy.Sampling.Samplers.polychord_sampler import DyPolyChordSampler
 from lenstronomy.Sampling.Samplers.dynesty_sampler import DynestySampler
 from lenstronomy.Sampling.Samplers.nautilus_sampler import NautilusSampler
 from lenstronomy.Sampling.Samplers.cobaya_sampler import CobayaSampler
+from lenstronomy.ImSim.component_cache import merge_stats
+from lenstronomy.Util.checkpoint_util import CheckpointWriter, remove_checkpoint
 import numpy as np
 import lenstronomy.Util.analysis_util as analysis_util
 
@@ -71,6 +73,10 @@ class FittingSequence(object):
         self._mcmc_init_samples = None
         self._psf_iteration_memory = []
         self._psf_iteration_index = 0  # index of the sequence of the PSF iteration (how many times it is being run)
+        self._likelihood_class = None
+        self._component_cache_stats = {}
+        # worker utilization of the last asynchronous PSO (see Sampler.pso())
+        self.pso_utilization = None
 
     @property
     def kwargs_fixed(self):
@@ -80,17 +86,39 @@ class FittingSequence(object):
         """
         return self._updateManager.fixed_kwargs
 
-    def fit_sequence(self, fitting_list):
+    def fit_sequence(
+        self, fitting_list, checkpoint_filename=None, checkpoint_interval=10
+    ):
         """
 
         :param fitting_list: list of [['string', {kwargs}], ..] with 'string being the specific fitting option and
          kwargs being the arguments passed to this option
+        :param checkpoint_filename: (optional) path of a checkpoint file. The state of the FittingSequence is stored
+         after each completed step. If the file exists, the completed steps are skipped and the sequence is resumed
+         from the stored state. PSO steps additionally store their swarm in the file '<checkpoint_filename>_step<i>'
+         every checkpoint_interval iterations and resume from it.
+        :param checkpoint_interval: number of PSO iterations between two checkpoints of the swarm
         :return: fitting results
         """
         chain_list = []
+        fitting_types = [fitting[0] for fitting in fitting_list]
+        index_start = 0
+        writer = None
+        if checkpoint_filename is not None:
+            writer = CheckpointWriter(checkpoint_filename)
+            state = writer.load()
+            if state is not None:
+                chain_list, index_start = self._set_checkpoint_state(
+                    state, fitting_types
+                )
+            if not self._is_master():
+                writer = None
         for i, fitting in enumerate(fitting_list):
+            if i < index_start:
+                continue
             fitting_type = fitting[0]
             kwargs = fitting[1]
+            checkpoint_filename_step = None
 
             if fitting_type in [
                 "PSO",
@@ -129,6 +157,13 @@ class FittingSequence(object):
                 self.flux_calibration(**kwargs)
 
             elif fitting_type == "PSO":
+                if checkpoint_filename is not None:
+                    checkpoint_filename_step = "%s_step%i" % (checkpoint_filename, i)
+                    kwargs = dict(
+                        kwargs,
+                        checkpoint_filename=checkpoint_filename_step,
+                        checkpoint_interval=checkpoint_interval,
+                    )
                 kwargs_result, chain, param = self.pso(**kwargs)
                 self._updateManager.update_param_state(**kwargs_result)
 
@@ -221,8 +256,68 @@ class FittingSequence(object):
                     "'align_images'".format(fitting_type)
                 )
 
+            if writer is not None:
+                writer.save(self._checkpoint_state(chain_list, fitting_types[: i + 1]))
+                writer.flush()
+                remove_checkpoint(checkpoint_filename_step)
+
         return chain_list
 
+    def _checkpoint_state(self, chain_list, fitting_types):
+        """State of the FittingSequence after the completed steps of a fitting sequence.
+        The data and the update manager are stored together, such that references
+        between them are preserved.
+
+        :param chain_list: list of the outputs of the completed steps
+        :param fitting_types: list of the fitting types of the completed steps
+        :return: dictionary
+        """
+        return {
+            "fitting_types": fitting_types,
+            "chain_list": chain_list,
+            "update_manager": self._updateManager,
+            "kwargs_data_joint": self.kwargs_data_joint,
+            "multi_band_list": self.multi_band_list,
+            "mcmc_init_samples": self._mcmc_init_samples,
+            "psf_iteration_memory": self._psf_iteration_memory,
+            "psf_iteration_index": self._psf_iteration_index,
+            "random_state": np.random.get_state(),
+        }
+
+    def _set_checkpoint_state(self, state, fitting_types):
+        """Restores the state of the FittingSequence from a checkpoint.
+
+        :param state: dictionary as returned by _checkpoint_state()
+        :param fitting_types: list of the fitting types of the fitting sequence to be resumed
+        :return: list of the outputs of the completed steps, index of the next step
+        """
+        fitting_types_done = state["fitting_types"]
+        if fitting_types[: len(fitting_types_done)] != fitting_types_done:
+            raise ValueError(
+                "The checkpoint of the fitting sequence %s does not match the fitting sequence %s."
+                % (fitting_types_done, fitting_types)
+            )
+        self._updateManager = state["update_manager"]
+        self.kwargs_data_joint = state["kwargs_data_joint"]
+        self.multi_band_list = state["multi_band_list"]
+        self._mcmc_init_samples = state["mcmc_init_samples"]
+        self._psf_iteration_memory = state["psf_iteration_memory"]
+        self._psf_iteration_index = state["psf_iteration_index"]
+        self._likelihood_class = None
+        np.random.set_state(state["random_state"])
+        return state["chain_list"], len(fitting_types_done)
+
+    def _is_master(self):
+        """
+
+        :return: bool, False for the MPI processes other than rank 0
+        """
+        if self._mpi is True:
+            from mpi4py import MPI
+
+            return MPI.COMM_WORLD.Get_rank() == 0
+        return True
+
     def best_fit(self, bijective=False):
         """
 
@@ -290,8 +385,30 @@ class FittingSequence(object):
         likelihood_class = Likelihood(
             self.kwargs_data_joint, kwargs_model, self.param_class, **kwargs_likelihood
         )
+        if self._likelihood_class is not None:
+            self._component_cache_stats = merge_stats(
+                [
+                    self._component_cache_stats,
+                    self._likelihood_class.component_cache_stats,
+                ]
+            )
+        self._likelihood_class = likelihood_class
         return likelihood_class
 
+    @property
+    def component_cache_stats(self):
+        """Hit and miss counters of the memoized model components accumulated over all
+        likelihood evaluations of the fitting sequence in this process (evaluations in
+        worker processes of a pool are not included).
+
+        :return: dictionary {component name: {'hits': int, 'misses': int}}
+        """
+        if self._likelihood_class is None:
+            return dict(self._component_cache_stats)
+        return merge_stats(
+            [self._component_cache_stats, self._likelihood_class.component_cache_stats]
+        )
+
     def simplex(self, n_iterations, method="Nelder-Mead"):
         """Downhill simplex optimization using the Nelder-Mead algorithm.
 
@@ -413,7 +530,16 @@ class FittingSequence(object):
         return output
 
     def pso(
-        self, n_particles, n_iterations, sigma_scale=1, print_key="PSO", threadCount=1
+        self,
+        n_particles,
+        n_iterations,
+        sigma_scale=1,
+        print_key="PSO",
+        threadCount=1,
+        asynchronous=False,
+        checkpoint_filename=None,
+        checkpoint_interval=10,
+        early_rejection=False,
     ):
         """Particle Swarm Optimization.
 
@@ -423,6 +549,16 @@ class FittingSequence(object):
             width in the initial settings
         :param print_key: string, printed text when executing this routine
         :param threadCount: number of CPU threads. If MPI option is set, threadCount=1
+        :param asynchronous: bool, if True, each particle is moved and re-evaluated as
+            soon as its own likelihood is returned (see Sampler.pso())
+        :param checkpoint_filename: (optional) path of a checkpoint file of the swarm,
+            the PSO is resumed from it if the file exists
+        :param checkpoint_interval: number of iterations between two checkpoints
+        :param early_rejection: bool, if True, the remaining likelihood terms of a
+            particle are skipped once its running log likelihood drops below the lowest
+            fitness of the swarm in the previous iteration. A rejected particle carries
+            the partial sum (an upper bound of its log likelihood) as its fitness (see
+            Sampler.pso())
         :return: result of the best fit, the PSO chain of the best fit parameter after
             each iteration [lnlikelihood, parameters, velocities], list of parameters in
             same order as in chain
@@ -455,7 +591,12 @@ class FittingSequence(object):
             mpi=self._mpi,
             print_key=print_key,
             verbose=self._verbose,
+            asynchronous=asynchronous,
+            checkpoint_filename=checkpoint_filename,
+            checkpoint_interval=checkpoint_interval,
+            early_rejection=early_rejection,
         )
+        self.pso_utilization = sampler.pso_utilization
         kwargs_result = param_class.args2kwargs(result, bijective=True)
         return kwargs_result, chain, param_list
 
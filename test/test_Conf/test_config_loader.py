@@ -17,5 +17,12 @@ def test_conventions_conf():
     assert "sersic_major_axis" in conf
 
 
+def test_fft_conf():
+    conf = config_loader.fft_conf()
+    assert "backend" in conf
+    assert "workers" in conf
+    assert "wisdom_file" in conf
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 import numpy.testing as npt
 
 from lenstronomy.Cosmo.background import Background
@@ -35,6 +36,51 @@ class TestCosmoProp(object):
         d_xy_interp = bkg_interp.d_xy(z_observer=0.1, z_source=0.8)
         npt.assert_almost_equal(d_xy_interp / d_xy, 1, decimal=5)
 
+    def test_T_xy_table(self):
+        from astropy.cosmology import FlatLambdaCDM
+
+        T_xy = self.bkg.T_xy_table(self.z_L, self.z_S)
+        npt.assert_almost_equal(T_xy, self.bkg.T_xy(self.z_L, self.z_S), decimal=8)
+        assert self.bkg.T_xy_table(self.z_L, self.z_S) == T_xy
+        for z in range(20):
+            self.bkg.T_xy_table(0, 0.1 + z * 0.1)
+        npt.assert_almost_equal(
+            self.bkg.T_xy_table(0, 1.5), self.bkg.T_xy(0, 1.5), decimal=8
+        )
+
+        # setting a new cosmology invalidates the table
+        self.bkg.cosmo = FlatLambdaCDM(H0=80, Om0=0.3, Ob0=0.05)
+        npt.assert_almost_equal(
+            self.bkg.T_xy_table(self.z_L, self.z_S),
+            self.bkg.T_xy(self.z_L, self.z_S),
+            decimal=8,
+        )
+        assert self.bkg.T_xy_table(self.z_L, self.z_S) != T_xy
+
+    def test_distances_batch(self):
+        from astropy.cosmology import wCDM
+
+        H0 = np.array([65, 70, 75])
+        Om0 = np.array([0.25, 0.3, 0.35])
+        Ok0 = np.array([-0.05, 0, 0.1])
+        w0 = np.array([-0.9, -1, -1.1])
+        z_lens = np.array([0.3, 0.5, 0.8, 0.5])
+        z_source = np.array([1.0, 2.0, 3.0, 1.5])
+        dd, ds, dds, ddt = self.bkg.distances_batch(
+            z_lens, z_source, H0=H0, Om0=Om0, Ok0=Ok0, w0=w0, max_elements=100
+        )
+        assert ddt.shape == (3, 4)
+        for i in range(3):
+            cosmo = wCDM(H0=H0[i], Om0=Om0[i], Ode0=1 - Om0[i] - Ok0[i], w0=w0[i])
+            bkg = Background(cosmo)
+            npt.assert_almost_equal(dd[i] / bkg.d_xy(0, z_lens), 1, decimal=8)
+            npt.assert_almost_equal(ds[i] / bkg.d_xy(0, z_source), 1, decimal=8)
+            npt.assert_almost_equal(dds[i] / bkg.d_xy(z_lens, z_source), 1, decimal=8)
+            npt.assert_almost_equal(ddt[i] / bkg.ddt(z_lens, z_source), 1, decimal=8)
+
+        dd, ds, dds, ddt = self.bkg.distances_batch(self.z_L, self.z_S, H0=70, Om0=0.3)
+        npt.assert_almost_equal(ddt / self.bkg.ddt(self.z_L, self.z_S), 1, decimal=5)
+
 
 if __name__ == "__main__":
     pytest.main()
@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+import numpy.testing as npt
+import unittest
+from astropy.cosmology import FlatLambdaCDM, LambdaCDM, w0waCDM, Planck18
+from lenstronomy.Cosmo.cosmo_numpy import CosmoNumpy
+from lenstronomy.Cosmo.background import Background
+
+
+class TestCosmoNumpy(object):
+    def setup_method(self):
+        self.z1 = np.linspace(0, 2, 20)
+        self.z2 = self.z1 + 0.7
+        self.cosmo_list = [
+            FlatLambdaCDM(H0=70, Om0=0.3),
+            FlatLambdaCDM(H0=70, Om0=0.3, Tcmb0=2.725),
+            LambdaCDM(H0=70, Om0=0.3, Ode0=0.6),
+            LambdaCDM(H0=70, Om0=0.3, Ode0=0.8),
+            w0waCDM(H0=70, Om0=0.3, Ode0=0.7, w0=-0.9, wa=0.2),
+        ]
+
+    def test_angular_diameter_distance(self):
+        for cosmo in self.cosmo_list:
+            cosmo_numpy = CosmoNumpy(cosmo=cosmo)
+            d_xy = cosmo.angular_diameter_distance_z1z2(self.z1, self.z2).value
+            d_xy_numpy = cosmo_numpy.angular_diameter_distance(self.z1, self.z2).value
+            npt.assert_almost_equal(d_xy_numpy / d_xy, 1, decimal=6)
+
+            d = cosmo.angular_diameter_distance(self.z2).value
+            d_numpy = cosmo_numpy.angular_diameter_distance(self.z2).value
+            npt.assert_almost_equal(d_numpy / d, 1, decimal=6)
+
+            npt.assert_almost_equal(
+                cosmo_numpy.efunc(self.z2), cosmo.efunc(self.z2), decimal=8
+            )
+            npt.assert_almost_equal(
+                cosmo_numpy.hubble_distance.value,
+                cosmo.hubble_distance.value,
+                decimal=6,
+            )
+            npt.assert_almost_equal(cosmo_numpy.H(0).value, cosmo.H(0).value, decimal=8)
+
+    def test_einstein_de_sitter(self):
+        cosmo_numpy = CosmoNumpy(H0=70, Om0=1)
+        cosmo = LambdaCDM(H0=70, Om0=1, Ode0=0)
+        npt.assert_almost_equal(
+            cosmo_numpy.d_xy(0, self.z2)
+            / cosmo.angular_diameter_distance(self.z2).value,
+            1,
+            decimal=8,
+        )
+
+    def test_parameter_arrays(self):
+        H0 = np.array([[60], [70], [80]])
+        Om0 = np.array([[0.25], [0.3], [0.35]])
+        w0 = np.array([[-1], [-0.9], [-1.1]])
+        z = np.array([0.5, 1, 3])
+        for Ok0 in [0, 0.1]:
+            d_xy = CosmoNumpy(H0=H0, Om0=Om0, Ok0=Ok0).d_xy(0.3, z)
+            d_xy_w = CosmoNumpy(H0=H0, Om0=Om0, Ok0=Ok0, w0=w0).d_xy(0.3, z)
+            assert d_xy.shape == (3, 3)
+            for i in range(3):
+                cosmo = LambdaCDM(H0=H0[i, 0], Om0=Om0[i, 0], Ode0=1 - Om0[i, 0] - Ok0)
+                d_astropy = cosmo.angular_diameter_distance_z1z2(0.3, z).value
+                npt.assert_almost_equal(d_xy[i] / d_astropy, 1, decimal=6)
+                cosmo_w = w0waCDM(
+                    H0=H0[i, 0], Om0=Om0[i, 0], Ode0=1 - Om0[i, 0] - Ok0, w0=w0[i, 0]
+                )
+                d_astropy = cosmo_w.angular_diameter_distance_z1z2(0.3, z).value
+                npt.assert_almost_equal(d_xy_w[i] / d_astropy, 1, decimal=6)
+
+    def test_table_extension(self):
+        cosmo = LambdaCDM(H0=70, Om0=0.3, Ode0=0.6)
+        cosmo_numpy = CosmoNumpy(cosmo=cosmo, z_stop=1, num_interp=1000)
+        d_xy = cosmo_numpy.d_xy(0, 0.5)
+        npt.assert_almost_equal(
+            d_xy / cosmo.angular_diameter_distance(0.5).value, 1, decimal=6
+        )
+        d_xy = cosmo_numpy.d_xy(0, 5)
+        npt.assert_almost_equal(
+            d_xy / cosmo.angular_diameter_distance(5).value, 1, decimal=6
+        )
+
+    def test_background(self):
+        cosmo = FlatLambdaCDM(H0=70, Om0=0.3)
+        bkg = Background(cosmo)
+        bkg_numpy = Background(cosmo, numpy_engine=True)
+        npt.assert_almost_equal(bkg_numpy.d_xy(0.5, 2) / bkg.d_xy(0.5, 2), 1, decimal=8)
+        npt.assert_almost_equal(bkg_numpy.ddt(0.5, 2) / bkg.ddt(0.5, 2), 1, decimal=8)
+        npt.assert_almost_equal(bkg_numpy.rho_crit / bkg.rho_crit, 1, decimal=8)
+        npt.assert_almost_equal(
+            bkg_numpy.rho_crit_z(1) / bkg.rho_crit_z(1), 1, decimal=8
+        )
+
+    def test_background_massive_neutrinos(self):
+        bkg = Background(Planck18)
+        bkg_numpy = Background(Planck18, numpy_engine=True)
+        for z in [0.5, 1, 2, 5]:
+            npt.assert_almost_equal(bkg_numpy.d_xy(0, z) / bkg.d_xy(0, z), 1, decimal=7)
+            npt.assert_almost_equal(
+                bkg_numpy.d_xy(0.3, z) / bkg.d_xy(0.3, z), 1, decimal=7
+            )
+        z = np.linspace(0, 5, 20)
+        npt.assert_almost_equal(bkg_numpy.cosmo.efunc(z), Planck18.efunc(z), decimal=10)
+
+
+class TestRaise(unittest.TestCase):
+    def test_raise(self):
+        with self.assertRaises(ValueError):
+            Background(FlatLambdaCDM(H0=70, Om0=0.3), interp=True, numpy_engine=True)
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -24,6 +24,13 @@ class TestLensCosmo(object):
         npt.assert_almost_equal(self.lensCosmo.dd, 1548.7055203661785, decimal=8)
         npt.assert_almost_equal(self.lensCosmo.dds, 892.0038749095863, decimal=8)
 
+    def test_distances_batch(self):
+        dd, ds, dds, ddt = self.lensCosmo.distances_batch(H0=[70, 70], Om0=0.3)
+        npt.assert_almost_equal(dd, self.lensCosmo.dd, decimal=6)
+        npt.assert_almost_equal(ds, self.lensCosmo.ds, decimal=6)
+        npt.assert_almost_equal(dds, self.lensCosmo.dds, decimal=6)
+        npt.assert_almost_equal(ddt, self.lensCosmo.ddt, decimal=6)
+
     def test_epsilon_crit(self):
         npt.assert_almost_equal(self.lensCosmo.sigma_crit / 1.9121e15, 1, decimal=3)
 
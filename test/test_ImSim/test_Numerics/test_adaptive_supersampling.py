@@ -0,0 +1,188 @@
+import numpy as np
+import numpy.testing as npt
+import pytest
+import unittest
+
+import lenstronomy.Util.simulation_util as sim_util
+from lenstronomy.Data.imaging_data import ImageData
+from lenstronomy.Data.psf import PSF
+from lenstronomy.Data.pixel_grid import PixelGrid
+from lenstronomy.LensModel.lens_model import LensModel
+from lenstronomy.LightModel.light_model import LightModel
+from lenstronomy.ImSim.image_model import ImageModel
+from lenstronomy.ImSim.image_linear_solve import ImageLinearFit
+from lenstronomy.ImSim.Numerics.adaptive_supersampling import AdaptiveSupersampling
+from lenstronomy.Util import kernel_util
+
+
+class TestAdaptiveSupersampling(object):
+    def setup_method(self):
+        self.background_rms = 0.05
+        kwargs_data = sim_util.data_configure_simple(
+            num_pix=60, delta_pix=0.05, exposure_time=100, background_rms=0.05
+        )
+        self.data_class = ImageData(**kwargs_data)
+        kernel = kernel_util.kernel_gaussian(num_pix=11, delta_pix=0.05, fwhm=0.1)
+        self.psf_class = PSF(psf_type="PIXEL", kernel_point_source=kernel)
+        self.lens_model = LensModel(["SIE", "SHEAR"])
+        self.kwargs_lens = [
+            {"theta_E": 1.0, "e1": 0.1, "e2": 0, "center_x": 0, "center_y": 0},
+            {"gamma1": 0.02, "gamma2": 0.01},
+        ]
+        self.source_model = LightModel(["SERSIC_ELLIPSE"])
+        self.kwargs_source = [
+            {
+                "amp": 200,
+                "R_sersic": 0.05,
+                "n_sersic": 2,
+                "e1": 0.1,
+                "e2": 0,
+                "center_x": 0.05,
+                "center_y": 0.02,
+            }
+        ]
+        self.lens_light_model = LightModel(["SERSIC"])
+        self.kwargs_lens_light = [
+            {"amp": 100, "R_sersic": 0.3, "n_sersic": 3, "center_x": 0, "center_y": 0}
+        ]
+        self.adaptive = AdaptiveSupersampling(
+            pixel_grid=self.data_class,
+            lens_model=self.lens_model,
+            source_model=self.source_model,
+            lens_light_model=self.lens_light_model,
+            flux_tolerance=0.1 * self.background_rms,
+            supersampling_factor=8,
+        )
+
+    def _image_model(self, kwargs_numerics, image_class=ImageModel):
+        return image_class(
+            self.data_class,
+            self.psf_class,
+            self.lens_model,
+            self.source_model,
+            self.lens_light_model,
+            kwargs_numerics=kwargs_numerics,
+        )
+
+    def test_update(self):
+        assert self.adaptive.num_evaluations == 60**2
+        updated = self.adaptive.update(
+            self.kwargs_lens, self.kwargs_source, self.kwargs_lens_light
+        )
+        assert updated is True
+        factors = self.adaptive.supersampling_factors
+        assert np.max(factors) == 8
+        assert np.min(factors) == 1
+        assert set(np.unique(factors)).issubset({1, 2, 4, 8})
+        # the lensed arcs need more super-sampling than the outskirts
+        assert factors[0, 0] == 1
+        assert 0.5 < self.adaptive.evaluation_savings < 1
+        assert self.adaptive.num_evaluations_uniform == 60**2 * 64
+
+        # changes below the update tolerance do not trigger a re-evaluation
+        kwargs_lens = [dict(self.kwargs_lens[0], theta_E=1.001), self.kwargs_lens[1]]
+        updated = self.adaptive.update(
+            kwargs_lens, self.kwargs_source, self.kwargs_lens_light
+        )
+        assert updated is False
+        assert self.adaptive.num_updates == 1
+        kwargs_lens = [dict(self.kwargs_lens[0], theta_E=1.2), self.kwargs_lens[1]]
+        updated = self.adaptive.update(
+            kwargs_lens, self.kwargs_source, self.kwargs_lens_light
+        )
+        assert updated is True
+        assert self.adaptive.num_updates == 2
+        self.adaptive.update(
+            kwargs_lens, self.kwargs_source, self.kwargs_lens_light, force=True
+        )
+        assert self.adaptive.num_updates == 3
+
+    def test_surface_brightness_gradient(self):
+        # without lensing and lens light, the gradient is the one of the source profile
+        adaptive = AdaptiveSupersampling(
+            pixel_grid=self.data_class,
+            lens_model=LensModel([]),
+            source_model=LightModel(["GAUSSIAN"]),
+            flux_tolerance=1,
+        )
+        kwargs_source = [{"amp": 1, "sigma": 0.5, "center_x": 0, "center_y": 0}]
+        gradient = adaptive.surface_brightness_gradient([], kwargs_source)
+        x, y = self.data_class.pixel_coordinates
+        r = np.sqrt(x**2 + y**2).flatten()
+        flux = LightModel(["GAUSSIAN"]).surface_brightness(
+            x.flatten(), y.flatten(), kwargs_source
+        )
+        npt.assert_almost_equal(gradient, flux * r / 0.5**2, decimal=4)
+
+    def test_image_model(self):
+        image_reference = self._image_model({"supersampling_factor": 16}).image(
+            self.kwargs_lens, self.kwargs_source, self.kwargs_lens_light
+        )
+        image_uniform = self._image_model({"supersampling_factor": 8}).image(
+            self.kwargs_lens, self.kwargs_source, self.kwargs_lens_light
+        )
+        image_model = self._image_model(
+            {"compute_mode": "adaptive_auto", "supersampling_factor": 8}
+        )
+        image_adaptive = image_model.image(
+            self.kwargs_lens, self.kwargs_source, self.kwargs_lens_light
+        )
+        error_uniform = np.max(np.abs(image_uniform - image_reference))
+        error_adaptive = np.max(np.abs(image_adaptive - image_reference))
+        assert error_adaptive < 1.1 * error_uniform
+        adaptive = image_model.adaptive_supersampling
+        assert adaptive.evaluation_savings > 0.5
+        num_evaluate = len(image_model.ImageNumerics.coordinates_evaluate[0])
+        assert num_evaluate == adaptive.num_evaluations
+
+        # the factors depend on the solved linear amplitudes
+        image_linear_fit = self._image_model(
+            {"compute_mode": "adaptive_auto", "supersampling_factor": 8},
+            image_class=ImageLinearFit,
+        )
+        self.data_class.update_data(image_reference)
+        kwargs_source = [dict(self.kwargs_source[0], amp=1)]
+        kwargs_lens_light = [dict(self.kwargs_lens_light[0], amp=1)]
+        model, _, _, param = image_linear_fit.image_linear_solve(
+            self.kwargs_lens, kwargs_source, kwargs_lens_light
+        )
+        npt.assert_almost_equal(param[0] / 200, 1, decimal=2)
+        factors = image_linear_fit.adaptive_supersampling.supersampling_factors
+        assert np.mean(factors == adaptive.supersampling_factors) > 0.98
+        updated = image_model.update_adaptive_supersampling(
+            self.kwargs_lens, self.kwargs_source, self.kwargs_lens_light
+        )
+        assert updated is False
+
+
+class TestRaise(unittest.TestCase):
+    def test_raise(self):
+        pixel_grid = PixelGrid(
+            nx=10, ny=10, transform_pix2angle=np.eye(2), ra_at_xy_0=0, dec_at_xy_0=0
+        )
+        with self.assertRaises(ValueError):
+            AdaptiveSupersampling(
+                pixel_grid, LensModel([]), LightModel([]), supersampling_factor=2.0
+            )
+        with self.assertRaises(ValueError):
+            ImageModel(
+                pixel_grid,
+                PSF(),
+                kwargs_numerics={"compute_mode": "adaptive_auto"},
+            )
+        kwargs_psf = {"psf_type": "PIXEL", "kernel_point_source": np.ones((3, 3))}
+        with self.assertRaises(ValueError):
+            ImageModel(
+                pixel_grid,
+                PSF(**kwargs_psf),
+                kwargs_numerics={
+                    "compute_mode": "adaptive_auto",
+                    "supersampling_factor": 2,
+                    "supersampling_convolution": True,
+                    "adaptive_flux_tolerance": 0.1,
+                },
+            )
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -6,6 +6,7 @@ from lenstronomy.ImSim.Numerics.convolution import (
     MultiGaussianConvolution,
     PixelKernelConvolution,
     SubgridKernelConvolution,
+    TiledKernelConvolution,
     MGEConvolution,
 )
 from lenstronomy.LightModel.light_model import LightModel
@@ -29,6 +30,22 @@ class TestPixelKernelConvolution(object):
         image_convolved = pixel_conv.convolution2d(self.model)
         npt.assert_almost_equal(np.sum(image_convolved), np.sum(self.model), decimal=2)
 
+    def test_convolve_stack(self):
+        kernel = np.zeros((5, 5))
+        kernel[1, 2] = 0.6
+        kernel[2, 2] = 0.4
+        image_stack = np.array([self.model, self.model.T, self.model**2])
+        for convolution_type in ["fft_static", "fft", "grid"]:
+            pixel_conv = PixelKernelConvolution(
+                kernel=kernel, convolution_type=convolution_type
+            )
+            image_conv_stack = pixel_conv.convolution2d(image_stack)
+            assert image_conv_stack.shape == image_stack.shape
+            for i, image in enumerate(image_stack):
+                npt.assert_almost_equal(
+                    image_conv_stack[i], pixel_conv.convolution2d(image), decimal=10
+                )
+
     def test_copy_transpose(self):
         kernel = np.zeros((3, 3))
         kernel[1, 1] = 1
@@ -94,6 +111,63 @@ class TestPixelKernelConvolution(object):
         npt.assert_almost_equal(np.sum(model_conv_1d * y), 0, decimal=5)
 
 
+class TestTiledKernelConvolution(object):
+    def setup_method(self):
+        np.random.seed(42)
+        self.kernel = np.random.rand(7, 5)
+        x, y = util.make_grid(100, delta_pix=1)
+        r = np.sqrt(x**2 + y**2)
+        self.image = util.array2image(np.exp(-(r**2) / 200) * (r < 30))
+        self.mask = util.array2image((r > 10) & (r < 20))
+
+    def test_convolution2d(self):
+        image_conv = PixelKernelConvolution(self.kernel).convolution2d(self.image)
+        for tile_size in [None, 10, 200]:
+            tiled_conv = TiledKernelConvolution(self.kernel, tile_size=tile_size)
+            npt.assert_almost_equal(
+                tiled_conv.convolution2d(self.image), image_conv, decimal=10
+            )
+        # zero input footprint is skipped
+        num_computed, num_tiles = tiled_conv.num_tiles
+        assert num_computed == num_tiles == 1
+        tiled_conv = TiledKernelConvolution(self.kernel, tile_size=10)
+        tiled_conv.convolution2d(self.image)
+        assert tiled_conv.compute_fraction < 1
+
+        tiled_conv = TiledKernelConvolution(
+            self.kernel, compute_indexes=self.mask, tile_size=10
+        )
+        image_conv_tiled = tiled_conv.convolution2d(self.image)
+        npt.assert_almost_equal(image_conv_tiled, image_conv * self.mask, decimal=10)
+        num_computed, num_tiles = tiled_conv.num_tiles
+        assert num_computed < num_tiles
+        npt.assert_almost_equal(tiled_conv.compute_fraction, num_computed / num_tiles)
+        image_conv_tiled = tiled_conv.re_size_convolve(np.zeros_like(self.image))
+        npt.assert_equal(image_conv_tiled, 0)
+        assert tiled_conv.compute_fraction == 0
+
+    def test_convolve_stack(self):
+        image_stack = np.array([self.image, self.image.T, np.zeros_like(self.image)])
+        tiled_conv = TiledKernelConvolution(
+            self.kernel, compute_indexes=self.mask, tile_size=16
+        )
+        image_conv_stack = tiled_conv.convolution2d(image_stack)
+        for i, image in enumerate(image_stack):
+            npt.assert_almost_equal(
+                image_conv_stack[i], tiled_conv.convolution2d(image), decimal=10
+            )
+
+    def test_pixel_kernel(self):
+        tiled_conv = TiledKernelConvolution(self.kernel)
+        npt.assert_equal(tiled_conv.pixel_kernel(), self.kernel)
+        assert len(tiled_conv.pixel_kernel(num_pix=3)) == 3
+
+    def test_raise(self):
+        tiled_conv = TiledKernelConvolution(self.kernel, compute_indexes=self.mask)
+        with pytest.raises(ValueError):
+            tiled_conv.convolution2d(np.ones((10, 10)))
+
+
 class TestSubgridKernelConvolution(object):
     def setup_method(self):
         self.supersampling_factor = 3
@@ -142,6 +216,21 @@ class TestSubgridKernelConvolution(object):
         model_conv_static = conv_static.convolution2d(self.model)
         npt.assert_almost_equal(model_conv_static, model_conv_scipy, decimal=3)
 
+    def test_convolve_stack(self):
+        image_stack = np.array([self.model_sub, self.model_sub.T])
+        for supersampling_kernel_size in [None, 3]:
+            subgrid_conv = SubgridKernelConvolution(
+                self.kernel_sub,
+                self.supersampling_factor,
+                supersampling_kernel_size=supersampling_kernel_size,
+            )
+            image_conv_stack = subgrid_conv.convolution2d(image_stack)
+            assert image_conv_stack.shape == (2, 20, 20)
+            for i, image in enumerate(image_stack):
+                npt.assert_almost_equal(
+                    image_conv_stack[i], subgrid_conv.convolution2d(image), decimal=10
+                )
+
     def test_convolve2d(self):
         # kernel_supersampled = kernel_util.subgrid_kernel(self.kernel, self.supersampling_factor, odd=True, num_iter=5)
         subgrid_conv = SubgridKernelConvolution(
@@ -5,6 +5,7 @@ import numpy.testing as npt
 from lenstronomy.Util import util
 from lenstronomy.ImSim.Numerics.grid import AdaptiveGrid
 from lenstronomy.ImSim.Numerics.grid import RegularGrid
+from lenstronomy.ImSim.Numerics.grid import MultiLevelAdaptiveGrid
 from lenstronomy.LightModel.light_model import LightModel
 
 import pytest
@@ -114,5 +115,71 @@ class TestRegularGrid(object):
         assert ssf == self._supersampling_factor
 
 
+class TestMultiLevelAdaptiveGrid(object):
+    def setup_method(self):
+        transform_pix2angle = np.array([[1, 0], [0, 1]])
+        ra_at_xy_0, dec_at_xy_0 = -5, -5
+        self.nx, self.ny = 11, 11
+        self._factors = np.ones((self.nx, self.ny), dtype=int)
+        self._factors[5, 5] = 4
+        self._factors[4:7, 2] = 2
+        self._args = (self.nx, self.ny, transform_pix2angle, ra_at_xy_0, dec_at_xy_0)
+        self._grid = MultiLevelAdaptiveGrid(*self._args, self._factors)
+
+    def test_coordinates_evaluate(self):
+        x_grid, y_grid = self._grid.coordinates_evaluate
+        assert len(x_grid) == self.nx * self.ny - 4 + 3 * 2**2 + 4**2
+        assert self._grid.num_evaluations == len(x_grid)
+        assert self._grid.supersampling_levels == [1, 2, 4]
+        assert self._grid.supersampling_factor == 4
+        npt.assert_almost_equal(x_grid[-16:-12], [-0.375, -0.125, 0.125, 0.375])
+        npt.assert_almost_equal(y_grid[-16:-12], -0.375)
+
+    def test_flux_array2image_low_high(self):
+        # the subpixel coordinates agree with AdaptiveGrid for a single level
+        factors = np.ones((self.nx, self.ny), dtype=int)
+        factors[5, 5] = 4
+        grid = MultiLevelAdaptiveGrid(*self._args, factors)
+        adaptive_grid = AdaptiveGrid(*self._args, factors > 1, 4)
+        x, y = grid.coordinates_evaluate
+        x_, y_ = adaptive_grid.coordinates_evaluate
+        npt.assert_almost_equal(x, x_)
+        npt.assert_almost_equal(y, y_)
+
+        model = LightModel(light_model_list=["GAUSSIAN"])
+        kwargs_light = [{"center_x": 0, "center_y": 0, "sigma": 1, "amp": 1}]
+        x, y = self._grid.coordinates_evaluate
+        flux_values = model.surface_brightness(x, y, kwargs_light)
+        image, image_high_res = self._grid.flux_array2image_low_high(flux_values)
+        assert image_high_res is None
+        x_sub, y_sub = np.meshgrid([-3.25, -2.75], [-0.25, 0.25])
+        npt.assert_almost_equal(
+            image[5, 2],
+            np.mean(model.surface_brightness(x_sub, y_sub, kwargs_light)),
+            decimal=8,
+        )
+        x_grid, y_grid = self._grid.coordinate_grid(self.nx, self.ny)
+        image_low = util.array2image(
+            model.surface_brightness(x_grid, y_grid, kwargs_light)
+        )
+        npt.assert_almost_equal(image[0, 0], image_low[0, 0], decimal=10)
+        assert image[5, 5] < image_low[5, 5]
+
+    def test_flux_evaluate_indexes(self):
+        flux_evaluate_indexes = np.zeros((self.nx, self.ny), dtype=bool)
+        flux_evaluate_indexes[4:7, 4:7] = True
+        grid = MultiLevelAdaptiveGrid(*self._args, self._factors, flux_evaluate_indexes)
+        assert grid.num_evaluations == 8 + 4**2
+        assert grid.supersampling_levels == [1, 4]
+        assert grid.supersampling_factors[0, 0] == 0
+        image, _ = grid.flux_array2image_low_high(np.ones(grid.num_evaluations))
+        npt.assert_almost_equal(image, flux_evaluate_indexes)
+
+    def test_raise(self):
+        with pytest.raises(ValueError):
+            x, y = self._grid.coordinates_evaluate
+            self._grid.flux_array2image_low_high(x, high_res_return=True)
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -389,6 +389,103 @@ class TestNumerics(object):
         delta = (self.image_true * self.psf_norm_factor - image_conv) / self.image_true
         npt.assert_almost_equal(delta[self._conv_pixels_partial], 0, decimal=1)
 
+    def test_re_size_convolve_stack(self):
+        for kwargs_numerics in [
+            self.kwargs_numerics_high_res_narrow,
+            self.kwargs_numerics_low_conv_high_grid,
+            self.kwargs_numerics_low_conv_high_adaptive,
+            self.kwargs_numerics_low_res,
+            self.kwargs_numerics_partial,
+        ]:
+            image_model = ImageModel(
+                self.pixel_grid,
+                self.psf_class,
+                lens_light_model_class=self.lightModel,
+                kwargs_numerics=kwargs_numerics,
+            )
+            image_numerics = image_model.ImageNumerics
+            x, y = image_numerics.coordinates_evaluate
+            flux = self.lightModel.surface_brightness(x, y, self.kwargs_light)
+            flux_arrays = np.array([flux, flux**2, np.zeros_like(flux)])
+            for unconvolved in [False, True]:
+                images = image_numerics.re_size_convolve_stack(
+                    flux_arrays, unconvolved=unconvolved
+                )
+                for i, flux_array in enumerate(flux_arrays):
+                    image = image_numerics.re_size_convolve(
+                        flux_array, unconvolved=unconvolved
+                    )
+                    npt.assert_almost_equal(images[i], image, decimal=10)
+
+    def test_fft_tiled(self):
+        kwargs_numerics = {
+            "supersampling_factor": self._supersampling_factor,
+            "supersampling_convolution": False,
+        }
+        image_model = ImageModel(
+            self.pixel_grid,
+            self.psf_class,
+            lens_light_model_class=self.lightModel,
+            kwargs_numerics=kwargs_numerics,
+        )
+        image_conv = image_model.image(kwargs_lens_light=self.kwargs_light)
+
+        mask = np.zeros_like(self._conv_pixels_partial)
+        mask[5:20, 30:50] = True
+        kwargs_numerics["convolution_type"] = "fft_tiled"
+        kwargs_numerics["compute_indexes"] = mask
+        image_model = ImageModel(
+            self.pixel_grid,
+            self.psf_class,
+            lens_light_model_class=self.lightModel,
+            kwargs_numerics=kwargs_numerics,
+        )
+        image_conv_tiled = image_model.image(kwargs_lens_light=self.kwargs_light)
+        npt.assert_almost_equal(image_conv_tiled, image_conv * mask, decimal=8)
+        conv_class = image_model.ImageNumerics.convolution_class
+        assert 0 < conv_class.compute_fraction < 1
+
+        # without compute_indexes, the tiled convolution is restricted to the likelihood mask
+        del kwargs_numerics["compute_indexes"]
+        image_model = ImageModel(
+            self.pixel_grid,
+            self.psf_class,
+            lens_light_model_class=self.lightModel,
+            kwargs_numerics=kwargs_numerics,
+            likelihood_mask=mask,
+        )
+        image_conv_tiled = image_model.image(kwargs_lens_light=self.kwargs_light)
+        npt.assert_almost_equal(image_conv_tiled, image_conv * mask, decimal=8)
+        conv_class = image_model.ImageNumerics.convolution_class
+        assert 0 < conv_class.compute_fraction < 1
+
+    def test_float32_precision(self):
+        for kwargs_numerics in [
+            self.kwargs_numerics_true,
+            self.kwargs_numerics_low_conv_high_grid,
+            self.kwargs_numerics_low_res,
+        ]:
+            image_model = ImageModel(
+                self.pixel_grid,
+                self.psf_class,
+                lens_light_model_class=self.lightModel,
+                kwargs_numerics=kwargs_numerics,
+            )
+            image = image_model.image(kwargs_lens_light=self.kwargs_light)
+            image_model_32 = ImageModel(
+                self.pixel_grid,
+                self.psf_class,
+                lens_light_model_class=self.lightModel,
+                kwargs_numerics=dict(kwargs_numerics, precision="float32"),
+            )
+            assert image_model_32.precision == "float32"
+            image_numerics = image_model_32.ImageNumerics
+            assert image_numerics.precision == "float32"
+            x, y = image_numerics.coordinates_evaluate
+            assert x.dtype == np.float32
+            image_32 = image_model_32.image(kwargs_lens_light=self.kwargs_light)
+            npt.assert_allclose(image_32, image, rtol=1e-4, atol=1e-5 * np.max(image))
+
     def test_property_access(self):
         image_model = ImageModel(
             self.pixel_grid,
@@ -578,6 +675,46 @@ def test_supersampling_simple():
 
 
 class TestRaise(unittest.TestCase):
+    def test_fft_tiled_supersampling_convolution(self):
+        kwargs_psf = {"psf_type": "PIXEL", "kernel_point_source": np.ones((3, 3))}
+        psf_class = PSF(**kwargs_psf)
+        pixel_grid = PixelGrid(
+            nx=10, ny=10, transform_pix2angle=np.eye(2), ra_at_xy_0=0, dec_at_xy_0=0
+        )
+        with self.assertRaises(ValueError):
+            Numerics(
+                pixel_grid=pixel_grid,
+                psf=psf_class,
+                supersampling_factor=3,
+                supersampling_convolution=True,
+                convolution_type="fft_tiled",
+            )
+
+    def test_supersampling_factors_supersampling_convolution(self):
+        kwargs_psf = {"psf_type": "PIXEL", "kernel_point_source": np.ones((3, 3))}
+        psf_class = PSF(**kwargs_psf)
+        pixel_grid = PixelGrid(
+            nx=10, ny=10, transform_pix2angle=np.eye(2), ra_at_xy_0=0, dec_at_xy_0=0
+        )
+        with self.assertRaises(ValueError):
+            Numerics(
+                pixel_grid=pixel_grid,
+                psf=psf_class,
+                supersampling_factor=3,
+                compute_mode="adaptive",
+                supersampling_convolution=True,
+                supersampling_factors=np.ones((10, 10), dtype=int),
+            )
+
+    def test_precision(self):
+        kwargs_psf = {"psf_type": "NONE"}
+        psf_class = PSF(**kwargs_psf)
+        pixel_grid = PixelGrid(
+            nx=10, ny=10, transform_pix2angle=np.eye(2), ra_at_xy_0=0, dec_at_xy_0=0
+        )
+        with self.assertRaises(ValueError):
+            Numerics(pixel_grid=pixel_grid, psf=psf_class, precision="float16")
+
     def test_integer_in_supersampling_factor(self):
 
         kwargs_psf = {"psf_type": "NONE"}
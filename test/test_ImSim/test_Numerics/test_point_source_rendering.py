@@ -1,4 +1,6 @@
 from lenstronomy.ImSim.Numerics.point_source_rendering import PointSourceRendering
+from lenstronomy.ImSim.Numerics import point_source_rendering
+from lenstronomy.Util import image_util, kernel_util
 from lenstronomy.Data.pixel_grid import PixelGrid
 from lenstronomy.Data.psf import PSF
 
@@ -58,6 +60,78 @@ class TestPointSourceRendering(object):
         model = self._ps_rendering.point_source_rendering(ra_pos, dec_pos, amp)
         npt.assert_almost_equal(np.sum(model), 2, decimal=8)
 
+    def test_point_source_rendering_supersampled(self):
+        # compare with shifting the super-sampled kernel and re-sizing the super-sampled image
+        kernel = kernel_util.kernel_gaussian(num_pix=21, delta_pix=1, fwhm=2)
+        psf_class = PSF(psf_type="PIXEL", kernel_point_source=kernel)
+        pixel_grid = PixelGrid(
+            nx=20, ny=20, transform_pix2angle=np.eye(2), ra_at_xy_0=0, dec_at_xy_0=0
+        )
+        ra_pos, dec_pos, amp = [3.3, 10.71, 18.5], [2.45, 9.1, 15.02], [1, 2, 3]
+        for supersampling_factor in [1, 3]:
+            ps_rendering = PointSourceRendering(
+                pixel_grid, supersampling_factor=supersampling_factor, psf=psf_class
+            )
+            kernel_super = psf_class.kernel_point_source_supersampled(
+                supersampling_factor
+            )
+            subgrid2d = np.zeros((20 * supersampling_factor, 20 * supersampling_factor))
+            for i in range(3):
+                subgrid2d = image_util.add_layer2image(
+                    subgrid2d,
+                    ra_pos[i] * supersampling_factor + (supersampling_factor - 1) / 2,
+                    dec_pos[i] * supersampling_factor + (supersampling_factor - 1) / 2,
+                    amp[i] * kernel_super,
+                )
+            model_ref = (
+                image_util.re_size(subgrid2d, supersampling_factor)
+                * supersampling_factor**2
+            )
+            model = ps_rendering.point_source_rendering(ra_pos, dec_pos, amp)
+            npt.assert_almost_equal(model, model_ref, decimal=10)
+
+            # numpy implementation without numba
+            images = np.zeros((1, 20, 20))
+            point_source_rendering._add_point_sources_numpy(
+                images,
+                kernel_super,
+                np.array(ra_pos) * supersampling_factor
+                + (supersampling_factor - 1) / 2,
+                np.array(dec_pos) * supersampling_factor
+                + (supersampling_factor - 1) / 2,
+                np.array(amp, dtype=float),
+                np.zeros(3, dtype=int),
+                supersampling_factor,
+            )
+            npt.assert_almost_equal(images[0], model, decimal=12)
+
+    def test_flux_conservation(self):
+        # the shifted stamps are not truncated at the kernel boundary
+        kernel = np.ones((3, 3)) / 9.0
+        psf_class = PSF(psf_type="PIXEL", kernel_point_source=kernel)
+        ps_rendering = PointSourceRendering(
+            self._ps_rendering._pixel_grid, supersampling_factor=1, psf=psf_class
+        )
+        model = ps_rendering.point_source_rendering([4.3], [5.6], [2])
+        npt.assert_almost_equal(np.sum(model), 2, decimal=12)
+        npt.assert_almost_equal(model[4, 3], 2 / 9.0 * 0.7 * 0.4, decimal=12)
+
+    def test_point_source_rendering_stack(self):
+        ra_pos_list = [np.array([0, 1]), np.array([3.4]), np.array([])]
+        dec_pos_list = [np.array([1, 0]), np.array([7.2]), np.array([])]
+        amp_list = [np.array([1, 2]), np.array([3]), np.array([])]
+        images = self._ps_rendering.point_source_rendering_stack(
+            ra_pos_list, dec_pos_list, amp_list
+        )
+        assert np.shape(images) == (3, 10, 10)
+        for i in range(3):
+            model = self._ps_rendering.point_source_rendering(
+                ra_pos_list[i], dec_pos_list[i], amp_list[i]
+            )
+            npt.assert_almost_equal(images[i], model, decimal=12)
+        npt.assert_almost_equal(np.sum(images[0]), 3, decimal=8)
+        npt.assert_almost_equal(np.sum(images[2]), 0, decimal=8)
+
 
 class TestRaise(unittest.TestCase):
     def test_raise(self):
@@ -86,6 +160,16 @@ class TestRaise(unittest.TestCase):
             self._ps_rendering.point_source_rendering(
                 ra_pos=[1, 1], dec_pos=[0, 1], amp=[1]
             )
+        with self.assertRaises(ValueError):
+            point_source_rendering.add_point_sources(
+                np.zeros((1, 10, 10)),
+                np.ones((4, 4)),
+                np.array([1.0]),
+                np.array([1.0]),
+                np.array([1.0]),
+                np.array([0]),
+                1,
+            )
 
 
 class TestPointSourceRendering_for_interfermetry(unittest.TestCase):
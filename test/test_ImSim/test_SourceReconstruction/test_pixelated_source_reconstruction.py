@@ -360,6 +360,12 @@ class TestPixelatedSourceReconstruction(object):
         )
         assert np.allclose(M_default, M_diagonal)
         assert np.allclose(b_default, b_diagonal)
+        M_sparse, b_sparse = psr.generate_M_b(
+            kwargs_lens=self.kwargs_lens, sparse_output=True
+        )
+        assert M_sparse.format == "csr"
+        assert np.allclose(M_sparse.toarray(), M_default)
+        assert np.allclose(b_sparse, b_default)
 
         kwargs_data_interferometry_likelihood_test = self.kwargs_data.copy()
         kwargs_data_interferometry_likelihood_test["likelihood_method"] = (
@@ -380,6 +386,10 @@ class TestPixelatedSourceReconstruction(object):
         )
         assert np.allclose(M_natwt0, M_natwt1)
         assert np.allclose(b_natwt0, b_natwt1)
+        M_sparse, b_sparse = psr_natwt.generate_M_b(
+            kwargs_lens=self.kwargs_lens, sparse_output=True
+        )
+        assert np.allclose(M_sparse.toarray(), M_natwt0)
 
     def test_generate_M_b_diagonal_likelihood(self):
         psr = PixelatedSourceReconstruction(
@@ -573,6 +583,43 @@ class TestPixelatedSourceReconstruction(object):
         assert np.allclose(lensed_pixels_no_lens[3][2][2], 0.0, atol=1e-5)
         assert np.allclose(lensed_pixels_no_lens[3][3][2], 1.0, atol=1e-5)
 
+    def test_lensing_operator(self):
+        psr = PixelatedSourceReconstruction(
+            self.data_class,
+            self.psf_class,
+            self.lens_model_class,
+            self.source_pixel_grid_class,
+        )
+        lensing_operator = psr.lensing_operator(kwargs_lens=self.kwargs_lens)
+        assert lensing_operator.shape == (100, 6)
+        lensed_pixels = psr.lens_pixel_source_of_a_rectangular_region(
+            kwargs_lens=self.kwargs_lens
+        )
+        for i in range(6):
+            image = lensing_operator[:, i].toarray().reshape(10, 10)
+            assert np.allclose(image, psr.sparse_to_array(lensed_pixels[i]))
+
+    def test_convolution_operator(self):
+        psr = PixelatedSourceReconstruction(
+            self.data_class,
+            self.psf_class,
+            self.lens_model_class,
+            self.source_pixel_grid_class,
+        )
+        sp = [[0, 0, 0.7], [3, 4, 0.2], [9, 2, 1.5]]
+        image = psr.sparse_to_array(sp)
+        convolution_operator = psr.convolution_operator()
+        assert convolution_operator.shape == (100, 100)
+        image_conv = convolution_operator @ image.flatten()
+        assert np.allclose(image_conv.reshape(10, 10), psr.sparse_convolution(sp))
+
+        # operator restricted to a subset of the image pixels
+        image_index = np.array([0, 34, 92])
+        convolution_operator = psr.convolution_operator(image_index)
+        assert convolution_operator.shape == (100, 3)
+        image_conv = convolution_operator @ np.array([0.7, 0.2, 1.5])
+        assert np.allclose(image_conv.reshape(10, 10), psr.sparse_convolution(sp))
+
     def test_lens_an_image_by_rayshooting(self):
         psr = PixelatedSourceReconstruction(
             self.data_class,
@@ -375,3 +375,17 @@ def test_pixelated_regularization_matrix():
         ]
     )
     assert np.allclose(result, expected, atol=1e-5)
+
+
+def test_sparse_regularization_matrix():
+    for regularization_type in ["zeroth_order", "gradient", "curvature"]:
+        for xlen, ylen in [(1, 1), (1, 3), (2, 1), (4, 4), (5, 3)]:
+            result = pixelated_regularization_matrix(
+                xlen, ylen, regularization_type, sparse=True
+            )
+            expected = pixelated_regularization_matrix(xlen, ylen, regularization_type)
+            assert result.format == "csr"
+            assert np.array_equal(result.toarray(), expected)
+
+    with pytest.raises(ValueError, match="Unsupported regularization_type"):
+        pixelated_regularization_matrix(2, 2, "WRONG", sparse=True)
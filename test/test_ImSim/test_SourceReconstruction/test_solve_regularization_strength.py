@@ -1,8 +1,17 @@
 import numpy as np
+import numpy.testing as npt
 import pytest
+import scipy.sparse
 from lenstronomy.ImSim.SourceReconstruction.solve_regularization_strength import (
     d_log_evi_d_lambda,
     solve_optimal_lambda,
+    SparseEvidenceDerivative,
+    block_conjugate_gradient,
+    log_det_slq,
+    cholmod_cholesky,
+)
+from lenstronomy.ImSim.SourceReconstruction.regularization_matrix_pixel import (
+    pixelated_regularization_matrix,
 )
 
 
@@ -270,3 +279,97 @@ def test_solve_optimal_lambda_success():
         solve_optimal_lambda(
             d_log_evi_d_lambda, U, M, b, 1e0, 1e2, check_initial_bounds=True
         )
+
+
+def _sparse_problem(num_pix=12, seed=1):
+    # M of a blurred and masked identity operator, gradient regularization
+    rng = np.random.default_rng(seed)
+    n = num_pix**2
+    blur = pixelated_regularization_matrix(num_pix, num_pix, "gradient", sparse=True)
+    response = scipy.sparse.identity(n) * 2 - 0.2 * blur
+    response = response @ scipy.sparse.diags(rng.uniform(0.5, 1.5, n))
+    M = scipy.sparse.csr_matrix(response.T @ response) * 100
+    U = pixelated_regularization_matrix(num_pix, num_pix, "gradient", sparse=True)
+    source = np.exp(-np.linspace(-2, 2, num_pix) ** 2)
+    b = response.T @ (response @ np.outer(source, source).flatten()) * 100
+    b += 10 * rng.normal(size=n)
+    return U, M, b
+
+
+def test_sparse_evidence_derivative():
+    U, M, b = _sparse_problem()
+    derivative = SparseEvidenceDerivative(num_probes=300, use_cholesky=False)
+    for l in [1e-1, 1, 1e2]:
+        expected = d_log_evi_d_lambda(l, U.toarray(), M.toarray(), b)
+        result = derivative(l, U, M, b)
+        npt.assert_allclose(result, expected, rtol=2e-2)
+        # sparse U and dense M are evaluated exactly
+        result = d_log_evi_d_lambda(l, U, M.toarray(), b)
+        npt.assert_allclose(result, expected, rtol=1e-8)
+        # sparse M is evaluated with the stochastic estimate
+        result = d_log_evi_d_lambda(l, U, M, b)
+        npt.assert_allclose(result, expected, rtol=5e-2)
+
+    x = derivative.solve(1, U, M, b)
+    x_expected = np.linalg.solve(M.toarray() + U.toarray(), b)
+    npt.assert_allclose(x, x_expected, rtol=1e-5, atol=1e-8)
+
+    log_det = derivative.log_det(1, U, M)
+    log_det_expected = np.linalg.slogdet(M.toarray() + U.toarray())[1]
+    npt.assert_allclose(log_det, log_det_expected, rtol=1e-2)
+
+    # warm start from the solutions of the previous lambda
+    derivative = SparseEvidenceDerivative(num_probes=10, use_cholesky=False)
+    derivative(1, U, M, b)
+    num_iterations = derivative.num_iterations
+    derivative(1.01, U, M, b)
+    assert derivative.num_iterations - num_iterations < num_iterations
+
+    if cholmod_cholesky is None:
+        with pytest.raises(ImportError):
+            SparseEvidenceDerivative(use_cholesky=True)
+    else:
+        derivative = SparseEvidenceDerivative(num_probes=300, use_cholesky=True)
+        expected = d_log_evi_d_lambda(1, U.toarray(), M.toarray(), b)
+        npt.assert_allclose(derivative(1, U, M, b), expected, rtol=2e-2)
+        npt.assert_allclose(derivative.log_det(1, U, M), log_det_expected)
+
+
+def test_solve_optimal_lambda_sparse():
+    U, M, b = _sparse_problem()
+    optimal_lambda = solve_optimal_lambda(
+        d_log_evi_d_lambda, U.toarray(), M.toarray(), b, 1e-3, 1e3, tolerance=1e-4
+    )
+    optimal_lambda_sparse = solve_optimal_lambda(
+        SparseEvidenceDerivative(num_probes=300, use_cholesky=False),
+        U,
+        M,
+        b,
+        1e-3,
+        1e3,
+        tolerance=1e-4,
+    )
+    npt.assert_allclose(optimal_lambda_sparse, optimal_lambda, rtol=5e-2)
+
+
+def test_block_conjugate_gradient():
+    U, M, b = _sparse_problem()
+    A = M + U
+    rhs = np.column_stack([b, np.ones_like(b), np.zeros_like(b)])
+    x_expected = np.linalg.solve(A.toarray(), rhs)
+    x, num_iterations = block_conjugate_gradient(A, rhs, tolerance=1e-10)
+    npt.assert_allclose(x, x_expected, rtol=1e-6, atol=1e-10)
+    x, num_iterations_warm = block_conjugate_gradient(A, rhs, x0=x, tolerance=1e-10)
+    assert num_iterations_warm < num_iterations
+    x, _ = block_conjugate_gradient(A, rhs, max_iterations=2)
+    assert np.all(np.isfinite(x))
+
+
+def test_log_det_slq():
+    U, M, b = _sparse_problem()
+    A = M + U
+    log_det = log_det_slq(A, num_probes=100, num_steps=40)
+    npt.assert_allclose(log_det, np.linalg.slogdet(A.toarray())[1], rtol=1e-2)
+    # Lanczos breakdown on small matrices
+    A = np.diag([1.0, 2.0, 3.0])
+    npt.assert_allclose(log_det_slq(A, num_probes=10), np.log(6), rtol=1e-8)
@@ -0,0 +1,182 @@
+import numpy as np
+import numpy.testing as npt
+import pytest
+import copy
+
+from lenstronomy.ImSim.component_cache import (
+    ComponentCache,
+    merge_stats,
+    strip_linear_amplitudes,
+)
+from lenstronomy.ImSim.image_linear_solve import ImageLinearFit
+from lenstronomy.LensModel.lens_model import LensModel
+from lenstronomy.LightModel.light_model import LightModel
+from lenstronomy.PointSource.point_source import PointSource
+import lenstronomy.Util.simulation_util as sim_util
+from lenstronomy.Data.imaging_data import ImageData
+from lenstronomy.Data.psf import PSF
+
+
+class TestComponentCache(object):
+    def setup_method(self):
+        self.cache = ComponentCache()
+        self.num_calls = 0
+
+    def _function(self):
+        self.num_calls += 1
+        return self.num_calls
+
+    def test_evaluate(self):
+        kwargs = [{"amp": 1, "center_x": np.array([0.1, 0.2])}]
+        value = self.cache.evaluate("a", (kwargs, False), self._function)
+        assert value == 1
+        value = self.cache.evaluate("a", (copy.deepcopy(kwargs), False), self._function)
+        assert value == 1
+        # in-place changes of the arguments are detected
+        kwargs[0]["center_x"][0] = 0.3
+        value = self.cache.evaluate("a", (kwargs, False), self._function)
+        assert value == 2
+        value = self.cache.evaluate("a", (kwargs, True), self._function)
+        assert value == 3
+        # a different token invalidates the stored result
+        token = object()
+        assert self.cache.evaluate("a", (kwargs, True), self._function, token) == 4
+        assert self.cache.evaluate("a", (kwargs, True), self._function, token) == 4
+        assert self.cache.stats == {"a": {"hits": 2, "misses": 4}}
+
+        # nan values compare equal
+        self.cache.evaluate("b", [np.nan, None], self._function)
+        self.cache.evaluate("b", [np.nan, None], self._function)
+        assert self.cache.stats["b"] == {"hits": 1, "misses": 1}
+
+        self.cache.clear()
+        self.cache.evaluate("b", [np.nan, None], self._function)
+        assert self.cache.stats["b"] == {"hits": 1, "misses": 2}
+        self.cache.reset()
+        assert self.cache.stats == {}
+
+    def test_disabled(self):
+        self.cache.evaluate("a", 1, self._function)
+        self.cache.enabled = False
+        assert self.cache.enabled is False
+        assert self.cache.evaluate("a", 1, self._function) == 2
+        assert self.cache.evaluate("a", 1, self._function) == 3
+        assert self.cache.stats == {"a": {"hits": 0, "misses": 1}}
+
+    def test_merge_stats(self):
+        stats = merge_stats(
+            [
+                {"a": {"hits": 1, "misses": 2}},
+                {"a": {"hits": 3, "misses": 0}, "b": {"hits": 0, "misses": 1}},
+            ]
+        )
+        assert stats == {
+            "a": {"hits": 4, "misses": 2},
+            "b": {"hits": 0, "misses": 1},
+        }
+
+    def test_strip_linear_amplitudes(self):
+        assert strip_linear_amplitudes(None) is None
+        kwargs = [{"amp": 1, "sigma": 2}]
+        assert strip_linear_amplitudes(kwargs) == [{"sigma": 2}]
+        assert kwargs == [{"amp": 1, "sigma": 2}]
+
+
+class TestImageModelCache(object):
+    def setup_method(self):
+        kwargs_data = sim_util.data_configure_simple(
+            50, 0.1, exposure_time=100, background_rms=0.05, inverse=True
+        )
+        data_class = ImageData(**kwargs_data)
+        psf_class = PSF(psf_type="GAUSSIAN", fwhm=0.3, truncation=3)
+        self.kwargs_lens = [{"theta_E": 1.0, "center_x": 0, "center_y": 0}]
+        self.kwargs_source = [
+            {
+                "amp": 10,
+                "R_sersic": 0.3,
+                "n_sersic": 2,
+                "e1": 0.1,
+                "e2": 0,
+                "center_x": 0.05,
+                "center_y": 0,
+            }
+        ]
+        self.kwargs_lens_light = [
+            {"amp": 20, "R_sersic": 0.5, "n_sersic": 3, "center_x": 0, "center_y": 0}
+        ]
+        self.kwargs_ps = [{"ra_source": 0.01, "dec_source": 0.0, "source_amp": 5.0}]
+        kwargs_model = dict(
+            data_class=data_class,
+            psf_class=psf_class,
+            lens_model_class=LensModel(["SIS"]),
+            source_model_class=LightModel(["SERSIC_ELLIPSE"]),
+            lens_light_model_class=LightModel(["SERSIC"]),
+            point_source_class=PointSource(
+                point_source_type_list=["SOURCE_POSITION"],
+                fixed_magnification_list=[True],
+            ),
+            kwargs_numerics={"supersampling_factor": 2},
+        )
+        self.image_model = ImageLinearFit(**kwargs_model)
+        self.image_model_uncached = ImageLinearFit(**kwargs_model)
+        self.image_model_uncached.reset_component_cache(enabled=False)
+        image = self.image_model.image(
+            self.kwargs_lens, self.kwargs_source, self.kwargs_lens_light, self.kwargs_ps
+        )
+        data_class.update_data(image)
+        self.image_model.reset_component_cache()
+
+    def _args(self, kwargs_lens_light=None):
+        if kwargs_lens_light is None:
+            kwargs_lens_light = self.kwargs_lens_light
+        return self.kwargs_lens, self.kwargs_source, kwargs_lens_light, self.kwargs_ps
+
+    def test_image(self):
+        image = self.image_model.image(*self._args())
+        image_cached = self.image_model.image(*self._args())
+        npt.assert_almost_equal(image_cached, image, decimal=12)
+        stats = self.image_model.component_cache_stats
+        for name in ["source", "lens_light", "point_source"]:
+            assert stats[name] == {"hits": 1, "misses": 1}
+
+        kwargs_lens_light = [dict(self.kwargs_lens_light[0], R_sersic=0.6)]
+        image = self.image_model.image(*self._args(kwargs_lens_light))
+        image_uncached = self.image_model_uncached.image(*self._args(kwargs_lens_light))
+        npt.assert_allclose(image, image_uncached, rtol=1e-6, atol=1e-10)
+        stats = self.image_model.component_cache_stats
+        assert stats["source"] == {"hits": 2, "misses": 1}
+        assert stats["lens_light"] == {"hits": 1, "misses": 2}
+        assert self.image_model_uncached.component_cache_stats == {}
+
+    def test_linear_response_matrix(self):
+        A = self.image_model.linear_response_matrix(*self._args())
+        kwargs_lens_light = [dict(self.kwargs_lens_light[0], R_sersic=0.6, amp=1)]
+        A_lens_light = self.image_model.linear_response_matrix(
+            *self._args(kwargs_lens_light)
+        )
+        A_uncached = self.image_model_uncached.linear_response_matrix(
+            *self._args(kwargs_lens_light)
+        )
+        npt.assert_allclose(A_lens_light, A_uncached, rtol=1e-6, atol=1e-10)
+        npt.assert_almost_equal(A_lens_light[0], A[0], decimal=12)
+        stats = self.image_model.component_cache_stats
+        assert stats["source_response"] == {"hits": 1, "misses": 1}
+        assert stats["lens_light_response"] == {"hits": 0, "misses": 2}
+        assert stats["point_source_response"] == {"hits": 1, "misses": 1}
+
+        # the solved linear parameters are unaffected by the memoization
+        _, _, _, param = self.image_model.image_linear_solve(*self._args())
+        _, _, _, param_uncached = self.image_model_uncached.image_linear_solve(
+            *self._args()
+        )
+        npt.assert_allclose(param, param_uncached, rtol=1e-6)
+
+        # a new PSF invalidates all memoized components
+        self.image_model.update_psf(PSF(psf_type="GAUSSIAN", fwhm=0.5, truncation=3))
+        self.image_model.linear_response_matrix(*self._args())
+        stats = self.image_model.component_cache_stats
+        assert stats["source_response"]["misses"] == 2
+
+
+if __name__ == "__main__":
+    pytest.main()
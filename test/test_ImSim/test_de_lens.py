@@ -52,6 +52,88 @@ class TestDeLens(object):
         npt.assert_almost_equal(result[1], 0, decimal=8)
         npt.assert_almost_equal(image[0], 0, decimal=8)
 
+    def test_get_param_WLS_blocks(self):
+        np.random.seed(42)
+        num_data = 200
+        A_blocks = [
+            np.random.randn(3, num_data),
+            np.random.randn(0, num_data),
+            np.random.randn(2, num_data),
+        ]
+        C_D_inv = np.random.uniform(0.5, 2, num_data)
+        d = np.random.randn(num_data)
+        gram_blocks = de_lens.GramMatrixBlocks()
+        for inv_bool in [True, False]:
+            result, cov_error, image = de_lens.get_param_WLS(
+                np.concatenate(A_blocks).T, C_D_inv, d, inv_bool=inv_bool
+            )
+            result_blocks, cov_error_blocks, image_blocks = (
+                de_lens.get_param_WLS_blocks(
+                    A_blocks, C_D_inv, d, gram_blocks=gram_blocks, inv_bool=inv_bool
+                )
+            )
+            npt.assert_almost_equal(result_blocks, result, decimal=10)
+            npt.assert_almost_equal(image_blocks, image, decimal=10)
+            if inv_bool:
+                npt.assert_almost_equal(cov_error_blocks, cov_error, decimal=10)
+            else:
+                assert cov_error_blocks is None
+        assert gram_blocks.num_blocks_updated == 0
+
+        # only the changed block is re-projected
+        A_blocks[2] = np.random.randn(2, num_data)
+        result, cov_error, image = de_lens.get_param_WLS(
+            np.concatenate(A_blocks).T, C_D_inv, d
+        )
+        result_blocks, cov_error_blocks, image_blocks = de_lens.get_param_WLS_blocks(
+            A_blocks, C_D_inv, d, gram_blocks=gram_blocks
+        )
+        assert gram_blocks.num_blocks_updated == 1
+        npt.assert_almost_equal(result_blocks, result, decimal=10)
+        npt.assert_almost_equal(cov_error_blocks, cov_error, decimal=10)
+
+        # blocks passed as the same objects or as equal copies are not re-projected
+        de_lens.get_param_WLS_blocks(A_blocks, C_D_inv, d, gram_blocks=gram_blocks)
+        assert gram_blocks.num_blocks_updated == 0
+        A_blocks_copy = [np.array(block, copy=True) for block in A_blocks]
+        de_lens.get_param_WLS_blocks(A_blocks_copy, C_D_inv, d, gram_blocks=gram_blocks)
+        assert gram_blocks.num_blocks_updated == 0
+
+        # new data requires all blocks
+        d = np.random.randn(num_data)
+        de_lens.get_param_WLS_blocks(A_blocks, C_D_inv, d, gram_blocks=gram_blocks)
+        assert gram_blocks.num_blocks_updated == 3
+
+        # degenerate systems are treated as in get_param_WLS()
+        A_blocks = [np.array([[1, 2, 1], [1, 2, 1]])]
+        for inv_bool in [True, False]:
+            result, cov_error, image = de_lens.get_param_WLS_blocks(
+                A_blocks, np.ones(3), np.array([1, 2, 3]), inv_bool=inv_bool
+            )
+            npt.assert_almost_equal(result, 0, decimal=8)
+            npt.assert_almost_equal(image, 0, decimal=8)
+
+        result, cov_error, image = de_lens.get_param_WLS_blocks(
+            [np.zeros((0, 3))], np.ones(3), np.array([1, 2, 3])
+        )
+        assert len(result) == 0
+        assert cov_error.shape == (0, 0)
+        npt.assert_almost_equal(image, 0, decimal=8)
+
+    def test_get_param_WLS_normal(self):
+        M = np.array([[15, 3, 2], [3, 15, 3], [2, 3, 14]])
+        R = np.array([4, 2, 1])
+        param, M_inv = de_lens.get_param_WLS_normal(M, R)
+        npt.assert_almost_equal(param, np.linalg.solve(M, R), decimal=10)
+        npt.assert_almost_equal(M_inv, np.linalg.inv(M), decimal=10)
+
+        # not positive definite
+        M = np.array([[1, 2], [2, 1]])
+        R = np.array([1, 1])
+        param, M_inv = de_lens.get_param_WLS_normal(M, R, inv_bool=False)
+        npt.assert_almost_equal(param, np.linalg.solve(M, R), decimal=10)
+        assert M_inv is None
+
     def test_get_param_WLS_interferometry(self):
         M = np.array([[15, 3, 2], [3, 15, 3], [2, 3, 14]])
         b = np.array([4, 2, 1])
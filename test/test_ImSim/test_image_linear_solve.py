@@ -1,6 +1,7 @@
 __author__ = "sibirrer"
 
 import numpy as np
+import pytest
 
 from lenstronomy.ImSim.image_linear_solve import ImageLinearFit
 import lenstronomy.Util.param_util as param_util
@@ -116,6 +117,69 @@ class TestImageLinearFit(object):
         npt.assert_almost_equal(logL - logLmarg, 0, decimal=-3)
         assert logLmarg < logL
 
+    def test_likelihood_float32(self):
+        kwargs_numerics = {
+            "supersampling_factor": 2,
+            "supersampling_convolution": False,
+            "precision": "float32",
+            "precision_check_interval": 2,
+        }
+        args = (
+            self.imageLinearFit.Data,
+            self.imageLinearFit.PSF,
+            self.imageLinearFit.LensModel,
+            self.imageLinearFit.SourceModel,
+            self.imageLinearFit.LensLightModel,
+            self.imageLinearFit.PointSource,
+        )
+        logL, _ = self.imageLinearFit.likelihood_data_given_model(
+            self.kwargs_lens, self.kwargs_source, self.kwargs_lens_light, self.kwargs_ps
+        )
+        image_linear_fit = ImageLinearFit(*args, kwargs_numerics=kwargs_numerics)
+        assert image_linear_fit.precision == "float32"
+        for i in range(3):
+            logL_32, _ = image_linear_fit.likelihood_data_given_model(
+                self.kwargs_lens,
+                self.kwargs_source,
+                self.kwargs_lens_light,
+                self.kwargs_ps,
+            )
+            npt.assert_almost_equal(logL_32, logL, decimal=1)
+        assert image_linear_fit.precision == "float32"
+
+        # the numerics and memoized components of both precisions are kept
+        numerics_32 = image_linear_fit.ImageNumerics
+        image_linear_fit.set_precision("float64")
+        numerics_64 = image_linear_fit.ImageNumerics
+        assert numerics_64.precision == "float64"
+        image_linear_fit.set_precision("float32")
+        assert image_linear_fit.ImageNumerics is numerics_32
+        image_linear_fit.set_precision("float64")
+        assert image_linear_fit.ImageNumerics is numerics_64
+        image_linear_fit.set_precision("float32")
+        misses = image_linear_fit.component_cache_stats["source_response"]["misses"]
+        image_linear_fit.likelihood_data_given_model(
+            self.kwargs_lens,
+            self.kwargs_source,
+            self.kwargs_lens_light,
+            self.kwargs_ps,
+        )
+        stats = image_linear_fit.component_cache_stats
+        assert stats["source_response"]["misses"] == misses
+
+        # a failed accuracy check falls back to double precision
+        kwargs_numerics["precision_tolerance"] = 0
+        image_linear_fit = ImageLinearFit(*args, kwargs_numerics=kwargs_numerics)
+        with pytest.warns(UserWarning):
+            logL_64, _ = image_linear_fit.likelihood_data_given_model(
+                self.kwargs_lens,
+                self.kwargs_source,
+                self.kwargs_lens_light,
+                self.kwargs_ps,
+            )
+        assert image_linear_fit.precision == "float64"
+        npt.assert_almost_equal(logL_64, logL, decimal=6)
+
     def test_image_linear_solve(self):
         model, error_map, cov_param, param = self.imageLinearFit.image_linear_solve(
             self.kwargs_lens,
@@ -127,6 +191,21 @@ class TestImageLinearFit(object):
         chi2_reduced = self.imageLinearFit.reduced_chi2(model, error_map)
         npt.assert_almost_equal(chi2_reduced, 1, decimal=1)
 
+    def test_linear_response_blocks(self):
+        kwargs = (
+            self.kwargs_lens,
+            self.kwargs_source,
+            self.kwargs_lens_light,
+            self.kwargs_ps,
+        )
+        A_blocks = self.imageLinearFit.linear_response_blocks(*kwargs)
+        A_blocks_2 = self.imageLinearFit.linear_response_blocks(*kwargs)
+        # memoized blocks are returned as the same objects
+        for block, block_2 in zip(A_blocks, A_blocks_2):
+            assert block is block_2
+        A = self.imageLinearFit.linear_response_matrix(*kwargs)
+        npt.assert_almost_equal(np.concatenate(A_blocks), A, decimal=10)
+
     def test_num_param_linear(self):
         num_param_linear = self.imageLinearFit.num_param_linear(
             self.kwargs_lens, self.kwargs_source, self.kwargs_lens_light, self.kwargs_ps
@@ -117,6 +117,14 @@ class TestMultiPlaneOrganizer(object):
             self.lens_model.lens_model._T_ij_stop, fiducial_T_ij_stop, decimal=5
         )
 
+        # the lens planes are only regrouped when T_ij_list changes
+        plane_list = self.lens_model.lens_model.multi_plane_base._plane_list
+        self.multi_plane_organizer.update_lens_T_lists(self.lens_model, kwargs_special)
+        assert self.lens_model.lens_model.multi_plane_base._plane_list is plane_list
+        kwargs_special["factor_beta_1_2"] = 0.9
+        self.multi_plane_organizer.update_lens_T_lists(self.lens_model, kwargs_special)
+        assert self.lens_model.lens_model.multi_plane_base._plane_list is not plane_list
+
     def test_update_source_mapping_T_lists(self):
         """Test MultiPlaneOrganizer.update_source_T_lists()"""
         kwargs_special = {
@@ -348,6 +348,57 @@ class TestMultiPlane(object):
         npt.assert_almost_equal(beta_x_1, beta_x_2, decimal=8)
         npt.assert_almost_equal(beta_y_1, beta_y_2, decimal=8)
 
+    def test_grouped_planes(self):
+        z_source = 1.5
+        lens_model_list = ["SIS", "NFW", "NFW", "SIS", "NFW", "SHEAR"]
+        redshift_list = [0.5, 0.3, 0.5, 0.3, 0.5, 0.5]
+        kwargs_lens = [
+            {"theta_E": 1.0, "center_x": 0, "center_y": 0},
+            {"Rs": 0.5, "alpha_Rs": 0.1, "center_x": 0.3, "center_y": -0.2},
+            {"Rs": 0.3, "alpha_Rs": 0.05, "center_x": -0.5, "center_y": 0.4},
+            {"theta_E": 0.1, "center_x": 0.2, "center_y": 0.5},
+            {"Rs": 0.4, "alpha_Rs": 0.02, "center_x": 1.0, "center_y": 0.1},
+            {"gamma1": 0.03, "gamma2": -0.02},
+        ]
+        multi_plane_base = MultiPlaneBase(
+            lens_model_list=lens_model_list,
+            lens_redshift_list=redshift_list,
+            z_source_convention=z_source,
+        )
+        assert len(multi_plane_base._plane_list) == 2
+        assert multi_plane_base._plane_list[1]["groups"] is not None
+
+        theta_x, theta_y = np.linspace(-1, 1, 10), np.linspace(-0.5, 1.5, 10)
+        T_z_source = multi_plane_base._cosmo_bkg.T_xy(0, z_source)
+        x, y, alpha_x, alpha_y = multi_plane_base.ray_shooting_partial_comoving(
+            np.zeros_like(theta_x),
+            np.zeros_like(theta_y),
+            theta_x,
+            theta_y,
+            0,
+            z_source,
+            kwargs_lens,
+        )
+
+        # one plane per deflector reproduces the sequential evaluation
+        multi_plane_base._plane_list = [
+            {"z": redshift_list[k], "index": [i], "k": [k], "groups": None}
+            for i, k in enumerate(multi_plane_base._sorted_redshift_index)
+        ]
+        x_, y_, alpha_x_, alpha_y_ = multi_plane_base.ray_shooting_partial_comoving(
+            np.zeros_like(theta_x),
+            np.zeros_like(theta_y),
+            theta_x,
+            theta_y,
+            0,
+            z_source,
+            kwargs_lens,
+        )
+        npt.assert_almost_equal(x / T_z_source, x_ / T_z_source, decimal=10)
+        npt.assert_almost_equal(y / T_z_source, y_ / T_z_source, decimal=10)
+        npt.assert_almost_equal(alpha_x, alpha_x_, decimal=10)
+        npt.assert_almost_equal(alpha_y, alpha_y_, decimal=10)
+
     def test_ray_shooting_partial_2(self):
         z_source = 1.5
         lens_model_list = ["SIS", "SIS", "SIS", "SIS"]
@@ -121,6 +121,151 @@ class TestLensEquationSolver(object):
         source_x, source_y = lensModel.ray_shooting(x_pos, y_pos, kwargs_lens)
         npt.assert_almost_equal(sourcePos_x, source_x, decimal=10)
 
+    def test_vectorized(self):
+        lens_model_list = ["EPL", "SHEAR", "SIS"]
+        lensModel = LensModel(lens_model_list)
+        lensEquationSolver = LensEquationSolver(lensModel)
+        sourcePos_x = 0.03
+        sourcePos_y = -0.05
+        kwargs_lens = [
+            {
+                "theta_E": 1.0,
+                "gamma": 2.1,
+                "e1": 0.1,
+                "e2": -0.05,
+                "center_x": 0.0,
+                "center_y": 0.0,
+            },
+            {"gamma1": 0.03, "gamma2": 0.01},
+            {"theta_E": 0.1, "center_x": 0.8, "center_y": 0.3},
+        ]
+        kwargs_solver = {
+            "min_distance": 0.05,
+            "search_window": 5,
+            "precision_limit": 10 ** (-10),
+            "num_iter_max": 100,
+        }
+        x_pos, y_pos = lensEquationSolver.image_position_from_source(
+            sourcePos_x, sourcePos_y, kwargs_lens, **kwargs_solver
+        )
+        x_pos_vec, y_pos_vec = lensEquationSolver.image_position_from_source(
+            sourcePos_x, sourcePos_y, kwargs_lens, vectorized=True, **kwargs_solver
+        )
+        assert len(x_pos_vec) == len(x_pos)
+        npt.assert_almost_equal(np.sort(x_pos_vec), np.sort(x_pos), decimal=8)
+        npt.assert_almost_equal(np.sort(y_pos_vec), np.sort(y_pos), decimal=8)
+        source_x, source_y = lensModel.ray_shooting(x_pos_vec, y_pos_vec, kwargs_lens)
+        npt.assert_almost_equal(source_x, sourcePos_x, decimal=10)
+        npt.assert_almost_equal(source_y, sourcePos_y, decimal=10)
+
+        x_mins, y_mins, delta, num_iter = (
+            lensEquationSolver._solve_proposals_vectorized(
+                [], [], sourcePos_x, sourcePos_y, kwargs_lens, 10 ** (-10), 10, 0.05
+            )
+        )
+        assert len(x_mins) == 0
+
+    def test_quadtree(self):
+        lens_model_list = ["SPEP", "SIS", "SHEAR"]
+        lensModel = LensModel(lens_model_list)
+        lensEquationSolver = LensEquationSolver(lensModel)
+        kwargs_lens = [
+            {
+                "theta_E": 1.0,
+                "gamma": 1.9,
+                "e1": 0.2,
+                "e2": -0.03,
+                "center_x": 0.1,
+                "center_y": -0.1,
+            },
+            {"theta_E": 0.1, "center_x": 0.5, "center_y": 0},
+            {"gamma1": 0.03, "gamma2": -0.02},
+        ]
+        kwargs_solver = {
+            "min_distance": 0.01,
+            "search_window": 5,
+            "precision_limit": 10 ** (-10),
+            "num_iter_max": 100,
+        }
+        np.random.seed(41)
+        for sourcePos_x, sourcePos_y in [(0.1, -0.1), (0.02, 0.05), (-0.15, 0.0)]:
+            x_pos, y_pos = lensEquationSolver.image_position_from_source(
+                sourcePos_x, sourcePos_y, kwargs_lens, **kwargs_solver
+            )
+            num_rays_grid = lensEquationSolver.num_rays_shot
+            assert num_rays_grid == 500**2
+            x_pos_qt, y_pos_qt = lensEquationSolver.image_position_from_source(
+                sourcePos_x, sourcePos_y, kwargs_lens, quadtree=True, **kwargs_solver
+            )
+            assert lensEquationSolver.num_rays_shot < num_rays_grid / 10
+            assert len(x_pos_qt) == len(x_pos)
+            npt.assert_almost_equal(np.sort(x_pos_qt), np.sort(x_pos), decimal=8)
+            npt.assert_almost_equal(np.sort(y_pos_qt), np.sort(y_pos), decimal=8)
+
+        # without hierarchy on a small window, the candidates are found on the same grid as the full grid search
+        x_mins, y_mins, delta_map, pixel_width = lensEquationSolver.candidate_solutions(
+            0.02, 0.05, kwargs_lens, min_distance=0.2, search_window=3, quadtree=False
+        )
+        x_mins_qt, y_mins_qt, delta_map_qt, pixel_width_qt = (
+            lensEquationSolver.candidate_solutions(
+                0.02,
+                0.05,
+                kwargs_lens,
+                min_distance=0.2,
+                search_window=3,
+                quadtree=True,
+            )
+        )
+        assert lensEquationSolver.num_rays_shot == 15**2
+        npt.assert_almost_equal(pixel_width_qt, pixel_width, decimal=10)
+        assert len(x_mins_qt) > 0
+        for x, y, delta in zip(x_mins_qt, y_mins_qt, delta_map_qt):
+            i = np.argmin((x_mins - x) ** 2 + (y_mins - y) ** 2)
+            npt.assert_almost_equal(x_mins[i], x, decimal=8)
+            npt.assert_almost_equal(y_mins[i], y, decimal=8)
+            npt.assert_almost_equal(delta_map[i], delta, decimal=8)
+
+    def test_image_position_from_source_batch(self):
+        lens_model_list = ["SPEP", "SIS", "SHEAR"]
+        lensModel = LensModel(lens_model_list)
+        lensEquationSolver = LensEquationSolver(lensModel)
+        kwargs_lens = [
+            {
+                "theta_E": 1.0,
+                "gamma": 1.9,
+                "e1": 0.2,
+                "e2": -0.03,
+                "center_x": 0.1,
+                "center_y": -0.1,
+            },
+            {"theta_E": 0.1, "center_x": 0.5, "center_y": 0},
+            {"gamma1": 0.03, "gamma2": -0.02},
+        ]
+        kwargs_solver = {
+            "min_distance": 0.05,
+            "search_window": 5,
+            "precision_limit": 10 ** (-10),
+            "num_iter_max": 100,
+            "magnification_limit": 0.1,
+        }
+        np.random.seed(42)
+        source_x = np.append(np.random.uniform(-0.3, 0.3, 10), 10)
+        source_y = np.append(np.random.uniform(-0.3, 0.3, 10), 10)
+        x_image_list, y_image_list = (
+            lensEquationSolver.image_position_from_source_batch(
+                source_x, source_y, kwargs_lens, **kwargs_solver
+            )
+        )
+        assert len(x_image_list) == len(source_x)
+        assert len(x_image_list[-1]) == 0
+        for i in range(len(source_x)):
+            x_pos, y_pos = lensEquationSolver.image_position_from_source(
+                source_x[i], source_y[i], kwargs_lens, **kwargs_solver
+            )
+            assert len(x_image_list[i]) == len(x_pos)
+            npt.assert_almost_equal(x_image_list[i], x_pos, decimal=8)
+            npt.assert_almost_equal(y_image_list[i], y_pos, decimal=8)
+
     def test_central_image(self):
         lens_model_list = ["SPEP", "SIS", "SHEAR"]
         kwargs_spep = {
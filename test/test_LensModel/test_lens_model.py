@@ -338,6 +338,87 @@ class TestLensModel(object):
         curl = lensModel.curl(x=1, y=1, kwargs=kwargs)
         assert curl != 0
 
+    def test_derivatives_and_hessian(self):
+        lens_model_list = [
+            "EPL",
+            "SIE",
+            "NFW",
+            "TNFW",
+            "SHEAR",
+            "SERSIC",
+            "MULTIPOLE",
+            "MULTIPOLE",
+            "GAUSSIAN_POTENTIAL",
+        ]
+        kwargs_lens = [
+            {
+                "theta_E": 1.0,
+                "gamma": 2.1,
+                "e1": 0.1,
+                "e2": -0.05,
+                "center_x": 0.02,
+                "center_y": -0.01,
+            },
+            {"theta_E": 0.3, "e1": -0.1, "e2": 0.05, "center_x": 0.5, "center_y": 0},
+            {"Rs": 0.5, "alpha_Rs": 0.1, "center_x": -0.3, "center_y": 0.2},
+            {
+                "Rs": 0.1,
+                "alpha_Rs": 0.01,
+                "r_trunc": 0.5,
+                "center_x": 0.8,
+                "center_y": 0.7,
+            },
+            {"gamma1": 0.03, "gamma2": -0.02},
+            {
+                "n_sersic": 3,
+                "R_sersic": 1.0,
+                "k_eff": 0.1,
+                "center_x": 0,
+                "center_y": 0,
+            },
+            {"m": 1, "a_m": 0.01, "phi_m": 0.3, "center_x": 0, "center_y": 0},
+            {"m": 4, "a_m": 0.01, "phi_m": -0.2, "center_x": 0, "center_y": 0},
+            self.kwargs[0],
+        ]
+        x, y = make_grid(num_pix=10, delta_pix=0.31)
+        lens_model = LensModel(lens_model_list)
+        out = lens_model.derivatives_and_hessian(x, y, kwargs_lens)
+        f_x, f_y = lens_model.alpha(x, y, kwargs_lens)
+        f_xx, f_xy, f_yx, f_yy = lens_model.hessian(x, y, kwargs_lens)
+        for f_fused, f in zip(out, [f_x, f_y, f_xx, f_xy, f_yx, f_yy]):
+            npt.assert_allclose(f_fused, f, rtol=1e-8, atol=1e-10)
+
+        for k in range(len(lens_model_list)):
+            out = lens_model.derivatives_and_hessian(1.1, -0.4, kwargs_lens, k=k)
+            f_x, f_y = lens_model.alpha(1.1, -0.4, kwargs_lens, k=k)
+            f_xx, f_xy, f_yx, f_yy = lens_model.hessian(1.1, -0.4, kwargs_lens, k=k)
+            for f_fused, f in zip(out, [f_x, f_y, f_xx, f_xy, f_yx, f_yy]):
+                npt.assert_allclose(f_fused, f, rtol=1e-8, atol=1e-10)
+
+        beta_x, beta_y, f_xx_, f_xy_, f_yx_, f_yy_ = (
+            lens_model.ray_shooting_and_hessian(x, y, kwargs_lens)
+        )
+        beta_x_, beta_y_ = lens_model.ray_shooting(x, y, kwargs_lens)
+        npt.assert_almost_equal(beta_x, beta_x_, decimal=12)
+        npt.assert_almost_equal(beta_y, beta_y_, decimal=12)
+
+        # multi-plane lensing re-uses the ray-tracing of the deflection
+        lens_model = LensModel(
+            ["SIS", "NFW"],
+            multi_plane=True,
+            lens_redshift_list=[0.5, 0.7],
+            z_source=2,
+        )
+        kwargs_lens = [
+            {"theta_E": 1, "center_x": 0, "center_y": 0},
+            {"Rs": 0.5, "alpha_Rs": 0.1, "center_x": -0.3, "center_y": 0.2},
+        ]
+        out = lens_model.derivatives_and_hessian(x, y, kwargs_lens)
+        f_x, f_y = lens_model.alpha(x, y, kwargs_lens)
+        f_xx, f_xy, f_yx, f_yy = lens_model.hessian(x, y, kwargs_lens)
+        for f_fused, f in zip(out, [f_x, f_y, f_xx, f_xy, f_yx, f_yy]):
+            npt.assert_almost_equal(f_fused, f, decimal=8)
+
     def test_hessian_differentials(self):
         """Routine to test the private numerical differentials, both cross and square
         methods in the infinitesimal regime."""
@@ -0,0 +1,83 @@
+__author__ = "sibirrer"
+
+import numpy as np
+import numpy.testing as npt
+from lenstronomy.LensModel.single_plane import SinglePlane
+from lenstronomy.LensModel.profile_groups import ProfileGroups
+
+
+class TestProfileGroups(object):
+    def setup_method(self):
+        np.random.seed(42)
+        n_sub = 30
+        self.lens_model_list = ["SIE", "SHEAR"] + ["TNFW"] * n_sub + ["NFW"] * n_sub
+        self.lens_model_list += ["SIS"] * 3
+        self.kwargs = [
+            {"theta_E": 1.0, "e1": 0.1, "e2": -0.05, "center_x": 0, "center_y": 0},
+            {"gamma1": 0.03, "gamma2": 0.01},
+        ]
+        for i in range(n_sub):
+            self.kwargs.append(
+                {
+                    "Rs": np.random.uniform(0.05, 0.2),
+                    "alpha_Rs": np.random.uniform(0.001, 0.01),
+                    "r_trunc": np.random.uniform(0.1, 1),
+                    "center_x": np.random.uniform(-1.5, 1.5),
+                    "center_y": np.random.uniform(-1.5, 1.5),
+                }
+            )
+        for i in range(n_sub):
+            self.kwargs.append(
+                {
+                    "Rs": np.random.uniform(0.05, 0.2),
+                    "alpha_Rs": np.random.uniform(0.001, 0.01),
+                    "center_x": np.random.uniform(-1.5, 1.5),
+                    "center_y": np.random.uniform(-1.5, 1.5),
+                }
+            )
+        for i in range(3):
+            self.kwargs.append(
+                {
+                    "theta_E": 0.05,
+                    "center_x": np.random.uniform(-1.5, 1.5),
+                    "center_y": np.random.uniform(-1.5, 1.5),
+                }
+            )
+        self.lens_model = SinglePlane(self.lens_model_list)
+        self.lens_model_group = SinglePlane(
+            self.lens_model_list,
+            group_profiles=True,
+            kwargs_group_profiles={"max_elements": 1000},
+        )
+
+    def test_alpha(self):
+        x, y = np.meshgrid(np.linspace(-2, 2, 20), np.linspace(-2, 2, 20))
+        # include the exact centers of some profiles
+        x[0, 0], y[0, 0] = self.kwargs[2]["center_x"], self.kwargs[2]["center_y"]
+        x[0, 1], y[0, 1] = self.kwargs[-1]["center_x"], self.kwargs[-1]["center_y"]
+        f_x, f_y = self.lens_model.alpha(x, y, self.kwargs)
+        f_x_g, f_y_g = self.lens_model_group.alpha(x, y, self.kwargs)
+        assert f_x_g.shape == x.shape
+        npt.assert_allclose(f_x_g, f_x, rtol=1e-10, atol=1e-14)
+        npt.assert_allclose(f_y_g, f_y, rtol=1e-10, atol=1e-14)
+
+        f_x, f_y = self.lens_model.alpha(0.3, -0.2, self.kwargs, k=[0, 3, 40])
+        f_x_g, f_y_g = self.lens_model_group.alpha(0.3, -0.2, self.kwargs, k=[0, 3, 40])
+        npt.assert_almost_equal(f_x_g, f_x, decimal=12)
+        npt.assert_almost_equal(f_y_g, f_y, decimal=12)
+
+    def test_hessian(self):
+        x, y = np.linspace(-2, 2, 50), np.linspace(-1, 1.5, 50)
+        out = self.lens_model.hessian(x, y, self.kwargs)
+        out_g = self.lens_model_group.hessian(x, y, self.kwargs)
+        for f, f_g in zip(out, out_g):
+            npt.assert_allclose(f_g, f, rtol=1e-10, atol=1e-14)
+
+    def test_grouped_index(self):
+        groups = ProfileGroups(
+            self.lens_model_list, self.lens_model.func_list, min_group_size=5
+        )
+        grouped_index = groups.grouped_index
+        assert np.sum(grouped_index) == 60
+        assert not grouped_index[0]
+        assert not grouped_index[-1]
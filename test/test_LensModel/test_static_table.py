@@ -0,0 +1,155 @@
+__author__ = "sibirrer"
+
+import numpy as np
+import numpy.testing as npt
+import pytest
+
+from lenstronomy.LensModel.lens_model import LensModel
+from lenstronomy.LensModel.static_table import StaticLensTable, _regular_grid_axes
+from lenstronomy.Util import util
+
+
+class TestStaticLensTable(object):
+    def setup_method(self):
+        self.lens_model_list = ["SIE", "SHEAR", "NFW", "NFW", "SIS"]
+        self.kwargs_lens = [
+            {"theta_E": 1.0, "e1": 0.1, "e2": -0.05, "center_x": 0, "center_y": 0},
+            {"gamma1": 0.02, "gamma2": 0.01},
+            {"Rs": 0.5, "alpha_Rs": 0.1, "center_x": 1.0, "center_y": 0.3},
+            {"Rs": 0.3, "alpha_Rs": 0.05, "center_x": -0.6, "center_y": 0.8},
+            {"theta_E": 0.05, "center_x": 0.2, "center_y": -1.1},
+        ]
+        self.lens_model = LensModel(self.lens_model_list)
+        self.lens_model_table = LensModel(
+            self.lens_model_list, static_table_index=[1, 2, 3, 4]
+        )
+        self.x, self.y = util.make_grid(num_pix=20, delta_pix=0.13)
+
+    def test_alpha_hessian(self):
+        for i in range(2):
+            f_x, f_y = self.lens_model_table.alpha(self.x, self.y, self.kwargs_lens)
+            f_x_true, f_y_true = self.lens_model.alpha(self.x, self.y, self.kwargs_lens)
+            npt.assert_almost_equal(f_x, f_x_true, decimal=10)
+            npt.assert_almost_equal(f_y, f_y_true, decimal=10)
+            hessian = self.lens_model_table.hessian(self.x, self.y, self.kwargs_lens)
+            hessian_true = self.lens_model.hessian(self.x, self.y, self.kwargs_lens)
+            npt.assert_almost_equal(hessian, hessian_true, decimal=10)
+            out = self.lens_model_table.derivatives_and_hessian(
+                self.x, self.y, self.kwargs_lens
+            )
+            npt.assert_almost_equal(out[:2], [f_x_true, f_y_true], decimal=10)
+            npt.assert_almost_equal(out[2:], hessian_true, decimal=10)
+
+        # subsets of the tabulated models are evaluated directly
+        for k in [[0, 1], [2], 3]:
+            npt.assert_almost_equal(
+                self.lens_model_table.alpha(self.x, self.y, self.kwargs_lens, k=k),
+                self.lens_model.alpha(self.x, self.y, self.kwargs_lens, k=k),
+                decimal=10,
+            )
+
+    def test_invalidation(self):
+        static_table = self.lens_model_table.lens_model._static_table
+        self.lens_model_table.alpha(self.x, self.y, self.kwargs_lens)
+        self.lens_model_table.alpha(self.x, self.y, self.kwargs_lens)
+        assert len(static_table._tables) == 1
+
+        # a change of the non-tabulated model keeps the table
+        kwargs_lens = [dict(kwargs) for kwargs in self.kwargs_lens]
+        kwargs_lens[0]["theta_E"] = 1.1
+        self.lens_model_table.alpha(self.x, self.y, kwargs_lens)
+        assert len(static_table._tables) == 1
+
+        # a change of the tabulated models invalidates the table
+        kwargs_lens[2]["alpha_Rs"] = 0.2
+        f_x, f_y = self.lens_model_table.alpha(self.x, self.y, kwargs_lens)
+        f_x_true, f_y_true = self.lens_model.alpha(self.x, self.y, kwargs_lens)
+        npt.assert_almost_equal(f_x, f_x_true, decimal=10)
+        npt.assert_almost_equal(f_y, f_y_true, decimal=10)
+        assert len(static_table._tables) == 1
+
+        # new coordinates create a new table
+        f_x, f_y = self.lens_model_table.alpha(self.x + 0.01, self.y, kwargs_lens)
+        f_x_true, f_y_true = self.lens_model.alpha(self.x + 0.01, self.y, kwargs_lens)
+        npt.assert_almost_equal(f_x, f_x_true, decimal=10)
+        assert len(static_table._tables) == 2
+
+    def test_interpolation(self):
+        lens_model_table = LensModel(
+            self.lens_model_list,
+            static_table_index=[1, 2, 3],
+            kwargs_static_table={"interpolation": True, "max_tables": 2},
+        )
+        x, y = util.make_grid(num_pix=200, delta_pix=0.02)
+        lens_model_table.alpha(x, y, self.kwargs_lens)
+        x_ = np.array([0.1, -0.5, 1.3])
+        y_ = np.array([0.7, 0.2, -0.4])
+        f_x, f_y = lens_model_table.alpha(x_, y_, self.kwargs_lens)
+        f_x_true, f_y_true = self.lens_model.alpha(x_, y_, self.kwargs_lens)
+        npt.assert_almost_equal(f_x, f_x_true, decimal=4)
+        npt.assert_almost_equal(f_y, f_y_true, decimal=4)
+        f_xx, f_xy, f_yx, f_yy = lens_model_table.hessian(x_, y_, self.kwargs_lens)
+        f_xx_true, f_xy_true, f_yx_true, f_yy_true = self.lens_model.hessian(
+            x_, y_, self.kwargs_lens
+        )
+        npt.assert_almost_equal(f_xx, f_xx_true, decimal=3)
+        npt.assert_almost_equal(f_yy, f_yy_true, decimal=3)
+        assert len(lens_model_table.lens_model._static_table._tables) == 1
+
+        # coordinates outside of the regular grid are evaluated directly
+        f_x, f_y = lens_model_table.alpha(10.0, 0.0, self.kwargs_lens)
+        f_x_true, f_y_true = self.lens_model.alpha(10.0, 0.0, self.kwargs_lens)
+        npt.assert_almost_equal(f_x, f_x_true, decimal=10)
+        assert len(lens_model_table.lens_model._static_table._tables) == 1
+
+    def test_small_coordinates(self):
+        static_table = self.lens_model_table.lens_model._static_table
+        x, y = util.make_grid(num_pix=200, delta_pix=0.02)
+        self.lens_model_table.ray_shooting(x, y, self.kwargs_lens)
+        # point source positions and solver steps do not replace the grid table
+        for i in range(6):
+            x_ = np.random.uniform(-1, 1, 4)
+            y_ = np.random.uniform(-1, 1, 4)
+            beta_x, beta_y = self.lens_model_table.ray_shooting(
+                x_, y_, self.kwargs_lens
+            )
+            beta_x_true, beta_y_true = self.lens_model.ray_shooting(
+                x_, y_, self.kwargs_lens
+            )
+            npt.assert_almost_equal(beta_x, beta_x_true, decimal=10)
+            npt.assert_almost_equal(beta_y, beta_y_true, decimal=10)
+        assert len(static_table._tables) == 1
+        assert static_table._tables[0]["x"].shape == x.shape
+
+    def test_register_grid(self):
+        x_ = np.array([0.1, -0.5, 1.3])
+        y_ = np.array([0.7, 0.2, -0.4])
+        lens_model_table = LensModel(
+            self.lens_model_list,
+            static_table_index=[1, 2],
+            kwargs_static_table={"grid_list": [(x_, y_)], "max_tables": 1},
+        )
+        static_table = lens_model_table.lens_model._static_table
+        f_x, f_y = lens_model_table.alpha(x_, y_, self.kwargs_lens)
+        npt.assert_almost_equal(
+            f_x, self.lens_model.alpha(x_, y_, self.kwargs_lens)[0], decimal=10
+        )
+        assert len(static_table._tables) == 1
+        # the registered table is kept when a large grid exceeds max_tables
+        lens_model_table.alpha(self.x, self.y, self.kwargs_lens)
+        assert len(static_table._tables) == 1
+        assert static_table._tables[0]["registered"] is True
+
+    def test_regular_grid(self):
+        static_table = StaticLensTable(func_list=[], index_list=[])
+        assert static_table.index_list == []
+        x_axes, y_axes = _regular_grid_axes(self.x, self.y)
+        assert len(x_axes) == 20
+        assert len(y_axes) == 20
+        assert _regular_grid_axes(self.y, self.x) is None
+        assert _regular_grid_axes(self.x[:-1], self.y[:-1]) is None
+        assert _regular_grid_axes(np.array([1.0]), np.array([1.0])) is None
+
+
+if __name__ == "__main__":
+    pytest.main()
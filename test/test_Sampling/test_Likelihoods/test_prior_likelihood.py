@@ -67,6 +67,30 @@ class TestImageLikelihood(object):
         )
         npt.assert_almost_equal(logL, -3.7732255247006443, decimal=8)
 
+    def test_logL_batch(self):
+        sample = np.random.normal(loc=2, scale=0.2, size=1000)
+        prior = PriorLikelihood(
+            prior_lens=[[0, "gamma", 2, 0.1]],
+            prior_special=[["source_size", 1, 0.1]],
+            prior_lens_lognormal=[[0, "theta_E", 0.0, 0.1]],
+            prior_source=[[0, "center", np.array([0, 1]), 0.1]],
+            prior_lens_kde=[[0, "gamma", sample]],
+        )
+        kwargs_return_list = [
+            {
+                "kwargs_lens": [{"gamma": gamma, "theta_E": 1.2}],
+                "kwargs_source": [{"center": np.array([0.1, 0.9])}],
+                "kwargs_lens_light": [],
+                "kwargs_ps": [],
+                "kwargs_special": {"source_size": 1.1},
+            }
+            for gamma in [1.9, 2.0, 2.2]
+        ]
+        logL = prior.logL_batch(kwargs_return_list)
+        logL_list = [prior.logL(**kwargs) for kwargs in kwargs_return_list]
+        npt.assert_almost_equal(logL, logL_list, decimal=10)
+        assert len(prior.logL_batch([])) == 0
+
     def gauss(self, x, mean, simga):
         return np.exp(-(((x - mean) / (simga)) ** 2) / 2) / np.sqrt(2 * np.pi) / simga
 
@@ -9,6 +9,11 @@ class _FakeSamplerLikelihood(object):
         return float(np.sum(args))
 
 
+class _FakeThresholdLikelihood(object):
+    def logL(self, args, logL_threshold=None):
+        return float(np.sum(args)), logL_threshold
+
+
 class _FakeNestedLikelihood(object):
     def __call__(self, p):
         return float(np.sum(p))
@@ -37,6 +42,14 @@ def test_sampler_logl_worker_evaluates_logl():
     assert result == 6.0
 
 
+def test_sampler_logl_threshold_worker():
+    with pytest.raises(RuntimeError):
+        pu.sampler_logl_threshold_worker((np.array([1.0, 2.0]), -2.0))
+    pu.set_sampler_likelihood_module(_FakeThresholdLikelihood())
+    result = pu.sampler_logl_threshold_worker((np.array([1.0, 2.0]), -2.0))
+    assert result == (3.0, -2.0)
+
+
 def test_nested_logl_worker_requires_initialization():
     with pytest.raises(RuntimeError):
         pu.nested_logl_worker(np.array([1.0, 2.0]))
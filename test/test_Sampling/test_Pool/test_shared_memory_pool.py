@@ -0,0 +1,223 @@
+import numpy as np
+import numpy.testing as npt
+import pytest
+
+import lenstronomy.Util.simulation_util as sim_util
+from lenstronomy.Data.imaging_data import ImageData
+from lenstronomy.Data.psf import PSF
+from lenstronomy.ImSim.image_model import ImageModel
+from lenstronomy.LensModel.lens_model import LensModel
+from lenstronomy.LightModel.light_model import LightModel
+from lenstronomy.Sampling.likelihood import Likelihood
+from lenstronomy.Sampling.parameters import Param
+from lenstronomy.Sampling.sampler import Sampler
+from lenstronomy.Sampling.Pool.shared_memory_pool import (
+    SharedMemoryPool,
+    _SharedArray,
+    _attach_arrays,
+)
+
+
+class TestSharedMemoryPool(object):
+    def setup_class(self):
+        kwargs_data = sim_util.data_configure_simple(40, 0.1, 100, 0.05)
+        kwargs_psf = {"psf_type": "GAUSSIAN", "fwhm": 0.3}
+        kwargs_numerics = {"supersampling_factor": 1}
+        self.kwargs_lens = [{"theta_E": 1.0, "center_x": 0, "center_y": 0}]
+        self.kwargs_source = [
+            {"amp": 10, "R_sersic": 0.3, "n_sersic": 2, "center_x": 0, "center_y": 0}
+        ]
+        kwargs_model = {
+            "lens_model_list": ["SIS"],
+            "source_light_model_list": ["SERSIC"],
+        }
+        image_model = ImageModel(
+            ImageData(**kwargs_data),
+            PSF(**kwargs_psf),
+            LensModel(["SIS"]),
+            LightModel(["SERSIC"]),
+            kwargs_numerics=kwargs_numerics,
+        )
+        kwargs_data["image_data"] = sim_util.simulate_simple(
+            image_model, self.kwargs_lens, self.kwargs_source
+        )
+        self.kwargs_data_joint = {
+            "multi_band_list": [[kwargs_data, kwargs_psf, kwargs_numerics]],
+            "multi_band_type": "single-band",
+        }
+        self.kwargs_model = kwargs_model
+        self.kwargs_likelihood = {"prior_lens": [[0, "theta_E", 1, 0.1]]}
+        self.param_class = Param(
+            kwargs_model,
+            kwargs_lower_lens=[{"theta_E": 0.5, "center_x": -1, "center_y": -1}],
+            kwargs_upper_lens=[{"theta_E": 2, "center_x": 1, "center_y": 1}],
+            kwargs_lower_source=[
+                {"R_sersic": 0.01, "n_sersic": 0.5, "center_x": -1, "center_y": -1}
+            ],
+            kwargs_upper_source=[
+                {"R_sersic": 1, "n_sersic": 6, "center_x": 1, "center_y": 1}
+            ],
+        )
+        self.likelihood = Likelihood(
+            self.kwargs_data_joint,
+            kwargs_model,
+            self.param_class,
+            **self.kwargs_likelihood
+        )
+        self.pool = SharedMemoryPool(
+            self.kwargs_data_joint,
+            kwargs_model,
+            self.param_class,
+            self.kwargs_likelihood,
+            processes=2,
+            min_shared_bytes=1000,
+        )
+
+    def teardown_class(self):
+        self.pool.close()
+
+    def test_logL_batch(self):
+        args = self.param_class.kwargs2args(
+            kwargs_lens=self.kwargs_lens, kwargs_source=self.kwargs_source
+        )
+        args_array = np.array([args, args * 1.02, args * 0.98])
+        logL = self.pool.logL_batch(args_array)
+        npt.assert_allclose(logL, self.likelihood.logL_batch(args_array), rtol=1e-10)
+        npt.assert_allclose(self.pool.logL(args), logL[0], rtol=1e-10)
+        logL_threshold = self.pool.logL_batch(args_array, logL_threshold=logL[0] - 1)
+        npt.assert_allclose(logL_threshold[0], logL[0], rtol=1e-10)
+        assert np.all(logL_threshold >= logL)
+
+        timing = self.pool.worker_timing
+        assert len(timing) == 2
+        assert timing[0]["num_samples"] == 5
+        assert timing[1]["num_samples"] == 2
+        assert timing[0]["time"] > 0
+        assert self.pool.load_imbalance >= 1
+        self.pool.reset_timing()
+        assert self.pool.worker_timing[0]["num_calls"] == 0
+        assert self.pool.load_imbalance == 1
+
+    def test_sampler(self):
+        sampler = Sampler(likelihood_class=self.likelihood)
+        args = self.param_class.kwargs2args(
+            kwargs_lens=self.kwargs_lens, kwargs_source=self.kwargs_source
+        )
+        result, chain = sampler.pso(
+            n_particles=6,
+            n_iterations=2,
+            lower_start=args - 0.05,
+            upper_start=args + 0.05,
+            init_pos=args,
+            pool=self.pool,
+            verbose=False,
+        )
+        assert len(result) == len(args)
+        assert self.pool.worker_timing[1]["num_samples"] >= 6
+
+    def test_check_likelihood(self):
+        assert self.pool.num_param == self.param_class.num_param()[0]
+        npt.assert_equal(self.pool.param_limits, self.likelihood.param_limits)
+        self.pool.check_likelihood(self.likelihood)
+
+        # a sampler with different bounds or parameters does not accept the pool
+        param_class = Param(
+            self.kwargs_model,
+            kwargs_lower_lens=[{"theta_E": 0.1, "center_x": -1, "center_y": -1}],
+            kwargs_upper_lens=[{"theta_E": 2, "center_x": 1, "center_y": 1}],
+            kwargs_lower_source=[
+                {"R_sersic": 0.01, "n_sersic": 0.5, "center_x": -1, "center_y": -1}
+            ],
+            kwargs_upper_source=[
+                {"R_sersic": 1, "n_sersic": 6, "center_x": 1, "center_y": 1}
+            ],
+        )
+        likelihood = Likelihood(self.kwargs_data_joint, self.kwargs_model, param_class)
+        with pytest.raises(ValueError):
+            self.pool.check_likelihood(likelihood)
+        sampler = Sampler(likelihood_class=likelihood)
+        args = self.param_class.kwargs2args(
+            kwargs_lens=self.kwargs_lens, kwargs_source=self.kwargs_source
+        )
+        with pytest.raises(ValueError):
+            sampler.pso(
+                n_particles=6,
+                n_iterations=2,
+                lower_start=args - 0.05,
+                upper_start=args + 0.05,
+                init_pos=args,
+                pool=self.pool,
+                verbose=False,
+            )
+        param_class = Param(
+            self.kwargs_model,
+            kwargs_fixed_lens=[{"center_x": 0, "center_y": 0}],
+            kwargs_lower_lens=[{"theta_E": 0.5, "center_x": -1, "center_y": -1}],
+            kwargs_upper_lens=[{"theta_E": 2, "center_x": 1, "center_y": 1}],
+            kwargs_lower_source=[
+                {"R_sersic": 0.01, "n_sersic": 0.5, "center_x": -1, "center_y": -1}
+            ],
+            kwargs_upper_source=[
+                {"R_sersic": 1, "n_sersic": 6, "center_x": 1, "center_y": 1}
+            ],
+        )
+        likelihood = Likelihood(self.kwargs_data_joint, self.kwargs_model, param_class)
+        with pytest.raises(ValueError):
+            self.pool.check_likelihood(likelihood)
+
+    def test_share_data(self):
+        kwargs_data, kwargs_psf, kwargs_numerics = self.kwargs_data_joint[
+            "multi_band_list"
+        ][0]
+        kernel = np.ones((41, 41)) / 41**2
+        kwargs_psf = {"psf_type": "PIXEL", "kernel_point_source": kernel}
+        kwargs_data_joint = {
+            "multi_band_list": [[kwargs_data, kwargs_psf, kwargs_numerics]],
+            "multi_band_type": "single-band",
+        }
+        num_blocks = len(self.pool._shared_memory_list)
+        shared = self.pool._share_data(kwargs_data_joint, min_shared_bytes=1000)
+        kwargs_data_shared, kwargs_psf_shared, _ = shared["multi_band_list"][0]
+        # the imaging data is shared, the PSF (copied by the PSF() class) is not
+        assert isinstance(kwargs_data_shared["image_data"], _SharedArray)
+        assert kwargs_psf_shared["kernel_point_source"] is kernel
+        assert shared["multi_band_type"] == "single-band"
+        assert len(self.pool._shared_memory_list) == num_blocks + 1
+
+    def test_attach_arrays(self):
+        pool = self.pool
+        image = self.kwargs_data_joint["multi_band_list"][0][0]["image_data"]
+        shared = pool._share_arrays({"a": [image, 1]}, min_shared_bytes=0)
+        assert isinstance(shared["a"][0], _SharedArray)
+        shared_memory_list = []
+        attached = _attach_arrays(shared, shared_memory_list)
+        npt.assert_equal(attached["a"][0], image)
+        assert attached["a"][1] == 1
+        assert attached["a"][0].flags.writeable is False
+        del attached
+        for block in shared_memory_list:
+            block.close()
+
+
+class TestRaise(object):
+    def test_raise(self):
+        with pytest.raises(ValueError):
+            SharedMemoryPool({}, {}, None, processes=0)
+        # workers that fail to build the likelihood raise in the master process
+        with pytest.raises(RuntimeError):
+            SharedMemoryPool({}, {}, None, processes=1)
+        pool = SharedMemoryPool(
+            {"multi_band_list": []},
+            {},
+            Param({}),
+            {"image_likelihood": False},
+            processes=1,
+        )
+        pool.close()
+        pool.close()
+        with pytest.raises(RuntimeError):
+            pool.logL_batch(np.zeros((1, 0)))
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -6,10 +6,14 @@ Execute with py.test -v
 import numpy as np
 import pytest
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+import multiprocess
 import numpy.testing as npt
 
 from lenstronomy.Sampling.Samplers.pso import ParticleSwarmOptimizer
 from lenstronomy.Sampling.Samplers.pso import Particle
+from lenstronomy.Util.checkpoint_util import load_checkpoint
 
 
 class TestParticleSwarmOptimizer(object):
@@ -110,6 +114,176 @@ class TestParticleSwarmOptimizer(object):
         assert np.all(chi2_list) != 0
         assert pso.global_best.fitness != -np.inf
 
+    def test_vectorize(self):
+        np.random.seed(42)
+
+        def ln_probability(x):
+            assert np.shape(x) == (20, 2)
+            return -np.sum(x**2, axis=1)
+
+        pso = ParticleSwarmOptimizer(
+            ln_probability,
+            low=[-10, -10],
+            high=[10, 10],
+            particle_count=20,
+            vectorize=True,
+        )
+        result, [chi2_list, pos_list, vel_list] = pso.optimize(50, verbose=False)
+        assert len(chi2_list) == 50
+        npt.assert_almost_equal(result, [0, 0], decimal=2)
+
+    def test_early_rejection(self):
+        np.random.seed(42)
+        threshold_list = []
+
+        def ln_probability(x, logL_threshold):
+            threshold_list.append(logL_threshold)
+            return -np.sum(x**2, axis=1)
+
+        pso = ParticleSwarmOptimizer(
+            ln_probability,
+            low=[-10, -10],
+            high=[10, 10],
+            particle_count=20,
+            vectorize=True,
+            early_rejection=True,
+        )
+        result, _ = pso.optimize(50, verbose=False)
+        npt.assert_almost_equal(result, [0, 0], decimal=2)
+        # the initial swarm is evaluated in full, later particles are rejected below
+        # the worst particle of the previous iteration
+        assert np.all(threshold_list[0] == -np.inf)
+        assert len(threshold_list[1]) == 20
+        assert np.all(threshold_list[1] > -np.inf)
+
+        with pytest.raises(ValueError):
+            ParticleSwarmOptimizer(
+                ln_probability, low=[-10], high=[10], early_rejection=True
+            )
+
+    def test_optimize_async(self):
+        np.random.seed(42)
+
+        def ln_probability(x):
+            return -np.sum(np.array(x) ** 2)
+
+        pso = ParticleSwarmOptimizer(
+            ln_probability, low=[-10, -10], high=[10, 10], particle_count=20
+        )
+        result, [chi2_list, pos_list, vel_list] = pso.optimize_async(100, verbose=False)
+        npt.assert_almost_equal(result, [0, 0], decimal=3)
+        assert len(chi2_list) == len(pos_list) == len(vel_list)
+        assert pso.utilization["num_evaluations"] <= 100 * 20
+        assert pso.utilization["num_workers"] == 1
+        assert 0 < pso.utilization["utilization"] <= 1
+
+        # evaluation budget without convergence criteria being met
+        pso = ParticleSwarmOptimizer(
+            ln_probability, low=[-10, -10], high=[10, 10], particle_count=10
+        )
+        _, [chi2_list, _, _] = pso.optimize_async(3, verbose=True, m=0, n=0)
+        assert len(chi2_list) == 3
+        assert pso.utilization["num_evaluations"] == 30
+
+        # particles evaluated with an executor
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            executor.size = 4
+            pso = ParticleSwarmOptimizer(
+                ln_probability,
+                low=[-10, -10],
+                high=[10, 10],
+                particle_count=20,
+                pool=executor,
+            )
+            result, _ = pso.optimize_async(100, verbose=False, early_stop_tolerance=1)
+        assert -2 * pso.global_best.fitness < 1
+        assert pso.utilization["num_workers"] == 4
+
+        # particles evaluated with apply_async() of a process pool
+        with multiprocess.Pool(2) as pool:
+            pso = ParticleSwarmOptimizer(
+                _ln_probability, low=[-10], high=[10], particle_count=10, pool=pool
+            )
+            result, _ = pso.optimize_async(50, verbose=False)
+        npt.assert_almost_equal(result, [0], decimal=2)
+
+        pso = ParticleSwarmOptimizer(
+            ln_probability, low=[-10], high=[10], particle_count=10, vectorize=True
+        )
+        with pytest.raises(ValueError):
+            pso.optimize_async(10)
+
+        def ln_probability_raise(x):
+            raise RuntimeError("likelihood failed")
+
+        pso = ParticleSwarmOptimizer(
+            ln_probability_raise, low=[-10], high=[10], particle_count=2
+        )
+        with pytest.raises(RuntimeError):
+            pso.optimize_async(10)
+
+    def test_checkpoint(self, tmp_path):
+        checkpoint_filename = str(tmp_path / "pso_checkpoint.pkl")
+
+        class _Interrupt(Exception):
+            pass
+
+        def run(max_iter, seed, filename=None, max_calls=None, low=(-10, -10)):
+            np.random.seed(seed)
+            num_calls = [0]
+
+            def ln_probability(x):
+                num_calls[0] += 1
+                if max_calls is not None and num_calls[0] > max_calls:
+                    raise _Interrupt()
+                return _ln_probability(x)
+
+            pso = ParticleSwarmOptimizer(
+                ln_probability, low=low, high=[10, 10], particle_count=10
+            )
+            return pso.optimize(
+                max_iter,
+                verbose=False,
+                checkpoint_filename=filename,
+                checkpoint_interval=2,
+            )
+
+        result, [chi2_list, pos_list, _] = run(10, seed=42)
+        # an optimization interrupted in the 6th iteration is checkpointed after the 4th
+        with pytest.raises(_Interrupt):
+            run(10, seed=42, filename=checkpoint_filename, max_calls=65)
+        state = load_checkpoint(checkpoint_filename)
+        assert state["iteration"] == 4
+        assert state["finished"] is False
+        assert state["fingerprint"]["max_iter"] == 10
+        assert state["fingerprint"]["particle_count"] == 10
+        # the resumed optimization continues with the stored swarm and random state
+        result_resumed, [chi2_list_resumed, pos_list_resumed, _] = run(
+            10, seed=1, filename=checkpoint_filename
+        )
+        npt.assert_almost_equal(result_resumed, result, decimal=12)
+        npt.assert_almost_equal(chi2_list_resumed, chi2_list, decimal=12)
+        npt.assert_almost_equal(pos_list_resumed, pos_list, decimal=12)
+
+        # the completed optimization is marked as finished and returned as is
+        assert load_checkpoint(checkpoint_filename)["finished"] is True
+        result_finished, [chi2_list_finished, _, _] = run(
+            10, seed=1, filename=checkpoint_filename, max_calls=0
+        )
+        npt.assert_almost_equal(result_finished, result, decimal=12)
+        npt.assert_almost_equal(chi2_list_finished, chi2_list, decimal=12)
+
+        # checkpoints of different optimizations are refused
+        with pytest.raises(ValueError):
+            run(20, seed=42, filename=checkpoint_filename)
+        with pytest.raises(ValueError):
+            run(10, seed=42, filename=checkpoint_filename, low=(-5, -10))
+        pso = ParticleSwarmOptimizer(
+            _ln_probability, low=[-10], high=[10], particle_count=10
+        )
+        with pytest.raises(ValueError):
+            pso.optimize(10, checkpoint_filename=checkpoint_filename)
+
     def test_sample(self):
         """
 
@@ -158,5 +332,9 @@ class TestParticleSwarmOptimizer(object):
         npt.assert_almost_equal(result[0], 0, decimal=6)
 
 
+def _ln_probability(x):
+    return -np.sum(np.array(x) ** 2)
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -8,8 +8,13 @@ import lenstronomy.Util.class_creator as class_creator
 from lenstronomy.ImSim.image_model import ImageModel
 from lenstronomy.Sampling.likelihood import Likelihood
 from lenstronomy.Sampling.parameters import Param
+from lenstronomy.Sampling.Pool.parallelization_util import (
+    set_sampler_likelihood_module,
+)
 from lenstronomy.Data.imaging_data import ImageData
 from lenstronomy.Data.psf import PSF
+from lenstronomy.LightModel.light_model import LightModel
+from lenstronomy.Sampling.sampler import Sampler
 from lenstronomy.Data.kinematic_bin_2D import KinBin
 from lenstronomy.Sampling.Likelihoods import kinematic_NN_call
 import lenstronomy.Util.kernel_util as kernel_util
@@ -178,6 +183,7 @@ class TestLikelihood(object):
             param_class=self.param_class,
             **kwargs_likelihood,
         )
+        self.kwargs_likelihood = kwargs_likelihood
         self.kwargs_band = kwargs_band
         self.kwargs_psf = kwargs_psf
         self.num_pix = num_pix
@@ -195,6 +201,135 @@ class TestLikelihood(object):
         num_data_evaluate = self.Likelihood.num_data
         npt.assert_almost_equal(logL / num_data_evaluate, -1 / 2.0, decimal=1)
 
+        # a repeated evaluation re-uses the memoized model components
+        logL_repeat = self.Likelihood.logL(args)
+        npt.assert_almost_equal(logL_repeat, logL, decimal=8)
+        stats = self.Likelihood.component_cache_stats
+        assert stats["source_response"]["hits"] >= 1
+
+    def test_logL_batch(self):
+        args = self.param_class.kwargs2args(
+            kwargs_lens=self.kwargs_lens,
+            kwargs_source=self.kwargs_source,
+            kwargs_lens_light=self.kwargs_lens_light,
+            kwargs_ps=self.kwargs_ps,
+            kwargs_special=self.kwargs_cosmo,
+        )
+        lower_limit, upper_limit = self.Likelihood.param_limits
+        args_outside = np.array(args)
+        args_outside[0] = upper_limit[0] + 1
+        args_perturbed = np.array(args)
+        args_perturbed[0] *= 1.05
+        args_array = np.array([args, args_outside, args_perturbed])
+        logL_list = [self.Likelihood.logL(args_) for args_ in args_array]
+        logL = self.Likelihood.logL_batch(args_array)
+        assert logL.shape == (3,)
+        assert logL[1] == -(10**18)
+        npt.assert_allclose(logL, logL_list, rtol=1e-10)
+
+        # evaluation of the model likelihoods with the worker function of a pool
+        class _Pool(object):
+            def __init__(self):
+                self.items = []
+
+            def map(self, function, iterable):
+                self.items = list(iterable)
+                return map(function, self.items)
+
+        set_sampler_likelihood_module(self.Likelihood)
+        pool = _Pool()
+        logL_pool = self.Likelihood.logL_batch(args_array, pool=pool)
+        npt.assert_allclose(logL_pool, logL_list, rtol=1e-10)
+        # only the parameter vectors within the bounds are sent to the workers
+        assert len(pool.items) == 2
+        npt.assert_equal(pool.items[0], args_array[0])
+        npt.assert_equal(pool.items[1], args_array[2])
+
+    def test_early_rejection(self):
+        args = self.param_class.kwargs2args(
+            kwargs_lens=self.kwargs_lens,
+            kwargs_source=self.kwargs_source,
+            kwargs_lens_light=self.kwargs_lens_light,
+            kwargs_ps=self.kwargs_ps,
+            kwargs_special=self.kwargs_cosmo,
+        )
+        # the marginalization over the linear parameters can be positive, the imaging
+        # likelihood is then never skipped
+        logL_marg = self.Likelihood.logL(args)
+        npt.assert_almost_equal(
+            self.Likelihood.logL(args, logL_threshold=-0.1), logL_marg, decimal=8
+        )
+        assert self.Likelihood.term_stats["image"]["skips"] == 0
+
+        likelihood = Likelihood(
+            kwargs_data_joint=self.kwargs_data,
+            kwargs_model=self.kwargs_model,
+            param_class=self.param_class,
+            **dict(self.kwargs_likelihood, source_marg=False),
+        )
+        assert list(likelihood.term_stats.keys()) == [
+            "custom",
+            "prior",
+            "position",
+            "flux_ratio",
+            "image",
+        ]
+        likelihood.reset_term_stats()
+        logL = likelihood.logL(args)
+        # a threshold below the log likelihood does not change the result
+        logL_below = likelihood.logL(args, logL_threshold=logL - 1)
+        npt.assert_almost_equal(logL_below, logL, decimal=8)
+        stats = likelihood.term_stats
+        assert stats["image"]["calls"] == 2
+        assert stats["image"]["skips"] == 0
+        assert stats["image"]["time"] > 0
+
+        # the custom likelihood can be positive and is always evaluated, a positive
+        # threshold rejects the model right after it
+        assert likelihood.logL(args, logL_threshold=1) < 1
+        stats = likelihood.term_stats
+        assert stats["custom"]["calls"] == 3
+        assert stats["custom"]["skips"] == 0
+        assert stats["prior"]["skips"] == 1
+
+        # the image likelihood is skipped once the cheap terms fall below the threshold
+        logL_rejected = likelihood.logL(args, logL_threshold=-0.1)
+        assert logL < logL_rejected < -0.1
+        stats = likelihood.term_stats
+        assert stats["flux_ratio"]["calls"] == 3
+        assert stats["image"]["calls"] == 2
+        assert stats["image"]["skips"] == 2
+
+        logL_batch = likelihood.logL_batch(
+            np.array([args, args]), logL_threshold=np.array([logL - 1, -0.1])
+        )
+        npt.assert_almost_equal(logL_batch, [logL, logL_rejected], decimal=8)
+        assert likelihood.term_stats["prior"]["calls"] == 5
+
+        class _Pool(object):
+            @staticmethod
+            def map(function, iterable):
+                return map(function, iterable)
+
+        set_sampler_likelihood_module(likelihood)
+        logL_pool = likelihood.logL_batch(
+            np.array([args, args]), pool=_Pool(), logL_threshold=[logL - 1, -0.1]
+        )
+        npt.assert_almost_equal(logL_pool, [logL, logL_rejected], decimal=8)
+
+        likelihood.reset_term_stats()
+        assert likelihood.term_stats["image"] == {
+            "time": 0.0,
+            "calls": 0,
+            "skips": 0,
+        }
+
+    def test_check_bounds_batch(self):
+        bound_hit = self.Likelihood.check_bounds_batch(
+            args_array=[[0, 1], [1, 1], [1, 3]], lowerLimit=[1, 0], upperLimit=[2, 2]
+        )
+        npt.assert_equal(bound_hit, [True, False, True])
+
     def test_time_delay_likelihood(self):
         kwargs_likelihood = {
             "time_delay_likelihood": True,
@@ -562,5 +697,72 @@ class TestLikelihood(object):
         npt.assert_almost_equal(log_l, 0, decimal=5)
 
 
+class TestEarlyRejectionNatwt(object):
+    def setup_method(self):
+        kwargs_data = sim_util.data_configure_simple(
+            num_pix=20, delta_pix=0.1, background_rms=1, exposure_time=1
+        )
+        kwargs_data["likelihood_method"] = "interferometry_natwt"
+        kwargs_psf = {"psf_type": "NONE"}
+        self.kwargs_source = [{"amp": 100, "sigma": 0.3, "center_x": 0, "center_y": 0}]
+        image_model = ImageModel(
+            ImageData(**kwargs_data),
+            PSF(**kwargs_psf),
+            source_model_class=LightModel(["GAUSSIAN"]),
+        )
+        kwargs_data["image_data"] = image_model.image(kwargs_source=self.kwargs_source)
+        kwargs_model = {"source_light_model_list": ["GAUSSIAN"]}
+        self.param_class = Param(
+            kwargs_model,
+            kwargs_lower_source=[{"sigma": 0.01, "center_x": -1, "center_y": -1}],
+            kwargs_upper_source=[{"sigma": 1, "center_x": 1, "center_y": 1}],
+        )
+        self.Likelihood = Likelihood(
+            {
+                "multi_band_list": [[kwargs_data, kwargs_psf, {}]],
+                "multi_band_type": "single-band",
+            },
+            kwargs_model,
+            self.param_class,
+            prior_source=[[0, "sigma", 0.3, 0.1]],
+        )
+
+    def test_early_rejection(self):
+        # the natwt imaging likelihood is positive for a good model and is never skipped
+        args = self.param_class.kwargs2args(kwargs_source=self.kwargs_source)
+        logL = self.Likelihood.logL(args)
+        assert logL > 0
+        npt.assert_almost_equal(
+            self.Likelihood.logL(args, logL_threshold=logL - 1), logL, decimal=8
+        )
+        npt.assert_almost_equal(
+            self.Likelihood.logL(args, logL_threshold=logL + 1), logL, decimal=8
+        )
+        logL_batch = self.Likelihood.logL_batch(
+            np.array([args, args]), logL_threshold=logL - 1
+        )
+        npt.assert_almost_equal(logL_batch, [logL, logL], decimal=8)
+        assert self.Likelihood.term_stats["image"]["skips"] == 0
+
+    def test_pso(self):
+        sampler = Sampler(likelihood_class=self.Likelihood)
+        args = self.param_class.kwargs2args(kwargs_source=self.kwargs_source)
+        result_list = []
+        for early_rejection in [False, True]:
+            np.random.seed(42)
+            result, [chi2_list, _, _] = sampler.pso(
+                n_particles=10,
+                n_iterations=5,
+                lower_start=args - 0.1,
+                upper_start=args + 0.1,
+                init_pos=args,
+                verbose=False,
+                early_rejection=early_rejection,
+            )
+            result_list.append((result, chi2_list))
+        npt.assert_almost_equal(result_list[1][0], result_list[0][0], decimal=10)
+        npt.assert_almost_equal(result_list[1][1], result_list[0][1], decimal=8)
+
+
 if __name__ == "__main__":
     pytest.main()
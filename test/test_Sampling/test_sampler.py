@@ -156,6 +156,24 @@ class TestSampler(object):
         )
 
         assert len(result) == 16
+        assert self.sampler.pso_utilization is None
+
+        # the asynchronous PSO stores the worker utilization
+        result, chain = self.sampler.pso(
+            n_particles,
+            n_iterations,
+            lower_start=None,
+            upper_start=None,
+            threadCount=1,
+            print_key="PSO",
+            verbose=False,
+            asynchronous=True,
+        )
+        assert len(result) == 16
+        utilization = self.sampler.pso_utilization
+        assert utilization["num_evaluations"] == n_particles * n_iterations
+        assert utilization["num_workers"] == 1
+        assert 0 < utilization["utilization"] <= 1
 
     def test_mcmc_emcee(self):
         n_walkers = 36
@@ -0,0 +1,59 @@
+import os
+
+import numpy as np
+import numpy.testing as npt
+import pytest
+
+from lenstronomy.Util.checkpoint_util import (
+    CheckpointWriter,
+    load_checkpoint,
+    remove_checkpoint,
+    save_checkpoint,
+)
+
+
+class TestCheckpointUtil(object):
+    def test_save_load(self, tmp_path):
+        filename = str(tmp_path / "checkpoint.pkl")
+        assert load_checkpoint(filename) is None
+        assert load_checkpoint(None) is None
+        state = {"a": np.arange(3), "b": [1, "c"]}
+        save_checkpoint(filename, state)
+        state_loaded = load_checkpoint(filename)
+        npt.assert_equal(state_loaded["a"], state["a"])
+        assert state_loaded["b"] == state["b"]
+        # no temporary files are left behind
+        assert os.listdir(str(tmp_path)) == ["checkpoint.pkl"]
+        remove_checkpoint(filename)
+        assert not os.path.exists(filename)
+        remove_checkpoint(filename)
+        remove_checkpoint(None)
+
+    def test_checkpoint_writer(self, tmp_path):
+        filename = str(tmp_path / "sub" / "checkpoint.pkl")
+        writer = CheckpointWriter(filename)
+        assert writer.filename == filename
+        assert writer.load() is None
+        state = {"x": np.zeros(2)}
+        for i in range(20):
+            state["x"][0] = i
+            writer.save(state)
+        # the state is serialized when it is saved, later changes are not stored
+        state["x"][0] = -1
+        writer.flush()
+        npt.assert_equal(writer.load()["x"], [19, 0])
+        writer.remove()
+        assert not os.path.exists(filename)
+
+    def test_raise(self, tmp_path):
+        writer = CheckpointWriter(str(tmp_path))
+        writer.save(1)
+        with pytest.raises(OSError):
+            writer.flush()
+        writer.flush()
+        # the temporary file of the failed write is removed
+        assert os.listdir(str(tmp_path)) == []
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,65 @@
+import os
+import numpy as np
+import numpy.testing as npt
+import pytest
+import unittest
+from lenstronomy.Util.fft_util import FFTBackend
+from lenstronomy.ImSim.Numerics.convolution import PixelKernelConvolution
+
+
+class TestFFTBackend(object):
+    def setup_method(self):
+        np.random.seed(42)
+        self.image = np.random.rand(2, 20, 24)
+        self.kernel = np.random.rand(5, 5)
+
+    def test_rfftn(self):
+        sp_numpy = np.fft.rfftn(self.image, (32, 32), axes=(-2, -1))
+        for backend in ["numpy", "scipy", "pyfftw"]:
+            fft = FFTBackend(backend=backend, workers=2)
+            sp = fft.rfftn(self.image, (32, 32), axes=(-2, -1))
+            npt.assert_almost_equal(sp, sp_numpy, decimal=10)
+            # repeated transforms of the same shape re-use the plans
+            sp = fft.rfftn(self.image[::-1], (32, 32), axes=(-2, -1))
+            npt.assert_almost_equal(sp, sp_numpy[::-1], decimal=10)
+            image = fft.irfftn(sp_numpy, (32, 32), axes=(-2, -1))
+            npt.assert_almost_equal(image[:, :20, :24], self.image, decimal=10)
+
+    def test_convolution(self):
+        conv = PixelKernelConvolution(self.kernel, fft_backend="numpy")
+        image_conv = conv.convolution2d(self.image)
+        for backend in ["scipy", "pyfftw"]:
+            conv = PixelKernelConvolution(
+                self.kernel, fft_backend=backend, fft_workers=-1
+            )
+            npt.assert_almost_equal(
+                conv.convolution2d(self.image), image_conv, decimal=10
+            )
+            npt.assert_almost_equal(
+                conv.convolution2d(self.image[0]), image_conv[0], decimal=10
+            )
+
+    def test_wisdom(self, tmp_path):
+        wisdom_file = os.path.join(tmp_path, "wisdom.pkl")
+        fft = FFTBackend(backend="pyfftw", wisdom_file=wisdom_file)
+        fft.rfftn(self.image, (32, 32), axes=(-2, -1))
+        if fft.backend == "pyfftw":
+            # the wisdom is saved when a new shape is planned
+            assert os.path.exists(wisdom_file)
+            os.remove(wisdom_file)
+            fft.rfftn(self.image, (32, 32), axes=(-2, -1))
+            assert not os.path.exists(wisdom_file)
+            fft.save_wisdom()
+            assert os.path.exists(wisdom_file)
+            fft = FFTBackend(backend="pyfftw", wisdom_file=wisdom_file)
+            assert fft.backend == "pyfftw"
+
+
+class TestRaise(unittest.TestCase):
+    def test_raise(self):
+        with self.assertRaises(ValueError):
+            FFTBackend(backend="wrong")
+
+
+if __name__ == "__main__":
+    pytest.main()
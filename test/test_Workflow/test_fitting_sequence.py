@@ -290,6 +290,8 @@ class TestFittingSequence(object):
         assert logL < 0
         bic = fittingSequence.bic
         assert bic > 0
+        stats = fittingSequence.component_cache_stats
+        assert stats["source_response"]["misses"] >= 1
         # npt.assert_almost_equal(bic, 20000000220.29376, decimal=-4)
 
         # npt.assert_almost_equal(logL, -10000000061.792593, decimal=-4)
@@ -842,6 +844,55 @@ class TestFittingSequence(object):
 
         chain_list = fittingSequence.fit_sequence(fitting_list)
 
+    def test_checkpoint(self, tmp_path):
+        checkpoint_filename = str(tmp_path / "fitting_sequence.pkl")
+        fitting_list = [
+            ["SIMPLEX", {"n_iterations": 10}],
+            ["update_settings", {"lens_add_fixed": [[0, ["gamma"]]]}],
+            ["SIMPLEX", {"n_iterations": 10}],
+        ]
+
+        def fitting_sequence():
+            return FittingSequence(
+                copy.deepcopy(self.kwargs_data_joint),
+                self.kwargs_model,
+                self.kwargs_constraints,
+                self.kwargs_likelihood,
+                self.kwargs_params,
+                verbose=False,
+            )
+
+        fittingSequence = fitting_sequence()
+        chain_list = fittingSequence.fit_sequence(fitting_list)
+
+        # interrupted after the first step and resumed with a new instance
+        fittingSequence_checkpoint = fitting_sequence()
+        chain_list_1 = fittingSequence_checkpoint.fit_sequence(
+            fitting_list[:1], checkpoint_filename=checkpoint_filename
+        )
+        fittingSequence_resumed = fitting_sequence()
+        chain_list_resumed = fittingSequence_resumed.fit_sequence(
+            fitting_list, checkpoint_filename=checkpoint_filename
+        )
+        assert len(chain_list_resumed) == len(chain_list) == 2
+        npt.assert_equal(chain_list_resumed[0], chain_list_1[0])
+        kwargs_result = fittingSequence.best_fit()
+        kwargs_result_resumed = fittingSequence_resumed.best_fit()
+        for key in ["theta_E", "gamma", "e1", "e2"]:
+            npt.assert_almost_equal(
+                kwargs_result_resumed["kwargs_lens"][0][key],
+                kwargs_result["kwargs_lens"][0][key],
+                decimal=8,
+            )
+        assert "gamma" in fittingSequence_resumed.kwargs_fixed[0][0]
+
+        # a checkpoint of a different fitting sequence
+        with pytest.raises(ValueError):
+            fitting_sequence().fit_sequence(
+                [["PSO", {"n_particles": 2, "n_iterations": 2}]],
+                checkpoint_filename=checkpoint_filename,
+            )
+
     def test_minimizer(self):
         n_p = 2
         n_i = 2
@@ -899,6 +950,13 @@ class TestFittingSequence(object):
             kwargs_result["kwargs_lens"][0]["theta_E"], 1, decimal=2
         )
 
+        # the worker utilization of the asynchronous PSO is kept
+        assert fittingSequence.pso_utilization is None
+        fittingSequence.pso(n_particles=n_p, n_iterations=n_i, asynchronous=True)
+        utilization = fittingSequence.pso_utilization
+        assert utilization["num_evaluations"] == n_p * n_i
+        assert 0 < utilization["utilization"] <= 1
+
 
 if __name__ == "__main__":
     pytest.main()